@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import datetime
+import functools
 import logging
 import os
 import pathlib
@@ -28,9 +29,15 @@ from rich.prompt import IntPrompt, Prompt
 
 from ..utils.command import run_gcloud_command
 from ..utils.datastores import DATASTORE_TYPES, DATASTORES
+from ..utils.file_copy import copytree
 from ..utils.gcp import verify_credentials_and_vertex
 from ..utils.logging import display_welcome_banner, handle_cli_error
+from ..utils.matrix import create_projects, load_matrix, print_matrix_report
+from ..utils.prefetch import Prefetch
+from ..utils.profiler import phase, profile_options, profiled
+from ..utils.region import replace_region_in_files
 from ..utils.remote_template import (
+    clone_remote_template,
     fetch_remote_template,
     get_base_template_name,
     load_remote_template_config,
@@ -54,8 +61,12 @@ from ..utils.template import (
 
 console = Console()
 
+# Network steps create runs in the background, see _start_prefetch
+_PREFETCH_REMOTE_TEMPLATE = "remote template"
+_PREFETCH_CREDENTIALS = "credentials"
+
 # Export the shared decorator for use by other commands
-__all__ = ["create", "shared_template_options"]
+__all__ = ["create", "replace_region_in_files", "shared_template_options"]
 
 
 def shared_template_options(f: Callable) -> Callable:
@@ -70,6 +81,12 @@ def shared_template_options(f: Callable) -> Callable:
         default=None,
         help="Use Google AI Studio API key instead of Vertex AI. If provided without a value, generates a .env file with a placeholder.",
     )(f)
+    f = click.option(
+        "--no-cache",
+        is_flag=True,
+        help="Bypass the prebuilt scaffold bundles and the rendered output cache enabled with ASP_RENDER_CACHE=1",
+        default=False,
+    )(f)
     f = click.option(
         "-ag",
         "--agent-garden",
@@ -149,6 +166,7 @@ def shared_template_options(f: Callable) -> Callable:
         "-bt",
         help="Base template to use (overrides template default, only for remote templates)",
     )(f)
+    f = profile_options(f)
     return f
 
 
@@ -285,7 +303,26 @@ def normalize_project_name(project_name: str) -> str:
     help="Quickstart mode: adk + agent_engine + prototype, skips prompts",
     default=False,
 )
+@click.option(
+    "--matrix",
+    type=click.Path(exists=True, dir_okay=False, path_type=pathlib.Path),
+    help="Generate every project of a YAML/JSON matrix file in a single process. Options given on the command line apply to every project.",
+)
+@click.option(
+    "--matrix-workers",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of worker processes used with --matrix",
+)
+@click.option(
+    "--dry-run",
+    is_flag=True,
+    help="Show the files that would be generated, with counts and sizes, without writing anything",
+    default=False,
+)
 @handle_cli_error
+@profiled("create")
 def create(
     ctx: click.Context,
     project_name: str,
@@ -311,11 +348,33 @@ def create(
     locked: bool = False,
     cli_overrides: dict | None = None,
     google_api_key: str | None = None,
+    no_cache: bool = False,
+    matrix: pathlib.Path | None = None,
+    matrix_workers: int = 1,
+    dry_run: bool = False,
 ) -> None:
     """Create GCP-based AI agent projects from templates."""
+    if matrix:
+        create_matrix(ctx, matrix, matrix_workers)
+        return
+
+    prefetch = Prefetch()
     try:
         console = Console()
 
+        # Start the network steps that do not depend on prompts, so they run
+        # while the options are resolved and local files are prepared
+        _start_prefetch(
+            prefetch,
+            agent=agent,
+            adk=adk,
+            auto_approve=auto_approve,
+            agent_garden=agent_garden,
+            skip_checks=skip_checks,
+            google_api_key=google_api_key,
+            dry_run=dry_run,
+        )
+
         # Display welcome banner (unless skipped)
         if not skip_welcome:
             display_welcome_banner(agent, agent_garden=agent_garden)
@@ -406,7 +465,9 @@ def create(
         destination_dir = pathlib.Path(output_dir) if output_dir else pathlib.Path.cwd()
         destination_dir = destination_dir.resolve()  # Convert to absolute path
 
-        if in_folder:
+        if in_folder and dry_run:
+            project_path = destination_dir
+        elif in_folder:
             # For in-folder templating, use the current directory directly
             project_path = destination_dir
             # In-folder mode is permissive - we assume the user wants to enhance their existing repo
@@ -418,7 +479,7 @@ def create(
             console.print("📦 [blue]Creating backup before modification...[/blue]")
 
             try:
-                shutil.copytree(
+                copytree(
                     project_path, backup_dir, ignore=get_standard_ignore_patterns()
                 )
                 console.print(f"Backup created: [cyan]{backup_dir.name}[/cyan]")
@@ -464,11 +525,12 @@ def create(
                 temp_dir = tempfile.mkdtemp(prefix="asp_local_template_")
                 temp_dir_to_clean = temp_dir
                 template_source_path = pathlib.Path(temp_dir) / local_path.name
-                shutil.copytree(
-                    local_path,
-                    template_source_path,
-                    ignore=get_standard_ignore_patterns(),
-                )
+                with phase("copy local template"):
+                    copytree(
+                        local_path,
+                        template_source_path,
+                        ignore=get_standard_ignore_patterns(),
+                    )
 
                 # Check for version lock and execute nested command if found
                 from ..utils.remote_template import check_and_execute_with_version_lock
@@ -500,9 +562,14 @@ def create(
                         )
                     else:
                         console.print(f"Fetching remote template: {agent}")
-                    template_source_path, temp_dir_path = fetch_remote_template(
-                        remote_spec, agent, locked, project_name
-                    )
+                    with phase("fetch remote template"):
+                        cloned = prefetch.result(
+                            _PREFETCH_REMOTE_TEMPLATE,
+                            functools.partial(clone_remote_template, remote_spec),
+                        )
+                        template_source_path, temp_dir_path = fetch_remote_template(
+                            remote_spec, agent, locked, project_name, cloned=cloned
+                        )
                     temp_dir_to_clean = str(temp_dir_path)
                     selected_agent = f"remote_{hash(agent)}"  # Generate unique name for remote template
 
@@ -571,9 +638,10 @@ def create(
                         )
                     else:
                         console.print(f"Fetching remote template: {agent}")
-                    template_source_path, temp_dir_path = fetch_remote_template(
-                        remote_spec, agent, locked, project_name
-                    )
+                    with phase("fetch remote template"):
+                        template_source_path, temp_dir_path = fetch_remote_template(
+                            remote_spec, agent, locked, project_name
+                        )
                     temp_dir_to_clean = str(temp_dir_path)
                     final_agent = f"remote_{hash(agent)}"  # Generate unique name for remote template
 
@@ -867,16 +935,20 @@ def create(
         logging.debug("Setting up GCP...")
 
         creds_info = {}
-        if not skip_checks and not google_api_key:
+        if dry_run:
+            logging.debug("Dry run: skipping GCP setup")
+        elif not skip_checks and not google_api_key:
             # Set up GCP environment
             try:
-                creds_info = setup_gcp_environment(
-                    auto_approve=auto_approve,
-                    skip_checks=skip_checks,
-                    region=region,
-                    debug=debug,
-                    agent_garden=agent_garden,
-                )
+                with phase("credentials"):
+                    creds_info = setup_gcp_environment(
+                        auto_approve=auto_approve,
+                        skip_checks=skip_checks,
+                        region=region,
+                        debug=debug,
+                        agent_garden=agent_garden,
+                        prefetch=prefetch,
+                    )
             except Exception as e:
                 if debug:
                     logging.warning(f"GCP environment setup failed: {e}")
@@ -911,7 +983,7 @@ def create(
             logging.debug(f"Processing template for project: {project_name}")
 
         # Create output directory if it doesn't exist
-        if not destination_dir.exists():
+        if not dry_run and not destination_dir.exists():
             destination_dir.mkdir(parents=True)
 
         if debug:
@@ -926,29 +998,31 @@ def create(
 
         try:
             # Process template (handles both local and remote templates)
-            process_template(
-                agent_name=final_agent,
-                template_dir=template_path,
-                project_name=project_name,
-                deployment_target=final_deployment,
-                cicd_runner=final_cicd_runner,
-                include_data_ingestion=include_data_ingestion,
-                datastore=datastore,
-                session_type=final_session_type,
-                output_dir=destination_dir,
-                remote_template_path=template_source_path,
-                remote_config=config,
-                in_folder=in_folder,
-                cli_overrides=final_cli_overrides,
-                agent_garden=agent_garden,
-                remote_spec=remote_spec,
-                google_api_key=google_api_key,
-                google_cloud_project=creds_info.get("project"),
-            )
-
-            # Replace region in all files if a different region was specified
-            if region != "us-central1":
-                replace_region_in_files(project_path, region, debug=debug)
+            with phase("process template"):
+                process_template(
+                    agent_name=final_agent,
+                    template_dir=template_path,
+                    project_name=project_name,
+                    deployment_target=final_deployment,
+                    cicd_runner=final_cicd_runner,
+                    include_data_ingestion=include_data_ingestion,
+                    datastore=datastore,
+                    session_type=final_session_type,
+                    output_dir=destination_dir,
+                    remote_template_path=template_source_path,
+                    remote_config=config,
+                    in_folder=in_folder,
+                    cli_overrides=final_cli_overrides,
+                    agent_garden=agent_garden,
+                    remote_spec=remote_spec,
+                    google_api_key=google_api_key,
+                    google_cloud_project=creds_info.get("project"),
+                    no_cache=no_cache,
+                    region=region,
+                    dry_run=dry_run,
+                )
+            if dry_run:
+                return
 
             # Handle base template dependencies if override was used
             # Skip if --skip-deps is set (used when reusing saved config)
@@ -1045,6 +1119,76 @@ def create(
                 "An error occurred:"
             )  # This will print the full stack trace
         raise
+    finally:
+        prefetch.close()
+
+
+def _start_prefetch(
+    prefetch: Prefetch,
+    agent: str | None,
+    adk: bool,
+    auto_approve: bool,
+    agent_garden: bool,
+    skip_checks: bool,
+    google_api_key: str | None,
+    dry_run: bool,
+) -> None:
+    """Start the network steps create will need in the background.
+
+    A remote template given with --agent is cloned; its version lock is only
+    checked where it was fetched before, since it may re-run the CLI.
+    Credentials are verified when that happens without prompts, i.e. in
+    auto-approve and Agent Garden mode. Interactive credential checks ask the
+    user first and stay where they are.
+    """
+    if agent and not adk:
+        remote_spec = parse_agent_spec(resolve_agent_alias(agent))
+        if remote_spec:
+            prefetch.start(
+                _PREFETCH_REMOTE_TEMPLATE,
+                clone_remote_template,
+                remote_spec,
+                cleanup=lambda cloned: shutil.rmtree(cloned[1], ignore_errors=True),
+            )
+
+    if (
+        (auto_approve or adk or agent_garden)
+        and not skip_checks
+        and not google_api_key
+        and not dry_run
+    ):
+        prefetch.start(
+            _PREFETCH_CREDENTIALS,
+            verify_credentials_and_vertex,
+            context="agent-garden" if agent_garden else None,
+            auto_approve=True,
+        )
+
+
+def create_matrix(
+    ctx: click.Context, matrix_file: pathlib.Path, max_workers: int
+) -> None:
+    """Generate every project of a matrix file in a single process.
+
+    Options given explicitly on the command line apply to every project
+    unless the matrix overrides them.
+    """
+    defaults = {
+        name: value
+        for name, value in ctx.params.items()
+        if name not in ("project_name", "output_dir", "matrix", "matrix_workers")
+        and ctx.get_parameter_source(name) == ParameterSource.COMMANDLINE
+    }
+    results = create_projects(
+        load_matrix(matrix_file),
+        output_dir=ctx.params.get("output_dir"),
+        max_workers=max_workers,
+        defaults=defaults,
+    )
+    print_matrix_report(results, console)
+    failed = sum(1 for result in results if not result.ok)
+    if failed:
+        raise click.ClickException(f"{failed} of {len(results)} projects failed")
 
 
 def prompt_region_confirmation(
@@ -1123,7 +1267,8 @@ def display_agent_selection(deployment_target: str | None = None) -> str:
 def display_adk_samples_selection() -> str:
     """Display adk-samples agents and prompt for selection."""
 
-    from ..utils.remote_template import fetch_remote_template, parse_agent_spec
+    from ..utils.remote_catalog import discover_remote_adk_agents
+    from ..utils.remote_template import parse_agent_spec
 
     console.print("\n> Fetching agents from [bold blue]google/adk-samples[/]...")
 
@@ -1133,13 +1278,8 @@ def display_adk_samples_selection() -> str:
         if not spec:
             raise RuntimeError("Failed to parse adk-samples repository")
 
-        # Fetch the repository
-        repo_path, _ = fetch_remote_template(spec)
-
-        # Use shared ADK discovery function
-        from ..utils.remote_template import discover_adk_agents
-
-        adk_agents = discover_adk_agents(repo_path)
+        # Use shared ADK discovery function, cached by commit
+        adk_agents = discover_remote_adk_agents(spec)
 
         if not adk_agents:
             console.print("No agents found in adk-samples repository", style="yellow")
@@ -1227,6 +1367,7 @@ def setup_gcp_environment(
     region: str,
     debug: bool,
     agent_garden: bool = False,
+    prefetch: Prefetch | None = None,
 ) -> dict:
     """Set up the GCP environment with proper credentials and project.
 
@@ -1236,6 +1377,8 @@ def setup_gcp_environment(
         region: GCP region for deployment
         debug: Whether debug logging is enabled
         agent_garden: Whether this deployment is from Agent Garden
+        prefetch: Background steps of the command, which may already be
+            verifying the credentials in non-interactive mode
 
     Returns:
         Dictionary with credential information
@@ -1258,7 +1401,13 @@ def setup_gcp_environment(
     else:
         # Non-interactive mode
         console.print("> Verifying GCP credentials...")
-        creds_info = verify_credentials_and_vertex(context=context, auto_approve=True)
+        verify = functools.partial(
+            verify_credentials_and_vertex, context=context, auto_approve=True
+        )
+        if prefetch is not None:
+            creds_info = prefetch.result(_PREFETCH_CREDENTIALS, verify)
+        else:
+            creds_info = verify()
         console.print(f"> ✓ Connected to project: {creds_info['project']}")
 
     return creds_info
@@ -1347,112 +1496,3 @@ def _handle_interactive_credentials(context: str | None = None) -> dict:
     console.print(f"> ✓ Connected to project: {creds_info['project']}")
 
     return creds_info
-
-
-def replace_region_in_files(
-    project_path: pathlib.Path, new_region: str, debug: bool = False
-) -> None:
-    """Replace all instances of 'us-central1' with the specified region in project files.
-    Also handles vertex_ai_search region mapping.
-
-    Args:
-        project_path: Path to the project directory
-        new_region: The new region to use
-        debug: Whether to enable debug logging
-    """
-    if debug:
-        logging.debug(
-            f"Replacing region 'us-central1' with '{new_region}' in {project_path}"
-        )
-
-    # Define allowed file extensions
-    allowed_extensions = {
-        ".md",
-        ".py",
-        ".tfvars",
-        ".yaml",
-        ".tf",
-        ".yml",
-        "Makefile",
-        "makefile",
-    }
-
-    # Skip directories that shouldn't be modified
-    skip_dirs = {".git", "__pycache__", "venv", ".venv", "node_modules"}
-
-    # Determine data_store_region region value
-    if new_region.startswith("us"):
-        data_store_region = "us"
-    elif new_region.startswith("europe"):
-        data_store_region = "eu"
-    else:
-        data_store_region = "global"
-
-    for file_path in project_path.rglob("*"):
-        # Skip directories and files with unwanted extensions
-        if (
-            file_path.is_dir()
-            or any(skip_dir in file_path.parts for skip_dir in skip_dirs)
-            or (
-                file_path.suffix not in allowed_extensions
-                and file_path.name not in allowed_extensions
-            )
-        ):
-            continue
-
-        try:
-            content = file_path.read_text()
-            modified = False
-
-            # Replace standard region references
-            if "us-central1" in content:
-                if debug:
-                    logging.debug(f"Replacing region in {file_path}")
-                content = content.replace("us-central1", new_region)
-                modified = True
-
-            # Replace data_store_region region if present (all variants)
-            if 'data_store_region = "us"' in content:
-                if debug:
-                    logging.debug(f"Replacing vertex_ai_search region in {file_path}")
-                content = content.replace(
-                    'data_store_region = "us"',
-                    f'data_store_region = "{data_store_region}"',
-                )
-                modified = True
-            elif 'data_store_region="us"' in content:
-                if debug:
-                    logging.debug(f"Replacing data_store_region in {file_path}")
-                content = content.replace(
-                    'data_store_region="us"', f'data_store_region="{data_store_region}"'
-                )
-                modified = True
-            elif 'data-store-region="us"' in content:
-                if debug:
-                    logging.debug(f"Replacing data-store-region in {file_path}")
-                content = content.replace(
-                    'data-store-region="us"', f'data-store-region="{data_store_region}"'
-                )
-                modified = True
-            elif "_DATA_STORE_REGION: us" in content:
-                if debug:
-                    logging.debug(f"Replacing _DATA_STORE_REGION in {file_path}")
-                content = content.replace(
-                    "_DATA_STORE_REGION: us", f"_DATA_STORE_REGION: {data_store_region}"
-                )
-                modified = True
-            elif '"DATA_STORE_REGION", "us"' in content:
-                if debug:
-                    logging.debug(f"Replacing DATA_STORE_REGION in {file_path}")
-                content = content.replace(
-                    '"DATA_STORE_REGION", "us"',
-                    f'"DATA_STORE_REGION", "{data_store_region}"',
-                )
-                modified = True
-
-            if modified:
-                file_path.write_text(content)
-
-        except UnicodeDecodeError:
-            # Skip files that can't be read as text
-            continue
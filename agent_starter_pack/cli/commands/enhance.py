@@ -29,7 +29,9 @@ if sys.version_info >= (3, 11):
 else:
     import tomli as tomllib
 
+from ..utils.env_pool import get_cli_command
 from ..utils.logging import display_welcome_banner, handle_cli_error
+from ..utils.profiler import profiled
 from ..utils.template import (
     get_available_agents,
     resolve_agent_alias,
@@ -266,7 +268,7 @@ def _execute_with_saved_config(
             style="dim",
         )
         _ensure_uvx_available(project_version)
-        cmd = ["uvx", f"agent-starter-pack@{project_version}", *args]
+        cmd = [*get_cli_command(project_version), *args]
     else:
         console.print("✅ Using saved configuration", style="dim")
         cmd = ["agent-starter-pack", *args]
@@ -550,6 +552,7 @@ def display_agent_directory_selection(
     default=False,
 )
 @handle_cli_error
+@profiled("enhance")
 def enhance(
     ctx: click.Context,
     template_path: pathlib.Path,
@@ -571,6 +574,7 @@ def enhance(
     agent_directory: str | None,
     skip_welcome: bool = False,
     google_api_key: str | None = None,
+    no_cache: bool = False,
 ) -> None:
     """Enhance your existing project with AI agent capabilities.
 
@@ -995,4 +999,5 @@ def enhance(
         skip_welcome=True,  # Skip welcome message since enhance shows its own
         cli_overrides=final_cli_overrides if final_cli_overrides else None,
         google_api_key=google_api_key,
+        no_cache=no_cache,
     )
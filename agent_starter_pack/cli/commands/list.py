@@ -14,7 +14,9 @@
 
 import logging
 import pathlib
+import posixpath
 import sys
+from typing import Any
 
 import click
 
@@ -25,16 +27,19 @@ else:
 from rich.console import Console
 from rich.table import Table
 
-from ..utils.remote_template import fetch_remote_template, parse_agent_spec
+from ..utils.remote_catalog import discover_remote_adk_agents, read_remote_files
+from ..utils.remote_template import (
+    discover_adk_agents,
+    display_adk_caveat_if_needed,
+    fetch_remote_template,
+    parse_agent_spec,
+)
 from ..utils.template import get_available_agents
 
 console = Console()
 
 
-def display_agents_from_path(
-    base_path: pathlib.Path, source_name: str, is_adk_samples: bool = False
-) -> None:
-    """Scans a directory and displays available agents."""
+def _agents_table(source_name: str) -> Table:
     table = Table(
         title=f"Available agents in [bold blue]{source_name}[/]",
         show_header=True,
@@ -43,72 +48,111 @@ def display_agents_from_path(
     table.add_column("Name", style="bold")
     table.add_column("Path", style="cyan")
     table.add_column("Description", style="dim")
+    return table
+
+
+def display_adk_agents(adk_agents: dict[int, dict[str, Any]], source_name: str) -> None:
+    """Displays agents discovered in an ADK samples repository."""
+    if not adk_agents:
+        console.print(f"No agents found in {source_name}", style="yellow")
+        return
+
+    table = _agents_table(source_name)
+    for agent_info in adk_agents.values():
+        # Add indicator for inferred agents
+        name_with_indicator = agent_info["name"]
+        if not agent_info.get("has_explicit_config", True):
+            name_with_indicator += " *"
 
+        table.add_row(
+            name_with_indicator, f"/{agent_info['path']}", agent_info["description"]
+        )
+
+    # Show explanation for inferred agents at the top
+    display_adk_caveat_if_needed(adk_agents)
+    console.print(table)
+
+
+def display_agents_from_path(
+    base_path: pathlib.Path, source_name: str, is_adk_samples: bool = False
+) -> None:
+    """Scans a directory and displays available agents."""
     if not base_path.is_dir():
         console.print(f"Directory not found: {base_path}", style="bold red")
         return
 
-    found_agents = False
-    adk_agents = {}
-
     if is_adk_samples:
         # For ADK samples, use the shared discovery function
-        from ..utils.remote_template import discover_adk_agents
+        display_adk_agents(discover_adk_agents(base_path), source_name)
+        return
 
-        adk_agents = discover_adk_agents(base_path)
+    table = _agents_table(source_name)
+    found_agents = False
 
-        for agent_info in adk_agents.values():
-            # Add indicator for inferred agents
-            name_with_indicator = agent_info["name"]
-            if not agent_info.get("has_explicit_config", True):
-                name_with_indicator += " *"
+    # Search for pyproject.toml files with explicit config
+    for config_path in sorted(base_path.glob("**/pyproject.toml")):
+        try:
+            with open(config_path, "rb") as f:
+                pyproject_data = tomllib.load(f)
 
-            table.add_row(
-                name_with_indicator, f"/{agent_info['path']}", agent_info["description"]
+            # Display the agent's path relative to the scanned directory
+            relative_path = config_path.parent.relative_to(base_path)
+            found_agents |= _add_template_row(
+                table, pyproject_data, relative_path, config_path.parent.name
             )
-            found_agents = True
-    else:
-        # Original logic for non-ADK sources: Search for pyproject.toml files with explicit config
-        for config_path in sorted(base_path.glob("**/pyproject.toml")):
-            try:
-                with open(config_path, "rb") as f:
-                    pyproject_data = tomllib.load(f)
 
-                config = pyproject_data.get("tool", {}).get("agent-starter-pack", {})
+        except Exception as e:
+            logging.warning(f"Could not load agent from {config_path.parent}: {e}")
+
+    _print_templates_table(table, found_agents, source_name)
+
+
+def display_agents_from_pyprojects(
+    pyprojects: dict[str, bytes], source_name: str, default_name: str
+) -> None:
+    """Displays the agents of pyproject.toml contents, by path from the scan root."""
+    table = _agents_table(source_name)
+    found_agents = False
+
+    for config_path in sorted(pyprojects):
+        relative_path = pathlib.PurePosixPath(config_path).parent
+        try:
+            pyproject_data = tomllib.loads(pyprojects[config_path].decode("utf-8"))
+            found_agents |= _add_template_row(
+                table, pyproject_data, relative_path, relative_path.name or default_name
+            )
+        except Exception as e:
+            logging.warning(f"Could not load agent from {relative_path}: {e}")
+
+    _print_templates_table(table, found_agents, source_name)
 
-                # Skip pyproject.toml files that don't have agent-starter-pack config
-                if not config:
-                    continue
 
-                template_root = config_path.parent
+def _add_template_row(
+    table: Table,
+    pyproject_data: dict[str, Any],
+    relative_path: pathlib.PurePath,
+    default_name: str,
+) -> bool:
+    """Adds the template of a pyproject.toml to the table, if it has config."""
+    config = pyproject_data.get("tool", {}).get("agent-starter-pack", {})
 
-                # Use fallbacks to [project] section if needed
-                project_info = pyproject_data.get("project", {})
-                agent_name = (
-                    config.get("name") or project_info.get("name") or template_root.name
-                )
-                description = (
-                    config.get("description") or project_info.get("description") or ""
-                )
+    # Skip pyproject.toml files that don't have agent-starter-pack config
+    if not config:
+        return False
 
-                # Display the agent's path relative to the scanned directory
-                relative_path = template_root.relative_to(base_path)
+    # Use fallbacks to [project] section if needed
+    project_info = pyproject_data.get("project", {})
+    agent_name = config.get("name") or project_info.get("name") or default_name
+    description = config.get("description") or project_info.get("description") or ""
 
-                table.add_row(agent_name, f"/{relative_path}", description)
-                found_agents = True
+    table.add_row(agent_name, f"/{relative_path}", description)
+    return True
 
-            except Exception as e:
-                logging.warning(f"Could not load agent from {config_path.parent}: {e}")
 
+def _print_templates_table(table: Table, found_agents: bool, source_name: str) -> None:
     if not found_agents:
         console.print(f"No agents found in {source_name}", style="yellow")
     else:
-        # Show explanation for inferred agents at the top (only for ADK samples)
-        if is_adk_samples:
-            from ..utils.remote_template import display_adk_caveat_if_needed
-
-            display_adk_caveat_if_needed(adk_agents)
-
         console.print(table)
 
 
@@ -122,6 +166,21 @@ def list_remote_agents(remote_source: str, scan_from_root: bool = False) -> None
     console.print(f"\nFetching agents from [bold blue]{remote_source}[/]...")
 
     try:
+        if spec.is_adk_samples:
+            # Discovered agents are cached by commit, see remote_catalog
+            display_adk_agents(discover_remote_adk_agents(spec), remote_source)
+            return
+
+        # Only the pyproject.toml files are read from the git mirror cache
+        pyprojects = read_remote_files(spec, "pyproject.toml", scan_from_root)
+        if pyprojects is not None:
+            scan_path = "" if scan_from_root else spec.template_path.strip("/")
+            default_name = posixpath.basename(scan_path or spec.repo_url.rstrip("/"))
+            display_agents_from_pyprojects(
+                pyprojects, remote_source, default_name.removesuffix(".git")
+            )
+            return
+
         # fetch_remote_template clones the repo and returns a path to the
         # specific template directory within the repo.
         template_dir_path = fetch_remote_template(spec)
@@ -130,14 +189,7 @@ def list_remote_agents(remote_source: str, scan_from_root: bool = False) -> None
         repo_path, template_path = template_dir_path
         scan_path = repo_path if scan_from_root else template_path
 
-        # Check if this is ADK samples to enable inference
-        is_adk_samples = (
-            spec.is_adk_samples if hasattr(spec, "is_adk_samples") else False
-        )
-
-        display_agents_from_path(
-            scan_path, remote_source, is_adk_samples=is_adk_samples
-        )
+        display_agents_from_path(scan_path, remote_source)
 
     except (RuntimeError, FileNotFoundError) as e:
         console.print(f"Error: {e}", style="bold red")
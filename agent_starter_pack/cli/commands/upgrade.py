@@ -27,8 +27,10 @@ import click
 from rich.console import Console
 from rich.prompt import Prompt
 
+from ..utils.env_pool import get_cli_command
 from ..utils.generation_metadata import metadata_to_cli_args
 from ..utils.logging import handle_cli_error
+from ..utils.profiler import PhaseSequence, profile_options, profiled
 from ..utils.upgrade import (
     DependencyChange,
     FileCompareResult,
@@ -67,14 +69,14 @@ def _run_create_command(
         args: CLI arguments for create command
         output_dir: Directory to output the template
         project_name: Name for the project
-        version: Optional ASP version to use (uses uvx if specified)
+        version: Optional ASP version to use, from its prepared environment
 
     Returns:
         True if successful, False otherwise
     """
     # Build the command
     if version:
-        cmd = ["uvx", f"agent-starter-pack@{version}", "create"]
+        cmd = [*get_cli_command(version), "create"]
     else:
         cmd = ["agent-starter-pack", "create"]
 
@@ -398,7 +400,9 @@ def _update_pyproject_metadata(
     is_flag=True,
     help="Enable debug logging",
 )
+@profile_options
 @handle_cli_error
+@profiled("upgrade")
 def upgrade(
     project_path: pathlib.Path,
     dry_run: bool,
@@ -471,11 +475,13 @@ def upgrade(
     temp_base = pathlib.Path(tempfile.mkdtemp(prefix="asp_upgrade_"))
     old_template_dir = temp_base / "old"
     new_template_dir = temp_base / "new"
+    phases = PhaseSequence()
 
     try:
         console.print("[dim]Generating template versions for comparison...[/dim]")
 
         # Re-template old version
+        phases.next("generate old template")
         console.print(f"[dim]  - Old template (v{old_version})...[/dim]")
         if not _run_create_command(
             cli_args, old_template_dir, project_name, old_version
@@ -489,6 +495,7 @@ def upgrade(
             raise SystemExit(1)
 
         # Re-template new version
+        phases.next("generate new template")
         console.print(f"[dim]  - New template (v{new_version})...[/dim]")
         if not _run_create_command(cli_args, new_template_dir, project_name):
             console.print(
@@ -503,6 +510,7 @@ def upgrade(
         console.print()
 
         # Compare all files
+        phases.next("compare files")
         console.print("[dim]Comparing files...[/dim]")
         results = compare_all_files(
             project_dir,
@@ -521,6 +529,7 @@ def upgrade(
             new_template_project / "pyproject.toml",
         )
 
+        phases.end()
         console.print()
 
         # Display results
@@ -553,6 +562,7 @@ def upgrade(
                 return
 
         # Apply changes
+        phases.next("apply changes")
         counts = _apply_changes(
             groups,
             project_dir,
@@ -571,6 +581,7 @@ def upgrade(
         # Update metadata version
         if not dry_run:
             _update_pyproject_metadata(project_dir, new_version)
+        phases.end()
 
         # Summary
         console.print()
@@ -592,5 +603,6 @@ def upgrade(
             console.print("[bold green]✅ Upgrade complete![/bold green]")
 
     finally:
+        phases.end()
         # Cleanup temp directories
         shutil.rmtree(temp_base, ignore_errors=True)
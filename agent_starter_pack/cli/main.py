@@ -18,15 +18,22 @@ import sys
 import click
 from rich.console import Console
 
-from .commands.create import create
-from .commands.enhance import enhance
-from .commands.extract import extract
-from .commands.generate_skill import generate_skill
-from .commands.list import list_agents
-from .commands.register_gemini_enterprise import register_gemini_enterprise
-from .commands.setup_cicd import setup_cicd
-from .commands.upgrade import upgrade
-from .utils import display_update_message
+from .utils.lazy_group import LazyGroup
+
+# Commands are imported only when invoked, see LazyGroup
+COMMANDS = {
+    "create": "agent_starter_pack.cli.commands.create:create",
+    "enhance": "agent_starter_pack.cli.commands.enhance:enhance",
+    "extract": "agent_starter_pack.cli.commands.extract:extract",
+    "generate-skill": "agent_starter_pack.cli.commands.generate_skill:generate_skill",
+    "list": "agent_starter_pack.cli.commands.list:list_agents",
+    "register-gemini-enterprise": (
+        "agent_starter_pack.cli.commands.register_gemini_enterprise"
+        ":register_gemini_enterprise"
+    ),
+    "setup-cicd": "agent_starter_pack.cli.commands.setup_cicd:setup_cicd",
+    "upgrade": "agent_starter_pack.cli.commands.upgrade:upgrade",
+}
 
 console = Console()
 
@@ -42,7 +49,11 @@ def print_version(ctx: click.Context, param: click.Parameter, value: bool) -> No
     ctx.exit()
 
 
-@click.group(help="Production-ready Generative AI Agent templates for Google Cloud")
+@click.group(
+    cls=LazyGroup,
+    lazy_commands=COMMANDS,
+    help="Production-ready Generative AI Agent templates for Google Cloud",
+)
 @click.option(
     "--version",
     "-v",
@@ -52,21 +63,16 @@ def print_version(ctx: click.Context, param: click.Parameter, value: bool) -> No
     is_eager=True,
     help="Show the version and exit.",
 )
-def cli() -> None:
-    # Check for updates at startup (skip if --agent-garden, -ag, or --locked is used)
+@click.pass_context
+def cli(ctx: click.Context) -> None:
+    # Check for updates in the background and report them once the command is
+    # done (skip if --agent-garden, -ag, or --locked is used)
     if not any(flag in sys.argv for flag in ("--agent-garden", "-ag", "--locked")):
-        display_update_message()
-
+        from .utils.version import start_update_check
 
-# Register commands
-cli.add_command(create)
-cli.add_command(enhance)
-cli.add_command(extract)
-cli.add_command(generate_skill)
-cli.add_command(register_gemini_enterprise)
-cli.add_command(setup_cicd)
-cli.add_command(upgrade)
-cli.add_command(list_agents, name="list")
+        update_check = start_update_check()
+        if update_check is not None:
+            ctx.call_on_close(update_check.display)
 
 
 if __name__ == "__main__":
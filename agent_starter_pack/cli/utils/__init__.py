@@ -12,33 +12,40 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from .datastores import DATASTORE_TYPES, get_datastore_info
-from .gcp import verify_credentials_and_vertex
-from .generation_metadata import metadata_to_cli_args
-from .logging import handle_cli_error
-from .template import (
-    get_available_agents,
-    get_deployment_targets,
-    get_template_path,
-    load_template_config,
-    process_template,
-    prompt_datastore_selection,
-    prompt_deployment_target,
-)
-from .version import display_update_message
+"""CLI utilities.
 
-__all__ = [
-    "DATASTORE_TYPES",
-    "display_update_message",
-    "get_available_agents",
-    "get_datastore_info",
-    "get_deployment_targets",
-    "get_template_path",
-    "handle_cli_error",
-    "load_template_config",
-    "metadata_to_cli_args",
-    "process_template",
-    "prompt_datastore_selection",
-    "prompt_deployment_target",
-    "verify_credentials_and_vertex",
-]
+Names re-exported here are imported from their module on first access, so
+importing a single utility module (e.g. ``utils.version`` for the update
+check) does not load the template engine and cloud client dependencies.
+"""
+
+import importlib
+from typing import Any
+
+# Re-exported name -> module defining it
+_EXPORTS = {
+    "DATASTORE_TYPES": "datastores",
+    "display_update_message": "version",
+    "get_available_agents": "template",
+    "get_datastore_info": "datastores",
+    "get_deployment_targets": "template",
+    "get_template_path": "template",
+    "handle_cli_error": "logging",
+    "load_template_config": "template",
+    "metadata_to_cli_args": "generation_metadata",
+    "process_template": "template",
+    "prompt_datastore_selection": "template",
+    "prompt_deployment_target": "template",
+    "verify_credentials_and_vertex": "gcp",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,216 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Prebuilt scaffold bundles for the common agent and deployment target pairs.
+
+With default options, the projects ``create`` renders for a built-in agent
+and deployment target only differ in their project name, project ID and
+region. At release time, ``generate_bundles`` creates every pair once and
+records the render in the render cache with those values left out of its
+key; the entries are then packed into a zip shipped with the package, where
+each distinct file content is stored once, compressed.
+
+``create`` looks its render up in the bundles first. On a hit, files not
+reading the left-out values are unpacked (with the region substituted) and
+the others are rendered as usual. Renders with any other option, template
+content or CLI version miss and are rendered in full. ``ASP_NO_BUNDLES=1``
+disables the bundles.
+"""
+
+import functools
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import zipfile
+from typing import Any
+
+from .render_cache import PROJECT_VARIABLES, REGION_VARIABLE, RenderCache
+from .render_engine import FilePlan, RenderEngine, run_file_tasks
+from .version import get_current_version
+
+# Set to "1" to render every project in full
+NO_BUNDLES_ENV_VAR = "ASP_NO_BUNDLES"
+
+# Set by ``generate_bundles`` to record renders into this directory
+BUNDLE_BUILD_DIR_ENV_VAR = "ASP_BUNDLE_BUILD_DIR"
+
+# Config values that differ between projects served from the same bundle
+BUNDLE_PROJECT_VARIABLES = (
+    *PROJECT_VARIABLES,
+    "google_cloud_project",
+    REGION_VARIABLE,
+)
+
+# Bump when the format of the bundle archive changes
+BUNDLES_VERSION = 1
+
+BUNDLES_FILE = "scaffold_bundles.zip"
+
+_MANIFEST_FILE = "manifest.json"
+_BLOBS_DIR = "blobs"
+
+
+def get_bundles_path() -> pathlib.Path:
+    """Get the path of the scaffold bundles shipped with the package."""
+    return pathlib.Path(__file__).parent.parent.parent / "resources" / BUNDLES_FILE
+
+
+class ScaffoldBundles:
+    """Zip archive of prebuilt project renders, keyed like the render cache.
+
+    ``manifest.json`` maps every render cache key to the files of the
+    render, as content hash and permission bits, and the files to render
+    again; contents are stored as ``blobs/<sha256>``.
+    """
+
+    def __init__(self, path: pathlib.Path | None = None) -> None:
+        self.path = path or get_bundles_path()
+
+    def render(
+        self,
+        engine: RenderEngine,
+        plan: FilePlan,
+        project_dir: pathlib.Path,
+        max_workers: int | None = None,
+    ) -> bool:
+        """Render a plan into ``project_dir`` from its bundle, if there is one.
+
+        Returns:
+            True if the plan was rendered from a bundle
+        """
+        bundles = _load_manifest(str(self.path))
+        if not bundles:
+            return False
+        key = RenderCache(project_variables=BUNDLE_PROJECT_VARIABLES).get_key(
+            engine, plan
+        )
+        bundle = bundles.get(key)
+        if bundle is None:
+            logging.debug(f"No scaffold bundle for {key}")
+            return False
+
+        rerendered = set(bundle["rerendered"])
+        files = bundle["files"]
+        outputs = engine.resolve_outputs(plan, project_dir)
+        with zipfile.ZipFile(self.path) as archive:
+            tasks = []
+            for outfile, (rel_path, src, copy_only) in outputs.items():
+                out_rel = outfile.relative_to(project_dir).as_posix()
+                if rel_path not in rerendered and out_rel in files:
+                    digest, mode = files[out_rel]
+                    task = functools.partial(
+                        _unpack, engine, archive, digest, mode, outfile
+                    )
+                else:
+                    task = engine.output_task(outfile, rel_path, src, copy_only)
+                tasks.append((rel_path, task))
+            run_file_tasks(tasks, max_workers)
+        logging.debug(
+            f"Rendered from scaffold bundle {key}, {len(rerendered)} files rendered"
+        )
+        return True
+
+    @staticmethod
+    def build(entries_dir: pathlib.Path, path: pathlib.Path) -> int:
+        """Pack the render cache entries recorded by ``generate_bundles``.
+
+        Args:
+            entries_dir: Render cache directory the renders were recorded in
+            path: Archive to write
+
+        Returns:
+            Number of bundles written
+        """
+        bundles: dict[str, Any] = {}
+        blobs: dict[str, pathlib.Path] = {}
+        for key, manifest, tree in RenderCache(entries_dir).entries():
+            files = {}
+            for out_rel in manifest["files"]:
+                cached_file = tree / out_rel
+                digest = hashlib.sha256(cached_file.read_bytes()).hexdigest()
+                files[out_rel] = [digest, cached_file.stat().st_mode & 0o7777]
+                blobs.setdefault(digest, cached_file)
+            bundles[key] = {"rerendered": manifest["rerendered"], "files": files}
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}")
+        with zipfile.ZipFile(
+            tmp_path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=9
+        ) as archive:
+            archive.writestr(
+                _MANIFEST_FILE,
+                json.dumps(
+                    {
+                        "version": BUNDLES_VERSION,
+                        "asp_version": get_current_version(),
+                        "bundles": bundles,
+                    },
+                    sort_keys=True,
+                ),
+            )
+            for digest, cached_file in sorted(blobs.items()):
+                archive.write(cached_file, f"{_BLOBS_DIR}/{digest}")
+        os.replace(tmp_path, path)
+        return len(bundles)
+
+
+@functools.cache
+def _load_manifest(path: str) -> dict[str, Any]:
+    """Load the bundles of an archive, or none if it is missing or outdated."""
+    try:
+        with zipfile.ZipFile(path) as archive:
+            manifest = json.loads(archive.read(_MANIFEST_FILE))
+        if (
+            manifest["version"] == BUNDLES_VERSION
+            and manifest["asp_version"] == get_current_version()
+        ):
+            return manifest["bundles"]
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile) as e:
+        logging.debug(f"Could not load scaffold bundles from {path}: {e}")
+    return {}
+
+
+def _unpack(
+    engine: RenderEngine,
+    archive: zipfile.ZipFile,
+    digest: str,
+    mode: int,
+    outfile: pathlib.Path,
+) -> str:
+    return engine.write_output(archive.read(f"{_BLOBS_DIR}/{digest}"), mode, outfile)
+
+
+def render_from_bundle(
+    engine: RenderEngine, plan: FilePlan, project_dir: pathlib.Path
+) -> bool:
+    """Render a plan from the scaffold bundles, if one matches.
+
+    While ``generate_bundles`` runs, the render is recorded instead.
+
+    Returns:
+        True if the plan was rendered
+    """
+    build_dir = os.environ.get(BUNDLE_BUILD_DIR_ENV_VAR)
+    if build_dir:
+        RenderCache(
+            pathlib.Path(build_dir), project_variables=BUNDLE_PROJECT_VARIABLES
+        ).render(engine, plan, project_dir)
+        return True
+    if os.environ.get(NO_BUNDLES_ENV_VAR) == "1":
+        return False
+    return ScaffoldBundles().render(engine, plan, project_dir)
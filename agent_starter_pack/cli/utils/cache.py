@@ -0,0 +1,173 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Helpers for the on-disk caches used by the CLI."""
+
+import contextlib
+import logging
+import os
+import pathlib
+import shutil
+from collections.abc import Callable, Iterator
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+    import msvcrt
+
+# Environment variable used to relocate all CLI caches
+CACHE_DIR_ENV_VAR = "ASP_CACHE_DIR"
+
+
+def get_cache_dir(*parts: str) -> pathlib.Path:
+    """Return a directory inside the CLI cache root.
+
+    The root is ``$ASP_CACHE_DIR`` if set, otherwise
+    ``$XDG_CACHE_HOME/agent-starter-pack`` (``~/.cache/agent-starter-pack``).
+    The directory is not created.
+    """
+    root = os.environ.get(CACHE_DIR_ENV_VAR)
+    if root:
+        base = pathlib.Path(root).expanduser()
+    else:
+        xdg_cache = os.environ.get("XDG_CACHE_HOME")
+        cache_home = (
+            pathlib.Path(xdg_cache) if xdg_cache else pathlib.Path.home() / ".cache"
+        )
+        base = cache_home / "agent-starter-pack"
+    return base.joinpath(*parts)
+
+
+def prune_cache_dir(directory: pathlib.Path, max_bytes: int, pattern: str = "*") -> int:
+    """Evict least recently used files until the directory fits in ``max_bytes``.
+
+    Recency is taken from the file modification time, which cache readers
+    refresh on every hit.
+
+    Args:
+        directory: Cache directory to prune
+        max_bytes: Maximum total size of matching files
+        pattern: Glob pattern selecting the cache entries
+
+    Returns:
+        Number of files removed
+    """
+    entries = []
+    total = 0
+    try:
+        for path in directory.glob(pattern):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            if not path.is_file():
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+    except OSError:
+        return 0
+
+    removed = _evict_oldest(entries, total, max_bytes, pathlib.Path.unlink)
+    if removed:
+        logging.debug(f"Evicted {removed} cache entries from {directory}")
+    return removed
+
+
+def prune_cache_entries(
+    directory: pathlib.Path,
+    max_bytes: int,
+    remove: Callable[[pathlib.Path], object] = shutil.rmtree,
+) -> int:
+    """Evict least recently used entry directories beyond ``max_bytes``.
+
+    Like ``prune_cache_dir`` for caches storing one directory per entry. The
+    size of an entry is the total size of its files and its recency is the
+    modification time of the entry directory, which readers refresh on hits.
+    Directories whose name starts with a dot (in-progress writes) are skipped.
+    ``remove`` deletes an entry; entries for which it raises ``OSError``
+    (e.g. because they are in use) are kept.
+
+    Returns:
+        Number of entries removed
+    """
+    entries = []
+    total = 0
+    try:
+        for path in directory.iterdir():
+            if path.name.startswith(".") or not path.is_dir():
+                continue
+            try:
+                mtime = path.stat().st_mtime
+            except OSError:
+                continue
+            size = 0
+            for root, _, files in os.walk(path):
+                for name in files:
+                    try:
+                        size += os.lstat(os.path.join(root, name)).st_size
+                    except OSError:
+                        continue
+            entries.append((mtime, size, path))
+            total += size
+    except OSError:
+        return 0
+
+    removed = _evict_oldest(entries, total, max_bytes, remove)
+    if removed:
+        logging.debug(f"Evicted {removed} cache entries from {directory}")
+    return removed
+
+
+def _evict_oldest(
+    entries: list[tuple[float, int, pathlib.Path]],
+    total: int,
+    max_bytes: int,
+    remove: Callable[[pathlib.Path], object],
+) -> int:
+    removed = 0
+    for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+        if total <= max_bytes:
+            break
+        try:
+            remove(path)
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    return removed
+
+
+@contextlib.contextmanager
+def lock_file(path: pathlib.Path, blocking: bool = True) -> Iterator[None]:
+    """Hold an exclusive inter-process lock on ``path``, creating it if needed.
+
+    Raises:
+        OSError: If ``blocking`` is False and the lock is held elsewhere
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a+b") as f:
+        fd = f.fileno()
+        if fcntl is not None:
+            flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+            fcntl.flock(fd, flags)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
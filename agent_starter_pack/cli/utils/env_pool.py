@@ -0,0 +1,157 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Pool of prepared environments for running pinned versions of the CLI.
+
+Remote templates (through their ``uv.lock``) and projects (through their saved
+config) can pin the agent-starter-pack version they were made with, in which
+case the CLI runs itself again at that version. ``uvx`` resolves the
+environment of the pinned version on every run; instead, each version is
+installed once into a virtual environment in the CLI cache, whose
+``agent-starter-pack`` executable is then run directly. Environments are
+evicted least recently used first once the pool grows beyond
+``ENV_POOL_MAX_BYTES``. ``ASP_NO_ENV_POOL=1`` runs ``uvx`` instead.
+"""
+
+import logging
+import os
+import pathlib
+import shutil
+import subprocess
+import sys
+
+from packaging import version as pkg_version
+
+from .cache import get_cache_dir, lock_file, prune_cache_entries
+from .profiler import phase
+
+PACKAGE_NAME = "agent-starter-pack"
+
+# Set to "1" to run pinned versions with uvx instead of the pool
+NO_ENV_POOL_ENV_VAR = "ASP_NO_ENV_POOL"
+
+# Maximum total size of the prepared environments
+ENV_POOL_MAX_BYTES = 2 * 1024 * 1024 * 1024
+
+# Written once an environment is fully installed
+_READY_MARKER = ".asp-ready"
+
+
+def is_env_pool_enabled() -> bool:
+    """Check whether pinned versions run from prepared environments."""
+    return os.environ.get(NO_ENV_POOL_ENV_VAR) != "1"
+
+
+class EnvironmentPool:
+    """Virtual environments with a pinned CLI version, one per version."""
+
+    def __init__(
+        self,
+        directory: pathlib.Path | None = None,
+        max_bytes: int = ENV_POOL_MAX_BYTES,
+    ) -> None:
+        self.directory = directory or get_cache_dir("envs")
+        self.max_bytes = max_bytes
+
+    def env_path(self, version: str) -> pathlib.Path:
+        """Return the environment directory of a version.
+
+        Raises:
+            ValueError: If ``version`` is not a valid version
+        """
+        return self.directory / str(pkg_version.Version(version))
+
+    @staticmethod
+    def executable(env: pathlib.Path) -> pathlib.Path:
+        if sys.platform == "win32":
+            return env / "Scripts" / f"{PACKAGE_NAME}.exe"
+        return env / "bin" / PACKAGE_NAME
+
+    def prepare(self, version: str) -> pathlib.Path:
+        """Return the CLI executable of a version, installing it if needed.
+
+        Raises:
+            ValueError: If ``version`` is not a valid version
+            subprocess.CalledProcessError: If the installation fails
+            OSError: If ``uv`` is not installed or the pool is not writable
+        """
+        env = self.env_path(version)
+        with lock_file(self._lock_path(env)):
+            if not (env / _READY_MARKER).is_file():
+                self._install(env, version)
+                # The pool only grows here; the lock keeps the new environment
+                # itself from being evicted
+                prune_cache_entries(self.directory, self.max_bytes, remove=self._evict)
+            os.utime(env)
+        return self.executable(env)
+
+    def clear(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _install(self, env: pathlib.Path, version: str) -> None:
+        # Console scripts refer to the environment by absolute path, so it is
+        # installed in place; the marker tells complete environments apart
+        # from leftovers of an interrupted run
+        shutil.rmtree(env, ignore_errors=True)
+        logging.debug(f"Installing {PACKAGE_NAME} {version} into {env}")
+        try:
+            with phase("prepare environment"):
+                _run_uv("venv", "--quiet", env)
+                _run_uv(
+                    "pip",
+                    "install",
+                    "--quiet",
+                    "--python",
+                    env,
+                    f"{PACKAGE_NAME}=={version}",
+                )
+            (env / _READY_MARKER).touch()
+        except BaseException:
+            shutil.rmtree(env, ignore_errors=True)
+            raise
+
+    @staticmethod
+    def _lock_path(env: pathlib.Path) -> pathlib.Path:
+        return env.with_name(f"{env.name}.lock")
+
+    def _evict(self, env: pathlib.Path) -> None:
+        # Environments being installed or pruned by another run are skipped
+        with lock_file(self._lock_path(env), blocking=False):
+            shutil.rmtree(env)
+
+
+def _run_uv(*args: str | pathlib.Path) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        ["uv", *(str(arg) for arg in args)],
+        capture_output=True,
+        text=True,
+        check=True,
+        encoding="utf-8",
+    )
+
+
+def get_cli_command(version: str) -> list[str]:
+    """Return the command running agent-starter-pack at a pinned version.
+
+    Uses the prepared environment of the version, and ``uvx`` if the pool is
+    disabled or the environment cannot be prepared.
+    """
+    if is_env_pool_enabled():
+        try:
+            return [str(EnvironmentPool().prepare(version))]
+        except subprocess.CalledProcessError as e:
+            logging.debug(f"Could not prepare environment for {version}: {e.stderr}")
+        except (OSError, ValueError) as e:
+            logging.debug(f"Could not prepare environment for {version}: {e}")
+    return ["uvx", f"{PACKAGE_NAME}@{version}"]
@@ -0,0 +1,190 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""File copy strategies.
+
+Most files copied during ``create`` and ``enhance`` (frontends, notebooks,
+lock files, staged templates, backups) are never modified afterwards, or are
+modified by replacing their content. Copying them as reflinks on
+copy-on-write filesystems (btrfs, XFS, APFS-style clones) or as hardlinks for
+read-only destinations avoids most of the disk I/O of a full byte copy.
+"""
+
+import collections
+import errno
+import logging
+import os
+import pathlib
+import shutil
+import threading
+
+from .profiler import record_file
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # type: ignore[assignment]
+
+# Copy strategies selectable per call site
+# Reflink when supported, otherwise a byte copy. Safe for any destination.
+COPY_STRATEGY_AUTO = "auto"
+# Reflink, then hardlink, then a byte copy. Only for destinations that are
+# never modified in place (staging directories, read-only caches), since a
+# hardlink shares its content with the source file.
+COPY_STRATEGY_LINK = "link"
+# Always perform a full byte copy.
+COPY_STRATEGY_COPY = "copy"
+
+COPY_STRATEGIES = (COPY_STRATEGY_AUTO, COPY_STRATEGY_LINK, COPY_STRATEGY_COPY)
+
+# Methods reported by copy_file
+REFLINK = "reflink"
+HARDLINK = "hardlink"
+BYTE_COPY = "copy"
+
+# Linux ioctl cloning a whole file (_IOW(0x94, 9, int))
+_FICLONE = 0x40049409
+
+# Errors meaning reflinks are not possible between two filesystems
+_REFLINK_UNSUPPORTED_ERRNOS = {
+    errno.EOPNOTSUPP,
+    errno.ENOTTY,
+    errno.EXDEV,
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.EPERM,
+}
+
+# (source device, destination device) pairs known not to support reflinks
+_reflink_unsupported: set[tuple[int, int]] = set()
+_reflink_lock = threading.Lock()
+
+
+def _try_reflink(src: pathlib.Path, dst: pathlib.Path) -> bool:
+    """Clone ``src`` into ``dst`` with FICLONE, returning False if unsupported."""
+    if fcntl is None or not hasattr(fcntl, "ioctl"):
+        return False
+    try:
+        src_fd = os.open(src, os.O_RDONLY)
+    except OSError:
+        return False
+    try:
+        try:
+            devices = (os.fstat(src_fd).st_dev, os.stat(dst.parent).st_dev)
+        except OSError:
+            return False
+        if devices in _reflink_unsupported:
+            return False
+        try:
+            dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        except OSError:
+            return False
+        try:
+            fcntl.ioctl(dst_fd, _FICLONE, src_fd)
+        except OSError as e:
+            if e.errno in _REFLINK_UNSUPPORTED_ERRNOS:
+                with _reflink_lock:
+                    _reflink_unsupported.add(devices)
+            return False
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+    return True
+
+
+def _try_hardlink(src: pathlib.Path, dst: pathlib.Path) -> bool:
+    """Hardlink ``src`` to ``dst``, returning False if not possible."""
+    try:
+        if dst.is_symlink() or dst.exists():
+            dst.unlink()
+        os.link(src, dst)
+    except OSError:
+        return False
+    return True
+
+
+def copy_file(
+    src: pathlib.Path | str,
+    dst: pathlib.Path | str,
+    strategy: str = COPY_STRATEGY_AUTO,
+    preserve_stat: bool = True,
+) -> str:
+    """Copy a file using the cheapest method allowed by ``strategy``.
+
+    Args:
+        src: Source file
+        dst: Destination file, overwritten if it exists
+        strategy: One of COPY_STRATEGY_AUTO, COPY_STRATEGY_LINK or
+            COPY_STRATEGY_COPY
+        preserve_stat: Copy timestamps and permission bits like
+            ``shutil.copy2``; otherwise only permission bits like
+            ``shutil.copyfile`` + ``shutil.copymode``
+
+    Returns:
+        The method that was used: REFLINK, HARDLINK or BYTE_COPY
+    """
+    if strategy not in COPY_STRATEGIES:
+        raise ValueError(
+            f"Unknown copy strategy '{strategy}', expected one of {COPY_STRATEGIES}"
+        )
+    src = pathlib.Path(src)
+    dst = pathlib.Path(dst)
+    if dst.exists() and os.path.samefile(src, dst):
+        raise shutil.SameFileError(f"{src} and {dst} are the same file")
+    copy_metadata = shutil.copystat if preserve_stat else shutil.copymode
+
+    if strategy != COPY_STRATEGY_COPY and _try_reflink(src, dst):
+        copy_metadata(src, dst)
+        method = REFLINK
+    elif strategy == COPY_STRATEGY_LINK and _try_hardlink(src, dst):
+        method = HARDLINK
+    else:
+        shutil.copyfile(src, dst)
+        copy_metadata(src, dst)
+        method = BYTE_COPY
+    record_file(dst)
+    return method
+
+
+def copytree(
+    src: pathlib.Path,
+    dst: pathlib.Path,
+    strategy: str = COPY_STRATEGY_AUTO,
+    **kwargs: object,
+) -> collections.Counter[str]:
+    """``shutil.copytree`` using ``copy_file`` for every file.
+
+    Returns:
+        Number of files copied with each method
+    """
+    methods: collections.Counter[str] = collections.Counter()
+
+    def copy_function(file_src: str, file_dst: str) -> None:
+        methods[copy_file(file_src, file_dst, strategy)] += 1
+
+    shutil.copytree(src, dst, copy_function=copy_function, **kwargs)  # type: ignore[arg-type]
+    log_copy_methods(methods, src, dst)
+    return methods
+
+
+def log_copy_methods(
+    methods: collections.Counter[str], src: pathlib.Path, dst: pathlib.Path
+) -> None:
+    """Log how many files were copied with each method."""
+    if methods:
+        summary = ", ".join(f"{method}: {count}" for method, count in methods.items())
+        logging.debug(
+            f"Copied {sum(methods.values())} files from {src} to {dst} ({summary})"
+        )
@@ -0,0 +1,362 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Local mirror cache of remote template repositories.
+
+Every remote template repository is kept as a bare mirror in the CLI cache,
+keyed by its URL. Fetching a template only fetches the requested ref into the
+mirror (shallowly, so an unchanged ref transfers nothing) and checks it out
+into a new worktree. Mirrors are locked while in use, so concurrent runs can
+share them, and evicted least recently used first once the cache grows
+beyond ``GIT_CACHE_MAX_BYTES``. ``ASP_NO_GIT_CACHE=1`` disables the cache.
+
+Templates in a subdirectory of a repository (e.g. ``adk@<sample>`` in the
+adk-samples monorepo) are fetched without file contents (a blob-less partial
+fetch) and checked out sparsely, so only the contents of the template
+directory and the top-level files are downloaded. Servers without partial
+fetch support send everything, as for a regular clone.
+
+Listing templates does not need a checkout at all: the files of a ref are
+listed from its directory trees, and only the contents of the files read
+(e.g. the ``pyproject.toml`` of each agent) are fetched, in one batch.
+"""
+
+import hashlib
+import logging
+import os
+import pathlib
+import re
+import shutil
+import subprocess
+import tempfile
+
+from .cache import get_cache_dir, lock_file, prune_cache_entries
+
+# Set to "1" to clone remote templates directly instead of using the cache
+NO_GIT_CACHE_ENV_VAR = "ASP_NO_GIT_CACHE"
+
+# Maximum total size of the mirrors
+GIT_CACHE_MAX_BYTES = 1024 * 1024 * 1024
+
+_COMMIT_RE = re.compile(r"[0-9a-f]{40}")
+
+
+def is_git_cache_enabled() -> bool:
+    """Check whether remote templates are fetched through the mirror cache."""
+    return os.environ.get(NO_GIT_CACHE_ENV_VAR) != "1"
+
+
+def run_git(
+    *args: str | pathlib.Path, input: str | None = None
+) -> subprocess.CompletedProcess:
+    """Run a git command without prompting for credentials.
+
+    Raises:
+        subprocess.CalledProcessError: If the command fails
+    """
+    return subprocess.run(
+        ["git", *(str(arg) for arg in args)],
+        input=input,
+        capture_output=True,
+        text=True,
+        check=True,
+        encoding="utf-8",
+        # GIT_TERMINAL_PROMPT=0 prevents git from prompting for credentials
+        env={**os.environ, "GIT_TERMINAL_PROMPT": "0"},
+    )
+
+
+def is_commit_sha(ref: str) -> bool:
+    """Check whether a ref is a full commit SHA, which never moves."""
+    return _COMMIT_RE.fullmatch(ref) is not None
+
+
+def resolve_remote_ref(url: str, ref: str) -> str:
+    """Return the commit a branch or tag of a remote repository points to.
+
+    Only the refs are listed, nothing is fetched.
+
+    Raises:
+        subprocess.CalledProcessError: If the repository cannot be reached
+        LookupError: If the ref does not exist
+    """
+    if is_commit_sha(ref):
+        return ref
+    candidates = (f"refs/heads/{ref}", f"refs/tags/{ref}^{{}}", f"refs/tags/{ref}")
+    result = run_git("ls-remote", url, *candidates)
+    refs = {}
+    for line in result.stdout.splitlines():
+        commit, _, name = line.partition("\t")
+        refs[name] = commit
+    # Annotated tags are listed twice, the peeled ^{} entry is the commit
+    for name in candidates:
+        if name in refs:
+            return refs[name]
+    raise LookupError(f"Ref '{ref}' not found in {url}")
+
+
+def get_head_commit(path: pathlib.Path) -> str | None:
+    """Return the commit checked out in a git worktree or clone, if any."""
+    try:
+        return run_git("-C", path, "rev-parse", "HEAD").stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class GitMirrorCache:
+    """Bare mirrors of remote repositories, one directory per URL."""
+
+    def __init__(
+        self,
+        directory: pathlib.Path | None = None,
+        max_bytes: int = GIT_CACHE_MAX_BYTES,
+    ) -> None:
+        self.directory = directory or get_cache_dir("git")
+        self.max_bytes = max_bytes
+
+    def mirror_path(self, url: str) -> pathlib.Path:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()[:16]
+        return self.directory / f"{key}.git"
+
+    def checkout(
+        self, url: str, ref: str, dest: pathlib.Path, sparse_path: str = ""
+    ) -> str:
+        """Check out a branch, tag or commit of a repository into ``dest``.
+
+        Args:
+            url: Repository URL
+            ref: Branch, tag or commit SHA
+            dest: Directory to create the worktree in; must not exist
+            sparse_path: Only check out this directory (and top-level files)
+
+        Returns:
+            The SHA of the checked out commit
+
+        Raises:
+            subprocess.CalledProcessError: If the ref cannot be fetched or
+                checked out
+            OSError: If the cache directory is not writable
+        """
+        mirror = self.mirror_path(url)
+        with lock_file(self._lock_path(mirror)):
+            self._ensure_mirror(mirror, url)
+            commit = self._fetch(mirror, ref, partial=bool(sparse_path))
+            # Forget the worktrees of earlier runs, deleted with their temp dir
+            run_git("-C", mirror, "worktree", "prune")
+            if sparse_path:
+                run_git(
+                    "-C",
+                    mirror,
+                    "worktree",
+                    "add",
+                    "--detach",
+                    "--force",
+                    "--no-checkout",
+                    dest,
+                    commit,
+                )
+                # Missing file contents are fetched on checkout, in one batch
+                run_git("-C", dest, "sparse-checkout", "set", "--cone", sparse_path)
+                run_git("-C", dest, "reset", "--quiet", "--hard")
+            else:
+                run_git(
+                    "-C", mirror, "worktree", "add", "--detach", "--force", dest, commit
+                )
+            os.utime(mirror)
+        prune_cache_entries(self.directory, self.max_bytes, remove=self._evict)
+        return commit
+
+    def list_files(
+        self, url: str, ref: str, path: str = ""
+    ) -> tuple[str, dict[str, str]]:
+        """List the files of a branch, tag or commit without checking it out.
+
+        Only the commit and its directory trees are fetched, no file contents.
+
+        Args:
+            url: Repository URL
+            ref: Branch, tag or commit SHA
+            path: Only list the files in this directory
+
+        Returns:
+            The SHA of the commit, and the blob SHA of every file by its path
+            from the repository root
+
+        Raises:
+            subprocess.CalledProcessError: If the ref cannot be fetched
+            OSError: If the cache directory is not writable
+        """
+        mirror = self.mirror_path(url)
+        with lock_file(self._lock_path(mirror)):
+            self._ensure_mirror(mirror, url)
+            commit = self._fetch(mirror, ref, partial=True)
+            result = run_git(
+                "-C", mirror, "ls-tree", "-r", "-z", "--full-tree", commit, "--", path
+            )
+            os.utime(mirror)
+        prune_cache_entries(self.directory, self.max_bytes, remove=self._evict)
+
+        files = {}
+        for entry in result.stdout.split("\0"):
+            info, _, name = entry.partition("\t")
+            # Entries are "<mode> <type> <sha>"; skip submodules
+            _, kind, sha = info.split(" ") if info else ("", "", "")
+            if kind == "blob":
+                files[name] = sha
+        return commit, files
+
+    def read_files(self, url: str, commit: str, paths: list[str]) -> dict[str, bytes]:
+        """Read files of a commit listed by ``list_files``.
+
+        The contents missing from the mirror are fetched in one batch.
+
+        Returns:
+            The contents of the files by path; missing paths are left out
+
+        Raises:
+            subprocess.CalledProcessError: If the contents cannot be fetched
+            OSError: If the cache directory is not writable
+        """
+        if not paths:
+            return {}
+        mirror = self.mirror_path(url)
+        with lock_file(self._lock_path(mirror)):
+            self._fetch_missing(mirror, commit, paths)
+            return _cat_files(mirror, [f"{commit}:{path}" for path in paths], paths)
+
+    def clear(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _ensure_mirror(self, mirror: pathlib.Path, url: str) -> None:
+        if (mirror / "HEAD").is_file():
+            return
+        # Leftover of an interrupted run
+        shutil.rmtree(mirror, ignore_errors=True)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        staging = pathlib.Path(tempfile.mkdtemp(prefix=".", dir=self.directory))
+        try:
+            run_git("init", "--bare", "--quiet", staging)
+            run_git("-C", staging, "remote", "add", "origin", url)
+            os.rename(staging, mirror)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        logging.debug(f"Created git mirror of {url} at {mirror}")
+
+    def _fetch(self, mirror: pathlib.Path, ref: str, partial: bool = False) -> str:
+        """Fetch ``ref`` into the mirror and return its commit SHA.
+
+        With ``partial``, file contents are not fetched until checked out;
+        git then marks origin as the promisor remote providing them.
+        """
+        if is_commit_sha(ref):
+            # Commits never change, skip the network if already fetched
+            try:
+                return self._resolve(mirror, ref)
+            except subprocess.CalledProcessError:
+                pass
+        # Refs are stored under a hash of their name, so branches like "a"
+        # and "a/b" do not conflict
+        local_ref = f"refs/asp/{hashlib.sha256(ref.encode('utf-8')).hexdigest()[:16]}"
+        filter_args = ["--filter=blob:none"] if partial else []
+        run_git(
+            "-C",
+            mirror,
+            "fetch",
+            "--depth",
+            "1",
+            "--no-tags",
+            *filter_args,
+            "origin",
+            f"+{ref}:{local_ref}",
+        )
+        return self._resolve(mirror, local_ref)
+
+    @staticmethod
+    def _fetch_missing(mirror: pathlib.Path, commit: str, paths: list[str]) -> None:
+        """Fetch the contents of files left out by a partial fetch, in one batch."""
+        # Paths are read from stdin after "--", missing objects print as ?<sha>
+        listed = run_git(
+            "--literal-pathspecs",
+            "-C",
+            mirror,
+            "rev-list",
+            "--objects",
+            "--missing=print",
+            "--no-walk",
+            "--stdin",
+            input="\n".join([commit, "--", *paths]) + "\n",
+        )
+        missing = [
+            line[1:] for line in listed.stdout.splitlines() if line.startswith("?")
+        ]
+        if not missing:
+            return
+        logging.debug(f"Fetching {len(missing)} missing files into {mirror}")
+        # The same request git makes to lazily fetch objects of a partial clone
+        run_git(
+            "-C",
+            mirror,
+            "-c",
+            "fetch.negotiationAlgorithm=noop",
+            "fetch",
+            "--no-tags",
+            "--no-write-fetch-head",
+            "--recurse-submodules=no",
+            "--filter=blob:none",
+            "--stdin",
+            "origin",
+            input="\n".join(missing) + "\n",
+        )
+
+    @staticmethod
+    def _resolve(mirror: pathlib.Path, ref: str) -> str:
+        result = run_git("-C", mirror, "rev-parse", "--verify", f"{ref}^{{commit}}")
+        return result.stdout.strip()
+
+    @staticmethod
+    def _lock_path(mirror: pathlib.Path) -> pathlib.Path:
+        return mirror.with_suffix(".lock")
+
+    def _evict(self, mirror: pathlib.Path) -> None:
+        # Mirrors in use by another run are skipped
+        with lock_file(self._lock_path(mirror), blocking=False):
+            shutil.rmtree(mirror)
+
+
+def _cat_files(
+    mirror: pathlib.Path, objects: list[str], keys: list[str]
+) -> dict[str, bytes]:
+    """Read objects from a repository with one ``git cat-file`` process."""
+    result = subprocess.run(
+        ["git", "-C", str(mirror), "cat-file", "--batch"],
+        input="".join(f"{name}\n" for name in objects).encode("utf-8"),
+        capture_output=True,
+        check=True,
+        env={**os.environ, "GIT_TERMINAL_PROMPT": "0"},
+    )
+    contents = {}
+    output = result.stdout
+    pos = 0
+    for key in keys:
+        end = output.index(b"\n", pos)
+        header = output[pos:end].split(b" ")
+        pos = end + 1
+        # "<sha> <type> <size>", or "<name> missing"
+        if len(header) != 3:
+            continue
+        size = int(header[2])
+        contents[key] = output[pos : pos + size]
+        # Contents are followed by a newline
+        pos += size + 1
+    return contents
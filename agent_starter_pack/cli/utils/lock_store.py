@@ -0,0 +1,208 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Deduplicated store of the uv lock files of the built-in agents.
+
+Every agent and deployment target pair has its own ``uv.lock``, but the locks
+mostly list the same ``[[package]]`` entries. The store splits each lock into
+its header and package entries, keeps every distinct entry once, addressed by
+its content hash, and records the sequence of entries of every lock.
+Concatenating a lock's entries gives back its exact bytes.
+
+The store is a single file: a JSON index on the first line, followed by the
+entries. Only the entries are read to write a lock, without parsing them,
+and the project name is only substituted in the entries containing its
+placeholder. The store is not compressed on disk, as decompressing it would
+cost more than the copy it replaces; the wheel compresses it for download.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import pathlib
+import re
+from typing import Any
+
+from .profiler import record_file
+
+# Bump when the format of the store changes
+LOCK_STORE_VERSION = 1
+
+LOCK_STORE_FILE = "uv-locks.store"
+
+# Project name in the stored locks, replaced by the generated project's name
+PROJECT_NAME_PLACEHOLDER = "{{cookiecutter.project_name}}"
+
+_ENTRY_RE = re.compile(rb"^(?=\[\[package\]\]\n)", re.MULTILINE)
+
+# Length of the hex digest addressing an entry
+_DIGEST_LENGTH = 16
+
+
+def get_lock_store_path() -> pathlib.Path:
+    """Get the path of the lock store shipped with the package."""
+    return (
+        pathlib.Path(__file__).parent.parent.parent
+        / "resources"
+        / "locks"
+        / LOCK_STORE_FILE
+    )
+
+
+def get_lock_name(agent_name: str, deployment_target: str) -> str:
+    """Get the name of the lock of an agent and deployment target."""
+    return f"uv-{agent_name}-{deployment_target}.lock"
+
+
+def split_lock(content: bytes) -> list[bytes]:
+    """Split a lock into its header and ``[[package]]`` entries."""
+    return [entry for entry in _ENTRY_RE.split(content) if entry]
+
+
+class LockStore:
+    """Lock files stored as sequences of shared, content-addressed entries.
+
+    Entries are sorted by digest; locks refer to them by position. ``inputs``
+    records, per lock, a hash of what it was generated from, so unchanged
+    locks are not generated again.
+    """
+
+    def __init__(
+        self,
+        locks: dict[str, list[int]],
+        entries: list[tuple[str, int, int]],
+        templated: set[int],
+        data: bytes | memoryview,
+        inputs: dict[str, str] | None = None,
+    ) -> None:
+        self._locks = locks
+        self._entries = entries
+        self._templated = templated
+        self._data = memoryview(data)
+        self.inputs = inputs or {}
+
+    @classmethod
+    def build(
+        cls, locks: dict[str, bytes], inputs: dict[str, str] | None = None
+    ) -> "LockStore":
+        """Build a store from the content of every lock, by name."""
+        contents: dict[str, bytes] = {}
+        digests = {}
+        for name, content in locks.items():
+            digests[name] = []
+            for entry in split_lock(content):
+                digest = hashlib.sha256(entry).hexdigest()[:_DIGEST_LENGTH]
+                contents.setdefault(digest, entry)
+                digests[name].append(digest)
+
+        entries = []
+        positions = {}
+        templated = set()
+        offset = 0
+        for position, (digest, entry) in enumerate(sorted(contents.items())):
+            entries.append((digest, offset, len(entry)))
+            positions[digest] = position
+            if PROJECT_NAME_PLACEHOLDER.encode() in entry:
+                templated.add(position)
+            offset += len(entry)
+        return cls(
+            {
+                name: [positions[digest] for digest in sequence]
+                for name, sequence in digests.items()
+            },
+            entries,
+            templated,
+            b"".join(entry for _, entry in sorted(contents.items())),
+            inputs,
+        )
+
+    @classmethod
+    def load(cls, path: pathlib.Path) -> "LockStore":
+        """Load a store written by ``save``."""
+        content = path.read_bytes()
+        index_end = content.index(b"\n") + 1
+        index = json.loads(content[:index_end])
+        if index.get("version") != LOCK_STORE_VERSION:
+            raise ValueError(f"Unsupported lock store version in {path}")
+        return cls(
+            index["locks"],
+            [tuple(entry) for entry in index["entries"]],
+            set(index["templated"]),
+            memoryview(content)[index_end:],
+            index.get("inputs"),
+        )
+
+    def save(self, path: pathlib.Path) -> None:
+        """Write the store, replacing any previous one atomically."""
+        index: dict[str, Any] = {
+            "version": LOCK_STORE_VERSION,
+            "locks": dict(sorted(self._locks.items())),
+            "entries": self._entries,
+            "templated": sorted(self._templated),
+            "inputs": dict(sorted(self.inputs.items())),
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}")
+        with tmp_path.open("wb") as f:
+            f.write(json.dumps(index, separators=(",", ":")).encode())
+            f.write(b"\n")
+            f.write(self._data)
+        os.replace(tmp_path, path)
+
+    @property
+    def names(self) -> list[str]:
+        """Names of the stored locks."""
+        return sorted(self._locks)
+
+    @property
+    def size(self) -> int:
+        """Total size of the distinct entries."""
+        return len(self._data)
+
+    def read(self, name: str, project_name: str | None = None) -> bytes:
+        """Reconstruct a lock, optionally for a project name.
+
+        Raises:
+            FileNotFoundError: If the store has no lock of that name
+        """
+        if name not in self._locks:
+            raise FileNotFoundError(f"Lock file not found: {name}")
+        parts: list[bytes | memoryview] = []
+        for position in self._locks[name]:
+            _, offset, size = self._entries[position]
+            entry = self._data[offset : offset + size]
+            if project_name is not None and position in self._templated:
+                parts.append(
+                    bytes(entry).replace(
+                        PROJECT_NAME_PLACEHOLDER.encode(), project_name.encode()
+                    )
+                )
+            else:
+                parts.append(entry)
+        return b"".join(parts)
+
+    def write_lock(self, name: str, dst: pathlib.Path, project_name: str) -> None:
+        """Write the lock of a project to ``dst``."""
+        dst.write_bytes(self.read(name, project_name))
+        record_file(dst)
+
+
+@functools.cache
+def get_lock_store() -> LockStore:
+    """Load the lock store shipped with the package."""
+    path = get_lock_store_path()
+    if not path.exists():
+        raise FileNotFoundError(f"Lock store not found: {path}")
+    return LockStore.load(path)
@@ -0,0 +1,255 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Structured model of rendered Makefiles, used to merge them.
+
+A Makefile is parsed in one pass into a list of blocks: rules (the target
+line and its recipe), variable assignments, ``.PHONY`` declarations,
+conditional sections and everything else (blank lines, section comments)
+kept as plain text. The comment lines directly above a rule or variable
+belong to it. Joining the blocks gives back the original text exactly.
+"""
+
+import re
+from dataclasses import dataclass, field
+
+RULE = "rule"
+VARIABLE = "variable"
+PHONY = "phony"
+CONDITIONAL = "conditional"
+TEXT = "text"
+
+MERGED_COMMANDS_HEADER = "# --- Commands from Agent Starter Pack ---"
+
+_VARIABLE_RE = re.compile(
+    r"(?:(?:export|override|private)\s+)*([A-Za-z0-9_.-]+)\s*(?::{1,3}=|[?+!]?=)"
+)
+_RULE_RE = re.compile(r"([^\s:#=][^:#=]*?)\s*::?(?!=)")
+_DEFINE_RE = re.compile(r"(?:(?:export|override)\s+)*define\s+([A-Za-z0-9_.-]+)")
+_CONDITIONAL_START_RE = re.compile(r"(?:ifeq|ifneq|ifdef|ifndef)\b")
+_REFERENCE_RE = re.compile(r"\$[({]([A-Za-z0-9_.-]+)[)}]")
+
+
+@dataclass
+class MakefileBlock:
+    """A contiguous part of a Makefile.
+
+    ``names`` are the targets of a rule (or of the rules in a conditional
+    section), the name of a variable, or the targets declared by ``.PHONY``.
+    """
+
+    kind: str
+    text: str
+    names: tuple[str, ...] = ()
+
+
+@dataclass
+class Makefile:
+    """A parsed Makefile, as a list of blocks."""
+
+    blocks: list[MakefileBlock] = field(default_factory=list)
+
+    @classmethod
+    def parse(cls, text: str) -> "Makefile":
+        return cls(_Parser(text.splitlines(keepends=True)).parse())
+
+    def __str__(self) -> str:
+        return "".join(block.text for block in self.blocks)
+
+    def names(self, *kinds: str) -> set[str]:
+        """Return the names defined by blocks of the given kinds."""
+        return {
+            name for block in self.blocks if block.kind in kinds for name in block.names
+        }
+
+    @property
+    def targets(self) -> set[str]:
+        return self.names(RULE, CONDITIONAL)
+
+    @property
+    def variables(self) -> set[str]:
+        return self.names(VARIABLE)
+
+
+class _Parser:
+    def __init__(self, lines: list[str]) -> None:
+        self.lines = lines
+        self.pos = 0
+        self.blocks: list[MakefileBlock] = []
+        # Comment lines waiting to be attached to the next rule or variable
+        self.comments: list[str] = []
+
+    def parse(self) -> list[MakefileBlock]:
+        while self.pos < len(self.lines):
+            line = self.lines[self.pos]
+            stripped = line.lstrip(" ")
+            if line.startswith("#"):
+                self.comments.append(line)
+                self.pos += 1
+                continue
+            if _CONDITIONAL_START_RE.match(stripped):
+                lines = self._conditional()
+                # Targets defined in any branch count as defined
+                inner = Makefile(_Parser(lines[1:]).parse())
+                self._add(CONDITIONAL, lines, tuple(sorted(inner.targets)))
+                continue
+            define = _DEFINE_RE.match(stripped)
+            if define:
+                self._add(VARIABLE, self._define(), (define.group(1),))
+                continue
+            logical = self._logical_line()
+            header = "".join(logical)
+            # Recipe lines outside of a rule are kept as they are
+            variable = None if line.startswith("\t") else _VARIABLE_RE.match(header)
+            rule = None if line.startswith("\t") else _RULE_RE.match(header)
+            if variable:
+                self._add(VARIABLE, logical, (variable.group(1),))
+            elif rule and rule.group(1).split() == [".PHONY"]:
+                prerequisites = header[rule.end() :].replace("\\\n", " ")
+                self._add(PHONY, logical, tuple(prerequisites.split()))
+            elif rule:
+                targets = tuple(rule.group(1).split())
+                self._add(RULE, logical + self._recipe(), targets)
+            else:
+                self._add(TEXT, logical)
+        self._flush_comments()
+        return self.blocks
+
+    def _add(self, kind: str, lines: list[str], names: tuple[str, ...] = ()) -> None:
+        if kind in (RULE, VARIABLE, PHONY):
+            lines = self.comments + lines
+        else:
+            self._flush_comments()
+        self.comments = []
+        self.blocks.append(MakefileBlock(kind, "".join(lines), names))
+
+    def _flush_comments(self) -> None:
+        if self.comments:
+            self.blocks.append(MakefileBlock(TEXT, "".join(self.comments)))
+            self.comments = []
+
+    def _logical_line(self) -> list[str]:
+        """Consume a line and the lines it continues onto with a backslash."""
+        start = self.pos
+        self.pos += 1
+        while self.pos < len(self.lines) and self._continues(self.pos - 1):
+            self.pos += 1
+        return self.lines[start : self.pos]
+
+    def _continues(self, index: int) -> bool:
+        return self.lines[index].rstrip("\r\n").endswith("\\")
+
+    def _recipe(self) -> list[str]:
+        """Consume the recipe lines of a rule.
+
+        Blank and comment lines between recipe lines are part of the recipe,
+        as for make; trailing ones are not.
+        """
+        lines: list[str] = []
+        while self.pos < len(self.lines):
+            end = self.pos
+            while end < len(self.lines) and (
+                not self.lines[end].strip() or self.lines[end].startswith("#")
+            ):
+                end += 1
+            if end == len(self.lines) or not self.lines[end].startswith("\t"):
+                break
+            lines.extend(self.lines[self.pos : end])
+            self.pos = end
+            lines.extend(self._logical_line())
+        return lines
+
+    def _conditional(self) -> list[str]:
+        """Consume a conditional section, including nested ones."""
+        start = self.pos
+        depth = 0
+        while self.pos < len(self.lines):
+            stripped = self.lines[self.pos].strip()
+            self.pos += 1
+            if _CONDITIONAL_START_RE.match(stripped):
+                depth += 1
+            elif stripped == "endif" or stripped.startswith(("endif ", "endif#")):
+                depth -= 1
+                if depth == 0:
+                    break
+        return self.lines[start : self.pos]
+
+    def _define(self) -> list[str]:
+        """Consume a multi-line variable definition."""
+        start = self.pos
+        while self.pos < len(self.lines):
+            stripped = self.lines[self.pos].strip()
+            self.pos += 1
+            if stripped == "endef" or stripped.startswith("endef "):
+                break
+        return self.lines[start : self.pos]
+
+
+def merge_makefiles(remote_text: str, base_text: str) -> str:
+    """Merge a base Makefile into a remote template's Makefile.
+
+    The remote Makefile is kept as is. The rules of the base Makefile whose
+    targets it does not define are appended after a header, in their base
+    order and with their comments, along with the base variables they use
+    and their ``.PHONY`` declaration.
+    """
+    remote = Makefile.parse(remote_text)
+    base = Makefile.parse(base_text)
+    remote_targets = remote.targets
+
+    missing = [
+        block
+        for block in base.blocks
+        if block.kind in (RULE, CONDITIONAL)
+        and block.names
+        and not remote_targets.intersection(block.names)
+    ]
+    if not missing:
+        return remote_text
+
+    # Base variables used by the appended rules, directly or through other
+    # variables, unless the remote Makefile assigns them itself
+    variables = {
+        block.names[0]: block for block in base.blocks if block.kind == VARIABLE
+    }
+    needed: set[str] = set()
+    pending = [block.text for block in missing]
+    while pending:
+        for name in _REFERENCE_RE.findall(pending.pop()):
+            if name in variables and name not in needed:
+                needed.add(name)
+                pending.append(variables[name].text)
+    needed_variables = [
+        block
+        for block in base.blocks
+        if block.kind == VARIABLE
+        and block.names[0] in needed
+        and block.names[0] not in remote.variables
+    ]
+
+    appended_targets = {name for block in missing for name in block.names}
+    phony = [
+        name
+        for name in sorted(base.names(PHONY) & appended_targets)
+        if name not in remote.names(PHONY)
+    ]
+
+    parts = [remote_text, f"\n\n{MERGED_COMMANDS_HEADER}\n\n"]
+    for block in needed_variables:
+        parts.append(block.text.rstrip("\n") + "\n\n")
+    if phony:
+        parts.append(f".PHONY: {' '.join(phony)}\n\n")
+    for block in missing:
+        parts.append(block.text.rstrip("\n") + "\n\n")
+    return "".join(parts)
@@ -0,0 +1,152 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Manifest of the files a project generation writes, for ``create --dry-run``.
+
+The manifest is computed from the resolved file plan, after conditional
+files, agent exclusions and deployment target filters were applied, so it
+lists exactly the files that would be rendered or copied.
+"""
+
+import pathlib
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+
+from rich.console import Console
+from rich.table import Table
+
+from .render_engine import FilePlan
+
+# Group of the files at the root of the project
+ROOT_GROUP = "."
+
+
+@dataclass
+class ManifestGroup:
+    """Files generated under one top-level path of the project."""
+
+    files: int = 0
+    rendered: int = 0
+    copied: int = 0
+    bytes: int = 0
+
+
+@dataclass
+class GenerationManifest:
+    """Files a project generation would write, grouped by top-level path."""
+
+    project_dir: pathlib.Path
+    groups: dict[str, ManifestGroup] = field(default_factory=dict)
+    excluded_files: int = 0
+    excluded_bytes: int = 0
+    overlay_files: int = 0
+    overlay_bytes: int = 0
+
+    @property
+    def files(self) -> int:
+        return sum(group.files for group in self.groups.values())
+
+    @property
+    def bytes(self) -> int:
+        return sum(group.bytes for group in self.groups.values())
+
+    @classmethod
+    def from_outputs(
+        cls,
+        outputs: Mapping[pathlib.Path, tuple[str, pathlib.Path, bool]],
+        project_dir: pathlib.Path,
+        excluded: Mapping[pathlib.Path, pathlib.Path] | None = None,
+        overlay: FilePlan | None = None,
+    ) -> "GenerationManifest":
+        """Build the manifest of resolved render engine outputs.
+
+        Byte totals are the sizes of the source files; rendering only changes
+        them by the size of the substituted variables.
+
+        Args:
+            outputs: Resolved outputs, see ``RenderEngine.resolve_outputs``
+            project_dir: Directory the outputs were resolved against
+            excluded: Outputs left out of the project and their source
+            overlay: Remote template files copied over the rendered project
+        """
+        manifest = cls(project_dir)
+        for outfile, (_, src, copy_only) in outputs.items():
+            parts = outfile.relative_to(project_dir).parts
+            name = parts[0] if len(parts) > 1 else ROOT_GROUP
+            group = manifest.groups.setdefault(name, ManifestGroup())
+            group.files += 1
+            group.bytes += src.stat().st_size
+            if copy_only:
+                group.copied += 1
+            else:
+                group.rendered += 1
+        for src in (excluded or {}).values():
+            manifest.excluded_files += 1
+            manifest.excluded_bytes += src.stat().st_size
+        if overlay is not None:
+            for src in overlay.files.values():
+                manifest.overlay_files += 1
+                manifest.overlay_bytes += src.stat().st_size
+        return manifest
+
+
+def format_bytes(size: int) -> str:
+    """Format a byte count for display."""
+    value = float(size)
+    for unit in ("B", "KB", "MB"):
+        if value < 1024:
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GB"
+
+
+def print_generation_manifest(manifest: GenerationManifest, console: Console) -> None:
+    """Print the files a generation would write, per top-level path."""
+    table = Table(
+        title=f"Dry run: {manifest.project_dir}",
+        show_header=True,
+        header_style="bold magenta",
+    )
+    table.add_column("Path", style="bold")
+    table.add_column("Files", justify="right")
+    table.add_column("Rendered", justify="right")
+    table.add_column("Copied", justify="right")
+    table.add_column("Bytes", justify="right")
+
+    for name in sorted(manifest.groups):
+        group = manifest.groups[name]
+        table.add_row(
+            name if name == ROOT_GROUP else f"{name}/",
+            str(group.files),
+            str(group.rendered),
+            str(group.copied),
+            format_bytes(group.bytes),
+        )
+    console.print(table)
+
+    console.print(
+        f"\n{manifest.files} files ({format_bytes(manifest.bytes)}) would be generated"
+    )
+    if manifest.overlay_files:
+        console.print(
+            f"{manifest.overlay_files} files ({format_bytes(manifest.overlay_bytes)}) "
+            "would be copied from the remote template"
+        )
+    if manifest.excluded_files:
+        console.print(
+            f"{manifest.excluded_files} template files "
+            f"({format_bytes(manifest.excluded_bytes)}) are excluded for this "
+            "configuration"
+        )
+    console.print("No files were written.", style="dim")
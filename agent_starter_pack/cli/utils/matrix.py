@@ -0,0 +1,313 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Batch generation of many projects in a single process.
+
+Running ``agent-starter-pack create`` once per combination pays interpreter
+startup, imports and template discovery every time. ``create --matrix`` and
+``create_projects`` generate every combination of a matrix in one process,
+so agent configs, compiled templates and rendered output caches are shared
+between projects. Combinations can also be spread over a process pool.
+
+A matrix file is YAML (or JSON) and is either a list of projects or a
+mapping with optional ``defaults``, ``matrix`` and ``projects`` keys::
+
+    defaults:
+      cicd_runner: github_actions
+    matrix:  # every combination of the listed values
+      agent: [adk, langgraph]
+      deployment_target: [cloud_run, agent_engine]
+    projects:  # explicit combinations
+      - project_name: live-demo
+        agent: adk_live
+        deployment_target: agent_engine
+        prototype: true
+
+Keys are ``create`` option names, with dashes or underscores.
+"""
+
+import contextlib
+import io
+import itertools
+import pathlib
+import re
+import time
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+import click
+import yaml
+from rich.console import Console
+from rich.table import Table
+
+from .remote_template import batch_generation
+
+# Options managed by the batch runner itself
+_RESERVED_OPTIONS = {"matrix", "matrix_workers", "output_dir", "in_folder"}
+
+# Options applied to every project unless overridden; prompts cannot be
+# answered in batch mode
+_BATCH_DEFAULTS: dict[str, Any] = {"auto_approve": True, "skip_welcome": True}
+
+# Maximum project name length accepted by ``create``
+_MAX_PROJECT_NAME_LENGTH = 26
+
+
+@dataclass
+class MatrixProject:
+    """A single project of a matrix."""
+
+    project_name: str
+    options: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class MatrixResult:
+    """Outcome of generating a single project of a matrix."""
+
+    project_name: str
+    options: dict[str, Any]
+    project_path: pathlib.Path
+    seconds: float
+    error: str | None = None
+    output: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _normalize_options(options: dict[str, Any]) -> dict[str, Any]:
+    return {str(key).replace("-", "_"): value for key, value in options.items()}
+
+
+def _default_project_name(options: dict[str, Any], index: int) -> str:
+    agent = str(options.get("agent") or "project")
+    slug = re.sub(r"[^a-z0-9]+", "-", agent.lower()).strip("-") or "project"
+    suffix = f"-{index}"
+    return slug[: _MAX_PROJECT_NAME_LENGTH - len(suffix)].rstrip("-") + suffix
+
+
+def expand_matrix(spec: dict[str, Any] | list[Any]) -> list[MatrixProject]:
+    """Expand a matrix specification into the list of projects to generate.
+
+    Args:
+        spec: A list of project option mappings, or a mapping with optional
+            ``defaults``, ``matrix`` and ``projects`` keys
+
+    Returns:
+        The projects, matrix combinations first. Projects without a
+        ``project_name`` are named after their agent and position.
+    """
+    if isinstance(spec, list):
+        spec = {"projects": spec}
+    if not isinstance(spec, dict):
+        raise click.ClickException("A matrix must be a list or a mapping")
+    unknown_keys = set(spec) - {"defaults", "matrix", "projects"}
+    if unknown_keys:
+        raise click.ClickException(
+            f"Unknown matrix keys: {', '.join(sorted(unknown_keys))}"
+        )
+
+    defaults = _normalize_options(spec.get("defaults") or {})
+    combinations: list[dict[str, Any]] = []
+
+    axes = _normalize_options(spec.get("matrix") or {})
+    if axes:
+        values = [
+            value if isinstance(value, list) else [value] for value in axes.values()
+        ]
+        for combination in itertools.product(*values):
+            combinations.append(dict(zip(axes, combination, strict=True)))
+    for options in spec.get("projects") or []:
+        if not isinstance(options, dict):
+            raise click.ClickException(
+                f"Matrix projects must be mappings, got: {options!r}"
+            )
+        combinations.append(_normalize_options(options))
+
+    projects = []
+    for index, combination in enumerate(combinations, start=1):
+        options = {**defaults, **combination}
+        project_name = options.pop("project_name", None) or _default_project_name(
+            options, index
+        )
+        # Normalized like create does, so that the project directory is known
+        project_name = str(project_name).lower().replace("_", "-")
+        projects.append(MatrixProject(project_name, options))
+
+    names = [project.project_name for project in projects]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise click.ClickException(
+            f"Duplicate project names in matrix: {', '.join(duplicates)}"
+        )
+    return projects
+
+
+def load_matrix(path: pathlib.Path) -> list[MatrixProject]:
+    """Load and expand a YAML or JSON matrix file."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            spec = yaml.safe_load(f)
+    except (OSError, yaml.YAMLError) as e:
+        raise click.ClickException(f"Could not read matrix file {path}: {e}") from e
+    return expand_matrix(spec or [])
+
+
+def _get_create_command() -> click.Command:
+    # Imported lazily: the create command imports this module
+    from ..commands.create import create
+
+    return create
+
+
+def _validate_options(projects: Sequence[MatrixProject]) -> None:
+    create = _get_create_command()
+    valid = {param.name for param in create.params} - _RESERVED_OPTIONS
+    for project in projects:
+        unknown = set(project.options) - valid
+        if unknown:
+            raise click.ClickException(
+                f"Unknown create options for '{project.project_name}': "
+                f"{', '.join(sorted(unknown))}"
+            )
+
+
+def _create_project(
+    project: MatrixProject, output_dir: pathlib.Path, defaults: dict[str, Any]
+) -> MatrixResult:
+    """Generate one project in-process, capturing its console output."""
+    create = _get_create_command()
+    params = {
+        **_BATCH_DEFAULTS,
+        **defaults,
+        **project.options,
+        "project_name": project.project_name,
+        "output_dir": str(output_dir),
+    }
+    project_path = output_dir / project.project_name
+    output = io.StringIO()
+    error = None
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+            with batch_generation(), click.Context(create) as ctx:
+                ctx.invoke(create, **params)
+        if not project_path.is_dir():
+            error = "project was not generated"
+    except SystemExit as e:
+        error = f"exited with status {e.code}"
+    except Exception as e:
+        error = str(e) or type(e).__name__
+    seconds = time.perf_counter() - start
+    return MatrixResult(
+        project_name=project.project_name,
+        options=project.options,
+        project_path=project_path,
+        seconds=seconds,
+        error=error,
+        output=output.getvalue(),
+    )
+
+
+def create_projects(
+    projects: Iterable[MatrixProject | dict[str, Any]],
+    output_dir: pathlib.Path | str | None = None,
+    max_workers: int = 1,
+    defaults: dict[str, Any] | None = None,
+) -> list[MatrixResult]:
+    """Generate several projects in a single process.
+
+    Failures do not stop the batch; they are reported in the results.
+
+    Args:
+        projects: Projects to generate, as MatrixProject or as mappings of
+            ``create`` options (including an optional ``project_name``)
+        output_dir: Directory the projects are generated into, defaults to
+            the current directory
+        max_workers: Number of worker processes; 1 generates every project
+            sequentially in the current process
+        defaults: ``create`` options applied to every project unless the
+            project overrides them
+
+    Returns:
+        One result per project, in order
+    """
+    matrix = expand_matrix(
+        [
+            {"project_name": item.project_name, **item.options}
+            if isinstance(item, MatrixProject)
+            else item
+            for item in projects
+        ]
+    )
+    _validate_options(matrix)
+
+    destination = pathlib.Path(output_dir or pathlib.Path.cwd()).resolve()
+    destination.mkdir(parents=True, exist_ok=True)
+    defaults = _normalize_options(defaults or {})
+
+    if max_workers <= 1 or len(matrix) <= 1:
+        return [_create_project(project, destination, defaults) for project in matrix]
+
+    # create changes the working directory while rendering, so parallel
+    # projects run in separate processes rather than threads
+    with ProcessPoolExecutor(max_workers=min(max_workers, len(matrix))) as executor:
+        return list(
+            executor.map(
+                _create_project,
+                matrix,
+                itertools.repeat(destination),
+                itertools.repeat(defaults),
+            )
+        )
+
+
+def print_matrix_report(results: Sequence[MatrixResult], console: Console) -> None:
+    """Print per-project timings and the output of failed projects."""
+    table = Table(
+        title="Matrix generation",
+        show_header=True,
+        header_style="bold magenta",
+    )
+    table.add_column("Project", style="bold")
+    table.add_column("Agent", style="cyan")
+    table.add_column("Deployment target", style="cyan")
+    table.add_column("Time", justify="right")
+    table.add_column("Status")
+
+    for result in results:
+        table.add_row(
+            result.project_name,
+            str(result.options.get("agent") or ""),
+            str(result.options.get("deployment_target") or ""),
+            f"{result.seconds:.2f}s",
+            "[green]ok[/]" if result.ok else f"[red]{result.error}[/]",
+        )
+    console.print(table)
+
+    for result in results:
+        if not result.ok and result.output:
+            console.print(f"\n[bold red]Output of {result.project_name}:[/]")
+            console.print(result.output, markup=False, highlight=False)
+
+    failed = sum(1 for result in results if not result.ok)
+    total = sum(result.seconds for result in results)
+    console.print(
+        f"\nGenerated {len(results) - failed}/{len(results)} projects "
+        f"({total:.2f}s of project time)"
+    )
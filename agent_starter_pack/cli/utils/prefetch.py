@@ -0,0 +1,111 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Background prefetching of independent network steps.
+
+``create`` starts the slow network steps it knows it will need (cloning a
+remote template, verifying credentials non-interactively) as soon as its
+options are parsed, and collects each result where the step used to run.
+Prefetched steps never print or prompt, and their errors are raised when the
+result is collected, so output and errors come in the same order as when the
+steps ran one after another.
+"""
+
+import logging
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from .profiler import phase
+
+T = TypeVar("T")
+
+
+class Prefetch:
+    """Named background steps, collected with ``result``.
+
+    Call ``close`` when the command is done: steps that were never collected
+    are cancelled, or cleaned up once they finish.
+    """
+
+    def __init__(self, max_workers: int = 2) -> None:
+        self._max_workers = max_workers
+        self._executor: ThreadPoolExecutor | None = None
+        self._tasks: dict[str, tuple[Future, Callable[[Any], None] | None]] = {}
+
+    def start(
+        self,
+        key: str,
+        fn: Callable[..., Any],
+        *args: Any,
+        cleanup: Callable[[Any], None] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Start a step in the background.
+
+        Args:
+            key: Name of the step, used to collect its result
+            fn: Function running the step; it must not print or prompt
+            cleanup: Called with the step's result if it is never collected
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_workers, thread_name_prefix="asp-prefetch"
+            )
+
+        def run() -> Any:
+            with phase(f"prefetch {key}"):
+                return fn(*args, **kwargs)
+
+        logging.debug(f"Prefetching {key} in the background")
+        self._tasks[key] = (self._executor.submit(run), cleanup)
+
+    def result(self, key: str, fallback: Callable[[], T]) -> T:
+        """Return the result of a step, running ``fallback`` if not started.
+
+        Raises:
+            Any exception raised by the step
+        """
+        task = self._tasks.pop(key, None)
+        if task is None:
+            return fallback()
+        future, _ = task
+        if not future.done():
+            with phase(f"wait for {key}"):
+                return future.result()
+        return future.result()
+
+    def close(self) -> None:
+        """Discard the steps whose result was never collected."""
+        for key, (future, cleanup) in self._tasks.items():
+            if future.cancel() or cleanup is None:
+                continue
+            logging.debug(f"Discarding prefetched {key}")
+            future.add_done_callback(_discard(cleanup))
+        self._tasks.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+def _discard(cleanup: Callable[[Any], None]) -> Callable[[Future], None]:
+    def callback(future: Future) -> None:
+        if future.cancelled() or future.exception() is not None:
+            return
+        try:
+            cleanup(future.result())
+        except Exception as e:
+            logging.debug(f"Could not clean up prefetched result: {e}")
+
+    return callback
@@ -0,0 +1,268 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Phase profiler for ``--profile``.
+
+Code paths of ``create``, ``enhance`` and ``upgrade`` are wrapped in named
+phases. When a command runs with ``--profile``, the wall-clock time of every
+phase and the number and size of the files written in it are recorded and
+printed as a table; ``--profile-output`` also writes them as JSON. The JSON
+file holds a ``traceEvents`` list, so it can be opened directly in
+``chrome://tracing`` or Perfetto.
+
+Without ``--profile`` every hook is a no-op.
+"""
+
+import contextlib
+import functools
+import json
+import os
+import pathlib
+import threading
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import asdict, dataclass
+from typing import Any, TypeVar
+
+import click
+from rich.console import Console
+from rich.table import Table
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+@dataclass
+class PhaseRecord:
+    """A completed phase, with the files written directly in it."""
+
+    name: str
+    depth: int
+    start: float
+    seconds: float
+    files: int = 0
+    bytes: int = 0
+    # 1 for the command's thread, 2+ for phases run in background threads
+    thread: int = 1
+
+
+class Profiler:
+    """Records nested phases and the files written while they run.
+
+    Each thread opening phases (e.g. background prefetches) gets its own
+    stack of phases. Files written from threads without open phases (e.g.
+    the render pool) are attributed to the command thread's innermost phase.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.phases: list[PhaseRecord] = []
+        self._origin = time.perf_counter()
+        self._owner = threading.get_ident()
+        self._stacks: dict[int, list[PhaseRecord]] = {self._owner: []}
+        self._threads: dict[int, int] = {self._owner: 1}
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[PhaseRecord]:
+        """Time a phase of the command."""
+        ident = threading.get_ident()
+        with self._lock:
+            stack = self._stacks.setdefault(ident, [])
+            thread = self._threads.setdefault(ident, len(self._threads) + 1)
+            record = PhaseRecord(
+                name,
+                len(stack),
+                time.perf_counter() - self._origin,
+                0.0,
+                thread=thread,
+            )
+            self.phases.append(record)
+            stack.append(record)
+        try:
+            yield record
+        finally:
+            record.seconds = time.perf_counter() - self._origin - record.start
+            with self._lock:
+                stack.remove(record)
+
+    def add_files(self, files: int, size: int) -> None:
+        """Count files written in the innermost open phase."""
+        with self._lock:
+            stack = self._stacks.get(threading.get_ident()) or self._stacks[self._owner]
+            if stack:
+                stack[-1].files += files
+                stack[-1].bytes += size
+
+    @property
+    def seconds(self) -> float:
+        return time.perf_counter() - self._origin
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the profile as JSON-serializable data in Chrome trace format."""
+        pid = os.getpid()
+        return {
+            "command": self.name,
+            "seconds": self.seconds,
+            "phases": [asdict(record) for record in self.phases],
+            "displayTimeUnit": "ms",
+            "traceEvents": [
+                {
+                    "name": record.name,
+                    "cat": self.name,
+                    "ph": "X",
+                    "ts": round(record.start * 1_000_000),
+                    "dur": round(record.seconds * 1_000_000),
+                    "pid": pid,
+                    "tid": record.thread,
+                    "args": {"files": record.files, "bytes": record.bytes},
+                }
+                for record in self.phases
+            ],
+        }
+
+
+# Profiler of the running command, if it runs with --profile
+_active: Profiler | None = None
+
+
+def get_profiler() -> Profiler | None:
+    """Return the active profiler, if any."""
+    return _active
+
+
+def phase(name: str) -> contextlib.AbstractContextManager[Any]:
+    """Time a phase of the running command when profiling, else do nothing."""
+    if _active is None:
+        return contextlib.nullcontext()
+    return _active.phase(name)
+
+
+class PhaseSequence:
+    """Consecutive phases of a long function, each ending when the next starts.
+
+    Call ``end`` (e.g. in a ``finally`` block) to close the last phase.
+    """
+
+    def __init__(self) -> None:
+        self._stack = contextlib.ExitStack()
+
+    def next(self, name: str) -> None:
+        """End the current phase and start the next one."""
+        self._stack.close()
+        self._stack.enter_context(phase(name))
+
+    def end(self) -> None:
+        """End the current phase."""
+        self._stack.close()
+
+
+def record_file(path: pathlib.Path | str) -> None:
+    """Count a written file in the current phase when profiling."""
+    if _active is None:
+        return
+    try:
+        size = os.stat(path).st_size
+    except OSError:
+        size = 0
+    _active.add_files(1, size)
+
+
+def print_profile(profiler: Profiler, console: Console) -> None:
+    """Print the phases of a profile with their timings and file counters."""
+    total = profiler.seconds
+    table = Table(
+        title=f"Profile: {profiler.name}",
+        show_header=True,
+        header_style="bold magenta",
+    )
+    table.add_column("Phase", style="bold")
+    table.add_column("Time", justify="right")
+    table.add_column("%", justify="right")
+    table.add_column("Files", justify="right")
+    table.add_column("Bytes", justify="right")
+
+    for record in profiler.phases:
+        name = "  " * record.depth + record.name
+        if record.thread > 1:
+            name += " (background)"
+        table.add_row(
+            name,
+            f"{record.seconds:.3f}s",
+            f"{record.seconds / total * 100:.1f}" if total else "-",
+            str(record.files) if record.files else "",
+            str(record.bytes) if record.files else "",
+        )
+    console.print(table)
+    console.print(f"Total: {total:.3f}s")
+
+
+def write_profile(profiler: Profiler, path: pathlib.Path) -> None:
+    """Write a profile as JSON, loadable as a Chrome trace."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as f:
+        json.dump(profiler.to_dict(), f, indent=2)
+
+
+def profile_options(f: Callable) -> Callable:
+    """Add the ``--profile`` and ``--profile-output`` options to a command."""
+    f = click.option(
+        "--profile-output",
+        type=click.Path(dir_okay=False),
+        help="Also write the profile as JSON to this file (loadable in chrome://tracing or Perfetto). Implies --profile.",
+    )(f)
+    f = click.option(
+        "--profile",
+        is_flag=True,
+        default=False,
+        help="Print the time spent and files written in each phase",
+    )(f)
+    return f
+
+
+def profiled(name: str) -> Callable[[F], F]:
+    """Profile a click command run with ``--profile`` / ``--profile-output``.
+
+    The decorated command receives neither option. When a profiled command
+    invokes another one (e.g. ``enhance`` running ``create``), the nested
+    command's phases are recorded in the outer profile.
+    """
+
+    def decorator(f: F) -> F:
+        @functools.wraps(f)
+        def wrapper(
+            *args: Any,
+            profile: bool = False,
+            profile_output: str | None = None,
+            **kwargs: Any,
+        ) -> Any:
+            global _active
+            if _active is not None:
+                with _active.phase(name):
+                    return f(*args, **kwargs)
+            if not profile and not profile_output:
+                return f(*args, **kwargs)
+
+            profiler = Profiler(name)
+            _active = profiler
+            try:
+                return f(*args, **kwargs)
+            finally:
+                _active = None
+                print_profile(profiler, Console(stderr=True))
+                if profile_output:
+                    write_profile(profiler, pathlib.Path(profile_output))
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
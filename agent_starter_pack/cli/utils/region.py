@@ -0,0 +1,178 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Region substitution in generated projects.
+
+Templates are written for ``us-central1``. When another region is selected,
+every occurrence of the default region and the data store region settings
+(``data_store_region = "us"`` and its variants) are substituted in the
+generated Python, Terraform, YAML, Markdown and Makefile files.
+
+The single-pass render engine substitutes the region while writing each file.
+``replace_region_in_files`` then only handles the files written outside of
+the engine (remote template overlays, Makefiles, lock files, restored user
+files); projects generated with the cookiecutter engine or in-folder are
+walked in full, without descending into virtual environments,
+``node_modules`` or ``.git``.
+"""
+
+import logging
+import os
+import pathlib
+import re
+from collections.abc import Iterable, Iterator
+
+DEFAULT_REGION = "us-central1"
+
+# File suffixes and names the region is substituted in
+REGION_FILE_TYPES = frozenset(
+    {".md", ".py", ".tfvars", ".yaml", ".tf", ".yml", "Makefile", "makefile"}
+)
+
+# Directories whose content is never modified
+REGION_SKIP_DIRS = frozenset({".git", "__pycache__", "venv", ".venv", "node_modules"})
+
+# Data store region settings, in priority order: only the first one found in
+# a file is substituted
+_DATA_STORE_REGION_SETTINGS = (
+    'data_store_region = "{}"',
+    'data_store_region="{}"',
+    'data-store-region="{}"',
+    "_DATA_STORE_REGION: {}",
+    '"DATA_STORE_REGION", "{}"',
+)
+
+# Data store region of the default region
+_DEFAULT_DATA_STORE_REGION = "us"
+
+
+def get_data_store_region(region: str) -> str:
+    """Return the Vertex AI Search data store location serving a region."""
+    if region.startswith("us"):
+        return "us"
+    if region.startswith("europe"):
+        return "eu"
+    return "global"
+
+
+def is_region_file(path: pathlib.Path) -> bool:
+    """Check whether the region is substituted in a generated file."""
+    return (
+        path.suffix in REGION_FILE_TYPES or path.name in REGION_FILE_TYPES
+    ) and not REGION_SKIP_DIRS.intersection(path.parts)
+
+
+def encode_text(text: str, newline: str | None = None) -> bytes:
+    """Encode text the way a UTF-8 text file opened with ``newline`` writes it."""
+    if newline is None:
+        newline = os.linesep
+    if newline not in ("", "\n"):
+        text = text.replace("\n", newline)
+    return text.encode("utf-8")
+
+
+class RegionRewriter:
+    """Substitutes the default region and data store region in file content.
+
+    All patterns are searched for in one scan of the content, so files that
+    do not mention any of them (most of a project) are not modified.
+    """
+
+    def __init__(self, region: str) -> None:
+        self.region = region
+        self.data_store_region = get_data_store_region(region)
+        self._settings = [
+            (
+                setting.format(_DEFAULT_DATA_STORE_REGION),
+                setting.format(self.data_store_region),
+            )
+            for setting in _DATA_STORE_REGION_SETTINGS
+        ]
+        self._pattern = re.compile(
+            "|".join(
+                re.escape(pattern)
+                for pattern in (DEFAULT_REGION, *(old for old, _ in self._settings))
+            )
+        )
+
+    def matches(self, content: str) -> bool:
+        """Check whether the content mentions the default region or a setting."""
+        return self._pattern.search(content) is not None
+
+    def rewrite(self, content: str) -> str:
+        """Substitute the region and the first data store region setting found."""
+        content = content.replace(DEFAULT_REGION, self.region)
+        for old, new in self._settings:
+            if old in content:
+                return content.replace(old, new)
+        return content
+
+    def rewrite_bytes(self, data: bytes) -> bytes | None:
+        """Substitute the region in the raw content of a file.
+
+        Like reading and writing the file as text, the rewritten content has
+        universal newlines translated to the platform newline.
+
+        Returns:
+            The new content, or None if the file is left as is because it is
+            not UTF-8 text or mentions neither the region nor a setting
+        """
+        try:
+            content = data.decode("utf-8")
+        except UnicodeDecodeError:
+            return None
+        if not self.matches(content):
+            return None
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
+        return encode_text(self.rewrite(content))
+
+
+def replace_region_in_files(
+    project_path: pathlib.Path,
+    new_region: str,
+    files: Iterable[pathlib.Path] | None = None,
+) -> None:
+    """Replace all instances of 'us-central1' with the specified region in project files.
+    Also handles vertex_ai_search region mapping.
+
+    Args:
+        project_path: Path to the project directory
+        new_region: The new region to use
+        files: Files to substitute the region in, e.g. those written outside
+            the render engine; the whole project is walked if None
+    """
+    logging.debug(
+        f"Replacing region 'us-central1' with '{new_region}' in {project_path}"
+    )
+
+    if REGION_SKIP_DIRS.intersection(project_path.parts):
+        return
+
+    if files is None:
+        files = _walk_project_files(project_path)
+    rewriter = RegionRewriter(new_region)
+    for file_path in dict.fromkeys(files):
+        if not is_region_file(file_path) or not file_path.is_file():
+            continue
+        content = rewriter.rewrite_bytes(file_path.read_bytes())
+        if content is not None:
+            logging.debug(f"Replacing region in {file_path}")
+            file_path.write_bytes(content)
+
+
+def _walk_project_files(project_path: pathlib.Path) -> Iterator[pathlib.Path]:
+    for root, dirs, names in os.walk(project_path):
+        dirs[:] = [name for name in dirs if name not in REGION_SKIP_DIRS]
+        for name in names:
+            yield pathlib.Path(root, name)
@@ -0,0 +1,313 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Cache of the agents discovered in remote ADK sample repositories.
+
+``list --adk`` and the interactive ``create`` agent selection discover the
+agents of a repository by loading the config of every agent directory. The
+result only depends on the repository contents, so it is cached on disk keyed
+by the commit it was discovered at. The branch or tag being listed is resolved
+to its commit with ``git ls-remote``, and that resolution is itself reused for
+``ASP_REMOTE_CATALOG_TTL`` seconds: listing again within the TTL neither
+touches the network nor parses any config, and listing later only costs the
+``ls-remote`` call as long as the ref has not moved.
+
+On a cache miss, the agents are discovered from the directory trees of the
+git mirror cache instead of a clone: only the ``pyproject.toml`` of each agent
+is fetched and parsed, and nothing is checked out.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import posixpath
+import shutil
+import subprocess
+import sys
+import time
+from typing import Any
+
+if sys.version_info >= (3, 11):
+    import tomllib
+else:
+    import tomli as tomllib
+
+from .cache import get_cache_dir
+from .git_cache import (
+    GitMirrorCache,
+    get_head_commit,
+    is_git_cache_enabled,
+    resolve_remote_ref,
+)
+from .profiler import phase
+from .remote_template import (
+    RemoteTemplateSpec,
+    adk_agent_info,
+    apply_pyproject_config,
+    clone_remote_template,
+    discover_adk_agents,
+    number_adk_agents,
+)
+from .version import get_current_version
+
+# Seconds a resolved branch or tag is trusted without asking the remote
+REMOTE_CATALOG_TTL_ENV_VAR = "ASP_REMOTE_CATALOG_TTL"
+DEFAULT_REMOTE_CATALOG_TTL = 10 * 60
+
+# Bump when the format of the cached agent entries changes
+REMOTE_CATALOG_VERSION = 1
+
+# Commits whose agents are kept per repository
+_MAX_CATALOGS = 8
+
+
+def get_remote_catalog_ttl() -> float:
+    """Return the configured lifetime of a resolved ref, in seconds."""
+    value = os.environ.get(REMOTE_CATALOG_TTL_ENV_VAR, "").strip()
+    if not value:
+        return DEFAULT_REMOTE_CATALOG_TTL
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        logging.debug(f"Invalid {REMOTE_CATALOG_TTL_ENV_VAR} value '{value}'")
+        return DEFAULT_REMOTE_CATALOG_TTL
+
+
+class RemoteCatalogCache:
+    """Discovered agents of remote repositories, keyed by commit.
+
+    Each repository (and directory within it) has one JSON file holding its
+    recently resolved refs and the agents discovered at recent commits.
+    Entries written by another version of the CLI are ignored, since agent
+    discovery may have changed.
+    """
+
+    def __init__(
+        self, directory: pathlib.Path | None = None, ttl: float | None = None
+    ) -> None:
+        self.directory = directory or get_cache_dir("catalogs")
+        self.ttl = get_remote_catalog_ttl() if ttl is None else ttl
+
+    def resolve(self, spec: RemoteTemplateSpec) -> str | None:
+        """Return the commit the ref of ``spec`` points to.
+
+        A resolution younger than the TTL is reused without network access.
+
+        Returns:
+            The commit SHA, or None if the ref cannot be resolved
+        """
+        data = self._read(spec)
+        resolved = data["refs"].get(spec.git_ref)
+        if resolved and time.time() - resolved["resolved_at"] <= self.ttl:
+            return resolved["commit"]
+        try:
+            with phase("resolve ref"):
+                commit = resolve_remote_ref(spec.repo_url, spec.git_ref)
+        except (OSError, LookupError, subprocess.CalledProcessError) as e:
+            logging.debug(f"Could not resolve {spec.git_ref} of {spec.repo_url}: {e}")
+            return None
+        data["refs"][spec.git_ref] = {"commit": commit, "resolved_at": time.time()}
+        self._write(spec, data)
+        return commit
+
+    def get(
+        self, spec: RemoteTemplateSpec, commit: str
+    ) -> dict[int, dict[str, Any]] | None:
+        """Return the agents discovered at ``commit``, if cached."""
+        catalog = self._read(spec)["catalogs"].get(commit)
+        if catalog is None:
+            return None
+        return dict(enumerate(catalog["agents"], 1))
+
+    def put(
+        self,
+        spec: RemoteTemplateSpec,
+        commit: str,
+        agents: dict[int, dict[str, Any]],
+    ) -> None:
+        """Store the agents discovered at ``commit``, the commit of the ref."""
+        data = self._read(spec)
+        now = time.time()
+        data["refs"][spec.git_ref] = {"commit": commit, "resolved_at": now}
+        catalogs = data["catalogs"]
+        catalogs[commit] = {"agents": list(agents.values()), "stored_at": now}
+        # Keep the most recently stored commits
+        by_age = sorted(catalogs, key=lambda c: catalogs[c]["stored_at"])
+        for old in by_age[:-_MAX_CATALOGS]:
+            del catalogs[old]
+        self._write(spec, data)
+
+    def clear(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _path(self, spec: RemoteTemplateSpec) -> pathlib.Path:
+        key = f"{spec.repo_url}\0{spec.template_path}".encode()
+        return self.directory / f"{hashlib.sha256(key).hexdigest()[:16]}.json"
+
+    def _read(self, spec: RemoteTemplateSpec) -> dict[str, Any]:
+        try:
+            with self._path(spec).open(encoding="utf-8") as f:
+                data = json.load(f)
+            if (
+                data["version"] == REMOTE_CATALOG_VERSION
+                and data["asp_version"] == get_current_version()
+            ):
+                return {"refs": dict(data["refs"]), "catalogs": dict(data["catalogs"])}
+        except (OSError, ValueError, TypeError, KeyError):
+            pass
+        return {"refs": {}, "catalogs": {}}
+
+    def _write(self, spec: RemoteTemplateSpec, data: dict[str, Any]) -> None:
+        path = self._path(spec)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f".{path.name}.{os.getpid()}")
+            tmp_path.write_text(
+                json.dumps(
+                    {
+                        "version": REMOTE_CATALOG_VERSION,
+                        "asp_version": get_current_version(),
+                        **data,
+                    }
+                ),
+                encoding="utf-8",
+            )
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logging.debug(f"Could not write remote catalog cache: {e}")
+
+
+def discover_remote_adk_agents(
+    spec: RemoteTemplateSpec, cache: RemoteCatalogCache | None = None
+) -> dict[int, dict[str, Any]]:
+    """Discover the ADK agents of a remote repository, using the cache.
+
+    The template directory of ``spec`` is scanned, as with
+    ``discover_adk_agents``. The repository is only fetched if the agents at
+    the commit of its ref are not cached. Unlike ``create``, listing does not
+    switch to the CLI version locked by the repository.
+
+    Raises:
+        RuntimeError: If the repository cannot be fetched
+    """
+    cache = cache or RemoteCatalogCache()
+    commit = cache.resolve(spec)
+    if commit:
+        agents = cache.get(spec, commit)
+        if agents is not None:
+            logging.debug(f"Using cached agents of {spec.repo_url} at {commit}")
+            return agents
+
+    if is_git_cache_enabled():
+        try:
+            with phase("discover agents"):
+                commit, agents = _discover_adk_agents_from_tree(spec)
+            cache.put(spec, commit, agents)
+            return agents
+        except (OSError, subprocess.CalledProcessError) as e:
+            logging.debug(f"Could not list agents from the git mirror cache: {e}")
+
+    template_dir, temp_path = clone_remote_template(spec)
+    try:
+        with phase("discover agents"):
+            agents = discover_adk_agents(template_dir)
+        commit = get_head_commit(template_dir) or commit
+        if commit:
+            cache.put(spec, commit, agents)
+        return agents
+    finally:
+        shutil.rmtree(temp_path, ignore_errors=True)
+
+
+def read_remote_files(
+    spec: RemoteTemplateSpec, filename: str, scan_from_root: bool = False
+) -> dict[str, bytes] | None:
+    """Read every file named ``filename`` in a remote template directory.
+
+    The files are read from the git mirror cache without a checkout.
+
+    Args:
+        spec: Remote template whose directory is scanned
+        filename: Name of the files to read, e.g. "pyproject.toml"
+        scan_from_root: Scan the whole repository instead
+
+    Returns:
+        The file contents by path relative to the scanned directory, or None
+        if the git cache is disabled or the repository cannot be read
+    """
+    if not is_git_cache_enabled():
+        return None
+    git_cache = GitMirrorCache()
+    path = "" if scan_from_root else spec.template_path.strip("/")
+    try:
+        commit, files = git_cache.list_files(spec.repo_url, spec.git_ref, path)
+        paths = sorted(p for p in files if posixpath.basename(p) == filename)
+        contents = git_cache.read_files(spec.repo_url, commit, paths)
+    except (OSError, subprocess.CalledProcessError) as e:
+        logging.debug(f"Could not read {spec.repo_url} from the git mirror cache: {e}")
+        return None
+    return {posixpath.relpath(p, path or "."): data for p, data in contents.items()}
+
+
+def _discover_adk_agents_from_tree(
+    spec: RemoteTemplateSpec,
+) -> tuple[str, dict[int, dict[str, Any]]]:
+    """Discover ADK agents like ``discover_adk_agents``, from the git trees.
+
+    Every directory of ``python/agents`` is an agent, loaded from its
+    pyproject.toml only.
+
+    Returns:
+        The commit the agents were discovered at, and the agents
+
+    Raises:
+        subprocess.CalledProcessError: If the repository cannot be fetched
+        OSError: If the cache directory is not writable
+    """
+    git_cache = GitMirrorCache()
+    agents_path = posixpath.join(spec.template_path.strip("/"), "python", "agents")
+    commit, files = git_cache.list_files(spec.repo_url, spec.git_ref, agents_path)
+    # Git only tracks files, so every directory listed here has some
+    agent_names = sorted(
+        {
+            relative.split("/")[0]
+            for relative in (p[len(agents_path) + 1 :] for p in files)
+            if "/" in relative
+        }
+    )
+    pyproject_paths = {
+        name: f"{agents_path}/{name}/pyproject.toml" for name in agent_names
+    }
+    pyprojects = git_cache.read_files(
+        spec.repo_url,
+        commit,
+        [path for path in pyproject_paths.values() if path in files],
+    )
+
+    all_agents = []
+    for name in agent_names:
+        config: dict[str, Any] = {"name": name, "description": ""}
+        data = pyprojects.get(pyproject_paths[name])
+        if data is not None:
+            try:
+                pyproject_data = tomllib.loads(data.decode("utf-8"))
+                config["has_explicit_config"] = apply_pyproject_config(
+                    config, pyproject_data
+                )
+            except (UnicodeDecodeError, tomllib.TOMLDecodeError) as e:
+                logging.error(f"Error loading pyproject.toml config: {e}")
+        all_agents.append(adk_agent_info(name, f"python/agents/{name}", config))
+    return commit, number_adk_agents(all_agents)
@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import contextlib
+import functools
 import logging
 import os
 import pathlib
@@ -20,6 +22,8 @@ import shutil
 import subprocess
 import sys
 import tempfile
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Any
 
@@ -27,10 +31,21 @@ if sys.version_info >= (3, 11):
     import tomllib
 else:
     import tomli as tomllib
+import click
 from jinja2 import Environment
 from packaging import version as pkg_version
 from rich.console import Console
 
+from .env_pool import get_cli_command
+from .git_cache import GitMirrorCache, is_git_cache_enabled
+from .makefile import merge_makefiles
+from .profiler import phase, record_file
+from .template_cache import (
+    TemplateBytecodeCache,
+    get_bytecode_cache,
+    template_from_string,
+)
+
 
 @dataclass
 class RemoteTemplateSpec:
@@ -128,6 +143,47 @@ def parse_agent_spec(agent_spec: str) -> RemoteTemplateSpec | None:
     return None
 
 
+# Last release whose ``create`` command lacks the options below. They are
+# removed from the command line of version-locked runs of older versions.
+# Values are the number of arguments each option takes.
+_NEW_CREATE_OPTIONS_AFTER = "0.31.8"
+_NEW_CREATE_OPTIONS = {"--no-cache": 0, "--profile": 0, "--profile-output": 1}
+
+# Whether projects are being generated in-process by ``create --matrix``,
+# where the command line cannot be re-executed with another version
+_batch_generation = False
+
+
+@contextlib.contextmanager
+def batch_generation() -> Iterator[None]:
+    """Reject version-locked templates while generating projects in batch.
+
+    The version lock re-executes the process's command line with the pinned
+    version, which in batch mode is the whole ``create --matrix`` command.
+    """
+    global _batch_generation
+    previous = _batch_generation
+    _batch_generation = True
+    try:
+        yield
+    finally:
+        _batch_generation = previous
+
+
+def _strip_options(args: list[str], options: dict[str, int]) -> list[str]:
+    """Remove options, and the arguments they take, from a command line."""
+    stripped = []
+    skip = 0
+    for arg in args:
+        if skip:
+            skip -= 1
+        elif arg in options:
+            skip = options[arg]
+        elif arg.split("=", 1)[0] not in options:
+            stripped.append(arg)
+    return stripped
+
+
 def check_and_execute_with_version_lock(
     template_dir: pathlib.Path,
     original_agent_spec: str | None = None,
@@ -144,6 +200,10 @@ def check_and_execute_with_version_lock(
 
     Returns:
         True if version lock was found and executed, False otherwise
+
+    Raises:
+        click.ClickException: If a version lock is found in batch mode, see
+            ``batch_generation``
     """
     # Skip version locking if we're already in a locked execution (prevents recursion)
     # or if ASP_SKIP_VERSION_LOCK env var is set to "1" (for testing with local ASP)
@@ -152,22 +212,42 @@ def check_and_execute_with_version_lock(
     uv_lock_path = template_dir / "uv.lock"
     version = parse_agent_starter_pack_version_from_lock(uv_lock_path)
 
+    if version and _batch_generation:
+        raise click.ClickException(
+            f"Template requires agent-starter-pack version {version}, which "
+            "cannot be used in batch mode. Generate it on its own with "
+            "'agent-starter-pack create'."
+        )
+
     if version:
         console = Console()
         console.print(
             f"🔒 Remote template requires agent-starter-pack version {version}",
             style="bold blue",
         )
-        console.print(
-            f"📦 Switching to version {version}...",
-            style="dim",
-        )
 
         # Reconstruct the original command but with version constraint
         import sys
 
         original_args = sys.argv[1:]  # Skip 'agent-starter-pack' or script name
 
+        # Remove the options older versions do not know
+        if pkg_version.parse(version) <= pkg_version.parse(_NEW_CREATE_OPTIONS_AFTER):
+            if "--dry-run" in original_args:
+                # Running the pinned version without --dry-run would write files
+                console.print(
+                    f"⚠️  Version {version} does not support --dry-run, "
+                    "previewing with the current version",
+                    style="yellow",
+                )
+                return False
+            original_args = _strip_options(original_args, _NEW_CREATE_OPTIONS)
+
+        console.print(
+            f"📦 Switching to version {version}...",
+            style="dim",
+        )
+
         # Add version lock specific parameters and handle remote URL replacement
         if original_agent_spec:
             # Check if --agent flag exists in original args
@@ -221,10 +301,11 @@ def check_and_execute_with_version_lock(
             sys.exit(1)
 
         try:
-            # Execute uvx with the locked version
-            cmd = ["uvx", f"agent-starter-pack@{version}", *original_args]
+            # Execute the locked version, from its prepared environment
+            cmd = [*get_cli_command(version), *original_args]
             logging.debug(f"Executing nested command: {' '.join(cmd)}")
-            subprocess.run(cmd, check=True)
+            with phase("version lock re-exec"):
+                subprocess.run(cmd, check=True)
             return True
 
         except subprocess.CalledProcessError as e:
@@ -241,53 +322,60 @@ def check_and_execute_with_version_lock(
     return False
 
 
-def fetch_remote_template(
-    spec: RemoteTemplateSpec,
-    original_agent_spec: str | None = None,
-    locked: bool = False,
-    project_name: str | None = None,
-) -> tuple[pathlib.Path, pathlib.Path]:
-    """Fetch remote template and return path to template directory.
-
-    Uses Git to clone the remote repository. If the template contains a uv.lock
-    with agent-starter-pack version constraint, will execute nested uvx command.
-
-    Args:
-        spec: Remote template specification
-        original_agent_spec: Original agent spec string (used to prevent recursion)
-        locked: Whether this is already a locked execution (prevents recursion)
-        project_name: Project name (may have been entered interactively)
+def _checkout_from_git_cache(spec: RemoteTemplateSpec, repo_path: pathlib.Path) -> bool:
+    """Check out a remote template from the local mirror cache.
 
     Returns:
-        A tuple containing:
-        - Path to the fetched template directory.
-        - Path to the top-level temporary directory that should be cleaned up.
+        False if the cache is disabled or failed, to clone directly instead
     """
-    temp_dir = tempfile.mkdtemp(prefix="asp_remote_template_")
-    temp_path = pathlib.Path(temp_dir)
-    repo_path = temp_path / "repo"
-
-    # Attempt Git Clone
+    if not is_git_cache_enabled():
+        return False
     try:
-        clone_url = spec.repo_url
-
-        # Build clone command with --single-branch (optimized for branches)
-        clone_cmd = [
-            "git",
-            "clone",
-            "--depth",
-            "1",
-            "--single-branch",
-            "--branch",
-            spec.git_ref,
-            clone_url,
-            str(repo_path),
-        ]
+        with phase("git mirror checkout"):
+            commit = GitMirrorCache().checkout(
+                spec.repo_url,
+                spec.git_ref,
+                repo_path,
+                # Only the template directory is needed, not the whole repo
+                sparse_path=spec.template_path,
+            )
+    except subprocess.CalledProcessError as e:
+        logging.debug(f"Git mirror cache failed, cloning directly: {e.stderr}")
+    except OSError as e:
+        logging.debug(f"Git mirror cache unavailable, cloning directly: {e}")
+    else:
+        logging.debug(f"Checked out {spec.git_ref} ({commit}) from the git cache")
+        return True
+    shutil.rmtree(repo_path, ignore_errors=True)
+    return False
 
-        logging.debug(
-            f"Attempting to clone remote template with Git: {' '.join(clone_cmd)}"
-        )
-        # GIT_TERMINAL_PROMPT=0 prevents git from prompting for credentials
+
+def _git_clone(spec: RemoteTemplateSpec, repo_path: pathlib.Path) -> None:
+    """Shallow clone the ref of a remote template.
+
+    Raises:
+        subprocess.CalledProcessError: If the clone fails
+    """
+    clone_url = spec.repo_url
+
+    # Build clone command with --single-branch (optimized for branches)
+    clone_cmd = [
+        "git",
+        "clone",
+        "--depth",
+        "1",
+        "--single-branch",
+        "--branch",
+        spec.git_ref,
+        clone_url,
+        str(repo_path),
+    ]
+
+    logging.debug(
+        f"Attempting to clone remote template with Git: {' '.join(clone_cmd)}"
+    )
+    # GIT_TERMINAL_PROMPT=0 prevents git from prompting for credentials
+    with phase("git clone"):
         result = subprocess.run(
             clone_cmd,
             capture_output=True,
@@ -296,23 +384,24 @@ def fetch_remote_template(
             env={**os.environ, "GIT_TERMINAL_PROMPT": "0"},
         )
 
-        # If clone with --single-branch fails, retry without it (for tags)
-        if result.returncode != 0:
-            # Check if the error is related to branch not found (indicates it's likely a tag)
-            if "Remote branch" in result.stderr or "not found" in result.stderr:
-                logging.debug(
-                    f"Clone with --single-branch failed, retrying without it (git_ref '{spec.git_ref}' is likely a tag)"
-                )
-                clone_cmd_without_single_branch = [
-                    "git",
-                    "clone",
-                    "--depth",
-                    "1",
-                    "--branch",
-                    spec.git_ref,
-                    clone_url,
-                    str(repo_path),
-                ]
+    # If clone with --single-branch fails, retry without it (for tags)
+    if result.returncode != 0:
+        # Check if the error is related to branch not found (indicates it's likely a tag)
+        if "Remote branch" in result.stderr or "not found" in result.stderr:
+            logging.debug(
+                f"Clone with --single-branch failed, retrying without it (git_ref '{spec.git_ref}' is likely a tag)"
+            )
+            clone_cmd_without_single_branch = [
+                "git",
+                "clone",
+                "--depth",
+                "1",
+                "--branch",
+                spec.git_ref,
+                clone_url,
+                str(repo_path),
+            ]
+            with phase("git clone (tag)"):
                 subprocess.run(
                     clone_cmd_without_single_branch,
                     capture_output=True,
@@ -321,34 +410,92 @@ def fetch_remote_template(
                     encoding="utf-8",
                     env={**os.environ, "GIT_TERMINAL_PROMPT": "0"},
                 )
-                logging.debug("Git clone successful (without --single-branch).")
-            else:
-                # Different error, raise it
-                raise subprocess.CalledProcessError(
-                    result.returncode, clone_cmd, result.stdout, result.stderr
-                )
+            logging.debug("Git clone successful (without --single-branch).")
         else:
-            logging.debug("Git clone successful.")
+            # Different error, raise it
+            raise subprocess.CalledProcessError(
+                result.returncode, clone_cmd, result.stdout, result.stderr
+            )
+    else:
+        logging.debug("Git clone successful.")
+
+
+def clone_remote_template(
+    spec: RemoteTemplateSpec,
+) -> tuple[pathlib.Path, pathlib.Path]:
+    """Clone a remote template without prompting or printing.
+
+    Safe to run in a background thread, see ``fetch_remote_template``.
+
+    Args:
+        spec: Remote template specification
+
+    Returns:
+        A tuple containing:
+        - Path to the fetched template directory.
+        - Path to the top-level temporary directory that should be cleaned up.
+    """
+    temp_dir = tempfile.mkdtemp(prefix="asp_remote_template_")
+    temp_path = pathlib.Path(temp_dir)
+    repo_path = temp_path / "repo"
+
+    # Attempt Git Clone
+    try:
+        if not _checkout_from_git_cache(spec, repo_path):
+            _git_clone(spec, repo_path)
     except subprocess.CalledProcessError as e:
         shutil.rmtree(temp_path, ignore_errors=True)
         raise RuntimeError(f"Git clone failed: {e.stderr.strip()}") from e
 
-    # Process the successfully fetched template
-    try:
-        if spec.template_path:
-            template_dir = repo_path / spec.template_path
-        else:
-            template_dir = repo_path
+    if spec.template_path:
+        template_dir = repo_path / spec.template_path
+    else:
+        template_dir = repo_path
 
-        if not template_dir.exists():
-            raise FileNotFoundError(
-                f"Template path not found in the repository: {spec.template_path}"
-            )
+    if not template_dir.exists():
+        shutil.rmtree(temp_path, ignore_errors=True)
+        raise RuntimeError(
+            "An unexpected error occurred after fetching remote template: "
+            f"Template path not found in the repository: {spec.template_path}"
+        )
+
+    return template_dir, temp_path
+
+
+def fetch_remote_template(
+    spec: RemoteTemplateSpec,
+    original_agent_spec: str | None = None,
+    locked: bool = False,
+    project_name: str | None = None,
+    cloned: tuple[pathlib.Path, pathlib.Path] | None = None,
+) -> tuple[pathlib.Path, pathlib.Path]:
+    """Fetch remote template and return path to template directory.
+
+    Uses Git to clone the remote repository. If the template contains a uv.lock
+    with agent-starter-pack version constraint, will execute nested uvx command.
+
+    Args:
+        spec: Remote template specification
+        original_agent_spec: Original agent spec string (used to prevent recursion)
+        locked: Whether this is already a locked execution (prevents recursion)
+        project_name: Project name (may have been entered interactively)
+        cloned: Result of an earlier ``clone_remote_template`` call for the
+            same spec (e.g. started in the background), instead of cloning
 
+    Returns:
+        A tuple containing:
+        - Path to the fetched template directory.
+        - Path to the top-level temporary directory that should be cleaned up.
+    """
+    template_dir, temp_path = cloned or clone_remote_template(spec)
+
+    try:
         # Check for version lock and execute nested command if found
-        if check_and_execute_with_version_lock(
-            template_dir, original_agent_spec, locked, project_name
-        ):
+        with phase("version lock check"):
+            executed_with_lock = check_and_execute_with_version_lock(
+                template_dir, original_agent_spec, locked, project_name
+            )
+        if executed_with_lock:
             # If we executed with locked version, the nested process will handle everything
             # Clean up and exit successfully
             shutil.rmtree(temp_path, ignore_errors=True)
@@ -445,6 +592,38 @@ def _infer_agent_directory_for_adk(
     }
 
 
+def apply_pyproject_config(
+    config: dict[str, Any], pyproject_data: dict[str, Any]
+) -> bool:
+    """Apply the template configuration of a parsed pyproject.toml to ``config``.
+
+    Values from [tool.agent-starter-pack] override those in ``config``, with
+    fallbacks to [project] for name and description.
+
+    Returns:
+        Whether the pyproject.toml has an explicit configuration
+    """
+    # Extract the agent-starter-pack configuration
+    toml_config = pyproject_data.get("tool", {}).get("agent-starter-pack", {})
+
+    # Fallback to [project] fields if not specified in agent-starter-pack section
+    project_info = pyproject_data.get("project", {})
+
+    # Apply pyproject.toml configuration (overrides defaults)
+    if toml_config:
+        config.update(toml_config)
+        logging.debug("Found explicit [tool.agent-starter-pack] configuration")
+
+    # Apply [project] fallbacks if not already set
+    if "name" not in toml_config and "name" in project_info:
+        config["name"] = project_info["name"]
+
+    if "description" not in toml_config and "description" in project_info:
+        config["description"] = project_info["description"]
+
+    return bool(toml_config)
+
+
 def load_remote_template_config(
     template_dir: pathlib.Path,
     cli_overrides: dict[str, Any] | None = None,
@@ -484,27 +663,7 @@ def load_remote_template_config(
             with open(pyproject_path, "rb") as f:
                 pyproject_data = tomllib.load(f)
 
-            # Extract the agent-starter-pack configuration
-            toml_config = pyproject_data.get("tool", {}).get("agent-starter-pack", {})
-
-            # Fallback to [project] fields if not specified in agent-starter-pack section
-            project_info = pyproject_data.get("project", {})
-
-            # Track if we have explicit configuration
-            has_explicit_config = bool(toml_config)
-
-            # Apply pyproject.toml configuration (overrides defaults)
-            if toml_config:
-                config.update(toml_config)
-                logging.debug("Found explicit [tool.agent-starter-pack] configuration")
-
-            # Apply [project] fallbacks if not already set
-            if "name" not in toml_config and "name" in project_info:
-                config["name"] = project_info["name"]
-
-            if "description" not in toml_config and "description" in project_info:
-                config["description"] = project_info["description"]
-
+            has_explicit_config = apply_pyproject_config(config, pyproject_data)
             logging.debug(f"Loaded template config from {pyproject_path}")
         except Exception as e:
             logging.error(f"Error loading pyproject.toml config: {e}")
@@ -601,9 +760,51 @@ def merge_template_configs(
     return deep_merge(merged_config, remote_config)
 
 
+def _load_adk_agent_info(
+    repo_path: pathlib.Path, agent_dir: pathlib.Path
+) -> dict[str, Any] | None:
+    """Load the listing info of one ADK agent, or None if it cannot be loaded."""
+    logging.debug(f"Processing agent directory: {agent_dir.name}")
+    try:
+        # Load configuration with ADK inference support
+        config = load_remote_template_config(template_dir=agent_dir, is_adk_sample=True)
+    except Exception as e:
+        logging.warning(f"Could not load agent from {agent_dir}: {e}")
+        return None
+
+    # Relative path from repo root
+    return adk_agent_info(agent_dir.name, str(agent_dir.relative_to(repo_path)), config)
+
+
+def adk_agent_info(
+    agent_name: str, path: str, config: dict[str, Any]
+) -> dict[str, Any]:
+    """Return the listing info of an ADK agent from its loaded config."""
+    return {
+        "name": config.get("name", agent_name),
+        "description": config.get("description", ""),
+        "path": path,
+        "spec": f"adk@{agent_name}",
+        "has_explicit_config": config.get("has_explicit_config", False),
+    }
+
+
+def number_adk_agents(
+    all_agents: list[dict[str, Any]],
+) -> dict[int, dict[str, Any]]:
+    """Sort the listing info of ADK agents and number them from 1."""
+    # Sort agents: explicit config first, then inferred (both alphabetically within their groups)
+    all_agents = sorted(
+        all_agents, key=lambda x: (not x["has_explicit_config"], x["name"].lower())
+    )
+    return dict(enumerate(all_agents, 1))
+
+
 def discover_adk_agents(repo_path: pathlib.Path) -> dict[int, dict[str, Any]]:
     """Discover and load all ADK agents from a repository with inference support.
 
+    The agent configs are loaded in parallel.
+
     Args:
         repo_path: Path to the cloned ADK samples repository
 
@@ -615,62 +816,27 @@ def discover_adk_agents(repo_path: pathlib.Path) -> dict[int, dict[str, Any]]:
         - spec: adk@ specification string
         - has_explicit_config: Whether agent has explicit configuration
     """
-    import logging
-
-    adk_agents = {}
-
     # Search specifically for agents in python/agents/* directories
     agents_dir = repo_path / "python" / "agents"
     logging.debug(f"Looking for agents in: {agents_dir}")
-    if agents_dir.exists():
-        all_items = list(agents_dir.iterdir())
-        logging.debug(
-            f"Found items in agents directory: {[item.name for item in all_items]}"
-        )
-
-        # Collect all agents first, then sort by configuration type
-        all_agents = []
-
-        for agent_dir in sorted(agents_dir.iterdir()):
-            if not agent_dir.is_dir():
-                logging.debug(f"Skipping non-directory: {agent_dir.name}")
-                continue
-            logging.debug(f"Processing agent directory: {agent_dir.name}")
-
-            try:
-                # Load configuration with ADK inference support
-                config = load_remote_template_config(
-                    template_dir=agent_dir, is_adk_sample=True
-                )
-
-                agent_name = config.get("name", agent_dir.name)
-                description = config.get("description", "")
-                has_explicit_config = config.get("has_explicit_config", False)
-
-                # Get the relative path from repo root
-                relative_path = agent_dir.relative_to(repo_path)
-                agent_spec_name = agent_dir.name
-
-                agent_info = {
-                    "name": agent_name,
-                    "description": description,
-                    "path": str(relative_path),
-                    "spec": f"adk@{agent_spec_name}",
-                    "has_explicit_config": has_explicit_config,
-                }
-                all_agents.append(agent_info)
-
-            except Exception as e:
-                logging.warning(f"Could not load agent from {agent_dir}: {e}")
-
-        # Sort agents: explicit config first, then inferred (both alphabetically within their groups)
-        all_agents.sort(key=lambda x: (not x["has_explicit_config"], x["name"].lower()))
+    if not agents_dir.exists():
+        return {}
 
-        # Convert to numbered dictionary
-        for i, agent_info in enumerate(all_agents, 1):
-            adk_agents[i] = agent_info
+    agent_dirs = []
+    for agent_dir in sorted(agents_dir.iterdir()):
+        if not agent_dir.is_dir():
+            logging.debug(f"Skipping non-directory: {agent_dir.name}")
+            continue
+        agent_dirs.append(agent_dir)
+
+    max_workers = min(32, (os.cpu_count() or 1) + 4, max(1, len(agent_dirs)))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        loaded = executor.map(
+            functools.partial(_load_adk_agent_info, repo_path), agent_dirs
+        )
+        all_agents = [agent_info for agent_info in loaded if agent_info]
 
-    return adk_agents
+    return number_adk_agents(all_agents)
 
 
 def display_adk_caveat_if_needed(agents: dict[int, dict[str, Any]]) -> None:
@@ -727,6 +893,29 @@ def parse_agent_starter_pack_version_from_lock(
     return None
 
 
+@functools.cache
+def _get_makefile_environment(
+    bytecode_cache: TemplateBytecodeCache | None,
+) -> Environment:
+    """Return the Jinja environment shared by all Makefile renders."""
+    return Environment(bytecode_cache=bytecode_cache)
+
+
+def _render_makefile(
+    template_path: pathlib.Path | None, cookiecutter_config: dict
+) -> str:
+    """Render the Makefile of a template, or return "" if it has none."""
+    if template_path is None:
+        return ""
+    makefile_path = template_path / "Makefile"
+    if not makefile_path.exists():
+        return ""
+    env = _get_makefile_environment(get_bytecode_cache())
+    with open(makefile_path, encoding="utf-8") as f:
+        template = template_from_string(env, f.read(), "Makefile")
+    return template.render(cookiecutter=cookiecutter_config)
+
+
 def render_and_merge_makefiles(
     base_template_path: pathlib.Path,
     final_destination: pathlib.Path,
@@ -737,58 +926,19 @@ def render_and_merge_makefiles(
     Renders the base and remote Makefiles separately, then merges them.
 
     If remote_template_path is not provided, only the base Makefile is rendered.
+    The merge keeps the remote Makefile and appends the base rules it lacks,
+    see ``merge_makefiles``.
     """
-
-    env = Environment()
-
-    # Render the base Makefile
-    base_makefile_path = base_template_path / "Makefile"
-    if base_makefile_path.exists():
-        with open(base_makefile_path, encoding="utf-8") as f:
-            base_template = env.from_string(f.read())
-        rendered_base_makefile = base_template.render(cookiecutter=cookiecutter_config)
-    else:
-        rendered_base_makefile = ""
-
-    # Render the remote Makefile if a path is provided
-    rendered_remote_makefile = ""
-    if remote_template_path:
-        remote_makefile_path = remote_template_path / "Makefile"
-        if remote_makefile_path.exists():
-            with open(remote_makefile_path, encoding="utf-8") as f:
-                remote_template = env.from_string(f.read())
-            rendered_remote_makefile = remote_template.render(
-                cookiecutter=cookiecutter_config
-            )
+    rendered_base_makefile = _render_makefile(base_template_path, cookiecutter_config)
+    rendered_remote_makefile = _render_makefile(
+        remote_template_path, cookiecutter_config
+    )
 
     # Merge the rendered Makefiles
     if rendered_base_makefile and rendered_remote_makefile:
-        # A simple merge: remote content first, then append missing commands from base
-        base_commands = set(
-            re.findall(r"^([a-zA-Z0-9_-]+):", rendered_base_makefile, re.MULTILINE)
+        final_makefile_content = merge_makefiles(
+            rendered_remote_makefile, rendered_base_makefile
         )
-        remote_commands = set(
-            re.findall(r"^([a-zA-Z0-9_-]+):", rendered_remote_makefile, re.MULTILINE)
-        )
-        missing_commands = base_commands - remote_commands
-
-        if missing_commands:
-            commands_to_append = ["\n\n# --- Commands from Agent Starter Pack ---\n\n"]
-            for command in sorted(missing_commands):
-                command_block_match = re.search(
-                    rf"^{command}:.*?(?=\n\n(?:^#.*\n)*?^[a-zA-Z0-9_-]+:|" + r"\Z)",
-                    rendered_base_makefile,
-                    re.MULTILINE | re.DOTALL,
-                )
-                if command_block_match:
-                    commands_to_append.append(command_block_match.group(0))
-                    commands_to_append.append("\n\n")
-
-            final_makefile_content = rendered_remote_makefile + "".join(
-                commands_to_append
-            )
-        else:
-            final_makefile_content = rendered_remote_makefile
     elif rendered_remote_makefile:
         final_makefile_content = rendered_remote_makefile
     else:
@@ -797,4 +947,5 @@ def render_and_merge_makefiles(
     # Write the final merged Makefile
     with open(final_destination / "Makefile", "w", encoding="utf-8") as f:
         f.write(final_makefile_content)
+    record_file(final_destination / "Makefile")
     logging.debug("Rendered and merged Makefile written to final destination.")
@@ -0,0 +1,302 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Opt-in cache of rendered project trees.
+
+Generating the same agent / deployment target / options combination again
+(CI matrices, demos, repeated ``create`` runs with different project names)
+renders the same files every time. With ``ASP_RENDER_CACHE=1`` the rendered
+output is stored per combination, keyed by the package version, the content
+of every template file, the region the engine substitutes and the
+cookiecutter config with its project-specific values (project name,
+generation timestamp, output directory) left out.
+
+While rendering a miss, the engine records which variables every file reads.
+On a hit only the files reading a project-specific value are rendered again;
+all other files are copied from the cache. Entries are evicted least recently
+used first once the cache grows beyond ``RENDER_CACHE_MAX_BYTES``.
+"""
+
+import functools
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import shutil
+import tempfile
+from collections.abc import Iterator
+from importlib.metadata import PackageNotFoundError, version
+from typing import Any
+
+from .cache import get_cache_dir, prune_cache_entries
+from .file_copy import copy_file
+from .region import DEFAULT_REGION
+from .render_engine import (
+    ALL_VARIABLES,
+    FilePlan,
+    RenderEngine,
+    build_render_context,
+    run_file_tasks,
+)
+from .template_cache import get_jinja_version
+from .version import get_current_version
+
+# Set to "1" to enable the rendered output cache
+RENDER_CACHE_ENV_VAR = "ASP_RENDER_CACHE"
+
+# Maximum total size of the rendered output cache
+RENDER_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+# Config values that differ between otherwise identical projects
+PROJECT_VARIABLES = ("project_name", "generated_at")
+
+# Key entry of the region outputs are written for; it is substituted by the
+# engine rather than read by templates, so it is not a config value
+REGION_VARIABLE = "region"
+
+# Context values that depend on where the project is generated
+LOCATION_VARIABLES = ("_output_dir",)
+
+_MANIFEST_FILE = "manifest.json"
+_TREE_DIR = "tree"
+
+
+def is_render_cache_enabled() -> bool:
+    """Check whether the rendered output cache is enabled."""
+    return os.environ.get(RENDER_CACHE_ENV_VAR) == "1"
+
+
+@functools.cache
+def _get_cookiecutter_version() -> str:
+    try:
+        return version("cookiecutter")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def _placeholder(name: str) -> str:
+    return f"__asp_render_cache_{name}__"
+
+
+class RenderCache:
+    """Rendered project trees keyed by template content and config.
+
+    Each entry is a directory holding a manifest and the rendered files that
+    do not depend on project-specific values. Entries are written to a
+    temporary directory and renamed into place, so concurrent runs never
+    observe a partially written entry.
+    """
+
+    def __init__(
+        self,
+        directory: pathlib.Path | None = None,
+        max_bytes: int = RENDER_CACHE_MAX_BYTES,
+        project_variables: tuple[str, ...] = PROJECT_VARIABLES,
+    ) -> None:
+        self.directory = directory or get_cache_dir("renders")
+        self.max_bytes = max_bytes
+        # Config values left out of the key; files reading them are rendered
+        # again on every hit
+        self.project_variables = project_variables
+
+    def get_key(self, engine: RenderEngine, plan: FilePlan) -> str:
+        """Compute the cache key of a render.
+
+        Resolved variables are a function of the config, so the key hashes the
+        config itself and lookups never resolve it a second time.
+        """
+        config = dict(engine.cookiecutter_config)
+        config[REGION_VARIABLE] = (
+            engine.region_rewriter.region if engine.region_rewriter else DEFAULT_REGION
+        )
+        config = {
+            name: _placeholder(name) if name in self.project_variables else value
+            for name, value in config.items()
+        }
+
+        digest = hashlib.sha256()
+        for part in (
+            get_current_version(),
+            get_jinja_version(),
+            _get_cookiecutter_version(),
+        ):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        digest.update(json.dumps(config, sort_keys=True, default=str).encode())
+        digest.update(b"\0")
+        for rel_dir in sorted(plan.directories):
+            digest.update(f"d\0{rel_dir}\0".encode())
+        for rel_path in sorted(plan.files):
+            src = plan.files[rel_path]
+            mode = src.stat().st_mode & 0o7777
+            digest.update(f"f\0{rel_path}\0{mode:o}\0".encode())
+            digest.update(hashlib.sha256(src.read_bytes()).digest())
+        return digest.hexdigest()
+
+    def get_project_variables(self, engine: RenderEngine) -> set[str]:
+        """Get the project-specific variables, including values derived from them."""
+        config = dict(engine.cookiecutter_config)
+        for name in self.project_variables:
+            if name in config:
+                config[name] = _placeholder(name)
+        variables = build_render_context(config)["cookiecutter"]
+
+        placeholders = [_placeholder(name) for name in self.project_variables]
+        project_variables = set(self.project_variables) | set(LOCATION_VARIABLES)
+        for name, value in variables.items():
+            serialized = json.dumps(value, default=str)
+            if any(placeholder in serialized for placeholder in placeholders):
+                project_variables.add(name)
+        return project_variables
+
+    def render(
+        self,
+        engine: RenderEngine,
+        plan: FilePlan,
+        project_dir: pathlib.Path,
+        max_workers: int | None = None,
+    ) -> bool:
+        """Render a plan into ``project_dir`` through the cache.
+
+        Args:
+            engine: Engine configured with the project's cookiecutter config
+            plan: File plan to render
+            project_dir: Directory the project is generated into
+            max_workers: Size of the render/write worker pool
+
+        Returns:
+            True if the output was served from the cache
+        """
+        key = self.get_key(engine, plan)
+        entry = self.directory / key
+        manifest = self._load_manifest(entry)
+        if manifest is not None:
+            try:
+                os.utime(entry)
+            except OSError:
+                pass
+            self._render_from_entry(
+                engine, plan, project_dir, entry, manifest, max_workers
+            )
+            return True
+
+        engine.dependencies = {}
+        try:
+            outputs = engine.resolve_outputs(plan, project_dir)
+            tasks = [
+                (rel_path, engine.output_task(outfile, rel_path, src, copy_only))
+                for outfile, (rel_path, src, copy_only) in outputs.items()
+            ]
+            run_file_tasks(tasks, max_workers)
+            dependencies = engine.dependencies
+        finally:
+            engine.dependencies = None
+
+        project_variables = self.get_project_variables(engine)
+        rerendered = sorted(
+            rel_path
+            for rel_path, accessed in dependencies.items()
+            if ALL_VARIABLES in accessed or accessed & project_variables
+        )
+        logging.debug(
+            f"Render cache miss for {key}, {len(rerendered)} project-specific files"
+        )
+        self._store(entry, outputs, project_dir, rerendered)
+        prune_cache_entries(self.directory, self.max_bytes)
+        return False
+
+    def _load_manifest(self, entry: pathlib.Path) -> dict[str, Any] | None:
+        try:
+            with (entry / _MANIFEST_FILE).open(encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(manifest, dict):
+            return None
+        return manifest
+
+    def _render_from_entry(
+        self,
+        engine: RenderEngine,
+        plan: FilePlan,
+        project_dir: pathlib.Path,
+        entry: pathlib.Path,
+        manifest: dict[str, Any],
+        max_workers: int | None,
+    ) -> None:
+        rerendered = set(manifest.get("rerendered", []))
+        cached = set(manifest.get("files", []))
+        outputs = engine.resolve_outputs(plan, project_dir)
+        tasks = []
+        copied = 0
+        for outfile, (rel_path, src, copy_only) in outputs.items():
+            out_rel = outfile.relative_to(project_dir).as_posix()
+            if rel_path not in rerendered and out_rel in cached:
+                task = functools.partial(
+                    engine.copy_rendered, entry / _TREE_DIR / out_rel, outfile
+                )
+                copied += 1
+            else:
+                task = engine.output_task(outfile, rel_path, src, copy_only)
+            tasks.append((rel_path, task))
+        run_file_tasks(tasks, max_workers)
+        logging.debug(
+            f"Render cache hit for {entry.name}, "
+            f"{copied} files copied, {len(tasks) - copied} rendered"
+        )
+
+    def _store(
+        self,
+        entry: pathlib.Path,
+        outputs: dict[pathlib.Path, tuple[str, pathlib.Path, bool]],
+        project_dir: pathlib.Path,
+        rerendered: list[str],
+    ) -> None:
+        """Write a cache entry; failures are logged and never break rendering."""
+        staging = None
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            staging = pathlib.Path(tempfile.mkdtemp(prefix=".", dir=self.directory))
+            tree = staging / _TREE_DIR
+            files = []
+            for outfile, (rel_path, _, _) in outputs.items():
+                if rel_path in rerendered:
+                    continue
+                out_rel = outfile.relative_to(project_dir).as_posix()
+                cached_file = tree / out_rel
+                cached_file.parent.mkdir(parents=True, exist_ok=True)
+                copy_file(outfile, cached_file, preserve_stat=False)
+                files.append(out_rel)
+            with (staging / _MANIFEST_FILE).open("w", encoding="utf-8") as f:
+                json.dump({"rerendered": rerendered, "files": files}, f)
+            os.rename(staging, entry)
+            staging = None
+        except OSError as e:
+            logging.debug(f"Could not write render cache entry {entry}: {e}")
+        finally:
+            if staging is not None:
+                shutil.rmtree(staging, ignore_errors=True)
+
+    def entries(self) -> Iterator[tuple[str, dict[str, Any], pathlib.Path]]:
+        """Yield the key, manifest and rendered file tree of every entry."""
+        if not self.directory.is_dir():
+            return
+        for entry in sorted(self.directory.iterdir()):
+            manifest = self._load_manifest(entry)
+            if manifest is not None:
+                yield entry.name, manifest, entry / _TREE_DIR
+
+    def clear(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
@@ -0,0 +1,747 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Single-pass render engine for project generation.
+
+The legacy flow stages every base, deployment target, agent and frontend file
+into a temporary cookiecutter template, writes a ``cookiecutter.json`` and lets
+``cookiecutter()`` walk the staged tree again. This module builds the same
+layered file plan in memory and renders each file exactly once, with a shared
+Jinja environment, straight into the output directory.
+
+Rendering follows cookiecutter's rules so that output is byte-identical:
+variables are resolved with cookiecutter's own ``prompt_for_config``, paths
+matching ``_copy_without_render`` are copied verbatim, binary files are never
+rendered and the newline style of each source file is preserved. Files
+without any Jinja syntax are copied verbatim too, see ``template_index``.
+"""
+
+import collections
+import contextlib
+import fnmatch
+import functools
+import glob
+import json
+import logging
+import os
+import pathlib
+import re
+import shutil
+from collections import OrderedDict
+from collections.abc import Callable, Collection, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from binaryornot.check import is_binary
+from cookiecutter.prompt import prompt_for_config
+from cookiecutter.utils import create_env_with_context
+from jinja2 import BaseLoader, Environment, TemplateNotFound
+
+from .file_copy import COPY_STRATEGY_AUTO, copy_file
+from .profiler import record_file
+from .region import RegionRewriter, encode_text, is_region_file
+from .template_cache import get_bytecode_cache, template_from_string
+from .template_index import get_template_index
+
+# Environment variable used to select the render engine.
+# "single_pass" (default) renders in-process; "cookiecutter" restores the
+# legacy staged cookiecutter invocation.
+RENDER_ENGINE_ENV_VAR = "ASP_RENDER_ENGINE"
+SINGLE_PASS_ENGINE = "single_pass"
+COOKIECUTTER_ENGINE = "cookiecutter"
+
+# Environment variable setting the size of the render/write worker pool.
+# Unset or "1" renders sequentially; "auto" sizes the pool from the CPU count.
+RENDER_WORKERS_ENV_VAR = "ASP_RENDER_WORKERS"
+
+T = TypeVar("T")
+
+# Method reported for files written through Jinja
+RENDERED = "render"
+
+# Method reported for copied files the region was substituted in
+REGION_REWRITTEN = "region"
+
+# Method reported for files written from previously generated content
+UNPACKED = "unpack"
+
+# Dependency recorded for templates that may read any cookiecutter variable
+ALL_VARIABLES = "*"
+
+# Context uses dependency tracking cannot follow: the whole ``cookiecutter``
+# mapping (e.g. ``{{ cookiecutter | tojson }}``) or the raw ``_cookiecutter``
+_UNTRACKED_CONTEXT_RE = re.compile(
+    r"\b_cookiecutter\b|\bcookiecutter\b(?!\s*\.\s*\w|\s*\[)"
+)
+
+
+# Callback notified of every plan ``create`` renders, see ``render_listener``
+RenderListener = Callable[["RenderEngine", "FilePlan", pathlib.Path], None]
+_render_listeners: list[RenderListener] = []
+
+
+def get_render_engine_name() -> str:
+    """Return the configured render engine name."""
+    engine = os.environ.get(RENDER_ENGINE_ENV_VAR, SINGLE_PASS_ENGINE).strip().lower()
+    if engine not in (SINGLE_PASS_ENGINE, COOKIECUTTER_ENGINE):
+        logging.warning(
+            f"Unknown {RENDER_ENGINE_ENV_VAR} value '{engine}', "
+            f"using '{SINGLE_PASS_ENGINE}'"
+        )
+        return SINGLE_PASS_ENGINE
+    return engine
+
+
+def get_render_workers() -> int:
+    """Return the configured size of the render/write worker pool."""
+    value = os.environ.get(RENDER_WORKERS_ENV_VAR, "").strip().lower()
+    if not value:
+        return 1
+    if value == "auto":
+        return min(32, (os.cpu_count() or 1) + 4)
+    try:
+        return max(1, int(value))
+    except ValueError:
+        logging.warning(
+            f"Invalid {RENDER_WORKERS_ENV_VAR} value '{value}', rendering sequentially"
+        )
+        return 1
+
+
+class RenderError(Exception):
+    """Raised when one or more files fail to render or copy in pool mode."""
+
+    def __init__(self, errors: list[tuple[str, Exception]]) -> None:
+        self.errors = errors
+        details = "\n".join(f"  {label}: {error}" for label, error in errors)
+        super().__init__(f"{len(errors)} file(s) failed to render:\n{details}")
+
+
+def run_file_tasks(
+    tasks: Sequence[tuple[str, Callable[[], T]]], max_workers: int | None = None
+) -> list[T]:
+    """Run file render/write tasks, optionally on a bounded worker pool.
+
+    Tasks must write to distinct paths. Results are returned in task order.
+    Sequential mode stops at the first failure; in pool mode every task runs
+    and all failures are raised together as a RenderError.
+
+    Args:
+        tasks: (label, callable) pairs, the label identifies the file in errors
+        max_workers: Pool size, defaults to ``ASP_RENDER_WORKERS``
+
+    Returns:
+        The task results, in task order
+    """
+    if max_workers is None:
+        max_workers = get_render_workers()
+    if max_workers <= 1 or len(tasks) <= 1:
+        return [task() for _, task in tasks]
+
+    results: list[Any] = []
+    errors: list[tuple[str, Exception]] = []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(tasks))) as executor:
+        futures = [executor.submit(task) for _, task in tasks]
+        for (label, _), future in zip(tasks, futures, strict=True):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                errors.append((label, e))
+                results.append(None)
+    if errors:
+        raise RenderError(errors)
+    return results
+
+
+@contextlib.contextmanager
+def render_listener(listener: RenderListener) -> Iterator[None]:
+    """Call ``listener`` with the engine, plan and directory of every render.
+
+    Used by the template watcher to keep the state of the last render, so
+    that changed templates can be rendered again on their own.
+    """
+    _render_listeners.append(listener)
+    try:
+        yield
+    finally:
+        _render_listeners.remove(listener)
+
+
+def notify_render(
+    engine: "RenderEngine", plan: "FilePlan", project_dir: pathlib.Path
+) -> None:
+    """Notify the active render listeners of a rendered plan."""
+    for listener in list(_render_listeners):
+        listener(engine, plan, project_dir)
+
+
+class FilePlan:
+    """Layered, in-memory plan of the files that make up a generated project.
+
+    Keys are project-relative POSIX paths (still containing Jinja placeholders
+    such as ``{{cookiecutter.agent_directory}}``); values are the source files
+    they come from. Later layers override earlier ones, mirroring
+    ``copy_files(..., overwrite=True)``.
+    """
+
+    def __init__(self) -> None:
+        self.files: dict[str, pathlib.Path] = {}
+        self.directories: set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+    def add_tree(
+        self,
+        src: pathlib.Path,
+        dest: str = "",
+        should_skip: Callable[[pathlib.Path], bool] | None = None,
+    ) -> None:
+        """Add a source file or directory tree as a new layer of the plan.
+
+        Args:
+            src: Source file or directory
+            dest: Project-relative destination path ("" for the project root)
+            should_skip: Optional predicate for paths that must not be copied
+        """
+        if src.is_dir():
+            if dest:
+                self._add_directory(dest)
+            for item in src.iterdir():
+                if should_skip is not None and should_skip(item):
+                    logging.debug(f"Skipping file/directory: {item}")
+                    continue
+                item_dest = f"{dest}/{item.name}" if dest else item.name
+                if item.is_dir():
+                    self.add_tree(item, item_dest, should_skip)
+                else:
+                    self._add_file(item_dest, item)
+        elif should_skip is None or not should_skip(src):
+            self._add_file(dest, src)
+
+    def _add_directory(self, rel_path: str) -> None:
+        parts = rel_path.split("/")
+        for i in range(1, len(parts) + 1):
+            self.directories.add("/".join(parts[:i]))
+
+    def _add_file(self, rel_path: str, src: pathlib.Path) -> None:
+        parent = rel_path.rpartition("/")[0]
+        if parent:
+            self._add_directory(parent)
+        self.files[rel_path] = src
+
+    def stage(
+        self,
+        target: pathlib.Path,
+        max_workers: int | None = None,
+        strategy: str = COPY_STRATEGY_AUTO,
+    ) -> collections.Counter[str]:
+        """Materialize the plan on disk, e.g. as a cookiecutter template.
+
+        Args:
+            target: Directory to write the plan into
+            max_workers: Size of the copy worker pool
+            strategy: Copy strategy, see ``file_copy.copy_file``
+
+        Returns:
+            Number of files copied with each method
+        """
+        target.mkdir(parents=True, exist_ok=True)
+        for rel_dir in sorted(self.directories):
+            (target / rel_dir).mkdir(parents=True, exist_ok=True)
+        tasks = []
+        for rel_path, src in self.files.items():
+            dst = target / rel_path
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            tasks.append((rel_path, functools.partial(copy_file, src, dst, strategy)))
+        methods = collections.Counter(run_file_tasks(tasks, max_workers))
+        logging.debug(f"Staged {len(tasks)} files into {target} ({dict(methods)})")
+        return methods
+
+
+def _walk_order(rel_path: str) -> tuple[tuple[int, str], ...]:
+    """Sort key reproducing cookiecutter's top-down ``os.walk`` file order.
+
+    Files of a directory come before its subdirectories, so that when two plan
+    entries render to the same output path the later one wins exactly as it
+    does with cookiecutter.
+    """
+    *dirs, name = rel_path.split("/")
+    return (*((1, d) for d in dirs), (0, name))
+
+
+class _PlanLoader(BaseLoader):
+    """Jinja loader that resolves template names against a FilePlan."""
+
+    def __init__(self, plan: FilePlan) -> None:
+        self.plan = plan
+
+    def get_source(
+        self, environment: Environment, template: str
+    ) -> tuple[str, str, Callable[[], bool]]:
+        src = self.plan.files.get(template)
+        if src is None:
+            raise TemplateNotFound(template)
+        mtime = src.stat().st_mtime
+        source = src.read_text(encoding="utf-8")
+        return source, str(src), lambda: src.stat().st_mtime == mtime
+
+
+def get_static_copy_patterns(
+    plan: FilePlan, cookiecutter_config: dict[str, Any]
+) -> list[str]:
+    """Return ``_copy_without_render`` patterns for the static files of a plan.
+
+    Used to let ``cookiecutter()`` copy the files without Jinja syntax of a
+    staged plan verbatim, as the single-pass engine does.
+    """
+    index = get_template_index(
+        create_env_with_context({"cookiecutter": cookiecutter_config})
+    )
+    if index is None:
+        return []
+    patterns = [
+        glob.escape(os.path.normpath(rel_path))
+        for rel_path, src in sorted(plan.files.items())
+        if index.is_static(src)
+    ]
+    index.save()
+    return patterns
+
+
+def build_render_context(
+    cookiecutter_config: dict[str, Any], output_dir: pathlib.Path | None = None
+) -> dict[str, Any]:
+    """Resolve cookiecutter variables exactly as ``cookiecutter()`` would.
+
+    The config goes through a JSON round-trip (as it would via
+    ``cookiecutter.json``) and cookiecutter's non-interactive prompt logic, so
+    list values become choice variables and string values are rendered.
+    """
+    raw = json.loads(json.dumps(cookiecutter_config), object_pairs_hook=OrderedDict)
+    context: dict[str, Any] = {"cookiecutter": raw}
+    context["_cookiecutter"] = {k: v for k, v in raw.items() if not k.startswith("_")}
+    context["cookiecutter"].update(prompt_for_config(context, no_input=True))
+    if output_dir is not None:
+        context["cookiecutter"]["_output_dir"] = str(output_dir.absolute())
+    return context
+
+
+class _AccessRecorder(OrderedDict):
+    """Cookiecutter variables that record which keys a template reads.
+
+    Jinja resolves ``cookiecutter.name`` through ``__getitem__`` once the
+    attribute lookup fails, so reading individual keys is tracked precisely.
+    Anything that enumerates the variables marks the template as depending on
+    all of them.
+    """
+
+    def __init__(self, variables: dict[str, Any], accessed: set[str]) -> None:
+        self._accessed = accessed
+        super().__init__(variables)
+
+    def __getitem__(self, key: str) -> Any:
+        self._accessed.add(key)
+        return super().__getitem__(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        self._accessed.add(key)
+        return super().get(key, default)
+
+    def __contains__(self, key: object) -> bool:
+        self._accessed.add(str(key))
+        return super().__contains__(key)
+
+    def __iter__(self) -> Any:
+        self._accessed.add(ALL_VARIABLES)
+        return super().__iter__()
+
+    def keys(self) -> Any:
+        self._accessed.add(ALL_VARIABLES)
+        return super().keys()
+
+    def values(self) -> Any:
+        self._accessed.add(ALL_VARIABLES)
+        return super().values()
+
+    def items(self) -> Any:
+        self._accessed.add(ALL_VARIABLES)
+        return super().items()
+
+    def __len__(self) -> int:
+        self._accessed.add(ALL_VARIABLES)
+        return super().__len__()
+
+    def __repr__(self) -> str:
+        self._accessed.add(ALL_VARIABLES)
+        return repr(OrderedDict(super().items()))
+
+
+class RenderEngine:
+    """Renders a FilePlan into a project directory in a single pass.
+
+    Setting ``dependencies`` to an empty dict before rendering records, for
+    every plan entry, the cookiecutter variables its path and content read
+    (``ALL_VARIABLES`` when that cannot be determined).
+
+    Setting ``region_rewriter`` substitutes the region in generated files as
+    they are written.
+
+    Setting ``exclude_output`` leaves out every output whose project-relative
+    path, or the path of one of its parent directories, it matches, e.g. files
+    generation would delete afterwards; excluded output files are recorded in
+    ``excluded`` with their source.
+    """
+
+    def __init__(
+        self,
+        cookiecutter_config: dict[str, Any],
+        output_dir: pathlib.Path | None = None,
+    ) -> None:
+        self.cookiecutter_config = cookiecutter_config
+        self.context = build_render_context(cookiecutter_config, output_dir)
+        self.env = create_env_with_context(self.context)
+        self.env.bytecode_cache = get_bytecode_cache()
+        self.copy_without_render: list[str] = list(
+            self.context["cookiecutter"].get("_copy_without_render", [])
+        )
+        self.template_index = get_template_index(self.env)
+        # Sources of the resolved outputs that render to their own content
+        self.static_sources: set[pathlib.Path] = set()
+        self.dependencies: dict[str, set[str]] | None = None
+        self.region_rewriter: RegionRewriter | None = None
+        self.exclude_output: Callable[[str], bool] | None = None
+        self.excluded: dict[pathlib.Path, pathlib.Path] = {}
+
+    def is_copy_only_path(self, rel_path: str) -> bool:
+        """Check whether a project-relative path must be copied verbatim."""
+        native_path = os.path.normpath(rel_path)
+        return any(
+            fnmatch.fnmatch(native_path, pattern)
+            for pattern in self.copy_without_render
+        )
+
+    def render_path(self, rel_path: str, accessed: set[str] | None = None) -> str:
+        """Render Jinja placeholders in a project-relative path."""
+        if "{" not in rel_path:
+            return rel_path
+        return self.env.from_string(rel_path).render(**self._get_context(accessed))
+
+    def render_plan(
+        self,
+        plan: FilePlan,
+        project_dir: pathlib.Path,
+        max_workers: int | None = None,
+    ) -> int:
+        """Render every file of the plan into ``project_dir``.
+
+        Args:
+            plan: File plan to render
+            project_dir: Directory the project is generated into
+            max_workers: Size of the render/write worker pool, defaults to
+                ``ASP_RENDER_WORKERS`` (1 renders sequentially)
+
+        Returns:
+            Number of files written
+        """
+        outputs = self.resolve_outputs(plan, project_dir)
+        tasks = [
+            (rel_path, self.output_task(outfile, rel_path, src, copy_only))
+            for outfile, (rel_path, src, copy_only) in outputs.items()
+        ]
+        methods = collections.Counter(run_file_tasks(tasks, max_workers))
+        logging.debug(
+            f"Rendered {len(tasks)} files into {project_dir} ({dict(methods)})"
+        )
+        return len(tasks)
+
+    def render_sources(
+        self,
+        plan: FilePlan,
+        project_dir: pathlib.Path,
+        sources: Collection[pathlib.Path],
+        max_workers: int | None = None,
+    ) -> list[pathlib.Path]:
+        """Render again only the outputs of some source files of a plan.
+
+        Used to refresh a previously rendered project after templates changed
+        in place. Other outputs are left untouched and directories are not
+        created again.
+
+        Args:
+            plan: File plan the project was rendered from
+            project_dir: Directory the project was generated into
+            sources: Changed source files, as listed in the plan
+            max_workers: Size of the render/write worker pool
+
+        Returns:
+            The output files written, in write order
+        """
+        outputs = {
+            outfile: output
+            for outfile, output in self.resolve_outputs(
+                plan, project_dir, create_dirs=False
+            ).items()
+            if output[1] in sources
+        }
+        tasks = [
+            (rel_path, self.output_task(outfile, rel_path, src, copy_only))
+            for outfile, (rel_path, src, copy_only) in outputs.items()
+        ]
+        run_file_tasks(tasks, max_workers)
+        return list(outputs)
+
+    def resolve_outputs(
+        self, plan: FilePlan, project_dir: pathlib.Path, create_dirs: bool = True
+    ) -> dict[pathlib.Path, tuple[str, pathlib.Path, bool]]:
+        """Create the project directories and resolve every output file.
+
+        When several plan entries render to the same output the last one in
+        walk order wins, as with cookiecutter.
+
+        Args:
+            plan: File plan to resolve
+            project_dir: Directory the project is generated into
+            create_dirs: Whether to create the project directories, False
+                only resolves the plan (e.g. for a dry run)
+
+        Returns:
+            Mapping of output file to (plan path, source file, copy only),
+            in write order
+        """
+        self.env.loader = _PlanLoader(plan)
+        self.excluded = {}
+        if create_dirs:
+            project_dir.mkdir(parents=True, exist_ok=True)
+
+        copy_only_dirs = self._find_copy_only_dirs(plan)
+
+        for rel_dir in sorted(plan.directories):
+            copy_only_root = self._copy_only_root(rel_dir, copy_only_dirs)
+            if copy_only_root is None:
+                out_dir = self.render_path(rel_dir)
+            else:
+                out_dir = self.render_path(copy_only_root) + rel_dir.removeprefix(
+                    copy_only_root
+                )
+            if create_dirs and not self._is_excluded(out_dir):
+                (project_dir / out_dir).mkdir(parents=True, exist_ok=True)
+
+        outputs: dict[pathlib.Path, tuple[str, pathlib.Path, bool]] = {}
+        for rel_path in sorted(plan.files, key=_walk_order):
+            src = plan.files[rel_path]
+            accessed = self._get_accessed(rel_path)
+            copy_only_root = self._copy_only_root(rel_path, copy_only_dirs)
+            if copy_only_root is not None:
+                out_rel = self.render_path(
+                    copy_only_root, accessed
+                ) + rel_path.removeprefix(copy_only_root)
+                copy_only = True
+            else:
+                out_rel = self.render_path(rel_path, accessed)
+                copy_only = self.is_copy_only_path(rel_path)
+            outfile = project_dir / out_rel
+            if self._is_excluded(out_rel):
+                self.excluded[outfile] = src
+                continue
+            if not copy_only and outfile.is_dir():
+                logging.debug(f"The resulting file name is empty: {outfile}")
+                continue
+            outputs.pop(outfile, None)
+            outputs[outfile] = (rel_path, src, copy_only)
+        self.static_sources = self._find_static_sources(outputs)
+        return outputs
+
+    def output_task(
+        self, outfile: pathlib.Path, rel_path: str, src: pathlib.Path, copy_only: bool
+    ) -> Callable[[], str]:
+        """Return the task writing one resolved output file."""
+        if copy_only or src in self.static_sources:
+            return functools.partial(self._copy_output, src, outfile)
+        return functools.partial(self._render_file, rel_path, src, outfile)
+
+    def is_static(self, src: pathlib.Path) -> bool:
+        """Check whether a template renders to its own content."""
+        return self.template_index is not None and self.template_index.is_static(src)
+
+    def _find_static_sources(
+        self, outputs: dict[pathlib.Path, tuple[str, pathlib.Path, bool]]
+    ) -> set[pathlib.Path]:
+        if self.template_index is None:
+            return set()
+        static_sources = {
+            src
+            for rel_path, src, copy_only in outputs.values()
+            if not copy_only and self.is_static(src)
+        }
+        self.template_index.save()
+        return static_sources
+
+    def _is_excluded(self, out_rel: str) -> bool:
+        """Check whether an output or one of its parent directories is excluded."""
+        if self.exclude_output is None:
+            return False
+        path = pathlib.PurePosixPath(pathlib.PurePath(out_rel).as_posix())
+        return any(
+            self.exclude_output(str(excluded))
+            for excluded in (path, *path.parents[:-1])
+        )
+
+    def _find_copy_only_dirs(self, plan: FilePlan) -> list[str]:
+        """Find the topmost directories cookiecutter would copy without walking."""
+        copy_only_dirs: list[str] = []
+        for rel_dir in sorted(plan.directories):
+            if self._copy_only_root(rel_dir, copy_only_dirs) is not None:
+                continue
+            if self.is_copy_only_path(rel_dir):
+                copy_only_dirs.append(rel_dir)
+        return copy_only_dirs
+
+    @staticmethod
+    def _copy_only_root(rel_path: str, copy_only_dirs: list[str]) -> str | None:
+        for rel_dir in copy_only_dirs:
+            if rel_path == rel_dir or rel_path.startswith(f"{rel_dir}/"):
+                return rel_dir
+        return None
+
+    def _get_accessed(self, rel_path: str) -> set[str] | None:
+        if self.dependencies is None:
+            return None
+        return self.dependencies.setdefault(rel_path, set())
+
+    def _get_context(self, accessed: set[str] | None) -> dict[str, Any]:
+        if accessed is None:
+            return self.context
+        return {
+            **self.context,
+            "cookiecutter": _AccessRecorder(self.context["cookiecutter"], accessed),
+        }
+
+    @staticmethod
+    def copy_verbatim(src: pathlib.Path, dst: pathlib.Path) -> str:
+        """Copy a file into the project without rendering it."""
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        return copy_file(src, dst, preserve_stat=False)
+
+    def copy_rendered(self, src: pathlib.Path, dst: pathlib.Path) -> str:
+        """Copy a previously generated output file, e.g. from the render cache."""
+        return self.copy_verbatim(src, dst)
+
+    def write_output(self, data: bytes, mode: int, dst: pathlib.Path) -> str:
+        """Write previously generated content, e.g. from a scaffold bundle.
+
+        The content is written for the default region, so the region is
+        substituted if set.
+        """
+        method = UNPACKED
+        if self.region_rewriter is not None and is_region_file(dst):
+            content = self.region_rewriter.rewrite_bytes(data)
+            if content is not None:
+                data = content
+                method = REGION_REWRITTEN
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        dst.write_bytes(data)
+        os.chmod(dst, mode)
+        record_file(dst)
+        return method
+
+    def _copy_output(self, src: pathlib.Path, dst: pathlib.Path) -> str:
+        """Copy a file without rendering it, substituting the region if set."""
+        if self.region_rewriter is None or not is_region_file(dst):
+            return self.copy_verbatim(src, dst)
+        data = src.read_bytes()
+        content = self.region_rewriter.rewrite_bytes(data)
+        if content is None:
+            method = self.copy_verbatim(src, dst)
+        else:
+            self._write_region_file(src, dst, content)
+            method = REGION_REWRITTEN
+        return method
+
+    def render_file(
+        self, src: pathlib.Path, outfile: pathlib.Path, rel_path: str | None = None
+    ) -> str:
+        """Render a single file outside of a plan, e.g. a preserved base file.
+
+        The file follows the same rules as files of a plan: paths matching
+        ``_copy_without_render``, binary files and files without Jinja syntax
+        are copied verbatim and the newline style of the source is preserved.
+
+        Args:
+            src: Template file
+            outfile: File to write
+            rel_path: Project-relative path of the file, used for
+                ``_copy_without_render`` matching (defaults to its name)
+
+        Returns:
+            How the file was written
+        """
+        rel_path = rel_path or src.name
+        if (
+            self.is_copy_only_path(rel_path)
+            or self.is_static(src)
+            or is_binary(str(src))
+        ):
+            return self._copy_output(src, outfile)
+        template = template_from_string(
+            self.env, src.read_text(encoding="utf-8"), rel_path
+        )
+        return self._write_rendered(src, outfile, template.render(**self.context))
+
+    def _render_file(
+        self, rel_path: str, src: pathlib.Path, outfile: pathlib.Path
+    ) -> str:
+        """Render a single templated file, returning how it was written."""
+        if is_binary(str(src)):
+            return self._copy_output(src, outfile)
+
+        accessed = self._get_accessed(rel_path)
+        if accessed is not None and _UNTRACKED_CONTEXT_RE.search(
+            src.read_text(encoding="utf-8")
+        ):
+            accessed.add(ALL_VARIABLES)
+        rendered = self.env.get_template(rel_path).render(**self._get_context(accessed))
+        return self._write_rendered(src, outfile, rendered)
+
+    def _write_rendered(
+        self, src: pathlib.Path, outfile: pathlib.Path, rendered: str
+    ) -> str:
+        # Preserve the newline style of the source file, like cookiecutter does
+        with open(src, encoding="utf-8") as source_file:
+            source_file.readline()
+        newline = source_file.newlines
+        if isinstance(newline, tuple):
+            newline = newline[0]
+
+        if self.region_rewriter is not None and is_region_file(outfile):
+            content = encode_text(rendered, newline)
+            content = self.region_rewriter.rewrite_bytes(content) or content
+            self._write_region_file(src, outfile, content)
+            return RENDERED
+
+        outfile.parent.mkdir(parents=True, exist_ok=True)
+        with open(outfile, "w", encoding="utf-8", newline=newline) as out:
+            out.write(rendered)
+        shutil.copymode(src, outfile)
+        record_file(outfile)
+        return RENDERED
+
+    @staticmethod
+    def _write_region_file(
+        src: pathlib.Path, outfile: pathlib.Path, content: bytes
+    ) -> None:
+        outfile.parent.mkdir(parents=True, exist_ok=True)
+        outfile.write_bytes(content)
+        shutil.copymode(src, outfile)
+        record_file(outfile)
@@ -12,6 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
+import copy
+import functools
+import hashlib
 import json
 import logging
 import os
@@ -21,6 +25,7 @@ import shutil
 import subprocess
 import sys
 import tempfile
+from collections.abc import Callable
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Any
@@ -39,11 +44,38 @@ from rich.prompt import Confirm, IntPrompt, Prompt
 
 from agent_starter_pack.cli.utils.version import get_current_version
 
+from .bundles import render_from_bundle
 from .datastores import DATASTORES
+from .file_copy import (
+    COPY_STRATEGY_AUTO,
+    COPY_STRATEGY_LINK,
+    copy_file,
+    copytree,
+    log_copy_methods,
+)
+from .lock_store import get_lock_name, get_lock_store
+from .manifest import GenerationManifest, print_generation_manifest
+from .profiler import PhaseSequence
+from .region import (
+    DEFAULT_REGION,
+    RegionRewriter,
+    replace_region_in_files,
+)
 from .remote_template import (
     get_base_template_name,
     render_and_merge_makefiles,
 )
+from .render_cache import RenderCache, is_render_cache_enabled
+from .render_engine import (
+    COOKIECUTTER_ENGINE,
+    FilePlan,
+    RenderEngine,
+    get_render_engine_name,
+    get_static_copy_patterns,
+    notify_render,
+    run_file_tasks,
+)
+from .template_cache import with_bytecode_cache_extension
 
 # =============================================================================
 # Agent Name Aliases (Backwards Compatibility)
@@ -90,8 +122,11 @@ def resolve_agent_alias(name: str | None) -> str | None:
 # =============================================================================
 
 # Helper: exclude service.tf only for adk_live + agent_engine combination
-_exclude_adk_live_agent_engine = lambda c: not (
-    c.get("agent_name") == "adk_live" and c.get("deployment_target") == "agent_engine"
+_exclude_adk_live_agent_engine = lambda c: (
+    not (
+        c.get("agent_name") == "adk_live"
+        and c.get("deployment_target") == "agent_engine"
+    )
 )
 
 CONDITIONAL_FILES = {
@@ -167,6 +202,54 @@ def apply_conditional_files(
             logging.debug(f"Conditional file '{rel_path}' condition True, keeping")
 
 
+# Directories removed from prototype/minimal projects (cicd_runner == "skip")
+PROTOTYPE_EXCLUDED_PATHS = ("deployment", "tests/load_test", "notebooks")
+
+
+def is_excluded_output(
+    rel_path: str,
+    config: dict[str, Any],
+    agent_directory: str = "app",
+) -> bool:
+    """Check whether a generated path is removed by the post-generation cleanup.
+
+    Covers conditional files whose condition is False, ``unused_*`` paths and
+    the prototype mode directories, so the render engine can leave them out
+    of the project instead of writing and then deleting them.
+
+    Args:
+        rel_path: Project-relative POSIX path of a generated file or directory
+        config: Conditional file configuration, see apply_conditional_files
+        agent_directory: Name of the agent directory
+
+    Returns:
+        True if the path would be deleted after generation
+    """
+    parts = rel_path.split("/")
+    for i, part in enumerate(parts):
+        # The unused_* cleanup globs do not descend into hidden directories
+        if i and parts[i - 1].startswith("."):
+            break
+        if part.startswith("unused_"):
+            return True
+
+    for rel_path_template, condition_fn in CONDITIONAL_FILES.items():
+        conditional_path = rel_path_template.replace(
+            "{agent_directory}", agent_directory
+        )
+        if (
+            rel_path == conditional_path or rel_path.startswith(f"{conditional_path}/")
+        ) and not condition_fn(config):
+            return True
+
+    if config.get("cicd_runner") == "skip":
+        return any(
+            rel_path == excluded or rel_path.startswith(f"{excluded}/")
+            for excluded in PROTOTYPE_EXCLUDED_PATHS
+        )
+    return False
+
+
 def add_base_template_dependencies_interactively(
     project_path: pathlib.Path,
     base_dependencies: list[str],
@@ -362,6 +445,8 @@ def get_overwrite_folders(agent_directory: str) -> list[str]:
 
 
 TEMPLATE_CONFIG_FILE = "templateconfig.yaml"
+AGENT_CATALOG_FILE = "agent_catalog.json"
+AGENT_CATALOG_VERSION = 1
 DEPLOYMENT_TARGETS = ["cloud_run", "agent_engine"]
 SUPPORTED_LANGUAGES = ["python", "go"]
 DEFAULT_FRONTEND = "None"
@@ -400,7 +485,9 @@ def _validate_skill_metadata(
             logging.warning(msg)
             continue
 
-        non_string_idx = [idx for idx, item in enumerate(value) if not isinstance(item, str)]
+        non_string_idx = [
+            idx for idx, item in enumerate(value) if not isinstance(item, str)
+        ]
         if non_string_idx:
             msg = (
                 f"Malformed template metadata in {source}: '{field}' must contain only "
@@ -419,6 +506,151 @@ def _validate_skill_metadata(
             )
 
 
+def _get_agents_dir() -> pathlib.Path:
+    return pathlib.Path(__file__).parent.parent.parent / "agents"
+
+
+def get_agent_catalog_path() -> pathlib.Path:
+    """Get the path of the agent catalog index shipped with the package."""
+    return (
+        pathlib.Path(__file__).parent.parent.parent / "resources" / AGENT_CATALOG_FILE
+    )
+
+
+def _read_agent_template_config(config_path: pathlib.Path) -> dict[str, Any]:
+    """Parse and validate an agent's templateconfig.yaml."""
+    with open(config_path, encoding="utf-8") as f:
+        config = yaml.safe_load(f)
+    if not isinstance(config, dict):
+        raise ValueError("Template config must be a YAML mapping")
+    _validate_skill_metadata(config, source=str(config_path), strict=False)
+    return config
+
+
+def build_agent_catalog(agents_dir: pathlib.Path | None = None) -> dict[str, Any]:
+    """Build the agent catalog index from the agents' template configs.
+
+    Each entry stores the parsed config together with the size and hash of
+    the YAML file it was built from, so stale entries can be detected.
+
+    Args:
+        agents_dir: Agents directory, defaults to the package agents
+
+    Returns:
+        The catalog as a JSON-serializable dictionary
+    """
+    agents_dir = agents_dir or _get_agents_dir()
+    agents = {}
+    for agent_dir in sorted(agents_dir.iterdir()):
+        if not agent_dir.is_dir() or agent_dir.name.startswith("__"):
+            continue
+        config_path = agent_dir / ".template" / TEMPLATE_CONFIG_FILE
+        if not config_path.exists():
+            continue
+        content = config_path.read_bytes()
+        agents[agent_dir.name] = {
+            "size": len(content),
+            "sha256": hashlib.sha256(content).hexdigest(),
+            "config": _read_agent_template_config(config_path),
+        }
+    return {"version": AGENT_CATALOG_VERSION, "agents": agents}
+
+
+def write_agent_catalog(
+    catalog_path: pathlib.Path | None = None,
+    agents_dir: pathlib.Path | None = None,
+) -> pathlib.Path:
+    """Generate the agent catalog index file.
+
+    Args:
+        catalog_path: Output path, defaults to the packaged catalog
+        agents_dir: Agents directory, defaults to the package agents
+
+    Returns:
+        Path of the written catalog
+    """
+    catalog_path = catalog_path or get_agent_catalog_path()
+    catalog = build_agent_catalog(agents_dir)
+    catalog_path.write_text(
+        json.dumps(catalog, separators=(",", ":"), ensure_ascii=False) + "\n",
+        encoding="utf-8",
+    )
+    _load_agent_catalog.cache_clear()
+    return catalog_path
+
+
+@functools.cache
+def _load_agent_catalog(catalog_path: str) -> tuple[dict[str, Any], float] | None:
+    """Load the agent catalog entries and the catalog modification time."""
+    try:
+        mtime = os.stat(catalog_path).st_mtime
+        with open(catalog_path, encoding="utf-8") as f:
+            catalog = json.load(f)
+    except (OSError, ValueError) as e:
+        logging.debug(f"Agent catalog unavailable, parsing template configs: {e}")
+        return None
+    if catalog.get("version") != AGENT_CATALOG_VERSION:
+        return None
+    return catalog.get("agents", {}), mtime
+
+
+def load_agent_template_configs(
+    agents_dir: pathlib.Path | None = None, strict: bool = False
+) -> dict[str, dict[str, Any]]:
+    """Load the template config of every agent, using the catalog index.
+
+    Catalog entries are used when the agent's YAML file is unchanged: it must
+    have the recorded size and either be older than the catalog or match the
+    recorded content hash. Other agents (edited or new in a dev checkout) are
+    parsed live.
+
+    Args:
+        agents_dir: Agents directory, defaults to the package agents
+        strict: If True, raise on unreadable configs instead of skipping them
+
+    Returns:
+        Mapping of agent name to its template config
+    """
+    default_agents_dir = _get_agents_dir()
+    agents_dir = agents_dir or default_agents_dir
+
+    catalog = None
+    if agents_dir.resolve() == default_agents_dir.resolve():
+        catalog = _load_agent_catalog(str(get_agent_catalog_path()))
+    entries, catalog_mtime = catalog if catalog else ({}, 0.0)
+
+    configs = {}
+    for agent_dir in agents_dir.iterdir():
+        if not agent_dir.is_dir() or agent_dir.name.startswith("__"):
+            continue
+        config_path = agent_dir / ".template" / TEMPLATE_CONFIG_FILE
+        try:
+            stat = config_path.stat()
+        except FileNotFoundError:
+            continue
+
+        entry = entries.get(agent_dir.name)
+        if (
+            entry is not None
+            and entry["size"] == stat.st_size
+            and (
+                stat.st_mtime <= catalog_mtime
+                or hashlib.sha256(config_path.read_bytes()).hexdigest()
+                == entry["sha256"]
+            )
+        ):
+            configs[agent_dir.name] = copy.deepcopy(entry["config"])
+            continue
+
+        try:
+            configs[agent_dir.name] = _read_agent_template_config(config_path)
+        except Exception as e:
+            if strict:
+                raise
+            logging.warning(f"Could not load agent from {agent_dir}: {e}")
+    return configs
+
+
 def get_available_agents(deployment_target: str | None = None) -> dict:
     """Dynamically load available agents from the agents directory.
 
@@ -439,64 +671,50 @@ def get_available_agents(deployment_target: str | None = None) -> dict:
     }
 
     agents_list = []
-    agents_dir = pathlib.Path(__file__).parent.parent.parent / "agents"
 
-    for agent_dir in agents_dir.iterdir():
-        if agent_dir.is_dir() and not agent_dir.name.startswith("__"):
-            template_config_path = agent_dir / ".template" / "templateconfig.yaml"
-            if template_config_path.exists():
-                try:
-                    with open(template_config_path, encoding="utf-8") as f:
-                        config = yaml.safe_load(f)
-                    if not isinstance(config, dict):
-                        raise ValueError("Template config must be a YAML mapping")
-                    _validate_skill_metadata(
-                        config,
-                        source=str(template_config_path),
-                        strict=False,
-                    )
-                    agent_name = agent_dir.name
-                    settings = config.get("settings", {})
-
-                    # Skip if deployment target specified and agent doesn't support it
-                    if deployment_target:
-                        targets = settings.get("deployment_targets", [])
-                        if isinstance(targets, str):
-                            targets = [targets]
-                        if deployment_target not in targets:
-                            continue
-
-                    # Determine language (default to python)
-                    language = settings.get("language", "python")
-
-                    # Determine framework from tags
-                    tags = settings.get("tags", [])
-                    if "langgraph" in tags:
-                        framework = "langgraph"
-                    elif "adk" in tags:
-                        framework = "adk"
-                    else:
-                        framework = "other"
-
-                    description = config.get("description", "No description available")
-                    priority = PRIORITY_ORDER.get(agent_name, 100)
-
-                    agent_info = {
-                        "name": agent_name,
-                        "description": description,
-                        "language": language,
-                        "framework": framework,
-                        "skill_triggers": config.get("skill_triggers", []),
-                        "skill_workflow": config.get("skill_workflow", []),
-                        "skill_inputs": config.get("skill_inputs", []),
-                        "skill_outputs": config.get("skill_outputs", []),
-                        "skill_constraints": config.get("skill_constraints", []),
-                        "skill_references": config.get("skill_references", []),
-                        "priority": priority,
-                    }
-                    agents_list.append(agent_info)
-                except Exception as e:
-                    logging.warning(f"Could not load agent from {agent_dir}: {e}")
+    for agent_name, config in load_agent_template_configs().items():
+        try:
+            settings = config.get("settings", {})
+
+            # Skip if deployment target specified and agent doesn't support it
+            if deployment_target:
+                targets = settings.get("deployment_targets", [])
+                if isinstance(targets, str):
+                    targets = [targets]
+                if deployment_target not in targets:
+                    continue
+
+            # Determine language (default to python)
+            language = settings.get("language", "python")
+
+            # Determine framework from tags
+            tags = settings.get("tags", [])
+            if "langgraph" in tags:
+                framework = "langgraph"
+            elif "adk" in tags:
+                framework = "adk"
+            else:
+                framework = "other"
+
+            description = config.get("description", "No description available")
+            priority = PRIORITY_ORDER.get(agent_name, 100)
+
+            agent_info = {
+                "name": agent_name,
+                "description": description,
+                "language": language,
+                "framework": framework,
+                "skill_triggers": config.get("skill_triggers", []),
+                "skill_workflow": config.get("skill_workflow", []),
+                "skill_inputs": config.get("skill_inputs", []),
+                "skill_outputs": config.get("skill_outputs", []),
+                "skill_constraints": config.get("skill_constraints", []),
+                "skill_references": config.get("skill_references", []),
+                "priority": priority,
+            }
+            agents_list.append(agent_info)
+        except Exception as e:
+            logging.warning(f"Could not load agent {agent_name}: {e}")
 
     # Define group order: Python ADK, Python LangGraph, Go ADK, Other
     GROUP_ORDER = {
@@ -797,15 +1015,24 @@ def copy_data_ingestion_files(
         project_template: Path to the project template directory
         datastore_type: Type of datastore to use for data ingestion
     """
+    plan = FilePlan()
+    add_data_ingestion_files_to_plan(plan, datastore_type)
+    plan.stage(project_template)
+
+
+def add_data_ingestion_files_to_plan(plan: FilePlan, datastore_type: str) -> None:
+    """Add data processing files to the plan's data_ingestion directory.
+
+    Args:
+        plan: File plan to extend
+        datastore_type: Type of datastore to use for data ingestion
+    """
     data_ingestion_src = pathlib.Path(__file__).parent.parent.parent / "data_ingestion"
-    data_ingestion_dst = project_template / "data_ingestion"
 
     if data_ingestion_src.exists():
-        logging.debug(
-            f"Copying data processing files from {data_ingestion_src} to {data_ingestion_dst}"
-        )
+        logging.debug(f"Adding data processing files from {data_ingestion_src}")
 
-        copy_files(data_ingestion_src, data_ingestion_dst, overwrite=True)
+        add_files_to_plan(plan, data_ingestion_src, "data_ingestion")
 
         logging.debug(f"Data ingestion files prepared for datastore: {datastore_type}")
     else:
@@ -987,6 +1214,97 @@ app = App(root_agent=root_agent, name="{agent_directory}")
         )
 
 
+def _read_preserved_files(project_dir: pathlib.Path) -> list[tuple[str, str]]:
+    """Read README and pyproject.toml files of an existing project.
+
+    Args:
+        project_dir: Existing project directory that is about to be regenerated
+
+    Returns:
+        List of (file name, content) tuples to restore after generation
+    """
+    existing_preserved_files: list[tuple[str, str]] = []
+    if project_dir.exists():
+        for item in project_dir.iterdir():
+            if item.is_file() and (
+                item.name.lower().startswith("readme") or item.name == "pyproject.toml"
+            ):
+                existing_preserved_files.append((item.name, item.read_text()))
+    return existing_preserved_files
+
+
+def _pop_existing_preserved_files(
+    project_dir: pathlib.Path,
+) -> list[tuple[str, str]]:
+    """Read README and pyproject.toml files of an existing project, then remove it.
+
+    Args:
+        project_dir: Existing project directory that is about to be regenerated
+
+    Returns:
+        List of (file name, content) tuples to restore after generation
+    """
+    existing_preserved_files = _read_preserved_files(project_dir)
+    if project_dir.exists():
+        shutil.rmtree(project_dir)
+    return existing_preserved_files
+
+
+def _set_aside_existing_project(project_dir: pathlib.Path) -> pathlib.Path | None:
+    """Move an existing project out of the way of a project rendered in place.
+
+    The project is renamed to a hidden sibling directory, on the same file
+    system, so that it can be put back if generation fails.
+
+    Args:
+        project_dir: Existing project directory that is about to be regenerated
+
+    Returns:
+        The directory the project was moved to, or None if there was none
+    """
+    if not project_dir.exists():
+        return None
+    previous_dir = project_dir.with_name(f".{project_dir.name}.{os.getpid()}.previous")
+    if previous_dir.exists():
+        shutil.rmtree(previous_dir)
+    project_dir.rename(previous_dir)
+    return previous_dir
+
+
+def _finish_set_aside_project(
+    project_dir: pathlib.Path, previous_dir: pathlib.Path, succeeded: bool
+) -> None:
+    """Remove a project set aside, or put it back if generation failed."""
+    if succeeded:
+        shutil.rmtree(previous_dir, ignore_errors=True)
+        return
+    if project_dir.exists():
+        shutil.rmtree(project_dir)
+    previous_dir.rename(project_dir)
+    logging.debug(f"Generation failed, restored existing project {project_dir}")
+
+
+def _restore_preserved_files(
+    project_dir: pathlib.Path, preserved_files: list[tuple[str, str]]
+) -> list[pathlib.Path]:
+    """Restore preserved README and pyproject.toml files with a starter_pack prefix.
+
+    Returns:
+        The files written
+    """
+    restored = []
+    for file_name, file_content in preserved_files:
+        base_name = pathlib.Path(file_name).stem
+        extension = pathlib.Path(file_name).suffix
+        preserved_file_path = project_dir / f"starter_pack_{base_name}{extension}"
+        preserved_file_path.write_text(file_content)
+        restored.append(preserved_file_path)
+        logging.debug(
+            f"File preservation: existing {file_name} preserved as starter_pack_{base_name}{extension}"
+        )
+    return restored
+
+
 def process_template(
     agent_name: str,
     template_dir: pathlib.Path,
@@ -1005,6 +1323,9 @@ def process_template(
     remote_spec: Any | None = None,
     google_api_key: str | None = None,
     google_cloud_project: str | None = None,
+    no_cache: bool = False,
+    region: str = DEFAULT_REGION,
+    dry_run: bool = False,
 ) -> None:
     """Process the template directory and create a new project.
 
@@ -1025,6 +1346,10 @@ def process_template(
         agent_garden: Whether this deployment is from Agent Garden
         google_api_key: Optional Google AI Studio API key to generate .env file
         google_cloud_project: Optional GCP project ID to populate .env file
+        no_cache: Bypass the scaffold bundles and the rendered output cache
+            (``ASP_RENDER_CACHE=1``)
+        region: GCP region substituted for ``us-central1`` in generated files
+        dry_run: Print the files that would be generated without writing them
     """
     logging.debug(f"Processing template from {template_dir}")
     logging.debug(f"Project name: {project_name}")
@@ -1107,7 +1432,7 @@ def process_template(
     destination_dir = output_dir if output_dir else pathlib.Path.cwd()
 
     # Create output directory if it doesn't exist
-    if not destination_dir.exists():
+    if not dry_run and not destination_dir.exists():
         destination_dir.mkdir(parents=True)
 
     # Create a new temporary directory and use it as our working directory
@@ -1116,20 +1441,24 @@ def process_template(
 
         # Important: Store the original working directory
         original_dir = pathlib.Path.cwd()
+        phases = PhaseSequence()
+        # Existing project moved aside while rendering in place, and whether
+        # generation completed so it can be discarded
+        previous_project_dir: pathlib.Path | None = None
+        succeeded = False
 
         try:
             os.chdir(temp_path)  # Change to temp directory
+            phases.next("build plan")
 
             # Extract agent sample info for labeling when using agent garden with remote templates
             agent_sample_id, agent_sample_publisher = _extract_agent_garden_labels(
                 agent_garden, remote_spec, remote_template_path
             )
 
-            # Create the cookiecutter template structure
-            cookiecutter_template = temp_path / "template"
-            cookiecutter_template.mkdir(parents=True)
-            project_template = cookiecutter_template / "{{cookiecutter.project_name}}"
-            project_template.mkdir(parents=True)
+            # Build the layered file plan in memory; files are only written
+            # once the plan is rendered
+            plan = FilePlan()
 
             # Get agent directory and language from config early for use in file copying
             if remote_config:
@@ -1148,29 +1477,25 @@ def process_template(
             # 1. First copy shared base template files (language-agnostic)
             shared_base_path = base_templates_path / "_shared"
             if shared_base_path.exists():
-                copy_files(
+                add_files_to_plan(
+                    plan,
                     shared_base_path,
-                    project_template,
-                    agent_name,
-                    overwrite=True,
+                    agent_name=agent_name,
                     agent_directory=agent_directory,
                 )
-                logging.debug(
-                    f"1a. Copied shared base template from {shared_base_path}"
-                )
+                logging.debug(f"1a. Added shared base template from {shared_base_path}")
 
             # 1b. Copy language-specific base template files
             language_base_path = base_templates_path / language
             if language_base_path.exists():
-                copy_files(
+                add_files_to_plan(
+                    plan,
                     language_base_path,
-                    project_template,
-                    agent_name,
-                    overwrite=True,
+                    agent_name=agent_name,
                     agent_directory=agent_directory,
                 )
                 logging.debug(
-                    f"1b. Copied {language} base template from {language_base_path}"
+                    f"1b. Added {language} base template from {language_base_path}"
                 )
             else:
                 raise FileNotFoundError(
@@ -1188,15 +1513,14 @@ def process_template(
                     deployment_targets_path / deployment_target / "_shared"
                 )
                 if shared_deployment_path.exists():
-                    copy_files(
+                    add_files_to_plan(
+                        plan,
                         shared_deployment_path,
-                        project_template,
                         agent_name=agent_name,
-                        overwrite=True,
                         agent_directory=agent_directory,
                     )
                     logging.debug(
-                        f"2a. Copied shared deployment files from {shared_deployment_path}"
+                        f"2a. Added shared deployment files from {shared_deployment_path}"
                     )
 
                 # 2b. Copy language-specific deployment target files
@@ -1204,15 +1528,14 @@ def process_template(
                     deployment_targets_path / deployment_target / language
                 )
                 if language_deployment_path.exists():
-                    copy_files(
+                    add_files_to_plan(
+                        plan,
                         language_deployment_path,
-                        project_template,
                         agent_name=agent_name,
-                        overwrite=True,
                         agent_directory=agent_directory,
                     )
                     logging.debug(
-                        f"2b. Copied {language} deployment files from {language_deployment_path}"
+                        f"2b. Added {language} deployment files from {language_deployment_path}"
                     )
 
             # 3. Copy data ingestion files if needed
@@ -1220,7 +1543,7 @@ def process_template(
                 logging.debug(
                     f"3. Including data processing files with datastore: {datastore}"
                 )
-                copy_data_ingestion_files(project_template, datastore)
+                add_data_ingestion_files_to_plan(plan, datastore)
 
             # 4. Skip remote template files during cookiecutter processing
             # Remote files will be copied after cookiecutter to avoid Jinja conflicts
@@ -1256,7 +1579,7 @@ def process_template(
             frontend_type = template_config.get("settings", {}).get(
                 "frontend_type", DEFAULT_FRONTEND
             )
-            copy_frontend_files(frontend_type, project_template)
+            add_frontend_files_to_plan(plan, frontend_type)
             logging.debug(f"5. Processed frontend files for type: {frontend_type}")
 
             # 6. Copy agent-specific files to override base template (using final config)
@@ -1278,16 +1601,15 @@ def process_template(
                 logging.debug(
                     f"6. Source agent folder: {source_agent_folder}, exists: {source_agent_folder.exists()}"
                 )
-                target_agent_folder = project_template / agent_directory
                 if source_agent_folder.exists():
                     logging.debug(
-                        f"6. Copying agent folder {template_agent_directory} -> {agent_directory} with override"
+                        f"6. Adding agent folder {template_agent_directory} -> {agent_directory} with override"
                     )
-                    copy_files(
+                    add_files_to_plan(
+                        plan,
                         source_agent_folder,
-                        target_agent_folder,
-                        agent_name,
-                        overwrite=True,
+                        agent_directory,
+                        agent_name=agent_name,
                         agent_directory=agent_directory,
                     )
 
@@ -1295,14 +1617,13 @@ def process_template(
                 other_folders = ["frontend", "tests", "notebooks"]
                 for folder in other_folders:
                     agent_folder = agent_path / folder
-                    project_folder = project_template / folder
                     if agent_folder.exists():
-                        logging.debug(f"6. Copying {folder} folder with override")
-                        copy_files(
+                        logging.debug(f"6. Adding {folder} folder with override")
+                        add_files_to_plan(
+                            plan,
                             agent_folder,
-                            project_folder,
-                            agent_name,
-                            overwrite=True,
+                            folder,
+                            agent_name=agent_name,
                             agent_directory=agent_directory,
                         )
 
@@ -1311,7 +1632,7 @@ def process_template(
                 logging.debug(
                     f"Including data processing files with datastore: {datastore}"
                 )
-                copy_data_ingestion_files(project_template, datastore)
+                add_data_ingestion_files_to_plan(plan, datastore)
 
             # Create cookiecutter.json in the template root
             # Get settings from template config
@@ -1389,31 +1710,126 @@ def process_template(
                 ],
             }
 
-            with open(
-                cookiecutter_template / "cookiecutter.json", "w", encoding="utf-8"
-            ) as json_file:
-                json.dump(cookiecutter_config, json_file, indent=4)
-
-            logging.debug(f"Template structure created at {cookiecutter_template}")
-            logging.debug(
-                f"Directory contents: {list(cookiecutter_template.iterdir())}"
+            # Conditional file configuration, also used to leave files the
+            # cleanup below would delete out of the render
+            conditional_config = {
+                "agent_name": agent_name,
+                "deployment_target": deployment_target,
+                "cicd_runner": cicd_runner or "google_cloud_build",
+                "is_adk": "adk" in tags,
+                "is_adk_live": "adk_live" in tags,
+                "is_a2a": "a2a" in tags,
+            }
+            exclude_output = functools.partial(
+                is_excluded_output,
+                config=conditional_config,
+                agent_directory=cookiecutter_config["agent_directory"],
             )
 
-            # Process the template
-            cookiecutter(
-                str(cookiecutter_template),
-                no_input=True,
-                overwrite_if_exists=True,
-                extra_context={
-                    "project_name": project_name,
-                    "agent_name": agent_name,
-                },
-            )
+            if dry_run:
+                dry_run_engine = RenderEngine(cookiecutter_config, destination_dir)
+                dry_run_engine.exclude_output = exclude_output
+                project_dir = (
+                    destination_dir if in_folder else destination_dir / project_name
+                )
+                outputs = dry_run_engine.resolve_outputs(
+                    plan, project_dir, create_dirs=False
+                )
+                overlay = FilePlan()
+                if is_remote and remote_template_path:
+                    add_files_to_plan(
+                        overlay,
+                        remote_template_path,
+                        agent_name=agent_name,
+                        agent_directory=agent_directory,
+                    )
+                print_generation_manifest(
+                    GenerationManifest.from_outputs(
+                        outputs, project_dir, dry_run_engine.excluded, overlay
+                    ),
+                    console,
+                )
+                return
+
+            phases.next("render")
+            # Render the plan. The single-pass engine renders straight into the
+            # final project directory unless in-folder mode needs to merge the
+            # generated files with an existing directory.
+            use_cookiecutter = get_render_engine_name() == COOKIECUTTER_ENGINE
+            render_directly = not use_cookiecutter and not in_folder
+            use_render_cache = not no_cache and is_render_cache_enabled()
+
+            # Engine of the render, reused for single files rendered later
+            render_engine: RenderEngine | None = None
+            # Files written into the project after rendering, the only ones
+            # the region still has to be substituted in when rendered directly
+            written_files: list[pathlib.Path] = []
+
+            def render_plan(
+                engine: RenderEngine, plan: FilePlan, project_dir: pathlib.Path
+            ) -> None:
+                if no_cache or not render_from_bundle(engine, plan, project_dir):
+                    if use_render_cache:
+                        RenderCache().render(engine, plan, project_dir)
+                    else:
+                        engine.render_plan(plan, project_dir)
+                notify_render(engine, plan, project_dir)
+
+            existing_preserved_files: list[tuple[str, str]] = []
+
+            if use_cookiecutter:
+                cookiecutter_template = temp_path / "template"
+                # The staged template is only read by cookiecutter, so hardlinks
+                # are safe
+                plan.stage(
+                    cookiecutter_template / "{{cookiecutter.project_name}}",
+                    strategy=COPY_STRATEGY_LINK,
+                )
+
+                with open(
+                    cookiecutter_template / "cookiecutter.json", "w", encoding="utf-8"
+                ) as json_file:
+                    staged_config = with_bytecode_cache_extension(cookiecutter_config)
+                    staged_config["_copy_without_render"] = [
+                        *cookiecutter_config["_copy_without_render"],
+                        *get_static_copy_patterns(plan, cookiecutter_config),
+                    ]
+                    json.dump(staged_config, json_file, indent=4)
+
+                logging.debug(f"Template structure created at {cookiecutter_template}")
+
+                # Process the template
+                cookiecutter(
+                    str(cookiecutter_template),
+                    no_input=True,
+                    overwrite_if_exists=True,
+                    extra_context={
+                        "project_name": project_name,
+                        "agent_name": agent_name,
+                    },
+                )
+                generated_project_dir = temp_path / project_name
+            elif render_directly:
+                generated_project_dir = destination_dir / project_name
+                existing_preserved_files = _read_preserved_files(generated_project_dir)
+                previous_project_dir = _set_aside_existing_project(
+                    generated_project_dir
+                )
+                render_engine = RenderEngine(cookiecutter_config, destination_dir)
+                render_engine.exclude_output = exclude_output
+                if region != DEFAULT_REGION:
+                    render_engine.region_rewriter = RegionRewriter(region)
+                render_plan(render_engine, plan, generated_project_dir)
+            else:
+                generated_project_dir = temp_path / project_name
+                render_engine = RenderEngine(cookiecutter_config, temp_path)
+                render_engine.exclude_output = exclude_output
+                render_plan(render_engine, plan, generated_project_dir)
             logging.debug("Template processing completed successfully")
 
-            # Now overlay remote template files if present (after cookiecutter processing)
+            # Now overlay remote template files if present (after rendering)
             if is_remote and remote_template_path:
-                generated_project_dir = temp_path / project_name
+                phases.next("remote overlay")
                 logging.debug(
                     f"Copying remote template files from {remote_template_path} to {generated_project_dir}"
                 )
@@ -1460,6 +1876,7 @@ def process_template(
                             / f"starter_pack_{base_name}{extension}"
                         )
                         shutil.copy2(base_file, preserved_file)
+                        written_files.append(preserved_file)
                         logging.debug(
                             f"Preserved base template {preserve_file} as starter_pack_{base_name}{extension}"
                         )
@@ -1483,14 +1900,14 @@ def process_template(
                     logging.debug(
                         f"Flat structure detected: copying files to {agent_directory}/"
                     )
-                    copy_flat_structure_agent_files(
+                    written_files += copy_flat_structure_agent_files(
                         remote_template_path,
                         generated_project_dir,
                         agent_directory,
                     )
                 else:
                     # Standard structure: copy as-is
-                    copy_files(
+                    written_files += copy_files(
                         remote_template_path,
                         generated_project_dir,
                         agent_name=agent_name,
@@ -1517,10 +1934,10 @@ def process_template(
                         _inject_app_object_if_missing(
                             agent_py_path, agent_directory, console
                         )
+                    written_files.append(agent_py_path)
 
+            phases.next("copy to destination")
             # Move the generated project to the final destination
-            generated_project_dir = temp_path / project_name
-
             if in_folder:
                 # For in-folder mode, copy files directly to the destination directory
                 final_destination = destination_dir
@@ -1557,65 +1974,16 @@ def process_template(
                                 logging.debug(
                                     f"{item.name} conflict: preserving existing {item.name}, using base template {item.name} as starter_pack_{base_name}{extension}"
                                 )
-                                # Process the base template file through cookiecutter
+                                # Render the base template file with the
+                                # project's config and Jinja environment
                                 try:
-                                    import tempfile as tmp_module
-
-                                    with (
-                                        tmp_module.TemporaryDirectory() as temp_file_dir
-                                    ):
-                                        temp_file_path = pathlib.Path(temp_file_dir)
-
-                                        # Create a minimal cookiecutter structure for just the file
-                                        file_template_dir = (
-                                            temp_file_path / "file_template"
-                                        )
-                                        file_template_dir.mkdir()
-                                        file_project_dir = (
-                                            file_template_dir
-                                            / "{{cookiecutter.project_name}}"
-                                        )
-                                        file_project_dir.mkdir()
-
-                                        # Copy base file to template structure
-                                        shutil.copy2(
-                                            base_file, file_project_dir / item.name
-                                        )
-
-                                        # Create cookiecutter.json with same config as main template
-                                        with open(
-                                            file_template_dir / "cookiecutter.json",
-                                            "w",
-                                            encoding="utf-8",
-                                        ) as config_file:
-                                            json.dump(
-                                                cookiecutter_config,
-                                                config_file,
-                                                indent=4,
-                                            )
-
-                                        # Process the file template
-                                        cookiecutter(
-                                            str(file_template_dir),
-                                            no_input=True,
-                                            overwrite_if_exists=True,
-                                            output_dir=str(temp_file_path),
-                                            extra_context={
-                                                "project_name": project_name,
-                                                "agent_name": agent_name,
-                                            },
-                                        )
-
-                                        # Copy the processed file
-                                        processed_file = (
-                                            temp_file_path / project_name / item.name
+                                    if render_engine is None:
+                                        render_engine = RenderEngine(
+                                            cookiecutter_config, temp_path
                                         )
-                                        if processed_file.exists():
-                                            shutil.copy2(processed_file, dest_item)
-                                        else:
-                                            # Fallback to original behavior if processing fails
-                                            shutil.copy2(item, dest_item)
-
+                                    render_engine.render_file(
+                                        base_file, dest_item, item.name
+                                    )
                                 except Exception as e:
                                     logging.warning(
                                         f"Failed to process base template {item.name}: {e}. Using templated {item.name} instead."
@@ -1632,12 +2000,19 @@ def process_template(
                             if item.is_dir():
                                 if dest_item.exists():
                                     shutil.rmtree(dest_item)
-                                shutil.copytree(item, dest_item, dirs_exist_ok=True)
+                                copytree(item, dest_item, dirs_exist_ok=True)
                             else:
-                                shutil.copy2(item, dest_item)
+                                copy_file(item, dest_item)
                     logging.debug(
                         f"Project files successfully copied to {final_destination}"
                     )
+            elif render_directly:
+                # Standard mode, rendered in place: only restore preserved files
+                final_destination = generated_project_dir
+                written_files += _restore_preserved_files(
+                    final_destination, existing_preserved_files
+                )
+                logging.debug(f"Project successfully created at {final_destination}")
             else:
                 # Standard mode: create project subdirectory
                 final_destination = destination_dir / project_name
@@ -1647,33 +2022,18 @@ def process_template(
 
                 if generated_project_dir.exists():
                     # Check for existing README and pyproject.toml files before removing destination
-                    existing_preserved_files = []
-                    if final_destination.exists():
-                        for item in final_destination.iterdir():
-                            if item.is_file() and (
-                                item.name.lower().startswith("readme")
-                                or item.name == "pyproject.toml"
-                            ):
-                                existing_preserved_files.append(
-                                    (item.name, item.read_text())
-                                )
-                        shutil.rmtree(final_destination)
+                    existing_preserved_files = _pop_existing_preserved_files(
+                        final_destination
+                    )
 
-                    shutil.copytree(
+                    copytree(
                         generated_project_dir, final_destination, dirs_exist_ok=True
                     )
 
                     # Restore existing README and pyproject.toml files with starter_pack prefix
-                    for file_name, file_content in existing_preserved_files:
-                        base_name = pathlib.Path(file_name).stem
-                        extension = pathlib.Path(file_name).suffix
-                        preserved_file_path = (
-                            final_destination / f"starter_pack_{base_name}{extension}"
-                        )
-                        preserved_file_path.write_text(file_content)
-                        logging.debug(
-                            f"File preservation: existing {file_name} preserved as starter_pack_{base_name}{extension}"
-                        )
+                    _restore_preserved_files(
+                        final_destination, existing_preserved_files
+                    )
 
                     logging.debug(
                         f"Project successfully created at {final_destination}"
@@ -1688,6 +2048,7 @@ def process_template(
                     f"Final destination directory not found at {final_destination}"
                 )
 
+            phases.next("makefiles")
             # Render and merge Makefiles.
             # If it's a local template, remote_template_path will be None,
             # and only the base Makefile will be rendered.
@@ -1699,7 +2060,9 @@ def process_template(
                 cookiecutter_config=cookiecutter_config,
                 remote_template_path=remote_template_path,
             )
+            written_files.append(final_destination / "Makefile")
 
+            phases.next("cleanup")
             # Delete appropriate files based on ADK tag
             agent_directory = get_agent_directory(template_config, cli_overrides)
 
@@ -1718,14 +2081,6 @@ def process_template(
                     )
 
             # Apply conditional file logic (Windows-compatible replacement for Jinja2 filenames)
-            conditional_config = {
-                "agent_name": agent_name,
-                "deployment_target": deployment_target,
-                "cicd_runner": cicd_runner or "google_cloud_build",
-                "is_adk": "adk" in tags,
-                "is_adk_live": "adk_live" in tags,
-                "is_a2a": "a2a" in tags,
-            }
             apply_conditional_files(
                 final_destination, conditional_config, agent_directory
             )
@@ -1751,24 +2106,14 @@ def process_template(
 
             # Clean up additional files for prototype/minimal mode (cicd_runner == "skip")
             if cicd_runner == "skip":
-                # Remove deployment folder
-                deployment_dir = final_destination / "deployment"
-                if deployment_dir.exists():
-                    shutil.rmtree(deployment_dir)
-                    logging.debug(f"Prototype mode: deleted {deployment_dir}")
-
-                # Remove load_test folder
-                load_test_dir = final_destination / "tests" / "load_test"
-                if load_test_dir.exists():
-                    shutil.rmtree(load_test_dir)
-                    logging.debug(f"Prototype mode: deleted {load_test_dir}")
-
-                # Remove notebooks folder
-                notebooks_dir = final_destination / "notebooks"
-                if notebooks_dir.exists():
-                    shutil.rmtree(notebooks_dir)
-                    logging.debug(f"Prototype mode: deleted {notebooks_dir}")
-
+                # Remove deployment, load_test and notebooks folders
+                for excluded_path in PROTOTYPE_EXCLUDED_PATHS:
+                    excluded_dir = final_destination / excluded_path
+                    if excluded_dir.exists():
+                        shutil.rmtree(excluded_dir)
+                        logging.debug(f"Prototype mode: deleted {excluded_dir}")
+
+            phases.next("lock file")
             # Handle pyproject.toml and uv.lock files (Python only)
             if language == "python":
                 if is_remote and remote_template_path:
@@ -1777,46 +2122,23 @@ def process_template(
                     remote_uv_lock = remote_template_path / "uv.lock"
 
                     if remote_pyproject.exists():
-                        shutil.copy2(
+                        copy_file(
                             remote_pyproject, final_destination / "pyproject.toml"
                         )
+                        written_files.append(final_destination / "pyproject.toml")
                         logging.debug("Used pyproject.toml from remote template")
 
                     if remote_uv_lock.exists():
-                        shutil.copy2(remote_uv_lock, final_destination / "uv.lock")
+                        copy_file(remote_uv_lock, final_destination / "uv.lock")
+                        written_files.append(final_destination / "uv.lock")
                         logging.debug("Used uv.lock from remote template")
                 elif deployment_target:
-                    # For local templates, use the existing logic
-                    lock_path = (
-                        pathlib.Path(__file__).parent.parent.parent
-                        / "resources"
-                        / "locks"
-                        / f"uv-{agent_name}-{deployment_target}.lock"
-                    )
-                    logging.debug(f"Looking for lock file at: {lock_path}")
-                    logging.debug(f"Lock file exists: {lock_path.exists()}")
-                    if not lock_path.exists():
-                        raise FileNotFoundError(f"Lock file not found: {lock_path}")
-                    # Copy and rename to uv.lock in the project directory
-                    shutil.copy2(lock_path, final_destination / "uv.lock")
-                    logging.debug(
-                        f"Copied lock file from {lock_path} to {final_destination}/uv.lock"
-                    )
-
-                    # Replace cookiecutter project name with actual project name in lock file
+                    # For local templates, reconstruct the lock from the store
+                    lock_name = get_lock_name(agent_name, deployment_target)
                     lock_file_path = final_destination / "uv.lock"
-                    with open(lock_file_path, "r+", encoding="utf-8") as lock_file:
-                        content = lock_file.read()
-                        lock_file.seek(0)
-                        lock_file.write(
-                            content.replace(
-                                "{{cookiecutter.project_name}}", project_name
-                            )
-                        )
-                        lock_file.truncate()
-                    logging.debug(
-                        f"Updated project name in lock file at {lock_file_path}"
-                    )
+                    get_lock_store().write_lock(lock_name, lock_file_path, project_name)
+                    written_files.append(lock_file_path)
+                    logging.debug(f"Wrote lock file {lock_name} to {lock_file_path}")
 
             # Generate .env file for Google API Key if provided
             if google_api_key:
@@ -1829,6 +2151,7 @@ def process_template(
 GOOGLE_API_KEY={google_api_key}
 """
                     env_file_path.write_text(env_content)
+                    written_files.append(env_file_path)
                     logging.debug(f"Updated .env file at {env_file_path}")
                     console.print(
                         "📝 Updated [cyan].env[/cyan] file for Google AI Studio"
@@ -1840,19 +2163,35 @@ GOOGLE_API_KEY={google_api_key}
 GOOGLE_API_KEY={google_api_key}
 """
                     env_file_path.write_text(env_content)
+                    written_files.append(env_file_path)
                     logging.debug(f"Generated .env file at {env_file_path}")
                     console.print(
                         f"📝 Generated .env file at [cyan]{agent_directory}/.env[/cyan] "
                         "for Google AI Studio"
                     )
 
+            # Substitute the region in files not written by the render engine
+            if region != DEFAULT_REGION:
+                phases.next("region")
+                replace_region_in_files(
+                    final_destination,
+                    region,
+                    files=written_files if render_directly else None,
+                )
+            succeeded = True
+
         except Exception as e:
             logging.error(f"Failed to process template: {e!s}")
             raise
 
         finally:
+            phases.end()
             # Always restore the original working directory
             os.chdir(original_dir)
+            if previous_project_dir is not None:
+                _finish_set_aside_project(
+                    destination_dir / project_name, previous_project_dir, succeeded
+                )
 
 
 def should_exclude_path(
@@ -1869,13 +2208,59 @@ def should_exclude_path(
     return False
 
 
+def should_skip_template_path(
+    path: pathlib.Path, agent_name: str | None = None, agent_directory: str = "app"
+) -> bool:
+    """Determine if a template file/directory should be skipped when copying."""
+    if path.suffix in [".pyc"]:
+        return True
+    if "__pycache__" in str(path) or path.name == "__pycache__":
+        return True
+    if ".git" in path.parts:
+        return True
+    if agent_name is not None and should_exclude_path(
+        path, agent_name, agent_directory
+    ):
+        return True
+    if path.is_dir() and path.name == ".template":
+        return True
+    return False
+
+
+def add_files_to_plan(
+    plan: FilePlan,
+    src: pathlib.Path,
+    dest: str = "",
+    agent_name: str | None = None,
+    agent_directory: str = "app",
+) -> None:
+    """Add a template layer to a file plan, applying the copy_files exclusions.
+
+    Args:
+        plan: File plan to extend
+        src: Source file or directory
+        dest: Project-relative destination path ("" for the project root)
+        agent_name: Name of the agent (for agent-specific exclusions)
+        agent_directory: Name of the agent directory (for agent-specific exclusions)
+    """
+    plan.add_tree(
+        src,
+        dest,
+        should_skip=lambda path: should_skip_template_path(
+            path, agent_name, agent_directory
+        ),
+    )
+
+
 def copy_files(
     src: pathlib.Path,
     dst: pathlib.Path,
     agent_name: str | None = None,
     overwrite: bool = False,
     agent_directory: str = "app",
-) -> None:
+    max_workers: int | None = None,
+    strategy: str = COPY_STRATEGY_AUTO,
+) -> list[pathlib.Path]:
     """
     Copy files with configurable behavior for exclusions and overwrites.
 
@@ -1885,23 +2270,16 @@ def copy_files(
         agent_name: Name of the agent (for agent-specific exclusions)
         overwrite: Whether to overwrite existing files (True) or skip them (False)
         agent_directory: Name of the agent directory (for agent-specific exclusions)
+        max_workers: Size of the copy worker pool, defaults to ASP_RENDER_WORKERS
+        strategy: Copy strategy (reflink/hardlink/byte copy), see file_copy
+
+    Returns:
+        The files copied
     """
 
     def should_skip(path: pathlib.Path) -> bool:
         """Determine if a file/directory should be skipped during copying."""
-        if path.suffix in [".pyc"]:
-            return True
-        if "__pycache__" in str(path) or path.name == "__pycache__":
-            return True
-        if ".git" in path.parts:
-            return True
-        if agent_name is not None and should_exclude_path(
-            path, agent_name, agent_directory
-        ):
-            return True
-        if path.is_dir() and path.name == ".template":
-            return True
-        return False
+        return should_skip_template_path(path, agent_name, agent_directory)
 
     def log_windows_path_warning(path: pathlib.Path) -> None:
         """Log a warning if path exceeds Windows MAX_PATH limit."""
@@ -1912,7 +2290,19 @@ def copy_files(
                     f"Path length ({len(path_str)} chars) may exceed Windows limit. Try using a shorter output directory."
                 )
 
-    if src.is_dir():
+    def copy_one(item: pathlib.Path, d: pathlib.Path) -> str:
+        try:
+            # Ensure parent directory exists before copying
+            d.parent.mkdir(parents=True, exist_ok=True)
+            logging.debug(f"Copying file: {item} -> {d}")
+            return copy_file(item, d, strategy)
+        except OSError:
+            logging.error(f"Failed to copy: {item} -> {d}")
+            log_windows_path_warning(d)
+            raise
+
+    def collect(src: pathlib.Path, dst: pathlib.Path) -> None:
+        """Create directories and collect the file copies to perform."""
         if not dst.exists():
             try:
                 dst.mkdir(parents=True)
@@ -1928,36 +2318,30 @@ def copy_files(
 
             d = dst / item.name
             if item.is_dir():
-                copy_files(item, d, agent_name, overwrite, agent_directory)
+                collect(item, d)
+            elif overwrite or not d.exists():
+                copies.append((str(d), functools.partial(copy_one, item, d)))
             else:
-                if overwrite or not d.exists():
-                    try:
-                        # Ensure parent directory exists before copying
-                        d.parent.mkdir(parents=True, exist_ok=True)
-                        logging.debug(f"Copying file: {item} -> {d}")
-                        shutil.copy2(item, d)
-                    except OSError:
-                        logging.error(f"Failed to copy: {item} -> {d}")
-                        log_windows_path_warning(d)
-                        raise
-                else:
-                    logging.debug(f"Skipping existing file: {d}")
-    else:
-        if not should_skip(src):
-            if overwrite or not dst.exists():
-                try:
-                    # Ensure parent directory exists before copying
-                    dst.parent.mkdir(parents=True, exist_ok=True)
-                    logging.debug(f"Copying file: {src} -> {dst}")
-                    shutil.copy2(src, dst)
-                except OSError:
-                    logging.error(f"Failed to copy: {src} -> {dst}")
-                    log_windows_path_warning(dst)
-                    raise
+                logging.debug(f"Skipping existing file: {d}")
+
+    copies: list[tuple[str, Callable[[], str]]] = []
+    if src.is_dir():
+        collect(src, dst)
+    elif not should_skip(src) and (overwrite or not dst.exists()):
+        copies.append((str(dst), functools.partial(copy_one, src, dst)))
+    log_copy_methods(collections.Counter(run_file_tasks(copies, max_workers)), src, dst)
+    return [pathlib.Path(name) for name, _ in copies]
 
 
 def copy_frontend_files(frontend_type: str, project_template: pathlib.Path) -> None:
     """Copy files from the specified frontend folder directly to project root."""
+    plan = FilePlan()
+    add_frontend_files_to_plan(plan, frontend_type)
+    plan.stage(project_template)
+
+
+def add_frontend_files_to_plan(plan: FilePlan, frontend_type: str) -> None:
+    """Add files from the specified frontend folder to the plan's project root."""
     # Skip copying if frontend_type is "None" or empty
     if not frontend_type or frontend_type == "None":
         logging.debug("Frontend type is 'None' or empty, skipping frontend files")
@@ -1976,13 +2360,13 @@ def copy_frontend_files(frontend_type: str, project_template: pathlib.Path) -> N
     if frontends_path.exists():
         logging.debug(f"Copying frontend files from {frontends_path}")
         # Copy frontend files directly to project root instead of a nested frontend directory
-        copy_files(frontends_path, project_template, overwrite=True)
+        add_files_to_plan(plan, frontends_path)
     else:
         logging.warning(f"Frontend type directory not found: {frontends_path}")
         # Don't fall back to default if it's "None" - just skip
         if DEFAULT_FRONTEND != "None":
             logging.info(f"Falling back to default frontend: {DEFAULT_FRONTEND}")
-            copy_frontend_files(DEFAULT_FRONTEND, project_template)
+            add_frontend_files_to_plan(plan, DEFAULT_FRONTEND)
         else:
             logging.debug("No default frontend configured, skipping frontend files")
 
@@ -2021,7 +2405,8 @@ def copy_flat_structure_agent_files(
     src: pathlib.Path,
     dst: pathlib.Path,
     agent_directory: str,
-) -> None:
+    max_workers: int | None = None,
+) -> list[pathlib.Path]:
     """Copy agent files from a flat structure template to the agent directory.
 
     For flat structure templates, Python files (*.py) in the root are copied
@@ -2031,6 +2416,10 @@ def copy_flat_structure_agent_files(
         src: Source path (template root with flat structure)
         dst: Destination path (project root)
         agent_directory: Target agent directory name
+        max_workers: Size of the copy worker pool, defaults to ASP_RENDER_WORKERS
+
+    Returns:
+        The files copied
     """
     agent_dst = dst / agent_directory
     agent_dst.mkdir(parents=True, exist_ok=True)
@@ -2040,6 +2429,8 @@ def copy_flat_structure_agent_files(
     # Files to skip entirely
     skip_files = {"pyproject.toml", "uv.lock", "README.md", ".gitignore"}
 
+    file_copies: list[tuple[str, Callable[[], Any]]] = []
+    copied: list[pathlib.Path] = []
     for item in src.iterdir():
         if item.name.startswith(".") or item.name in skip_files:
             continue
@@ -2053,16 +2444,24 @@ def copy_flat_structure_agent_files(
                 logging.debug(
                     f"Flat structure: copying {item.name} -> {agent_directory}/{item.name}"
                 )
-                shutil.copy2(item, dest_file)
             else:
                 # Other files go to project root
                 dest_file = dst / item.name
                 logging.debug(f"Flat structure: copying {item.name} -> {item.name}")
-                shutil.copy2(item, dest_file)
+            file_copies.append(
+                (str(dest_file), functools.partial(copy_file, item, dest_file))
+            )
         elif item.is_dir():
             # Directories are copied to project root (preserving structure)
             dest_dir = dst / item.name
             logging.debug(f"Flat structure: copying directory {item.name}")
             if dest_dir.exists():
                 shutil.rmtree(dest_dir)
-            shutil.copytree(item, dest_dir)
+            copytree(item, dest_dir)
+            copied.extend(path for path in dest_dir.rglob("*") if path.is_file())
+
+    # Directory copies above may have replaced the agent directory
+    agent_dst.mkdir(parents=True, exist_ok=True)
+    run_file_tasks(file_copies, max_workers)
+    copied.extend(pathlib.Path(name) for name, _ in file_copies)
+    return copied
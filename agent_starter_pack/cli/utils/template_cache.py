@@ -0,0 +1,232 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Persistent cache of compiled Jinja templates.
+
+Parsing and compiling the larger templates (``fast_api_app.py``,
+``agent_engine_app.py``, the Makefile, ...) dominates rendering time. Compiled
+bytecode is stored on disk, keyed by the package version and the template
+content hash, so the compile cost is paid once per release instead of on
+every ``create``.
+"""
+
+import functools
+import hashlib
+import logging
+import os
+import pathlib
+import tempfile
+from importlib.metadata import PackageNotFoundError, version
+from typing import Any
+
+from jinja2 import Environment, Template
+from jinja2.bccache import Bucket, BytecodeCache
+from jinja2.ext import Extension
+
+from .cache import get_cache_dir, prune_cache_dir
+from .version import get_current_version
+
+# Set to "1" to disable the compiled template cache
+TEMPLATE_CACHE_DISABLE_ENV_VAR = "ASP_DISABLE_TEMPLATE_CACHE"
+
+# Maximum total size of the compiled template cache
+TEMPLATE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Import path of the extension that attaches the cache to cookiecutter's
+# environment (cookiecutter builds its own Environment from ``_extensions``)
+BYTECODE_CACHE_EXTENSION = (
+    "agent_starter_pack.cli.utils.template_cache.BytecodeCacheExtension"
+)
+
+_CACHE_SUFFIX = ".jinjabc"
+
+
+def get_jinja_version() -> str:
+    try:
+        return version("jinja2")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def _environment_fingerprint(environment: Environment) -> str:
+    """Describe the environment settings that affect compiled output."""
+    autoescape = environment.autoescape
+    return repr(
+        (
+            environment.block_start_string,
+            environment.block_end_string,
+            environment.variable_start_string,
+            environment.variable_end_string,
+            environment.comment_start_string,
+            environment.comment_end_string,
+            environment.line_statement_prefix,
+            environment.line_comment_prefix,
+            environment.trim_blocks,
+            environment.lstrip_blocks,
+            environment.newline_sequence,
+            environment.keep_trailing_newline,
+            environment.optimized,
+            environment.is_async,
+            environment.finalize is not None,
+            autoescape if isinstance(autoescape, bool) else "callable",
+            tuple(sorted(environment.extensions)),
+        )
+    )
+
+
+class TemplateBytecodeCache(BytecodeCache):
+    """Jinja bytecode cache keyed by package version and template content.
+
+    Entries are invalidated by any change to the package version, the Jinja
+    version, the environment settings, the template name or its source.
+    Recency is tracked through file modification times so that
+    ``prune`` can evict the least recently used entries.
+    """
+
+    def __init__(
+        self, directory: pathlib.Path, max_bytes: int = TEMPLATE_CACHE_MAX_BYTES
+    ) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._version_key = f"{get_current_version()}\0{get_jinja_version()}"
+
+    def get_content_key(
+        self,
+        environment: Environment,
+        name: str,
+        filename: str | None,
+        source: str,
+    ) -> str:
+        """Compute the cache key of a template."""
+        digest = hashlib.sha256()
+        for part in (
+            self._version_key,
+            _environment_fingerprint(environment),
+            name,
+            filename or "",
+        ):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        digest.update(source.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get_bucket(
+        self,
+        environment: Environment,
+        name: str,
+        filename: str | None,
+        source: str,
+    ) -> Bucket:
+        key = self.get_content_key(environment, name, filename, source)
+        bucket = Bucket(environment, key, key)
+        self.load_bytecode(bucket)
+        return bucket
+
+    def _get_cache_path(self, bucket: Bucket) -> pathlib.Path:
+        return self.directory / f"{bucket.key}{_CACHE_SUFFIX}"
+
+    def load_bytecode(self, bucket: Bucket) -> None:
+        path = self._get_cache_path(bucket)
+        try:
+            with path.open("rb") as f:
+                bucket.load_bytecode(f)
+        except OSError:
+            return
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def dump_bytecode(self, bucket: Bucket) -> None:
+        path = self._get_cache_path(bucket)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first so that concurrent runs never
+            # observe a partially written entry
+            with tempfile.NamedTemporaryFile(
+                dir=self.directory, suffix=".tmp", delete=False
+            ) as f:
+                bucket.write_bytecode(f)
+            os.replace(f.name, path)
+        except OSError as e:
+            logging.debug(f"Could not write template cache entry {path}: {e}")
+
+    def clear(self) -> None:
+        for path in self.directory.glob(f"*{_CACHE_SUFFIX}"):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def prune(self) -> int:
+        """Evict least recently used entries beyond the size cap."""
+        return prune_cache_dir(self.directory, self.max_bytes, f"*{_CACHE_SUFFIX}")
+
+
+@functools.cache
+def _get_bytecode_cache(directory: str) -> TemplateBytecodeCache:
+    bytecode_cache = TemplateBytecodeCache(pathlib.Path(directory))
+    bytecode_cache.prune()
+    return bytecode_cache
+
+
+def get_bytecode_cache() -> TemplateBytecodeCache | None:
+    """Return the shared compiled template cache, or None if disabled."""
+    if os.environ.get(TEMPLATE_CACHE_DISABLE_ENV_VAR) == "1":
+        return None
+    return _get_bytecode_cache(str(get_cache_dir("templates")))
+
+
+class BytecodeCacheExtension(Extension):
+    """Jinja extension that attaches the compiled template cache.
+
+    Cookiecutter creates its own environment, so listing this extension in
+    the template's ``_extensions`` is the only way to configure it.
+    """
+
+    def __init__(self, environment: Environment) -> None:
+        super().__init__(environment)
+        if environment.bytecode_cache is None:
+            environment.bytecode_cache = get_bytecode_cache()
+
+
+def with_bytecode_cache_extension(cookiecutter_config: dict[str, Any]) -> dict:
+    """Return a copy of a cookiecutter config that enables the template cache."""
+    extensions = list(cookiecutter_config.get("_extensions", []))
+    if BYTECODE_CACHE_EXTENSION not in extensions:
+        extensions.append(BYTECODE_CACHE_EXTENSION)
+    return {**cookiecutter_config, "_extensions": extensions}
+
+
+def template_from_string(
+    environment: Environment, source: str, name: str | None = None
+) -> Template:
+    """Load a template from source, reusing cached bytecode when available.
+
+    Drop-in replacement for ``Environment.from_string``, which always
+    compiles and bypasses the environment's bytecode cache.
+    """
+    bytecode_cache = environment.bytecode_cache
+    if bytecode_cache is None:
+        return environment.from_string(source)
+
+    bucket = bytecode_cache.get_bucket(environment, name or "", None, source)
+    code = bucket.code
+    if code is None:
+        code = environment.compile(source, name)
+        bucket.code = code
+        bytecode_cache.set_bucket(bucket)
+    return environment.template_class.from_code(
+        environment, code, environment.make_globals(None)
+    )
@@ -0,0 +1,182 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Index of template files without any Jinja syntax.
+
+Most files of a generated project (frontend sources, notebooks, lock files,
+...) contain no Jinja syntax, so rendering them only reproduces their content
+after parsing and compiling it. Such static files are copied verbatim instead.
+A file is static if it contains none of the environment's markers (``{{``,
+``{%``, ``{#`` and any line statement or comment prefix), is valid UTF-8 and
+uses a single newline style, which rendering would normalize; copying it then
+gives the same bytes as rendering.
+
+Classifying a file means reading it, so the classification of the templates
+shipped with the package is kept in an on-disk index keyed by path, size and
+modification time, and later runs only stat them.
+"""
+
+import functools
+import json
+import logging
+import os
+import pathlib
+import re
+import threading
+
+from jinja2 import Environment
+from jinja2.ext import Extension
+
+from .cache import get_cache_dir
+from .region import encode_text
+
+# Bump when the classification of files changes
+TEMPLATE_INDEX_VERSION = 1
+
+# Only files of the package are indexed; others (e.g. remote templates
+# cloned into a temporary directory) are classified on every run
+_PACKAGE_ROOT = pathlib.Path(__file__).resolve().parents[2]
+
+_NEWLINE_RE = re.compile(r"\r\n|\r|\n")
+
+
+def get_template_markers(environment: Environment) -> tuple[str, ...] | None:
+    """Return the markers a template needs to render differently from its source.
+
+    Returns:
+        The markers, or None if the environment may change any file, e.g.
+        through an extension preprocessing the source
+    """
+    if environment.newline_sequence != "\n" or not environment.keep_trailing_newline:
+        return None
+    for extension in environment.extensions.values():
+        if (
+            type(extension).preprocess is not Extension.preprocess
+            or type(extension).filter_stream is not Extension.filter_stream
+        ):
+            return None
+    return tuple(
+        marker
+        for marker in (
+            environment.block_start_string,
+            environment.variable_start_string,
+            environment.comment_start_string,
+            environment.line_statement_prefix,
+            environment.line_comment_prefix,
+        )
+        if marker
+    )
+
+
+def is_static_content(data: bytes, markers: tuple[str, ...]) -> bool:
+    """Check whether rendering a file's content would give it back unchanged."""
+    try:
+        text = data.decode("utf-8")
+    except UnicodeDecodeError:
+        return False
+    if any(marker in text for marker in markers):
+        return False
+    # Rendered files are written with the newline style of their first line
+    first_newline = _NEWLINE_RE.search(text)
+    if first_newline is None:
+        return True
+    return data == encode_text(_NEWLINE_RE.sub("\n", text), first_newline.group())
+
+
+class TemplateIndex:
+    """Classification of template files as static, keyed by path and stat."""
+
+    def __init__(
+        self, markers: tuple[str, ...], path: pathlib.Path | None = None
+    ) -> None:
+        self.markers = markers
+        self.path = path or get_cache_dir("template-index") / "index.json"
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._files = self._load()
+        self._transient: dict[str, tuple[int, int, bool]] = {}
+
+    def is_static(self, path: pathlib.Path) -> bool:
+        """Check whether a template file renders to its own content."""
+        stat = path.stat()
+        key = str(path)
+        entry = self._files.get(key) or self._transient.get(key)
+        if entry is not None and entry[:2] == (stat.st_size, stat.st_mtime_ns):
+            return entry[2]
+
+        static = is_static_content(path.read_bytes(), self.markers)
+        entry = (stat.st_size, stat.st_mtime_ns, static)
+        with self._lock:
+            if path.is_relative_to(_PACKAGE_ROOT):
+                self._files[key] = entry
+                self._dirty = True
+            else:
+                self._transient[key] = entry
+        return static
+
+    def save(self) -> None:
+        """Write the index if files were classified since it was loaded."""
+        with self._lock:
+            if not self._dirty:
+                return
+            files = {key: list(entry) for key, entry in self._files.items()}
+            self._dirty = False
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}")
+            tmp_path.write_text(
+                json.dumps(
+                    {
+                        "version": TEMPLATE_INDEX_VERSION,
+                        "markers": list(self.markers),
+                        "files": files,
+                    }
+                ),
+                encoding="utf-8",
+            )
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logging.debug(f"Could not write template index: {e}")
+
+    def _load(self) -> dict[str, tuple[int, int, bool]]:
+        try:
+            with self.path.open(encoding="utf-8") as f:
+                data = json.load(f)
+            if data["version"] == TEMPLATE_INDEX_VERSION and data["markers"] == list(
+                self.markers
+            ):
+                return {
+                    key: (int(size), int(mtime_ns), bool(static))
+                    for key, (size, mtime_ns, static) in data["files"].items()
+                }
+        except (OSError, ValueError, TypeError, KeyError):
+            pass
+        return {}
+
+
+@functools.cache
+def _get_template_index(markers: tuple[str, ...]) -> TemplateIndex:
+    return TemplateIndex(markers)
+
+
+def get_template_index(environment: Environment) -> TemplateIndex | None:
+    """Return the shared template index for an environment's syntax.
+
+    Returns:
+        The index, or None if no file can be copied without rendering
+    """
+    markers = get_template_markers(environment)
+    if markers is None:
+        return None
+    return _get_template_index(markers)
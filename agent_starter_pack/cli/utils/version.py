@@ -12,19 +12,40 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-"""Version checking utilities for the CLI."""
+"""Version checking utilities for the CLI.
 
+The update check never delays a command: the latest PyPI version is cached
+on disk for ``ASP_UPDATE_CHECK_TTL`` seconds, a stale cache is refreshed in a
+background thread, and the update message is printed when the command exits
+only if the version is known by then. ``ASP_NO_UPDATE_CHECK=1`` disables it.
+"""
+
+import json
 import logging
+import os
+import pathlib
+import threading
+import time
 from importlib.metadata import PackageNotFoundError, version
 
-import requests
 from packaging import version as pkg_version
 from rich.console import Console
 
+from .cache import get_cache_dir
+
 console = Console()
 
 PACKAGE_NAME = "agent-starter-pack"
 
+# Set to "1" to disable the update check
+NO_UPDATE_CHECK_ENV_VAR = "ASP_NO_UPDATE_CHECK"
+
+# Seconds a checked latest version is reused for
+UPDATE_CHECK_TTL_ENV_VAR = "ASP_UPDATE_CHECK_TTL"
+DEFAULT_UPDATE_CHECK_TTL = 24 * 60 * 60
+
+_UPDATE_CHECK_FILE = "update_check.json"
+
 
 def get_current_version() -> str:
     """Get the current installed version of the package."""
@@ -37,6 +58,9 @@ def get_current_version() -> str:
 
 def get_latest_version() -> str:
     """Get the latest version available on PyPI."""
+    # Imported here to keep requests out of the CLI startup path
+    import requests
+
     try:
         response = requests.get(f"https://pypi.org/pypi/{PACKAGE_NAME}/json", timeout=2)
         if response.status_code == 200:
@@ -60,28 +84,139 @@ def check_for_updates() -> tuple[bool, str, str]:
     return needs_update, current, latest
 
 
+def is_update_check_enabled() -> bool:
+    """Check whether the update check is enabled."""
+    return os.environ.get(NO_UPDATE_CHECK_ENV_VAR) != "1"
+
+
+def get_update_check_ttl() -> float:
+    """Return the configured lifetime of a cached update check, in seconds."""
+    value = os.environ.get(UPDATE_CHECK_TTL_ENV_VAR, "").strip()
+    if not value:
+        return DEFAULT_UPDATE_CHECK_TTL
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        logging.debug(f"Invalid {UPDATE_CHECK_TTL_ENV_VAR} value '{value}'")
+        return DEFAULT_UPDATE_CHECK_TTL
+
+
+class UpdateCheck:
+    """Latest version lookup that never blocks the caller.
+
+    ``start`` reads the cached result and, if it is missing or older than the
+    TTL, fetches the latest version in a daemon thread that refreshes the
+    cache. Failed lookups are cached too, so runners without network access
+    do not retry on every invocation.
+    """
+
+    def __init__(
+        self, cache_path: pathlib.Path | None = None, ttl: float | None = None
+    ) -> None:
+        self.cache_path = cache_path or get_cache_dir(_UPDATE_CHECK_FILE)
+        self.ttl = get_update_check_ttl() if ttl is None else ttl
+        self._latest: str | None = None
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Load the cached latest version, refreshing it in the background."""
+        cached = self._read_cache()
+        if cached is not None:
+            self._latest = cached
+            return
+        self._thread = threading.Thread(
+            target=self._refresh, name="asp-update-check", daemon=True
+        )
+        self._thread.start()
+
+    def latest_version(self) -> str | None:
+        """Return the latest version, or None if it is not known yet."""
+        if self._thread is not None and self._thread.is_alive():
+            return None
+        return self._latest
+
+    def display(self) -> None:
+        """Print the update message if a newer version is already known."""
+        latest = self.latest_version()
+        if latest is None:
+            return
+        try:
+            current = get_current_version()
+            if pkg_version.parse(latest) > pkg_version.parse(current):
+                print_update_message(current, latest)
+        except Exception as e:
+            logging.debug(f"Error checking for updates: {e}")
+
+    def _read_cache(self) -> str | None:
+        try:
+            with self.cache_path.open(encoding="utf-8") as f:
+                data = json.load(f)
+            if time.time() - float(data["checked_at"]) > self.ttl:
+                return None
+            return str(data["latest"])
+        except (OSError, ValueError, TypeError, KeyError):
+            return None
+
+    def _refresh(self) -> None:
+        latest = get_latest_version()
+        self._latest = latest
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_name(
+                f".{self.cache_path.name}.{os.getpid()}"
+            )
+            tmp_path.write_text(
+                json.dumps({"latest": latest, "checked_at": time.time()}),
+                encoding="utf-8",
+            )
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logging.debug(f"Could not write update check cache: {e}")
+
+
+def start_update_check() -> UpdateCheck | None:
+    """Start a background update check, unless disabled.
+
+    Returns:
+        The running check, whose ``display`` prints the update message
+    """
+    if not is_update_check_enabled():
+        return None
+    check = UpdateCheck()
+    check.start()
+    return check
+
+
+def print_update_message(current: str, latest: str) -> None:
+    """Print how to upgrade from the current to the latest version."""
+    console.print(
+        f"\n[yellow]⚠️  Update available: {current} → {latest}[/]",
+        highlight=False,
+    )
+    console.print(
+        f"[yellow]Run `pip install --upgrade {PACKAGE_NAME}` to update.",
+        highlight=False,
+    )
+    console.print(
+        f"[yellow]Or, if you used pipx: `pipx upgrade {PACKAGE_NAME}`",
+        highlight=False,
+    )
+    console.print(
+        f"[yellow]Or, if you used uv: `uv pip install --upgrade {PACKAGE_NAME}`",
+        highlight=False,
+    )
+
+
 def display_update_message() -> None:
-    """Check for updates and display a message if an update is available."""
+    """Check for updates and display a message if an update is available.
+
+    Unlike ``start_update_check`` this waits for the PyPI lookup.
+    """
     try:
         needs_update, current, latest = check_for_updates()
 
         if needs_update:
-            console.print(
-                f"\n[yellow]⚠️  Update available: {current} → {latest}[/]",
-                highlight=False,
-            )
-            console.print(
-                f"[yellow]Run `pip install --upgrade {PACKAGE_NAME}` to update.",
-                highlight=False,
-            )
-            console.print(
-                f"[yellow]Or, if you used pipx: `pipx upgrade {PACKAGE_NAME}`",
-                highlight=False,
-            )
-            console.print(
-                f"[yellow]Or, if you used uv: `uv pip install --upgrade {PACKAGE_NAME}`",
-                highlight=False,
-            )
+            print_update_message(current, latest)
     except Exception as e:
         # Don't let version checking errors affect the CLI
         logging.debug(f"Error checking for updates: {e}")
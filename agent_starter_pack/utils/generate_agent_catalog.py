@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Utility script to generate the agent catalog index shipped with the package."""
+
+import click
+
+from agent_starter_pack.cli.utils.template import write_agent_catalog
+
+
+@click.command()
+def main() -> None:
+    """Generate resources/agent_catalog.json from the agents' template configs."""
+    catalog_path = write_agent_catalog()
+    print(f"Generated {catalog_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Utility script to generate the scaffold bundles shipped with the package."""
+
+import os
+import pathlib
+import subprocess
+import sys
+import tempfile
+
+import click
+
+from agent_starter_pack.cli.utils.bundles import (
+    BUNDLE_BUILD_DIR_ENV_VAR,
+    ScaffoldBundles,
+    get_bundles_path,
+)
+from agent_starter_pack.cli.utils.template import load_agent_template_configs
+
+# Agents scaffolded often enough to ship prebuilt
+BUNDLED_AGENTS = ["adk", "adk_a2a", "adk_live", "agentic_rag", "langgraph"]
+
+
+def get_bundled_combinations() -> list[tuple[str, str]]:
+    """Get the agent and deployment target pairs to prebuild."""
+    configs = load_agent_template_configs()
+    combinations = []
+    for agent in BUNDLED_AGENTS:
+        targets = configs[agent].get("settings", {}).get("deployment_targets", [])
+        if isinstance(targets, str):
+            targets = [targets]
+        combinations.extend((agent, target) for target in targets)
+    return combinations
+
+
+@click.command()
+@click.option(
+    "--output",
+    type=click.Path(path_type=pathlib.Path),
+    default=None,
+    help="Archive to write (defaults to the one shipped with the package)",
+)
+def main(output: pathlib.Path | None) -> None:
+    """Generate resources/scaffold_bundles.zip for the common agents."""
+    output = output or get_bundles_path()
+    with tempfile.TemporaryDirectory() as tmp:
+        entries_dir = pathlib.Path(tmp) / "entries"
+        env = {**os.environ, BUNDLE_BUILD_DIR_ENV_VAR: str(entries_dir)}
+        for agent, target in get_bundled_combinations():
+            print(f"Rendering {agent} for {target}")
+            subprocess.run(
+                [
+                    sys.executable,
+                    "-m",
+                    "agent_starter_pack.cli.main",
+                    "create",
+                    "bundle-agent",
+                    "--agent",
+                    agent,
+                    "--deployment-target",
+                    target,
+                    "--output-dir",
+                    str(pathlib.Path(tmp) / f"{agent}-{target}"),
+                    "--auto-approve",
+                    "--skip-checks",
+                ],
+                env=env,
+                check=True,
+                stdout=subprocess.DEVNULL,
+            )
+        count = ScaffoldBundles.build(entries_dir, output)
+    print(f"Generated {output} with {count} bundles")
+
+
+if __name__ == "__main__":
+    main()
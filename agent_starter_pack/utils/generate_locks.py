@@ -13,9 +13,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-"""Utility script to generate lock files for all agent and deployment target combinations."""
+"""Utility script to generate lock files for all agent and deployment target combinations.
 
+The uv locks are written to the deduplicated lock store in resources/locks,
+with a hash of the pyproject.toml each was generated from. Only the locks whose
+pyproject.toml changed are generated again, in parallel.
+"""
+
+import concurrent.futures
+import hashlib
+import json
 import logging
+import os
 import pathlib
 import shutil
 import subprocess
@@ -24,28 +33,22 @@ import tempfile
 import click
 from jinja2 import StrictUndefined, Template
 
+from ..cli.utils.lock_store import (
+    PROJECT_NAME_PLACEHOLDER,
+    LockStore,
+    get_lock_store_path,
+)
+from ..cli.utils.matrix import create_projects
 from .lock_utils import get_agent_configs, get_lock_filename
 
 # Path to Go base template
 GO_BASE_TEMPLATE = pathlib.Path("agent_starter_pack/base_templates/go")
 
+# Explicitly use PyPI to ensure consistent lock files
+UV_LOCK_COMMAND = ["uv", "lock", "--default-index", "https://pypi.org/simple"]
 
-def ensure_lock_dir() -> pathlib.Path:
-    """Ensure the locks directory exists and is empty.
-
-    Returns:
-        Path to the locks directory
-    """
-    lock_dir = pathlib.Path("agent_starter_pack/resources/locks")
-
-    # Remove if exists
-    if lock_dir.exists():
-        shutil.rmtree(lock_dir)
-
-    # Create fresh directory
-    lock_dir.mkdir(parents=True)
-
-    return lock_dir
+# Default number of `uv lock` runs in parallel; they mostly wait on the network
+DEFAULT_JOBS = min(8, os.cpu_count() or 1)
 
 
 def generate_pyproject(
@@ -92,8 +95,21 @@ def generate_pyproject(
     return result
 
 
-def generate_lock_file(pyproject_content: str, output_path: pathlib.Path) -> None:
-    """Generate uv.lock file from pyproject content."""
+def get_lock_input_hash(pyproject_content: str) -> str:
+    """Hash everything a lock is generated from.
+
+    A lock whose hash is unchanged is kept as is; ``--force`` refreshes it
+    against newer package releases.
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps(UV_LOCK_COMMAND).encode())
+    digest.update(b"\0")
+    digest.update(pyproject_content.encode())
+    return digest.hexdigest()
+
+
+def generate_lock_file(pyproject_content: str) -> bytes:
+    """Generate uv.lock content from pyproject content."""
     with tempfile.TemporaryDirectory() as tmpdir:
         tmp_dir = pathlib.Path(tmpdir)
 
@@ -101,25 +117,42 @@ def generate_lock_file(pyproject_content: str, output_path: pathlib.Path) -> Non
         with open(tmp_dir / "pyproject.toml", "w", encoding="utf-8") as f:
             f.write(pyproject_content)
 
-        # Run uv pip compile to generate lock file
-        # Explicitly use PyPI to ensure consistent lock files
-        subprocess.run(
-            ["uv", "lock", "--default-index", "https://pypi.org/simple"],
-            cwd=tmp_dir,
-            check=True,
-        )
+        # Every run uses uv's default cache, which concurrent runs share
+        subprocess.run(UV_LOCK_COMMAND, cwd=tmp_dir, check=True, capture_output=True)
         # Replace locked-template with {{cookiecutter.project_name}} in generated lock file
-        lock_file_path = tmp_dir / "uv.lock"
-        with open(lock_file_path, "r+", encoding="utf-8") as f:
-            lock_content = f.read()
-            f.seek(0)
-            f.write(
-                lock_content.replace("locked-template", "{{cookiecutter.project_name}}")
-            )
-            f.truncate()
+        lock_content = (tmp_dir / "uv.lock").read_bytes()
+        return lock_content.replace(
+            b"locked-template", PROJECT_NAME_PLACEHOLDER.encode()
+        )
 
-        # Copy the generated lock file to output location
-        shutil.copy2(lock_file_path, output_path)
+
+def generate_lock_files(
+    pyprojects: dict[str, str], jobs: int
+) -> tuple[dict[str, bytes], dict[str, Exception]]:
+    """Run ``uv lock`` for every pyproject.toml, ``jobs`` at a time.
+
+    Returns:
+        The generated locks and the errors of the failed ones, by lock name
+    """
+    locks: dict[str, bytes] = {}
+    errors: dict[str, Exception] = {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = {
+            executor.submit(generate_lock_file, content): lock_name
+            for lock_name, content in pyprojects.items()
+        }
+        for future in concurrent.futures.as_completed(futures):
+            lock_name = futures[future]
+            try:
+                locks[lock_name] = future.result()
+            except (OSError, subprocess.CalledProcessError) as e:
+                errors[lock_name] = e
+                print(f"Failed to generate {lock_name}: {e}")
+                if isinstance(e, subprocess.CalledProcessError) and e.stderr:
+                    print(e.stderr.decode(errors="replace"))
+            else:
+                print(f"Generated {lock_name}")
+    return locks, errors
 
 
 def generate_go_lock_file() -> None:
@@ -142,18 +175,23 @@ def generate_go_lock_file() -> None:
         tmp_dir = pathlib.Path(tmpdir)
         project_name = "go-lock-gen"
 
-        # Generate a Go project using the CLI
-        subprocess.run(
+        # Generate a Go project in-process with the batch create API
+        (result,) = create_projects(
             [
-                "uv", "run", "agent-starter-pack", "create", project_name,
-                "-p", "-s", "-y",
-                "-a", "adk_go",
-                "-d", "cloud_run",
-                "--output-dir", str(tmp_dir),
+                {
+                    "project_name": project_name,
+                    "agent": "adk_go",
+                    "deployment_target": "cloud_run",
+                    "prototype": True,
+                    "skip_checks": True,
+                }
             ],
-            check=True,
-            capture_output=True,
+            output_dir=tmp_dir,
         )
+        if not result.ok:
+            raise RuntimeError(
+                f"Failed to generate Go project: {result.error}\n{result.output}"
+            )
 
         project_dir = tmp_dir / project_name
 
@@ -190,31 +228,75 @@ def generate_go_lock_file() -> None:
     default="agent_starter_pack/base_templates/python/pyproject.toml",
     help="Path to template pyproject.toml",
 )
-def main(template: pathlib.Path) -> None:
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=DEFAULT_JOBS,
+    show_default=True,
+    help="Number of `uv lock` runs in parallel",
+)
+@click.option(
+    "--force",
+    is_flag=True,
+    help="Regenerate every lock, even if its pyproject.toml did not change",
+)
+def main(template: pathlib.Path, jobs: int, force: bool) -> None:
     """Generate lock files for all agent and deployment target combinations."""
-    lock_dir = ensure_lock_dir()
     agent_configs = get_agent_configs()
-
-    # Generate Python lock files
+    store_path = get_lock_store_path()
+    try:
+        previous = LockStore.load(store_path)
+    except (OSError, ValueError, KeyError) as e:
+        logging.debug(f"Not reusing locks from {store_path}: {e}")
+        previous = LockStore.build({})
+
+    # Render the pyproject.toml of every Python lock
+    pyprojects = {}
     for agent_name, config in agent_configs.items():
         # Skip Go agents (they use go.sum, not uv.lock)
         if config.get("language") == "go":
             continue
-
         for target in config["deployment_targets"]:
-            print(f"Generating lock file for {agent_name} with {target}...")
-
-            # Generate pyproject content
-            content = generate_pyproject(
+            pyprojects[get_lock_filename(agent_name, target)] = generate_pyproject(
                 template,
                 deployment_target=target,
                 config=config,
             )
+    inputs = {
+        lock_name: get_lock_input_hash(content)
+        for lock_name, content in pyprojects.items()
+    }
 
-            # Generate lock file
-            output_path = lock_dir / get_lock_filename(agent_name, target)
-            generate_lock_file(content, output_path)
-            print(f"Generated {output_path}")
+    # Keep the locks whose input did not change
+    locks = {}
+    for lock_name, input_hash in inputs.items():
+        if not force and previous.inputs.get(lock_name) == input_hash:
+            locks[lock_name] = previous.read(lock_name)
+    stale = {name: pyprojects[name] for name in pyprojects if name not in locks}
+    print(f"{len(locks)} lock files up to date, generating {len(stale)}...")
+
+    generated, errors = generate_lock_files(stale, jobs)
+    locks.update(generated)
+    # Failed locks keep their previous content, still marked as outdated
+    for lock_name in errors:
+        if lock_name in previous.names:
+            locks[lock_name] = previous.read(lock_name)
+            inputs[lock_name] = previous.inputs.get(lock_name, "")
+        else:
+            del inputs[lock_name]
+
+    # Store the locks deduplicated in the lock store
+    store = LockStore.build(locks, inputs)
+    store.save(store_path)
+    print(
+        f"Generated {store_path} with {len(locks)} lock files "
+        f"({store.size} bytes of distinct entries)"
+    )
+    if errors:
+        raise click.ClickException(
+            f"Failed to generate {len(errors)} lock files: {', '.join(sorted(errors))}"
+        )
 
     # Generate Go lock file (go.sum)
     generate_go_lock_file()
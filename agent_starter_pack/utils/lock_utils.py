@@ -15,10 +15,10 @@
 """Utilities for managing uv lock files and dependencies."""
 
 import pathlib
-from pathlib import Path
 from typing import NamedTuple
 
-import yaml
+from agent_starter_pack.cli.utils.lock_store import get_lock_name
+from agent_starter_pack.cli.utils.template import load_agent_template_configs
 
 
 class AgentConfig(NamedTuple):
@@ -39,25 +39,12 @@ def get_agent_configs(
     Returns:
         Dictionary mapping agent names to their configuration
     """
-    agent_configs = {}
-
-    for agent_dir in agents_dir.iterdir():
-        if not agent_dir.is_dir():
-            continue
-
-        config_file = agent_dir / ".template" / "templateconfig.yaml"
-        if not config_file.exists():
-            continue
-
-        with open(config_file, encoding="utf-8") as f:
-            config = yaml.safe_load(f)
-
-        agent_name = agent_dir.name
-        settings = config.get("settings", {})
-
-        agent_configs[agent_name] = settings
-
-    return agent_configs
+    return {
+        agent_name: config.get("settings", {})
+        for agent_name, config in load_agent_template_configs(
+            agents_dir, strict=True
+        ).items()
+    }
 
 
 def get_lock_filename(agent_name: str, deployment_target: str) -> str:
@@ -68,12 +55,6 @@ def get_lock_filename(agent_name: str, deployment_target: str) -> str:
         deployment_target: Target deployment platform
 
     Returns:
-        Formatted lock filename
+        Formatted lock filename, the name of the lock in the lock store
     """
-    return f"uv-{agent_name}-{deployment_target}.lock"
-
-
-def get_lock_path(agent_name: str, deployment_target: str) -> Path:
-    """Get the path to the appropriate lock file."""
-    lock_filename = get_lock_filename(agent_name, deployment_target)
-    return Path("agent_starter_pack/resources/locks") / lock_filename
+    return get_lock_name(agent_name, deployment_target)
@@ -12,19 +12,70 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+"""Watch an agent's templates and keep a generated project up to date.
+
+By default the project is generated in-process and kept warm: when template
+files are edited in place, only the files generated from them are rendered
+again with the engine of the last build. Adding, removing or renaming
+templates, editing the agent's ``.template`` config or a Makefile regenerates
+the whole project, still in-process. ``--no-incremental`` regenerates the
+whole project with ``uv run`` on every change instead, e.g. to pick up changes
+to the CLI itself.
+
+Events are debounced: a burst of changes, e.g. a save touching several files
+or a branch switch, is rebuilt once after events stop arriving.
+"""
+
 import logging
+import os
 import pathlib
+import re
 import shutil
 import subprocess
+import threading
 import time
 
 import click
 from rich.console import Console
-from watchdog.events import FileSystemEventHandler
+from watchdog.events import FileSystemEvent, FileSystemEventHandler
 from watchdog.observers import Observer
 
+from agent_starter_pack.cli.commands.create import create
+from agent_starter_pack.cli.utils.render_engine import (
+    FilePlan,
+    RenderEngine,
+    render_listener,
+)
+
 console = Console()
 
+PACKAGE_DIR = pathlib.Path(__file__).parent.parent.resolve()
+
+# Directories projects are generated from
+TEMPLATE_DIRS = [
+    PACKAGE_DIR / "base_templates",
+    PACKAGE_DIR / "deployment_targets",
+    PACKAGE_DIR / "agents",
+    PACKAGE_DIR / "frontends",
+    PACKAGE_DIR / "data_ingestion",
+]
+
+# Seconds without new events before a batch of changes is rebuilt
+DEBOUNCE_SECONDS = 0.1
+
+# Generated files rewritten after rendering, see process_template
+POST_PROCESSED_OUTPUTS = {"Makefile"}
+
+# Events changing files; watchdog also reports files being opened and closed
+_CHANGE_EVENTS = {"created", "modified", "deleted", "moved"}
+
+# Swap, backup and lock files written by editors while saving
+_EDITOR_FILE_RE = re.compile(r"^\.#|^#.*#$|~$|\.sw[a-p]$|^4913$")
+
+
+def _is_ignored(path: pathlib.Path) -> bool:
+    return "__pycache__" in path.parts or bool(_EDITOR_FILE_RE.search(path.name))
+
 
 class TemplateHandler(FileSystemEventHandler):
     def __init__(
@@ -35,6 +86,8 @@ class TemplateHandler(FileSystemEventHandler):
         output_dir: str | None,
         region: str,
         extra_params: str | None = None,
+        incremental: bool = True,
+        debounce: float = DEBOUNCE_SECONDS,
     ):
         self.agent_name = agent_name
         self.project_name = project_name
@@ -42,31 +95,164 @@ class TemplateHandler(FileSystemEventHandler):
         self.output_dir = output_dir
         self.region = region
         self.extra_params = extra_params
-        self.last_rebuild = 0
-        self.rebuild_cooldown = 1  # Seconds to wait between rebuilds
+        self.incremental = incremental
+        self.debounce = debounce
+        self.template_dir = PACKAGE_DIR / "agents" / agent_name / ".template"
+
+        # Paths changed since the last rebuild, and those created or removed
+        self._changed: set[pathlib.Path] = set()
+        self._added_or_removed: set[pathlib.Path] = set()
+        self._timer: threading.Timer | None = None
+        self._lock = threading.Lock()
+        self._rebuild_lock = threading.Lock()
+
+        # Engine, plan and sources (by resolved path) of the last render
+        self._render: tuple[RenderEngine, FilePlan, pathlib.Path] | None = None
+        self._sources: dict[pathlib.Path, pathlib.Path] = {}
+
+    @property
+    def project_path(self) -> pathlib.Path:
+        return (
+            pathlib.Path(self.output_dir) / self.project_name
+            if self.output_dir
+            else pathlib.Path(self.project_name)
+        )
+
+    def on_any_event(self, event: FileSystemEvent) -> None:
+        if event.event_type not in _CHANGE_EVENTS:
+            return
+        if event.is_directory and event.event_type == "modified":
+            return
 
-    def on_modified(self, event):
-        if event.is_directory:
+        paths = [pathlib.Path(os.fsdecode(event.src_path))]
+        if event.event_type == "moved":
+            paths.append(pathlib.Path(os.fsdecode(event.dest_path)))
+        paths = [path for path in paths if not _is_ignored(path)]
+        if not paths:
             return
 
-        # Implement cooldown to prevent multiple rapid rebuilds
-        current_time = time.time()
-        if current_time - self.last_rebuild < self.rebuild_cooldown:
+        # Restart the countdown, so a burst of events is rebuilt once
+        with self._lock:
+            self._changed.update(paths)
+            if event.event_type != "modified":
+                self._added_or_removed.update(paths)
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.debounce, self._rebuild_changes)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _rebuild_changes(self) -> None:
+        with self._lock:
+            changed, self._changed = self._changed, set()
+            added_or_removed, self._added_or_removed = self._added_or_removed, set()
+            self._timer = None
+
+        # Changes made during a rebuild are rebuilt in the next batch
+        with self._rebuild_lock:
+            for path in sorted(changed):
+                console.print(f"Detected change in {path}")
+            if self.incremental:
+                self.update_template(changed, added_or_removed)
+            else:
+                self.rebuild_template()
+
+    def _on_render(
+        self, engine: RenderEngine, plan: FilePlan, project_dir: pathlib.Path
+    ) -> None:
+        # Projects rendered into a temporary directory first (e.g. with the
+        # cookiecutter engine) cannot be updated in place
+        if project_dir.resolve() != self.project_path.resolve():
             return
+        self._render = (engine, plan, project_dir)
+        self._sources = {src.resolve(): src for src in plan.files.values()}
+
+    def get_changed_sources(
+        self, changed: set[pathlib.Path], added_or_removed: set[pathlib.Path]
+    ) -> set[pathlib.Path] | None:
+        """Map changed paths to the plan sources to render again.
 
-        self.last_rebuild = current_time
+        Returns:
+            The changed sources, or None if the project must be regenerated
+        """
+        if self._render is None:
+            return None
+        _, plan, _ = self._render
+        layer_dirs = {src.parent for src in self._sources}
+        added_or_removed = {path.resolve() for path in added_or_removed}
 
-        console.print(f"Detected change in {event.src_path}")
-        self.rebuild_template()
+        sources = set()
+        for path in changed:
+            path = path.resolve()
+            if path.is_relative_to(self.template_dir):
+                return None
+            src = self._sources.get(path)
+            if src is not None:
+                if not src.is_file():
+                    return None
+                sources.add(src)
+            elif path in added_or_removed and any(
+                parent in layer_dirs for parent in (path, *path.parents)
+            ):
+                # A template added to (or removed from) a directory of the plan
+                return None
+
+        if any(
+            rel_path in POST_PROCESSED_OUTPUTS and src in sources
+            for rel_path, src in plan.files.items()
+        ):
+            return None
+        return sources
+
+    def update_template(
+        self, changed: set[pathlib.Path], added_or_removed: set[pathlib.Path]
+    ) -> None:
+        sources = self.get_changed_sources(changed, added_or_removed)
+        if sources is None:
+            self.rebuild_template()
+            return
+        if not sources:
+            console.print("No generated files affected", style="dim")
+            return
+
+        assert self._render is not None
+        engine, plan, project_dir = self._render
+        start = time.perf_counter()
+        try:
+            written = engine.render_sources(plan, project_dir, sources)
+        except Exception as e:
+            console.print(f"Error updating template: {e}", style="bold red")
+            return
+        elapsed = (time.perf_counter() - start) * 1000
+        for outfile in written:
+            console.print(f"  Updated {outfile.relative_to(project_dir)}")
+        console.print(f"✨ Template updated in {elapsed:.0f} ms!", style="bold green")
+
+    def get_create_args(self) -> list[str]:
+        args = [
+            str(self.project_name),
+            "--agent",
+            self.agent_name,
+            "--deployment-target",
+            self.deployment_target,
+            "--output-dir",
+            str(self.output_dir) if self.output_dir else ".",
+            "--auto-approve",
+            "--region",
+            self.region,
+        ]
+
+        # Add extra parameters if provided
+        if self.extra_params:
+            # Split comma-separated parameters and add them individually
+            for param in self.extra_params.split(","):
+                args.append(param.strip())
+        return args
 
     def rebuild_template(self):
         try:
             # Clean output directory
-            project_path = (
-                pathlib.Path(self.output_dir) / self.project_name
-                if self.output_dir
-                else pathlib.Path(self.project_name)
-            )
+            project_path = self.project_path
 
             # Check if the project directory exists and remove it
             if project_path.exists():
@@ -75,6 +261,23 @@ class TemplateHandler(FileSystemEventHandler):
                 )
                 shutil.rmtree(project_path)
 
+            if self.incremental:
+                # Generate in-process, keeping the render state for updates
+                args = self.get_create_args()
+                console.print(
+                    f"Creating in-process: {' '.join(args)}", style="bold blue"
+                )
+                self._render = None
+                start = time.perf_counter()
+                with render_listener(self._on_render):
+                    create.main(args, prog_name="create", standalone_mode=False)
+                elapsed = time.perf_counter() - start
+                console.print(
+                    f"✨ Template rebuilt successfully in {elapsed:.1f} s!",
+                    style="bold green",
+                )
+                return
+
             # Rebuild using the CLI tool with agent and deployment target
             cmd = [
                 "uv",
@@ -82,24 +285,9 @@ class TemplateHandler(FileSystemEventHandler):
                 "-m",
                 "agent_starter_pack.cli.main",
                 "create",
-                str(self.project_name),
-                "--agent",
-                self.agent_name,
-                "--deployment-target",
-                self.deployment_target,
-                "--output-dir",
-                str(self.output_dir) if self.output_dir else ".",
-                "--auto-approve",
-                "--region",
-                self.region,
+                *self.get_create_args(),
             ]
-            
-            # Add extra parameters if provided
-            if self.extra_params:
-                # Split comma-separated parameters and add them individually
-                for param in self.extra_params.split(','):
-                    cmd.append(param.strip())
-                
+
             console.print(f"Executing: {' '.join(cmd)}", style="bold blue")
             subprocess.run(cmd, check=True)
 
@@ -107,6 +295,11 @@ class TemplateHandler(FileSystemEventHandler):
 
         except subprocess.CalledProcessError as e:
             console.print(f"Error rebuilding template: {e}", style="bold red")
+        except SystemExit as e:
+            console.print(
+                f"Error rebuilding template: create exited with status {e.code}",
+                style="bold red",
+            )
         except Exception as e:
             console.print(f"Unexpected error: {e}", style="bold red")
 
@@ -125,6 +318,12 @@ class TemplateHandler(FileSystemEventHandler):
 @click.option("--debug", is_flag=True, help="Enable debug logging")
 @click.option("--region", default="us-central1", help="GCP region to use")
 @click.option("--extra-params", help="Additional parameters to pass to the create command")
+@click.option(
+    "--incremental/--no-incremental",
+    default=True,
+    help="Render only the files of changed templates in-process, or regenerate "
+    "the whole project with uv run on every change",
+)
 def watch(
     agent: str,
     project_name: str,
@@ -133,6 +332,7 @@ def watch(
     debug: bool,
     region: str,
     extra_params: str | None,
+    incremental: bool,
 ):
     """
     Watch a agent's template and automatically rebuild when changes are detected.
@@ -144,16 +344,11 @@ def watch(
         logging.basicConfig(level=logging.DEBUG)
 
     # Get directories to watch
-    root_dir = pathlib.Path(__file__).parent.parent.parent.resolve()
-    src_dir = root_dir / "src"
-    agents_dir = root_dir / "agents"
+    agents_dir = PACKAGE_DIR / "agents"
 
     if not agents_dir.exists():
         raise click.BadParameter(f"agents directory not found: {agents_dir}")
 
-    if not src_dir.exists():
-        raise click.BadParameter(f"Source directory not found: {src_dir}")
-
     # Create output directory if it doesn't exist
     if output_dir:
         output_path = pathlib.Path(output_dir)
@@ -162,10 +357,10 @@ def watch(
 
     console.print(f"Watching agent: {agent}")
     console.print(f"Deployment target: {deployment_target}")
-    console.print(f"Source directory: {src_dir}")
-    console.print(f"agents directory: {agents_dir}")
+    console.print(f"Template directories: {PACKAGE_DIR}")
     console.print(f"Project name: {project_name}")
     console.print(f"Region: {region}")
+    console.print(f"Mode: {'incremental' if incremental else 'full rebuild'}")
     if extra_params:
         console.print(f"Extra parameters: {extra_params}")
 
@@ -176,19 +371,21 @@ def watch(
         output_dir=output_dir,
         region=region,
         extra_params=extra_params,
+        incremental=incremental,
     )
 
+    # Trigger initial build
+    console.print("\n🏗️ Performing initial build...", style="bold blue")
+    event_handler.rebuild_template()
+
     observer = Observer()
-    # Watch both src and agents directories
-    observer.schedule(event_handler, str(src_dir), recursive=True)
-    observer.schedule(event_handler, str(agents_dir), recursive=True)
+    # Watch every directory projects are generated from
+    for template_dir in TEMPLATE_DIRS:
+        if template_dir.exists():
+            observer.schedule(event_handler, str(template_dir), recursive=True)
     observer.start()
 
     try:
-        # Trigger initial build
-        console.print("\n🏗️ Performing initial build...", style="bold blue")
-        event_handler.rebuild_template()
-
         console.print(
             "\n🔍 Watching for changes (Press Ctrl+C to stop)...", style="bold blue"
         )
@@ -0,0 +1,143 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import pathlib
+from collections.abc import Iterator
+from unittest.mock import patch
+
+import pytest
+
+from agent_starter_pack.cli.utils import template
+from agent_starter_pack.cli.utils.template import (
+    build_agent_catalog,
+    get_agent_catalog_path,
+    load_agent_template_configs,
+    write_agent_catalog,
+)
+
+AGENT_CONFIG = """description: "Test agent"
+settings:
+  deployment_targets: ["cloud_run"]
+  tags: ["adk"]
+"""
+
+
+def _write_agent(agents_dir: pathlib.Path, name: str, content: str) -> pathlib.Path:
+    config_path = agents_dir / name / ".template" / "templateconfig.yaml"
+    config_path.parent.mkdir(parents=True, exist_ok=True)
+    config_path.write_text(content, encoding="utf-8")
+    return config_path
+
+
+@pytest.fixture
+def agents_dir(tmp_path: pathlib.Path) -> Iterator[pathlib.Path]:
+    """Point the catalog at a temporary agents directory and catalog file."""
+    agents = tmp_path / "agents"
+    _write_agent(agents, "agent_a", AGENT_CONFIG)
+    _write_agent(agents, "agent_b", AGENT_CONFIG.replace("Test", "Other"))
+    catalog_path = tmp_path / "agent_catalog.json"
+    with (
+        patch.object(template, "_get_agents_dir", return_value=agents),
+        patch.object(template, "get_agent_catalog_path", return_value=catalog_path),
+    ):
+        write_agent_catalog(catalog_path, agents)
+        # Make the YAML files older than the catalog, as in a fresh install
+        for config_path in agents.glob("*/.template/templateconfig.yaml"):
+            os.utime(config_path, (1_600_000_000, 1_600_000_000))
+        yield agents
+
+
+def _no_yaml_parsing():
+    return patch.object(
+        template.yaml, "safe_load", side_effect=AssertionError("YAML parsed")
+    )
+
+
+class TestAgentCatalog:
+    """Tests for the precomputed agent catalog index."""
+
+    def test_packaged_catalog_is_up_to_date(self) -> None:
+        """Test that resources/agent_catalog.json matches the agents.
+
+        Run `make generate-agent-catalog` after editing a templateconfig.yaml.
+        """
+        with open(get_agent_catalog_path(), encoding="utf-8") as f:
+            assert json.load(f) == build_agent_catalog()
+
+    def test_catalog_hit_skips_yaml_parsing(self, agents_dir: pathlib.Path) -> None:
+        """Test that unchanged agents are served from the catalog."""
+        with _no_yaml_parsing():
+            configs = load_agent_template_configs()
+
+        assert configs["agent_a"]["description"] == "Test agent"
+        assert configs["agent_b"]["description"] == "Other agent"
+
+    def test_matching_hash_with_newer_mtime_uses_catalog(
+        self, agents_dir: pathlib.Path
+    ) -> None:
+        """Test that a touched but unchanged file is still served from the catalog."""
+        config_path = agents_dir / "agent_a" / ".template" / "templateconfig.yaml"
+        os.utime(config_path, None)
+
+        with _no_yaml_parsing():
+            configs = load_agent_template_configs()
+
+        assert configs["agent_a"]["description"] == "Test agent"
+
+    def test_edited_config_falls_back_to_live_parsing(
+        self, agents_dir: pathlib.Path
+    ) -> None:
+        """Test that stale entries are detected in dev checkouts."""
+        _write_agent(agents_dir, "agent_a", AGENT_CONFIG.replace("Test", "Edited"))
+        _write_agent(agents_dir, "agent_c", AGENT_CONFIG.replace("Test", "New"))
+
+        configs = load_agent_template_configs()
+
+        assert configs["agent_a"]["description"] == "Edited agent"
+        assert configs["agent_b"]["description"] == "Other agent"
+        assert configs["agent_c"]["description"] == "New agent"
+
+    def test_missing_catalog_falls_back_to_live_parsing(
+        self, agents_dir: pathlib.Path, tmp_path: pathlib.Path
+    ) -> None:
+        """Test that configs are parsed when no catalog is available."""
+        with patch.object(
+            template, "get_agent_catalog_path", return_value=tmp_path / "missing.json"
+        ):
+            configs = load_agent_template_configs()
+
+        assert set(configs) == {"agent_a", "agent_b"}
+
+    def test_returned_configs_are_copies(self, agents_dir: pathlib.Path) -> None:
+        """Test that callers cannot mutate the cached catalog."""
+        load_agent_template_configs()["agent_a"]["settings"]["tags"].append("x")
+
+        assert load_agent_template_configs()["agent_a"]["settings"]["tags"] == ["adk"]
+
+    def test_malformed_config(self, agents_dir: pathlib.Path) -> None:
+        """Test that malformed configs are skipped, or raised in strict mode."""
+        _write_agent(agents_dir, "broken", "- not\n- a mapping\n")
+
+        assert "broken" not in load_agent_template_configs()
+        with pytest.raises(ValueError, match="YAML mapping"):
+            load_agent_template_configs(strict=True)
+
+    def test_get_available_agents_uses_catalog(self, agents_dir: pathlib.Path) -> None:
+        """Test that the agent menu is built without parsing YAML."""
+        with _no_yaml_parsing():
+            agents = template.get_available_agents(deployment_target="cloud_run")
+
+        assert [agent["name"] for agent in agents.values()] == ["agent_a", "agent_b"]
@@ -0,0 +1,198 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pathlib
+import zipfile
+from collections.abc import Iterator
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from agent_starter_pack.cli.utils import bundles
+from agent_starter_pack.cli.utils.bundles import (
+    BUNDLE_BUILD_DIR_ENV_VAR,
+    NO_BUNDLES_ENV_VAR,
+    ScaffoldBundles,
+    render_from_bundle,
+)
+from agent_starter_pack.cli.utils.region import DEFAULT_REGION, RegionRewriter
+from agent_starter_pack.cli.utils.render_engine import FilePlan, RenderEngine
+
+
+def _write(path: pathlib.Path, content: str) -> pathlib.Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+    return path
+
+
+def _tree(root: pathlib.Path) -> dict[str, bytes]:
+    return {
+        p.relative_to(root).as_posix(): p.read_bytes()
+        for p in sorted(root.rglob("*"))
+        if p.is_file()
+    }
+
+
+def _config(project_name: str, **overrides: Any) -> dict[str, Any]:
+    return {
+        "project_name": project_name,
+        "generated_at": f"{project_name}-timestamp",
+        "google_cloud_project": f"{project_name}-project",
+        "agent_directory": "app",
+        "package_name": "{{ cookiecutter.project_name | replace('-', '_') }}",
+        "deployment_target": "cloud_run",
+        **overrides,
+    }
+
+
+def _engine(config: dict[str, Any], region: str = DEFAULT_REGION) -> RenderEngine:
+    engine = RenderEngine(config)
+    if region != DEFAULT_REGION:
+        engine.region_rewriter = RegionRewriter(region)
+    return engine
+
+
+@pytest.fixture(autouse=True)
+def clear_manifests() -> Iterator[None]:
+    bundles._load_manifest.cache_clear()
+    yield
+    bundles._load_manifest.cache_clear()
+
+
+@pytest.fixture
+def plan(tmp_path: pathlib.Path) -> FilePlan:
+    src = tmp_path / "src"
+    _write(src / "README.md", "# {{cookiecutter.project_name}}\n")
+    _write(src / "pyproject.toml", 'name = "{{cookiecutter.package_name}}"\n')
+    _write(src / "deploy.env", "PROJECT={{cookiecutter.google_cloud_project}}\n")
+    _write(src / "Dockerfile", "# target: {{cookiecutter.deployment_target}}\n")
+    _write(src / "terraform" / "vars.tf", 'region = "us-central1"\n')
+    _write(src / "{{cookiecutter.agent_directory}}" / "agent.py", "x = 1\n")
+    plan = FilePlan()
+    plan.add_tree(src)
+    return plan
+
+
+@pytest.fixture
+def archive(tmp_path: pathlib.Path, plan: FilePlan) -> pathlib.Path:
+    """Bundle archive with the render of the default config."""
+    entries_dir = tmp_path / "entries"
+    with patch.dict("os.environ", {BUNDLE_BUILD_DIR_ENV_VAR: str(entries_dir)}):
+        config = _config("bundle-agent")
+        assert render_from_bundle(
+            _engine(config), plan, tmp_path / "build" / "bundle-agent"
+        )
+    path = tmp_path / "bundles.zip"
+    assert ScaffoldBundles.build(entries_dir, path) == 1
+    return path
+
+
+class TestScaffoldBundles:
+    """Tests for rendering projects from prebuilt bundles."""
+
+    @pytest.mark.parametrize("region", [DEFAULT_REGION, "europe-west4"])
+    def test_hit_matches_full_render(
+        self, tmp_path: pathlib.Path, plan: FilePlan, archive: pathlib.Path, region: str
+    ) -> None:
+        """Test that a project with another name, project and region is identical."""
+        config = _config("my-agent")
+        out = tmp_path / "hit" / "my-agent"
+
+        assert ScaffoldBundles(archive).render(_engine(config, region), plan, out)
+
+        expected = tmp_path / "expected" / "my-agent"
+        _engine(config, region).render_plan(plan, expected)
+        assert _tree(out) == _tree(expected)
+        if region != DEFAULT_REGION:
+            assert _tree(out)["terraform/vars.tf"] == f'region = "{region}"\n'.encode()
+
+    def test_only_project_specific_files_rendered(
+        self, tmp_path: pathlib.Path, plan: FilePlan, archive: pathlib.Path
+    ) -> None:
+        """Test that files not reading project values are unpacked."""
+        engine = _engine(_config("my-agent"))
+        rendered = []
+        render_file = engine._render_file
+
+        def record_render(rel_path: str, *args: Any) -> str:
+            rendered.append(rel_path)
+            return render_file(rel_path, *args)
+
+        with patch.object(engine, "_render_file", side_effect=record_render):
+            assert ScaffoldBundles(archive).render(engine, plan, tmp_path / "out")
+
+        assert sorted(rendered) == ["README.md", "deploy.env", "pyproject.toml"]
+
+    def test_other_config_misses(
+        self, tmp_path: pathlib.Path, plan: FilePlan, archive: pathlib.Path
+    ) -> None:
+        """Test that any other option or template content is rendered in full."""
+        bundle = ScaffoldBundles(archive)
+        out = tmp_path / "out"
+
+        config = _config("my-agent", deployment_target="agent_engine")
+        assert not bundle.render(_engine(config), plan, out)
+        _write(plan.files["Dockerfile"], "# changed\n")
+        assert not bundle.render(_engine(_config("my-agent")), plan, out)
+        assert not out.exists()
+
+    def test_outdated_or_missing_archive_ignored(
+        self, tmp_path: pathlib.Path, plan: FilePlan, archive: pathlib.Path
+    ) -> None:
+        """Test that archives of another CLI version are never used."""
+        engine = _engine(_config("my-agent"))
+
+        with patch.object(bundles, "get_current_version", return_value="9.9.9"):
+            assert not ScaffoldBundles(archive).render(engine, plan, tmp_path / "a")
+        assert not ScaffoldBundles(tmp_path / "missing.zip").render(
+            engine, plan, tmp_path / "b"
+        )
+        (tmp_path / "corrupt.zip").write_bytes(b"not a zip")
+        assert not ScaffoldBundles(tmp_path / "corrupt.zip").render(
+            engine, plan, tmp_path / "c"
+        )
+
+    def test_contents_deduplicated(
+        self, tmp_path: pathlib.Path, plan: FilePlan
+    ) -> None:
+        """Test that identical files across bundles are stored once."""
+        entries_dir = tmp_path / "entries"
+        with patch.dict("os.environ", {BUNDLE_BUILD_DIR_ENV_VAR: str(entries_dir)}):
+            for target in ("cloud_run", "agent_engine"):
+                config = _config("bundle-agent", deployment_target=target)
+                render_from_bundle(_engine(config), plan, tmp_path / target)
+        path = tmp_path / "bundles.zip"
+
+        assert ScaffoldBundles.build(entries_dir, path) == 2
+        with zipfile.ZipFile(path) as archive:
+            blobs = [name for name in archive.namelist() if name.startswith("blobs/")]
+        # Two Dockerfiles and the unpacked files shared by both targets
+        assert len(blobs) == 4
+
+
+class TestRenderFromBundle:
+    """Tests for the bundle lookup used by ``create``."""
+
+    def test_disabled(
+        self, tmp_path: pathlib.Path, plan: FilePlan, archive: pathlib.Path
+    ) -> None:
+        """Test that ASP_NO_BUNDLES=1 renders every project in full."""
+        engine = _engine(_config("my-agent"))
+
+        with patch.object(bundles, "get_bundles_path", return_value=archive):
+            with patch.dict("os.environ", {NO_BUNDLES_ENV_VAR: "1"}):
+                assert not render_from_bundle(engine, plan, tmp_path / "a")
+            with patch.dict("os.environ", {NO_BUNDLES_ENV_VAR: ""}):
+                assert render_from_bundle(engine, plan, tmp_path / "b")
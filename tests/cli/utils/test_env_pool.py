@@ -0,0 +1,145 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import pathlib
+import subprocess
+from collections.abc import Iterator
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from agent_starter_pack.cli.utils import env_pool
+from agent_starter_pack.cli.utils.cache import CACHE_DIR_ENV_VAR
+from agent_starter_pack.cli.utils.env_pool import (
+    NO_ENV_POOL_ENV_VAR,
+    EnvironmentPool,
+    get_cli_command,
+)
+
+
+def _fake_uv(*args: str | pathlib.Path) -> subprocess.CompletedProcess:
+    """Create the files ``uv venv`` and ``uv pip install`` would."""
+    if args[0] == "venv":
+        env = pathlib.Path(args[-1])
+        (env / "bin").mkdir(parents=True)
+        (env / "bin" / "python").write_text("#!")
+    else:
+        env = pathlib.Path(args[args.index("--python") + 1])
+        EnvironmentPool.executable(env).write_text("#!")
+    return subprocess.CompletedProcess(args, 0)
+
+
+@pytest.fixture
+def uv(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[MagicMock]:
+    """Stand in for uv, with an isolated cache."""
+    monkeypatch.setenv(CACHE_DIR_ENV_VAR, str(tmp_path / "cache"))
+    monkeypatch.delenv(NO_ENV_POOL_ENV_VAR, raising=False)
+    with (
+        patch.object(env_pool.sys, "platform", "linux"),
+        patch.object(env_pool, "_run_uv", side_effect=_fake_uv) as mock_uv,
+    ):
+        yield mock_uv
+
+
+class TestEnvironmentPool:
+    """Tests for the pool of environments with pinned CLI versions."""
+
+    def test_environment_installed_once(
+        self, uv: MagicMock, tmp_path: pathlib.Path
+    ) -> None:
+        """Test that a version is installed on first use only."""
+        pool = EnvironmentPool(tmp_path / "envs")
+
+        first = pool.prepare("0.14.2")
+        second = pool.prepare("0.14.2")
+
+        env = tmp_path / "envs" / "0.14.2"
+        assert first == second == env / "bin" / "agent-starter-pack"
+        assert first.exists()
+        assert uv.call_count == 2
+        assert uv.call_args.args[-1] == "agent-starter-pack==0.14.2"
+
+    def test_interrupted_install_redone(
+        self, uv: MagicMock, tmp_path: pathlib.Path
+    ) -> None:
+        """Test that an environment without the ready marker is reinstalled."""
+        pool = EnvironmentPool(tmp_path / "envs")
+        (tmp_path / "envs" / "0.14.2" / "bin").mkdir(parents=True)
+
+        assert pool.prepare("0.14.2").exists()
+        assert uv.call_count == 2
+
+    def test_failed_install_removed(
+        self, uv: MagicMock, tmp_path: pathlib.Path
+    ) -> None:
+        """Test that a failed install leaves no environment behind."""
+
+        def fail_install(*args: str | pathlib.Path) -> subprocess.CompletedProcess:
+            if args[0] == "pip":
+                raise subprocess.CalledProcessError(1, "uv", stderr="No solution")
+            return _fake_uv(*args)
+
+        uv.side_effect = fail_install
+        pool = EnvironmentPool(tmp_path / "envs")
+
+        with pytest.raises(subprocess.CalledProcessError):
+            pool.prepare("9.9.9")
+        assert not (tmp_path / "envs" / "9.9.9").exists()
+
+    def test_least_recently_used_evicted(
+        self, uv: MagicMock, tmp_path: pathlib.Path
+    ) -> None:
+        """Test that old environments are evicted when a new one is installed."""
+        pool = EnvironmentPool(tmp_path / "envs")
+        pool.prepare("0.14.1")
+        os.utime(tmp_path / "envs" / "0.14.1", (0, 0))
+        pool.max_bytes = 0
+
+        pool.prepare("0.14.2")
+
+        assert not (tmp_path / "envs" / "0.14.1").exists()
+        assert (tmp_path / "envs" / "0.14.2").exists()
+
+
+class TestGetCliCommand:
+    """Tests for the command running a pinned CLI version."""
+
+    def test_prepared_environment(self, uv: MagicMock, tmp_path: pathlib.Path) -> None:
+        """Test that the executable of the prepared environment is run."""
+        (command,) = get_cli_command("0.14.2")
+
+        assert command == str(
+            tmp_path / "cache" / "envs" / "0.14.2" / "bin" / "agent-starter-pack"
+        )
+
+    def test_uvx_when_disabled(
+        self, uv: MagicMock, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that ASP_NO_ENV_POOL=1 runs the version with uvx."""
+        monkeypatch.setenv(NO_ENV_POOL_ENV_VAR, "1")
+
+        assert get_cli_command("0.14.2") == ["uvx", "agent-starter-pack@0.14.2"]
+        uv.assert_not_called()
+
+    def test_uvx_when_install_fails(self, uv: MagicMock) -> None:
+        """Test that uvx is used if the environment cannot be prepared."""
+        uv.side_effect = FileNotFoundError("uv")
+
+        assert get_cli_command("0.14.2") == ["uvx", "agent-starter-pack@0.14.2"]
+
+    def test_uvx_for_invalid_version(self, uv: MagicMock) -> None:
+        """Test that versions that are not valid are never used as paths."""
+        assert get_cli_command("../0.14.2") == ["uvx", "agent-starter-pack@../0.14.2"]
+        uv.assert_not_called()
@@ -0,0 +1,171 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import errno
+import os
+import pathlib
+import shutil
+from unittest.mock import patch
+
+import pytest
+
+from agent_starter_pack.cli.utils import file_copy
+from agent_starter_pack.cli.utils.file_copy import (
+    BYTE_COPY,
+    COPY_STRATEGY_AUTO,
+    COPY_STRATEGY_COPY,
+    COPY_STRATEGY_LINK,
+    HARDLINK,
+    REFLINK,
+    copy_file,
+    copytree,
+)
+
+
+@pytest.fixture
+def source(tmp_path: pathlib.Path) -> pathlib.Path:
+    path = tmp_path / "src" / "uv.lock"
+    path.parent.mkdir()
+    path.write_text("lock content\n", encoding="utf-8")
+    path.chmod(0o640)
+    os.utime(path, (1_600_000_000, 1_600_000_000))
+    return path
+
+
+@pytest.fixture
+def no_reflink():
+    """Simulate a filesystem without reflink support."""
+    with patch.object(file_copy, "_try_reflink", return_value=False):
+        yield
+
+
+class TestCopyFile:
+    """Tests for copy strategy selection."""
+
+    def test_byte_copy_preserves_metadata(
+        self, tmp_path: pathlib.Path, source: pathlib.Path
+    ) -> None:
+        """Test that a byte copy behaves like shutil.copy2."""
+        dst = tmp_path / "dst.lock"
+
+        method = copy_file(source, dst, COPY_STRATEGY_COPY)
+
+        assert method == BYTE_COPY
+        assert dst.read_text(encoding="utf-8") == "lock content\n"
+        assert dst.stat().st_mtime == source.stat().st_mtime
+        assert dst.stat().st_mode == source.stat().st_mode
+        assert not os.path.samefile(source, dst)
+
+    def test_preserve_stat_false_copies_mode_only(
+        self, tmp_path: pathlib.Path, source: pathlib.Path
+    ) -> None:
+        """Test that only permission bits are copied when requested."""
+        dst = tmp_path / "dst.lock"
+
+        copy_file(source, dst, COPY_STRATEGY_COPY, preserve_stat=False)
+
+        assert dst.stat().st_mode == source.stat().st_mode
+        assert dst.stat().st_mtime != source.stat().st_mtime
+
+    def test_auto_never_hardlinks(
+        self, tmp_path: pathlib.Path, source: pathlib.Path, no_reflink: None
+    ) -> None:
+        """Test that the default strategy falls back to a byte copy."""
+        dst = tmp_path / "dst.lock"
+
+        assert copy_file(source, dst, COPY_STRATEGY_AUTO) == BYTE_COPY
+        assert not os.path.samefile(source, dst)
+
+    def test_link_strategy_hardlinks(
+        self, tmp_path: pathlib.Path, source: pathlib.Path, no_reflink: None
+    ) -> None:
+        """Test that the link strategy hardlinks when reflinks are unavailable."""
+        dst = tmp_path / "dst.lock"
+        dst.write_text("stale", encoding="utf-8")
+
+        assert copy_file(source, dst, COPY_STRATEGY_LINK) == HARDLINK
+        assert os.path.samefile(source, dst)
+
+    def test_link_strategy_falls_back_to_byte_copy(
+        self, tmp_path: pathlib.Path, source: pathlib.Path, no_reflink: None
+    ) -> None:
+        """Test the byte copy fallback when hardlinks fail (e.g. across devices)."""
+        dst = tmp_path / "dst.lock"
+
+        with patch.object(file_copy.os, "link", side_effect=OSError(errno.EXDEV, "")):
+            assert copy_file(source, dst, COPY_STRATEGY_LINK) == BYTE_COPY
+        assert dst.read_text(encoding="utf-8") == "lock content\n"
+
+    def test_reflink_used_when_supported(
+        self, tmp_path: pathlib.Path, source: pathlib.Path
+    ) -> None:
+        """Test that a successful clone is reported as a reflink."""
+        dst = tmp_path / "dst.lock"
+
+        def fake_clone(dst_fd: int, request: int, src_fd: int) -> None:
+            os.write(dst_fd, os.pread(src_fd, 1024, 0))
+
+        with (
+            patch.object(file_copy, "fcntl") as mock_fcntl,
+            patch.object(file_copy, "_reflink_unsupported", set()),
+        ):
+            mock_fcntl.ioctl.side_effect = fake_clone
+            assert copy_file(source, dst, COPY_STRATEGY_LINK) == REFLINK
+
+        assert dst.read_text(encoding="utf-8") == "lock content\n"
+        assert dst.stat().st_mtime == source.stat().st_mtime
+
+    def test_unsupported_reflink_is_remembered(
+        self, tmp_path: pathlib.Path, source: pathlib.Path
+    ) -> None:
+        """Test that reflinks are not retried on an unsupported filesystem."""
+        with (
+            patch.object(file_copy, "fcntl") as mock_fcntl,
+            patch.object(file_copy, "_reflink_unsupported", set()),
+        ):
+            mock_fcntl.ioctl.side_effect = OSError(errno.EOPNOTSUPP, "")
+            for i in range(3):
+                assert copy_file(source, tmp_path / f"dst_{i}") == BYTE_COPY
+
+        assert mock_fcntl.ioctl.call_count == 1
+        assert (tmp_path / "dst_2").read_text(encoding="utf-8") == "lock content\n"
+
+    def test_same_file_raises(self, source: pathlib.Path) -> None:
+        """Test that copying a file onto itself never truncates it."""
+        with pytest.raises(shutil.SameFileError):
+            copy_file(source, source)
+        assert source.read_text(encoding="utf-8") == "lock content\n"
+
+    def test_unknown_strategy(
+        self, tmp_path: pathlib.Path, source: pathlib.Path
+    ) -> None:
+        """Test that an unknown strategy is rejected."""
+        with pytest.raises(ValueError, match="Unknown copy strategy"):
+            copy_file(source, tmp_path / "dst", "symlink")
+
+
+class TestCopytree:
+    """Tests for strategy-aware tree copies."""
+
+    def test_reports_methods(
+        self, tmp_path: pathlib.Path, source: pathlib.Path, no_reflink: None
+    ) -> None:
+        """Test that copytree reports the method used for every file."""
+        (source.parent / "nested").mkdir()
+        (source.parent / "nested" / "a.txt").write_text("a", encoding="utf-8")
+
+        methods = copytree(source.parent, tmp_path / "copy", COPY_STRATEGY_LINK)
+
+        assert methods == {HARDLINK: 2}
+        assert (tmp_path / "copy" / "nested" / "a.txt").read_text() == "a"
@@ -0,0 +1,221 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import pathlib
+import subprocess
+
+import pytest
+
+from agent_starter_pack.cli.utils.cache import lock_file
+from agent_starter_pack.cli.utils.git_cache import (
+    GitMirrorCache,
+    resolve_remote_ref,
+    run_git,
+)
+
+
+def _commit(repo: pathlib.Path, name: str, content: str) -> str:
+    (repo / name).write_text(content)
+    run_git("-C", repo, "add", name)
+    run_git(
+        "-C",
+        repo,
+        "-c",
+        "user.name=test",
+        "-c",
+        "user.email=test@example.com",
+        "commit",
+        "--quiet",
+        "-m",
+        f"Add {name}",
+    )
+    return run_git("-C", repo, "rev-parse", "HEAD").stdout.strip()
+
+
+@pytest.fixture
+def origin(tmp_path: pathlib.Path) -> pathlib.Path:
+    """A local repository with a main branch and a tag."""
+    repo = tmp_path / "origin"
+    repo.mkdir()
+    run_git("init", "--quiet", "--initial-branch", "main", repo)
+    _commit(repo, "README.md", "v1")
+    run_git("-C", repo, "tag", "v1.0")
+    _commit(repo, "README.md", "v2")
+    return repo
+
+
+class TestResolveRemoteRef:
+    """Tests for resolving remote refs without fetching."""
+
+    def test_branches_and_tags(self, origin: pathlib.Path) -> None:
+        """Test that branches and lightweight and annotated tags resolve."""
+        head = run_git("-C", origin, "rev-parse", "HEAD").stdout.strip()
+        tagged = run_git("-C", origin, "rev-parse", "v1.0").stdout.strip()
+        run_git(
+            "-C",
+            origin,
+            "-c",
+            "user.name=test",
+            "-c",
+            "user.email=test@example.com",
+            "tag",
+            "--annotate",
+            "--message",
+            "v2",
+            "v2.0",
+        )
+        url = origin.as_uri()
+
+        assert resolve_remote_ref(url, "main") == head
+        assert resolve_remote_ref(url, "v1.0") == tagged
+        assert resolve_remote_ref(url, "v2.0") == head
+        assert resolve_remote_ref(url, tagged) == tagged
+        with pytest.raises(LookupError):
+            resolve_remote_ref(url, "missing")
+
+
+class TestGitMirrorCache:
+    """Tests for the local mirror cache of remote template repositories."""
+
+    def test_checkout_branch_and_tag(
+        self, origin: pathlib.Path, tmp_path: pathlib.Path
+    ) -> None:
+        """Test that branches and tags are checked out from one mirror."""
+        cache = GitMirrorCache(tmp_path / "cache")
+        url = origin.as_uri()
+
+        cache.checkout(url, "main", tmp_path / "main")
+        cache.checkout(url, "v1.0", tmp_path / "tag")
+
+        assert (tmp_path / "main" / "README.md").read_text() == "v2"
+        assert (tmp_path / "tag" / "README.md").read_text() == "v1"
+        assert [p.name for p in (tmp_path / "cache").glob("*.git")] == [
+            cache.mirror_path(url).name
+        ]
+
+    def test_fetch_is_incremental(
+        self, origin: pathlib.Path, tmp_path: pathlib.Path
+    ) -> None:
+        """Test that new commits of a ref are fetched into the same mirror."""
+        cache = GitMirrorCache(tmp_path / "cache")
+        url = origin.as_uri()
+        first = cache.checkout(url, "main", tmp_path / "first")
+
+        latest = _commit(origin, "README.md", "v3")
+        second = cache.checkout(url, "main", tmp_path / "second")
+
+        assert first != second == latest
+        assert (tmp_path / "second" / "README.md").read_text() == "v3"
+
+    def test_known_commit_skips_fetch(
+        self, origin: pathlib.Path, tmp_path: pathlib.Path
+    ) -> None:
+        """Test that a commit already in the mirror is used offline."""
+        cache = GitMirrorCache(tmp_path / "cache")
+        commit = cache.checkout(origin.as_uri(), "main", tmp_path / "first")
+        # Point the mirror at a repository that no longer exists
+        origin.rename(tmp_path / "moved")
+
+        assert cache.checkout(origin.as_uri(), commit, tmp_path / "second") == commit
+        assert (tmp_path / "second" / "README.md").read_text() == "v2"
+
+    def test_sparse_checkout(
+        self, origin: pathlib.Path, tmp_path: pathlib.Path
+    ) -> None:
+        """Test that only the template directory and top-level files are fetched."""
+        run_git("-C", origin, "config", "uploadpack.allowFilter", "true")
+        for name in ("a", "b"):
+            (origin / "agents" / name).mkdir(parents=True)
+            _commit(origin, f"agents/{name}/pyproject.toml", name)
+        blob = run_git("-C", origin, "rev-parse", "HEAD:agents/b/pyproject.toml")
+        cache = GitMirrorCache(tmp_path / "cache")
+        dest = tmp_path / "dest"
+
+        cache.checkout(origin.as_uri(), "main", dest, sparse_path="agents/a")
+
+        assert (dest / "agents" / "a" / "pyproject.toml").read_text() == "a"
+        assert (dest / "README.md").exists()
+        assert not (dest / "agents" / "b").exists()
+        # The contents of other directories were never downloaded
+        mirror = cache.mirror_path(origin.as_uri())
+        objects = run_git(
+            "-C", mirror, "rev-list", "--objects", "--missing=print", "--all"
+        )
+        assert f"?{blob.stdout.strip()}" in objects.stdout.splitlines()
+
+    def test_list_and_read_files(
+        self, origin: pathlib.Path, tmp_path: pathlib.Path
+    ) -> None:
+        """Test that files are listed and read without fetching other contents."""
+        run_git("-C", origin, "config", "uploadpack.allowFilter", "true")
+        for name in ("a", "b"):
+            (origin / "agents" / name).mkdir(parents=True)
+            _commit(origin, f"agents/{name}/pyproject.toml", name)
+            _commit(origin, f"agents/{name}/agent.py", f"# {name}")
+        head = run_git("-C", origin, "rev-parse", "HEAD").stdout.strip()
+        cache = GitMirrorCache(tmp_path / "cache")
+        url = origin.as_uri()
+
+        commit, files = cache.list_files(url, "main", "agents")
+        contents = cache.read_files(
+            url, commit, ["agents/a/pyproject.toml", "agents/b/pyproject.toml"]
+        )
+
+        assert commit == head
+        assert sorted(files) == [
+            "agents/a/agent.py",
+            "agents/a/pyproject.toml",
+            "agents/b/agent.py",
+            "agents/b/pyproject.toml",
+        ]
+        assert contents == {
+            "agents/a/pyproject.toml": b"a",
+            "agents/b/pyproject.toml": b"b",
+        }
+        # Only the files read were downloaded
+        mirror = cache.mirror_path(url)
+        objects = run_git(
+            "-C", mirror, "rev-list", "--objects", "--missing=print", "--all"
+        ).stdout.splitlines()
+        assert f"?{files['agents/a/agent.py']}" in objects
+        assert f"?{files['agents/a/pyproject.toml']}" not in objects
+
+    def test_missing_ref_raises(
+        self, origin: pathlib.Path, tmp_path: pathlib.Path
+    ) -> None:
+        """Test that an unknown ref fails like a failed clone."""
+        cache = GitMirrorCache(tmp_path / "cache")
+
+        with pytest.raises(subprocess.CalledProcessError):
+            cache.checkout(origin.as_uri(), "missing", tmp_path / "dest")
+
+    def test_least_recently_used_mirrors_evicted(
+        self, origin: pathlib.Path, tmp_path: pathlib.Path
+    ) -> None:
+        """Test that old mirrors are evicted, unless in use by another run."""
+        other = tmp_path / "other"
+        run_git("clone", "--quiet", origin, other)
+        cache = GitMirrorCache(tmp_path / "cache")
+        old_mirror = cache.mirror_path(other.as_uri())
+        cache.checkout(other.as_uri(), "main", tmp_path / "old")
+        os.utime(old_mirror, (0, 0))
+        cache.max_bytes = 0
+
+        with lock_file(old_mirror.with_suffix(".lock")):
+            cache.checkout(origin.as_uri(), "main", tmp_path / "busy")
+        assert old_mirror.exists()
+
+        cache.checkout(origin.as_uri(), "main", tmp_path / "new")
+        assert not old_mirror.exists()
@@ -0,0 +1,162 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import re
+import subprocess
+import sys
+
+import click
+import pytest
+from click.testing import CliRunner
+
+from agent_starter_pack.cli.main import COMMANDS, cli
+from agent_starter_pack.cli.utils.lazy_group import LazyGroup
+
+# Modules that must only be imported by the commands that need them
+HEAVY_MODULES = {
+    "agent_starter_pack.cli.commands.register_gemini_enterprise",
+    "backoff",
+    "cookiecutter",
+    "google.auth",
+    "jinja2",
+    "requests",
+    "vertexai",
+}
+
+# Heavy modules each command is allowed to import ("" is ``--version``)
+ALLOWED_HEAVY_MODULES = {
+    "": set(),
+    "create": {"cookiecutter", "google.auth", "jinja2", "requests"},
+    "enhance": {"cookiecutter", "google.auth", "jinja2", "requests"},
+    "extract": {"jinja2"},
+    "generate-skill": {"jinja2"},
+    "list": {"cookiecutter", "google.auth", "jinja2", "requests"},
+    "register-gemini-enterprise": HEAVY_MODULES - {"cookiecutter"},
+    "setup-cicd": {"backoff", "google.auth", "requests"},
+    "upgrade": {"cookiecutter", "google.auth", "jinja2", "requests"},
+}
+
+# Cumulative import time budget of the entry point and a command's module,
+# in seconds. Generous enough for slow CI runners, it catches commands that
+# start importing another command's dependencies.
+IMPORT_TIME_BUDGETS = {
+    "": 0.5,
+    "extract": 1.0,
+    "generate-skill": 1.0,
+}
+DEFAULT_IMPORT_TIME_BUDGET = 3.0
+
+_LOAD_COMMAND = """
+import json, sys
+import click
+from agent_starter_pack.cli.main import cli
+name = sys.argv[1]
+if name:
+    cli.get_command(click.Context(cli), name)
+print(json.dumps(sorted(sys.modules)))
+"""
+
+# Top-level "import time: self [us] | cumulative | package" lines of -X importtime
+_IMPORT_TIME_RE = re.compile(r"^import time:\s+\d+ \|\s+(\d+) \| \S")
+
+
+def _load_command(name: str) -> tuple[set[str], float]:
+    """Load a command in a fresh interpreter.
+
+    Returns:
+        The imported modules and the cumulative import time of the top-level
+        imports, in seconds
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _LOAD_COMMAND, name],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = set(json.loads(result.stdout))
+    total_us = 0
+    for line in result.stderr.splitlines():
+        # Nested imports are indented, and already counted by their parent
+        match = _IMPORT_TIME_RE.match(line)
+        if match:
+            total_us += int(match.group(1))
+    return modules, total_us / 1_000_000
+
+
+class TestLazyGroup:
+    """Tests for lazily loaded CLI commands."""
+
+    def test_commands_are_listed_without_loading(self) -> None:
+        """Test that commands are listed without importing their modules."""
+        group = LazyGroup(lazy_commands={"hello": "missing.module:hello"})
+
+        assert group.list_commands(click.Context(group)) == ["hello"]
+        with pytest.raises(ModuleNotFoundError):
+            group.get_command(click.Context(group), "hello")
+
+    def test_every_command_resolves(self) -> None:
+        """Test that every registered command imports under its name."""
+        ctx = click.Context(cli)
+        for name in COMMANDS:
+            command = cli.get_command(ctx, name)
+            assert isinstance(command, click.Command)
+            assert command.name == name
+
+    def test_non_command_attribute_rejected(self) -> None:
+        """Test that an import path must point to a click command."""
+        group = LazyGroup(lazy_commands={"bad": "json:dumps"})
+
+        with pytest.raises(TypeError, match="not a click command"):
+            group.get_command(click.Context(group), "bad")
+
+    def test_help_lists_all_commands(self) -> None:
+        """Test that the group help lists every command."""
+        result = CliRunner().invoke(cli, ["--help"])
+
+        assert result.exit_code == 0
+        for name in COMMANDS:
+            assert name in result.output
+
+
+class TestImportBudget:
+    """Tests for the import cost of the CLI entry point."""
+
+    @pytest.mark.parametrize("name", ["", *COMMANDS])
+    def test_command_import_budget(self, name: str) -> None:
+        """Test that a command only imports its own dependencies, quickly."""
+        modules, seconds = _load_command(name)
+
+        loaded_heavy = {
+            heavy
+            for heavy in HEAVY_MODULES
+            if heavy in modules or any(m.startswith(f"{heavy}.") for m in modules)
+        }
+        assert loaded_heavy <= ALLOWED_HEAVY_MODULES[name]
+        other_commands = {
+            path.partition(":")[0]
+            for other, path in COMMANDS.items()
+            if other != name
+            and path.partition(":")[0] != COMMANDS.get(name, "").partition(":")[0]
+        }
+        # Commands may share code with the commands they extend
+        if name in ("enhance", "upgrade"):
+            other_commands -= {
+                "agent_starter_pack.cli.commands.create",
+                "agent_starter_pack.cli.commands.enhance",
+            }
+        if name == "generate-skill":
+            other_commands.discard("agent_starter_pack.cli.commands.extract")
+        assert not other_commands & modules
+        assert seconds < IMPORT_TIME_BUDGETS.get(name, DEFAULT_IMPORT_TIME_BUDGET)
@@ -0,0 +1,121 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pathlib
+
+import pytest
+
+from agent_starter_pack.cli.utils.lock_store import (
+    LockStore,
+    get_lock_name,
+    get_lock_store,
+    get_lock_store_path,
+    split_lock,
+)
+from agent_starter_pack.cli.utils.template import load_agent_template_configs
+
+HEADER = b"""\
+version = 1
+revision = 3
+requires-python = ">=3.10, <3.14"
+
+"""
+
+
+def _package(name: str, version: str = "1.0.0") -> bytes:
+    return (
+        f'[[package]]\nname = "{name}"\nversion = "{version}"\n'
+        'source = { registry = "https://pypi.org/simple" }\n\n'
+    ).encode()
+
+
+PROJECT = b"""\
+[[package]]
+name = "{{cookiecutter.project_name}}"
+version = "0.1.0"
+source = { editable = "." }
+dependencies = [
+    { name = "requests" },
+]
+"""
+
+LOCKS = {
+    "uv-adk-cloud_run.lock": HEADER
+    + _package("attrs")
+    + _package("requests")
+    + PROJECT,
+    "uv-adk-agent_engine.lock": HEADER
+    + _package("attrs", "2.0.0")
+    + _package("requests")
+    + PROJECT,
+}
+
+
+class TestLockStore:
+    """Tests for the deduplicated lock store."""
+
+    def test_round_trip(self, tmp_path: pathlib.Path) -> None:
+        """Test that saved locks are reconstructed byte for byte."""
+        path = tmp_path / "uv-locks.store"
+        inputs = {name: f"{name}-input" for name in LOCKS}
+        LockStore.build(LOCKS, inputs).save(path)
+
+        store = LockStore.load(path)
+
+        assert store.names == sorted(LOCKS)
+        for name, content in LOCKS.items():
+            assert store.read(name) == content
+        assert store.inputs == inputs
+
+    def test_entries_deduplicated(self) -> None:
+        """Test that entries shared between locks are stored once."""
+        store = LockStore.build(LOCKS)
+
+        distinct = {
+            entry for content in LOCKS.values() for entry in split_lock(content)
+        }
+        assert store.size == sum(len(entry) for entry in distinct)
+
+    def test_project_name(self, tmp_path: pathlib.Path) -> None:
+        """Test that written locks carry the project's name."""
+        store = LockStore.build(LOCKS)
+        dst = tmp_path / "uv.lock"
+
+        store.write_lock("uv-adk-cloud_run.lock", dst, "my-agent")
+
+        assert dst.read_bytes() == LOCKS["uv-adk-cloud_run.lock"].replace(
+            b"{{cookiecutter.project_name}}", b"my-agent"
+        )
+
+    def test_missing_lock(self) -> None:
+        """Test that unknown combinations are reported like missing files."""
+        with pytest.raises(FileNotFoundError, match=r"uv-other-cloud_run\.lock"):
+            LockStore.build(LOCKS).read("uv-other-cloud_run.lock")
+
+    def test_shipped_store(self, tmp_path: pathlib.Path) -> None:
+        """Test that the shipped store has every lock and round-trips exactly."""
+        store = get_lock_store()
+        assert sorted(store.inputs) == store.names
+        for agent_name, config in load_agent_template_configs().items():
+            settings = config.get("settings", {})
+            if settings.get("language", "python") != "python":
+                continue
+            for target in settings.get("deployment_targets", []):
+                lock = store.read(get_lock_name(agent_name, target))
+                assert lock.startswith(b"version = 1\n")
+
+        path = tmp_path / "uv-locks.store"
+        locks = {name: store.read(name) for name in store.names}
+        LockStore.build(locks, store.inputs).save(path)
+        assert path.read_bytes() == get_lock_store_path().read_bytes()
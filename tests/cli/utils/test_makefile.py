@@ -0,0 +1,143 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pathlib
+
+import pytest
+
+from agent_starter_pack.cli.utils.makefile import (
+    CONDITIONAL,
+    MERGED_COMMANDS_HEADER,
+    PHONY,
+    RULE,
+    TEXT,
+    VARIABLE,
+    Makefile,
+    merge_makefiles,
+)
+
+SNAPSHOTS_DIR = (
+    pathlib.Path(__file__).parent.parent.parent / "fixtures" / "makefile_snapshots"
+)
+
+BASE = """\
+# Shared settings
+PORT ?= 8080
+URL = http://localhost:$(PORT)
+UNUSED := 1
+
+.PHONY: install lint backend
+
+# ==============================================================================
+# Installation
+# ==============================================================================
+
+# Install dependencies
+install:
+\tuv sync
+
+# Lint the code
+lint:
+\tuv run ruff check . && \\
+\t\tuv run ruff format --check .
+
+\t# Also check types
+\tuv run mypy .
+
+backend:
+\tcurl $(URL)
+ifeq ($(CI),true)
+ci:
+\techo ci
+endif
+"""
+
+
+class TestMakefileParse:
+    """Tests for parsing Makefiles into blocks."""
+
+    def test_blocks(self) -> None:
+        """Test that rules, variables, .PHONY and conditionals are recognized."""
+        makefile = Makefile.parse(BASE)
+
+        assert [(b.kind, b.names) for b in makefile.blocks if b.kind != TEXT] == [
+            (VARIABLE, ("PORT",)),
+            (VARIABLE, ("URL",)),
+            (VARIABLE, ("UNUSED",)),
+            (PHONY, ("install", "lint", "backend")),
+            (RULE, ("install",)),
+            (RULE, ("lint",)),
+            (RULE, ("backend",)),
+            (CONDITIONAL, ("ci",)),
+        ]
+        assert makefile.targets == {"install", "lint", "backend", "ci"}
+
+    def test_comments_and_recipes(self) -> None:
+        """Test that rules include their comments and whole recipe."""
+        lint = next(b for b in Makefile.parse(BASE).blocks if b.names == ("lint",))
+
+        assert lint.text.startswith("# Lint the code\nlint:\n")
+        assert lint.text.endswith("\tuv run mypy .\n")
+
+    @pytest.mark.parametrize(
+        "path", sorted(SNAPSHOTS_DIR.glob("*.makefile")), ids=lambda p: p.stem
+    )
+    def test_round_trip(self, path: pathlib.Path) -> None:
+        """Test that parsing keeps the exact text of real Makefiles."""
+        text = path.read_text(encoding="utf-8")
+
+        makefile = Makefile.parse(text)
+
+        assert str(makefile) == text
+        assert "install" in makefile.targets
+
+
+class TestMergeMakefiles:
+    """Tests for merging a base Makefile into a remote one."""
+
+    def test_missing_rules_appended(self) -> None:
+        """Test that base rules are appended with the variables they use."""
+        remote = "install:\n\techo remote\n"
+
+        merged = merge_makefiles(remote, BASE)
+
+        assert merged.startswith(remote + f"\n\n{MERGED_COMMANDS_HEADER}\n\n")
+        appended = merged[len(remote) :]
+        assert "uv sync" not in appended
+        assert "# Lint the code\nlint:\n" in appended
+        assert "\tuv run mypy .\n" in appended
+        assert "ifeq ($(CI),true)\nci:\n\techo ci\nendif\n" in appended
+        assert "PORT ?= 8080" in appended
+        assert "URL = http://localhost:$(PORT)" in appended
+        assert "UNUSED" not in appended
+        assert ".PHONY: backend lint\n" in appended
+        # Rules keep their order from the base Makefile
+        assert appended.index("lint:") < appended.index("backend:")
+
+    def test_remote_definitions_win(self) -> None:
+        """Test that variables and targets of the remote Makefile are kept."""
+        remote = "PORT = 9000\n\nlint:\n\techo remote\n\nci:\n\techo remote\n"
+
+        merged = merge_makefiles(remote, BASE)
+
+        assert "PORT ?= 8080" not in merged
+        assert "URL = http://localhost:$(PORT)" in merged
+        assert merged.count("lint:") == 1
+        assert "ifeq" not in merged
+
+    def test_nothing_missing(self) -> None:
+        """Test that the remote Makefile is unchanged if it has every target."""
+        remote = "install lint backend ci:\n\techo remote\n"
+
+        assert merge_makefiles(remote, BASE) == remote
@@ -0,0 +1,89 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pathlib
+
+from rich.console import Console
+
+from agent_starter_pack.cli.utils.manifest import (
+    ROOT_GROUP,
+    GenerationManifest,
+    format_bytes,
+    print_generation_manifest,
+)
+from agent_starter_pack.cli.utils.render_engine import FilePlan, RenderEngine
+
+
+def _write(path: pathlib.Path, content: str) -> pathlib.Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+    return path
+
+
+class TestGenerationManifest:
+    """Tests for the dry run manifest of a project generation."""
+
+    def test_groups_counts_and_bytes(self, tmp_path: pathlib.Path) -> None:
+        """Test that outputs are grouped by top-level path with their sizes."""
+        src = tmp_path / "src"
+        _write(src / "README.md", "# {{cookiecutter.project_name}}\n")
+        _write(src / "{{cookiecutter.agent_directory}}" / "agent.py", "x = 1\n")
+        _write(src / "notebooks" / "demo.ipynb", "{}")
+        _write(src / ".cloudbuild" / "ci.yaml", "steps: []\n")
+        overlay = FilePlan()
+        overlay.add_tree(_write(tmp_path / "remote" / "extra.py", "pass\n"))
+
+        plan = FilePlan()
+        plan.add_tree(src)
+        engine = RenderEngine(
+            {
+                "project_name": "demo",
+                "agent_directory": "app",
+                "_copy_without_render": ["notebooks/*"],
+            }
+        )
+        engine.exclude_output = lambda path: path.startswith(".cloudbuild")
+        project_dir = tmp_path / "out" / "demo"
+        outputs = engine.resolve_outputs(plan, project_dir, create_dirs=False)
+
+        manifest = GenerationManifest.from_outputs(
+            outputs, project_dir, engine.excluded, overlay
+        )
+
+        assert sorted(manifest.groups) == [ROOT_GROUP, "app", "notebooks"]
+        assert manifest.groups["notebooks"].copied == 1
+        assert manifest.groups[ROOT_GROUP].rendered == 1
+        assert manifest.files == 3
+        assert manifest.bytes == len("# {{cookiecutter.project_name}}\n") + 6 + 2
+        assert (manifest.excluded_files, manifest.excluded_bytes) == (1, 10)
+        assert (manifest.overlay_files, manifest.overlay_bytes) == (1, 5)
+        assert not project_dir.exists()
+
+    def test_print_manifest(self, tmp_path: pathlib.Path) -> None:
+        """Test the printed summary."""
+        manifest = GenerationManifest(tmp_path, excluded_files=2, excluded_bytes=10)
+        console = Console(record=True, width=120)
+
+        print_generation_manifest(manifest, console)
+
+        output = console.export_text()
+        assert "0 files (0 B) would be generated" in output
+        assert "2 template files (10 B) are excluded" in output
+        assert "No files were written." in output
+
+    def test_format_bytes(self) -> None:
+        """Test the byte count formatting."""
+        assert format_bytes(512) == "512 B"
+        assert format_bytes(2048) == "2.0 KB"
+        assert format_bytes(3 * 1024 * 1024) == "3.0 MB"
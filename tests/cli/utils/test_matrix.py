@@ -0,0 +1,164 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pathlib
+from typing import Any
+from unittest.mock import patch
+
+import click
+import pytest
+from click.testing import CliRunner
+
+from agent_starter_pack.cli.commands.create import create
+from agent_starter_pack.cli.utils.matrix import (
+    MatrixProject,
+    create_projects,
+    expand_matrix,
+    load_matrix,
+)
+
+MATRIX_FILE = """
+defaults:
+  cicd_runner: github_actions
+matrix:
+  agent: [adk, langgraph]
+  deployment-target: [cloud_run, agent_engine]
+projects:
+  - project_name: Live_Demo
+    agent: adk_live
+    deployment_target: agent_engine
+    prototype: true
+"""
+
+
+class TestExpandMatrix:
+    """Tests for matrix file expansion."""
+
+    def test_expands_combinations_and_projects(self, tmp_path: pathlib.Path) -> None:
+        """Test that axes are combined and defaults applied to every project."""
+        path = tmp_path / "matrix.yaml"
+        path.write_text(MATRIX_FILE, encoding="utf-8")
+
+        projects = load_matrix(path)
+
+        assert [project.project_name for project in projects] == [
+            "adk-1",
+            "adk-2",
+            "langgraph-3",
+            "langgraph-4",
+            "live-demo",
+        ]
+        assert projects[1].options == {
+            "cicd_runner": "github_actions",
+            "agent": "adk",
+            "deployment_target": "agent_engine",
+        }
+        assert projects[4].options["prototype"] is True
+
+    def test_list_of_projects(self) -> None:
+        """Test that a plain list is treated as explicit projects."""
+        projects = expand_matrix([{"agent": "adk@data-science"}])
+
+        assert projects == [
+            MatrixProject("adk-data-science-1", {"agent": "adk@data-science"})
+        ]
+
+    @pytest.mark.parametrize(
+        "spec,message",
+        [
+            ({"include": []}, "Unknown matrix keys"),
+            ([{"project_name": "a"}, {"project_name": "A"}], "Duplicate project"),
+            (["adk"], "must be mappings"),
+        ],
+    )
+    def test_invalid_matrix(self, spec: Any, message: str) -> None:
+        """Test that malformed matrices are rejected."""
+        with pytest.raises(click.ClickException, match=message):
+            expand_matrix(spec)
+
+
+class TestCreateProjects:
+    """Tests for in-process batch generation."""
+
+    def test_generates_projects_in_one_process(self, tmp_path: pathlib.Path) -> None:
+        """Test that every project is generated and timed."""
+        results = create_projects(
+            [
+                {"agent": "adk", "deployment_target": "cloud_run", "prototype": True},
+                {"agent": "missing_agent", "deployment_target": "cloud_run"},
+            ],
+            output_dir=tmp_path,
+            defaults={"skip_checks": True},
+        )
+
+        assert [result.project_name for result in results] == [
+            "adk-1",
+            "missing-agent-2",
+        ]
+        assert results[0].ok
+        assert (tmp_path / "adk-1" / "app" / "agent.py").exists()
+        assert results[0].seconds > 0
+        assert not results[1].ok
+        assert "missing_agent" in results[1].output
+
+    def test_version_locked_template_is_rejected(
+        self, tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that version-locked templates fail without re-executing."""
+        monkeypatch.delenv("ASP_SKIP_VERSION_LOCK", raising=False)
+        template = tmp_path / "template"
+        template.mkdir()
+        (template / "uv.lock").write_text(
+            '[[package]]\nname = "agent-starter-pack"\nversion = "0.14.2"\n',
+            encoding="utf-8",
+        )
+
+        with patch(
+            "agent_starter_pack.cli.utils.remote_template.subprocess.run"
+        ) as mock_run:
+            results = create_projects(
+                [{"agent": f"local@{template}", "deployment_target": "cloud_run"}],
+                output_dir=tmp_path / "out",
+                defaults={"skip_checks": True},
+            )
+
+        mock_run.assert_not_called()
+        assert not results[0].ok
+        assert "version 0.14.2" in results[0].output
+        assert "batch mode" in results[0].output
+
+    def test_unknown_option_is_rejected(self, tmp_path: pathlib.Path) -> None:
+        """Test that typos in option names fail before generating anything."""
+        with pytest.raises(click.ClickException, match="deploy_target"):
+            create_projects([{"agent": "adk", "deploy_target": "x"}], tmp_path)
+        assert list(tmp_path.iterdir()) == []
+
+    def test_create_matrix_option(self, tmp_path: pathlib.Path) -> None:
+        """Test that command line options are forwarded to every project."""
+        path = tmp_path / "matrix.yaml"
+        path.write_text(MATRIX_FILE, encoding="utf-8")
+
+        with patch(
+            "agent_starter_pack.cli.commands.create.create_projects", return_value=[]
+        ) as mock_create_projects:
+            result = CliRunner().invoke(
+                create,
+                ["--matrix", str(path), "-s", "--region", "europe-west1", "-o", "out"],
+            )
+
+        assert result.exit_code == 0, result.output
+        args, kwargs = mock_create_projects.call_args
+        assert len(args[0]) == 5
+        assert kwargs["output_dir"] == "out"
+        assert kwargs["defaults"] == {"skip_checks": True, "region": "europe-west1"}
@@ -0,0 +1,93 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from agent_starter_pack.cli.utils import profiler
+from agent_starter_pack.cli.utils.prefetch import Prefetch
+from agent_starter_pack.cli.utils.profiler import Profiler
+
+
+class TestPrefetch:
+    """Tests for background prefetching of network steps."""
+
+    def test_steps_run_concurrently(self) -> None:
+        """Test that started steps run while the caller does other work."""
+        started = threading.Event()
+        release = threading.Event()
+
+        def step() -> str:
+            started.set()
+            release.wait(5)
+            return "done"
+
+        prefetch = Prefetch()
+        try:
+            prefetch.start("step", step)
+            assert started.wait(5)
+            release.set()
+            assert prefetch.result("step", lambda: "fallback") == "done"
+        finally:
+            prefetch.close()
+
+    def test_fallback_when_not_started(self) -> None:
+        """Test that steps that were not prefetched run in the caller."""
+        prefetch = Prefetch()
+
+        assert prefetch.result("step", lambda: "fallback") == "fallback"
+
+    def test_errors_raised_when_collected(self) -> None:
+        """Test that a failed step raises where its result is collected."""
+
+        def step() -> None:
+            raise RuntimeError("Git clone failed")
+
+        prefetch = Prefetch()
+        try:
+            prefetch.start("step", step)
+            with pytest.raises(RuntimeError, match="Git clone failed"):
+                prefetch.result("step", lambda: None)
+        finally:
+            prefetch.close()
+
+    def test_uncollected_results_cleaned_up(self) -> None:
+        """Test that results nobody collects are cleaned up on close."""
+        cleaned = threading.Event()
+        cleanup = MagicMock(side_effect=lambda result: cleaned.set())
+
+        prefetch = Prefetch()
+        prefetch.start("step", lambda: "temp-dir", cleanup=cleanup)
+        prefetch.close()
+
+        assert cleaned.wait(5)
+        cleanup.assert_called_once_with("temp-dir")
+
+    def test_background_phases_profiled(self) -> None:
+        """Test that prefetched steps are profiled on their own thread."""
+        prof = Profiler("test")
+        profiler._active = prof
+        prefetch = Prefetch()
+        try:
+            prefetch.start("step", lambda: None)
+            prefetch.result("step", lambda: None)
+        finally:
+            prefetch.close()
+            profiler._active = None
+
+        record = next(r for r in prof.phases if r.name == "prefetch step")
+        assert record.thread > 1
+        assert record.depth == 0
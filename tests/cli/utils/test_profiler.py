@@ -0,0 +1,162 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import pathlib
+
+import click
+from click.testing import CliRunner
+
+from agent_starter_pack.cli.utils import profiler
+from agent_starter_pack.cli.utils.profiler import (
+    PhaseSequence,
+    Profiler,
+    get_profiler,
+    phase,
+    profile_options,
+    profiled,
+    record_file,
+)
+
+
+def _profiled_command(tmp_path: pathlib.Path) -> click.Command:
+    @click.command()
+    @profile_options
+    @profiled("demo")
+    def demo() -> None:
+        assert get_profiler() is not None
+        with phase("write"):
+            (tmp_path / "out.txt").write_text("hello")
+            record_file(tmp_path / "out.txt")
+
+    return demo
+
+
+class TestProfiler:
+    """Tests for the phase profiler."""
+
+    def test_nested_phases_and_counters(self, tmp_path: pathlib.Path) -> None:
+        """Test that files are counted in the innermost open phase."""
+        path = tmp_path / "file.txt"
+        path.write_bytes(b"12345")
+        prof = Profiler("test")
+
+        with prof.phase("outer"):
+            with prof.phase("inner"):
+                prof.add_files(1, path.stat().st_size)
+            prof.add_files(2, 10)
+
+        outer, inner = prof.phases
+        assert (outer.name, outer.depth, outer.files, outer.bytes) == (
+            "outer",
+            0,
+            2,
+            10,
+        )
+        assert (inner.name, inner.depth, inner.files, inner.bytes) == (
+            "inner",
+            1,
+            1,
+            5,
+        )
+        assert outer.seconds >= inner.seconds
+
+    def test_trace_events(self) -> None:
+        """Test that the profile is exported in Chrome trace format."""
+        prof = Profiler("test")
+        with prof.phase("render"):
+            prof.add_files(3, 300)
+
+        data = json.loads(json.dumps(prof.to_dict()))
+
+        (event,) = data["traceEvents"]
+        assert event["name"] == "render"
+        assert event["ph"] == "X"
+        assert event["args"] == {"files": 3, "bytes": 300}
+        assert data["phases"][0]["files"] == 3
+
+    def test_hooks_are_noops_when_inactive(self, tmp_path: pathlib.Path) -> None:
+        """Test that phases and file records do nothing without --profile."""
+        assert get_profiler() is None
+        with phase("ignored"):
+            record_file(tmp_path / "missing.txt")
+
+    def test_phase_sequence(self) -> None:
+        """Test that consecutive phases end when the next one starts."""
+        prof = Profiler("test")
+        profiler._active = prof
+        try:
+            phases = PhaseSequence()
+            phases.next("first")
+            phases.next("second")
+            phases.end()
+            phases.end()
+        finally:
+            profiler._active = None
+
+        assert [(r.name, r.depth) for r in prof.phases] == [
+            ("first", 0),
+            ("second", 0),
+        ]
+
+
+class TestProfiled:
+    """Tests for the --profile command options."""
+
+    def test_without_profile(self) -> None:
+        """Test that commands run unprofiled by default."""
+        command = click.command()(profile_options(profiled("demo")(lambda: None)))
+
+        result = CliRunner().invoke(command, [])
+
+        assert result.exit_code == 0
+        assert "Profile" not in result.output
+
+    def test_profile_output(self, tmp_path: pathlib.Path) -> None:
+        """Test that --profile-output prints and writes the profile."""
+        output = tmp_path / "profile" / "trace.json"
+
+        result = CliRunner().invoke(
+            _profiled_command(tmp_path), ["--profile-output", str(output)]
+        )
+
+        assert result.exit_code == 0, result.output
+        assert "Profile: demo" in result.output
+        data = json.loads(output.read_text())
+        assert data["command"] == "demo"
+        assert data["phases"][0]["name"] == "write"
+        assert data["phases"][0]["files"] == 1
+        assert data["phases"][0]["bytes"] == 5
+        assert get_profiler() is None
+
+    def test_nested_command_records_phase(self, tmp_path: pathlib.Path) -> None:
+        """Test that a command invoked by a profiled command is a phase."""
+        inner = _profiled_command(tmp_path)
+
+        @click.command()
+        @profile_options
+        @profiled("outer")
+        @click.pass_context
+        def outer(ctx: click.Context) -> None:
+            ctx.invoke(inner)
+
+        prof_path = tmp_path / "trace.json"
+        result = CliRunner().invoke(outer, ["--profile-output", str(prof_path)])
+
+        assert result.exit_code == 0, result.output
+        phases = json.loads(prof_path.read_text())["phases"]
+        assert [(p["name"], p["depth"]) for p in phases] == [
+            ("demo", 0),
+            ("write", 1),
+        ]
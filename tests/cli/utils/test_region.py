@@ -0,0 +1,160 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pathlib
+
+import pytest
+
+from agent_starter_pack.cli.utils.region import (
+    RegionRewriter,
+    get_data_store_region,
+    replace_region_in_files,
+)
+from agent_starter_pack.cli.utils.render_engine import FilePlan, RenderEngine
+
+
+def _write_bytes(path: pathlib.Path, content: bytes) -> pathlib.Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    return path
+
+
+def _tree(root: pathlib.Path) -> dict[str, bytes]:
+    return {
+        p.relative_to(root).as_posix(): p.read_bytes()
+        for p in sorted(root.rglob("*"))
+        if p.is_file()
+    }
+
+
+class TestRegionRewriter:
+    """Tests for substituting the region in file content."""
+
+    @pytest.mark.parametrize(
+        "region,expected",
+        [
+            ("us-east1", "us"),
+            ("europe-west4", "eu"),
+            ("asia-east1", "global"),
+        ],
+    )
+    def test_data_store_region(self, region: str, expected: str) -> None:
+        """Test the data store location derived from a region."""
+        assert get_data_store_region(region) == expected
+
+    @pytest.mark.parametrize(
+        "content,expected",
+        [
+            (
+                'region = "us-central1"\ndata_store_region = "us"\n',
+                'region = "europe-west1"\ndata_store_region = "eu"\n',
+            ),
+            # Only the first data store region setting found is substituted
+            (
+                'data_store_region="us"\n_DATA_STORE_REGION: us\n',
+                'data_store_region="eu"\n_DATA_STORE_REGION: us\n',
+            ),
+            # Settings are matched after substituting the region
+            (
+                "_DATA_STORE_REGION: us-central1\n'DATA_STORE_REGION', \"us\"\n",
+                "_DATA_STORE_REGION: europe-west1\n'DATA_STORE_REGION', \"us\"\n",
+            ),
+        ],
+    )
+    def test_rewrite(self, content: str, expected: str) -> None:
+        """Test the substitutions applied to matching content."""
+        rewriter = RegionRewriter("europe-west1")
+
+        assert rewriter.matches(content)
+        assert rewriter.rewrite(content) == expected
+
+    def test_rewrite_bytes(self) -> None:
+        """Test that only matching text files are rewritten, with LF newlines."""
+        rewriter = RegionRewriter("asia-east1")
+
+        assert rewriter.rewrite_bytes(b"location = 'global'\r\n") is None
+        assert rewriter.rewrite_bytes(b"\xff\xfeus-central1") is None
+        assert (
+            rewriter.rewrite_bytes(b'a: us-central1\r\nb: data-store-region="us"\r\n')
+            == b'a: asia-east1\nb: data-store-region="global"\n'
+        )
+
+
+class TestReplaceRegionInFiles:
+    """Tests for the post-generation region pass."""
+
+    def test_rewrites_project_files(self, tmp_path: pathlib.Path) -> None:
+        """Test which files of a project are rewritten."""
+        project = tmp_path / "project"
+        _write_bytes(project / "main.tf", b'region = "us-central1"\r\n')
+        _write_bytes(project / "Makefile", b"REGION ?= us-central1\n")
+        _write_bytes(project / "plain.py", b"x = 1\r\n")
+        _write_bytes(project / "data.json", b'{"region": "us-central1"}')
+        _write_bytes(project / ".venv" / "lib.py", b"us-central1")
+        _write_bytes(project / "node_modules" / "a" / "README.md", b"us-central1")
+
+        replace_region_in_files(project, "europe-west1")
+
+        assert _tree(project) == {
+            ".venv/lib.py": b"us-central1",
+            "Makefile": b"REGION ?= europe-west1\n",
+            "data.json": b'{"region": "us-central1"}',
+            "main.tf": b'region = "europe-west1"\n',
+            "node_modules/a/README.md": b"us-central1",
+            "plain.py": b"x = 1\r\n",
+        }
+
+    def test_only_rewrites_listed_files(self, tmp_path: pathlib.Path) -> None:
+        """Test that only the given files are rewritten when listed."""
+        project = tmp_path / "project"
+        rendered = _write_bytes(project / "a.md", b'data_store_region = "us"\n')
+        written = _write_bytes(project / "b.md", b'data_store_region = "us"\n')
+        lock = _write_bytes(project / "uv.lock", b"us-central1")
+
+        replace_region_in_files(
+            project,
+            "europe-west1",
+            files=[written, written, lock, project / "removed.md"],
+        )
+
+        assert rendered.read_bytes() == b'data_store_region = "us"\n'
+        assert written.read_bytes() == b'data_store_region = "eu"\n'
+        assert lock.read_bytes() == b"us-central1"
+
+    def test_render_time_substitution_matches_post_pass(
+        self, tmp_path: pathlib.Path
+    ) -> None:
+        """Test that substituting while rendering gives the same project."""
+        src = tmp_path / "src"
+        _write_bytes(
+            src / "README.md", b"# {{cookiecutter.project_name}} us-central1\n"
+        )
+        _write_bytes(src / "deploy.yaml", b"_DATA_STORE_REGION: us\r\nregion: x\r\n")
+        _write_bytes(src / "notebook.py", b"LOCATION = 'us-central1'")
+        _write_bytes(src / "raw.json", b'{"region": "us-central1"}')
+        _write_bytes(src / "__pycache__" / "cached.py", b"us-central1")
+        plan = FilePlan()
+        plan.add_tree(src)
+        config = {"project_name": "agent", "_copy_without_render": ["notebook.py"]}
+
+        expected = tmp_path / "expected"
+        RenderEngine(config).render_plan(plan, expected)
+        replace_region_in_files(expected, "europe-west1")
+
+        engine = RenderEngine(config)
+        engine.region_rewriter = RegionRewriter("europe-west1")
+        actual = tmp_path / "actual"
+        engine.render_plan(plan, actual)
+
+        assert _tree(actual) == _tree(expected)
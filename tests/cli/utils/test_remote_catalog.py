@@ -0,0 +1,216 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pathlib
+from collections.abc import Iterator
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from agent_starter_pack.cli.utils import remote_catalog
+from agent_starter_pack.cli.utils.cache import CACHE_DIR_ENV_VAR
+from agent_starter_pack.cli.utils.git_cache import NO_GIT_CACHE_ENV_VAR, run_git
+from agent_starter_pack.cli.utils.remote_catalog import (
+    RemoteCatalogCache,
+    discover_remote_adk_agents,
+    read_remote_files,
+)
+from agent_starter_pack.cli.utils.remote_template import (
+    RemoteTemplateSpec,
+    clone_remote_template,
+    discover_adk_agents,
+)
+
+PYPROJECT = """[project]
+name = "{name}"
+description = "The {name} agent"
+"""
+
+
+def _commit_agent(repo: pathlib.Path, name: str) -> None:
+    agent_dir = repo / "python" / "agents" / name
+    agent_dir.mkdir(parents=True)
+    (agent_dir / "pyproject.toml").write_text(PYPROJECT.format(name=name))
+    (agent_dir / "agent.py").write_text("root_agent = None\n")
+    _commit(repo, f"Add {name}")
+
+
+def _commit(repo: pathlib.Path, message: str) -> None:
+    run_git("-C", repo, "add", "--all")
+    run_git(
+        "-C",
+        repo,
+        "-c",
+        "user.name=test",
+        "-c",
+        "user.email=test@example.com",
+        "commit",
+        "--quiet",
+        "-m",
+        message,
+    )
+
+
+@pytest.fixture
+def spec(tmp_path: pathlib.Path) -> RemoteTemplateSpec:
+    """An ADK samples-like repository with one agent."""
+    repo = tmp_path / "adk-samples"
+    repo.mkdir()
+    run_git("init", "--quiet", "--initial-branch", "main", repo)
+    run_git("-C", repo, "config", "uploadpack.allowFilter", "true")
+    _commit_agent(repo, "alpha")
+    return RemoteTemplateSpec(
+        repo_url=repo.as_uri(),
+        template_path="",
+        git_ref="main",
+        is_adk_samples=True,
+    )
+
+
+@pytest.fixture
+def discover(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> Iterator[MagicMock]:
+    """Count the discoveries of remote agents, with an isolated cache."""
+    monkeypatch.setenv(CACHE_DIR_ENV_VAR, str(tmp_path / "cache"))
+    monkeypatch.delenv(NO_GIT_CACHE_ENV_VAR, raising=False)
+    with patch.object(
+        remote_catalog,
+        "_discover_adk_agents_from_tree",
+        wraps=remote_catalog._discover_adk_agents_from_tree,
+    ) as mock_discover:
+        yield mock_discover
+
+
+def _names(agents: dict) -> list[str]:
+    return [agent["name"] for agent in agents.values()]
+
+
+class TestDiscoverRemoteAdkAgents:
+    """Tests for the commit-keyed cache of discovered remote agents."""
+
+    def test_unchanged_commit_is_not_refetched(
+        self, spec: RemoteTemplateSpec, discover: MagicMock
+    ) -> None:
+        """Test that agents are discovered once per commit."""
+        first = discover_remote_adk_agents(spec, RemoteCatalogCache())
+        second = discover_remote_adk_agents(spec, RemoteCatalogCache(ttl=0))
+
+        assert _names(first) == _names(second) == ["alpha"]
+        assert second[1]["spec"] == "adk@alpha"
+        assert discover.call_count == 1
+
+    def test_resolved_ref_reused_within_ttl(
+        self, spec: RemoteTemplateSpec, discover: MagicMock
+    ) -> None:
+        """Test that the remote is not contacted again within the TTL."""
+        discover_remote_adk_agents(spec, RemoteCatalogCache())
+
+        with patch.object(remote_catalog, "resolve_remote_ref") as mock_resolve:
+            agents = discover_remote_adk_agents(spec, RemoteCatalogCache())
+
+        assert _names(agents) == ["alpha"]
+        mock_resolve.assert_not_called()
+        assert discover.call_count == 1
+
+    def test_new_commit_is_rediscovered(
+        self, spec: RemoteTemplateSpec, discover: MagicMock, tmp_path: pathlib.Path
+    ) -> None:
+        """Test that moving the ref invalidates the cached agents."""
+        discover_remote_adk_agents(spec, RemoteCatalogCache())
+        _commit_agent(tmp_path / "adk-samples", "beta")
+
+        agents = discover_remote_adk_agents(spec, RemoteCatalogCache(ttl=0))
+
+        assert _names(agents) == ["alpha", "beta"]
+        assert discover.call_count == 2
+
+    def test_other_cli_version_ignored(
+        self, spec: RemoteTemplateSpec, discover: MagicMock
+    ) -> None:
+        """Test that agents discovered by another CLI version are not used."""
+        discover_remote_adk_agents(spec, RemoteCatalogCache())
+
+        with patch.object(remote_catalog, "get_current_version", return_value="9.9"):
+            discover_remote_adk_agents(spec, RemoteCatalogCache())
+
+        assert discover.call_count == 2
+
+    def test_unreachable_remote_raises(
+        self, tmp_path: pathlib.Path, discover: MagicMock
+    ) -> None:
+        """Test that a repository that cannot be fetched fails like a clone."""
+        spec = RemoteTemplateSpec(
+            repo_url=(tmp_path / "missing").as_uri(),
+            template_path="",
+            git_ref="main",
+            is_adk_samples=True,
+        )
+
+        with pytest.raises(RuntimeError, match="Git clone failed"):
+            discover_remote_adk_agents(spec, RemoteCatalogCache())
+
+    def test_explicit_config_listed_first(
+        self, spec: RemoteTemplateSpec, discover: MagicMock, tmp_path: pathlib.Path
+    ) -> None:
+        """Test that agents are loaded from their pyproject.toml like a clone."""
+        repo = tmp_path / "adk-samples"
+        _commit_agent(repo, "zeta")
+        with (repo / "python" / "agents" / "zeta" / "pyproject.toml").open("a") as f:
+            f.write('[tool.agent-starter-pack]\nname = "Zeta"\n')
+        _commit_agent(repo, "no-config")
+        (repo / "python" / "agents" / "no-config" / "pyproject.toml").unlink()
+        _commit_agent(repo, "broken")
+        (repo / "python" / "agents" / "broken" / "pyproject.toml").write_text("[")
+        _commit(repo, "Update agents")
+
+        agents = discover_remote_adk_agents(spec, RemoteCatalogCache())
+
+        assert _names(agents) == ["Zeta", "alpha", "broken", "no-config"]
+        assert agents[1]["has_explicit_config"]
+        assert agents == discover_adk_agents(repo)
+
+    def test_clone_without_git_cache(
+        self,
+        spec: RemoteTemplateSpec,
+        discover: MagicMock,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Test that ASP_NO_GIT_CACHE=1 discovers agents from a clone."""
+        monkeypatch.setenv(NO_GIT_CACHE_ENV_VAR, "1")
+
+        with patch.object(
+            remote_catalog, "clone_remote_template", wraps=clone_remote_template
+        ) as clone:
+            agents = discover_remote_adk_agents(spec, RemoteCatalogCache())
+
+        assert _names(agents) == ["alpha"]
+        discover.assert_not_called()
+        assert clone.call_count == 1
+
+
+class TestReadRemoteFiles:
+    """Tests for reading files of remote templates without a checkout."""
+
+    def test_files_relative_to_template(
+        self, spec: RemoteTemplateSpec, discover: MagicMock
+    ) -> None:
+        """Test that only files below the template directory are read."""
+        spec.template_path = "python/agents"
+
+        pyprojects = read_remote_files(spec, "pyproject.toml")
+
+        assert pyprojects == {
+            "alpha/pyproject.toml": PYPROJECT.format(name="alpha").encode()
+        }
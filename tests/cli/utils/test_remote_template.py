@@ -19,11 +19,14 @@ from unittest.mock import MagicMock, mock_open, patch
 
 import pytest
 
+from agent_starter_pack.cli.utils.env_pool import NO_ENV_POOL_ENV_VAR
+from agent_starter_pack.cli.utils.git_cache import NO_GIT_CACHE_ENV_VAR
 from agent_starter_pack.cli.utils.remote_template import (
     RemoteTemplateSpec,
     _detect_flat_structure,
     _infer_agent_directory_for_adk,
     check_and_execute_with_version_lock,
+    discover_adk_agents,
     fetch_remote_template,
     get_base_template_name,
     load_remote_template_config,
@@ -134,8 +137,10 @@ class TestFetchRemoteTemplate:
         mock_rmtree: MagicMock,
         mock_mkdtemp: MagicMock,
         mock_subprocess: MagicMock,
+        monkeypatch: pytest.MonkeyPatch,
     ) -> None:
         """Test remote template fetching with git failure"""
+        monkeypatch.setenv(NO_GIT_CACHE_ENV_VAR, "1")
         mock_mkdtemp.return_value = "/tmp/test_dir"
         mock_subprocess.side_effect = subprocess.CalledProcessError(
             returncode=1, cmd="git clone", stderr="Git error"
@@ -164,8 +169,10 @@ class TestFetchRemoteTemplate:
         mock_exists: MagicMock,
         mock_mkdtemp: MagicMock,
         mock_subprocess: MagicMock,
+        monkeypatch: pytest.MonkeyPatch,
     ) -> None:
         """Test remote template fetching with template path not found"""
+        monkeypatch.setenv(NO_GIT_CACHE_ENV_VAR, "1")
         mock_mkdtemp.return_value = "/tmp/test_dir"
         mock_exists.return_value = False
         mock_subprocess.return_value = MagicMock(returncode=0, stderr="")
@@ -184,6 +191,34 @@ class TestFetchRemoteTemplate:
 
         mock_rmtree.assert_called_once()
 
+    @patch("subprocess.run")
+    @patch(
+        "agent_starter_pack.cli.utils.remote_template.check_and_execute_with_version_lock",
+        return_value=False,
+    )
+    def test_fetch_remote_template_reuses_clone(
+        self,
+        mock_version_lock: MagicMock,
+        mock_subprocess: MagicMock,
+        tmp_path: pathlib.Path,
+    ) -> None:
+        """Test that a clone started earlier is used instead of cloning again"""
+        template_dir = tmp_path / "repo"
+        template_dir.mkdir()
+        spec = RemoteTemplateSpec(
+            repo_url="https://github.com/org/repo",
+            template_path="",
+            git_ref="main",
+        )
+
+        result = fetch_remote_template(
+            spec, "org/repo", cloned=(template_dir, tmp_path)
+        )
+
+        assert result == (template_dir, tmp_path)
+        mock_subprocess.assert_not_called()
+        mock_version_lock.assert_called_once_with(template_dir, "org/repo", False, None)
+
 
 class TestLoadRemoteTemplateConfig:
     def test_load_remote_template_config_primary_location(self) -> None:
@@ -375,6 +410,36 @@ class TestMergeTemplateConfigs:
         assert remote_config == original_remote
 
 
+class TestDiscoverAdkAgents:
+    """Tests for discovering the agents of an ADK samples repository."""
+
+    def test_agents_sorted_and_numbered(self, tmp_path: pathlib.Path) -> None:
+        """Test that agents with explicit config come first, by name."""
+        agents_dir = tmp_path / "python" / "agents"
+        for name, explicit in [("zeta", True), ("beta", False), ("Alpha", False)]:
+            (agents_dir / name).mkdir(parents=True)
+            section = "tool.agent-starter-pack" if explicit else "project"
+            (agents_dir / name / "pyproject.toml").write_text(
+                f'[{section}]\nname = "{name}"\n'
+            )
+        (agents_dir / "README.md").write_text("Not an agent")
+
+        agents = discover_adk_agents(tmp_path)
+
+        assert [(num, agent["name"]) for num, agent in agents.items()] == [
+            (1, "zeta"),
+            (2, "Alpha"),
+            (3, "beta"),
+        ]
+        assert agents[1]["has_explicit_config"] is True
+        assert agents[2]["path"] == "python/agents/Alpha"
+        assert agents[2]["spec"] == "adk@Alpha"
+
+    def test_no_agents_directory(self, tmp_path: pathlib.Path) -> None:
+        """Test that a repository without python/agents has no agents."""
+        assert discover_adk_agents(tmp_path) == {}
+
+
 class TestRemoteTemplateIntegration:
     """Integration tests for remote template functionality"""
 
@@ -756,6 +821,11 @@ class TestParseAgentStarterPackVersionFromLock:
 class TestCheckAndExecuteWithVersionLock:
     """Test version lock checking and execution functionality."""
 
+    @pytest.fixture(autouse=True)
+    def _no_env_pool(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        # Run locked versions with uvx instead of installing them
+        monkeypatch.setenv(NO_ENV_POOL_ENV_VAR, "1")
+
     @patch(
         "agent_starter_pack.cli.utils.remote_template.parse_agent_starter_pack_version_from_lock"
     )
@@ -971,6 +1041,144 @@ class TestCheckAndExecuteWithVersionLock:
         ]
         mock_subprocess.assert_called_with(expected_cmd, check=True)
 
+    @patch(
+        "sys.argv",
+        ["agent-starter-pack", "create", "test-project", "-a", "remote/template"],
+    )
+    @patch("agent_starter_pack.cli.utils.remote_template.get_cli_command")
+    @patch("agent_starter_pack.cli.utils.remote_template.subprocess.run")
+    @patch(
+        "agent_starter_pack.cli.utils.remote_template.parse_agent_starter_pack_version_from_lock"
+    )
+    @patch("agent_starter_pack.cli.utils.remote_template.Console")
+    def test_version_lock_uses_prepared_environment(
+        self,
+        mock_console: MagicMock,
+        mock_parse_version: MagicMock,
+        mock_subprocess: MagicMock,
+        mock_get_cli_command: MagicMock,
+    ) -> None:
+        """Test that the locked version runs from its prepared environment."""
+        mock_parse_version.return_value = "0.14.2"
+        mock_get_cli_command.return_value = ["/envs/0.14.2/bin/agent-starter-pack"]
+        mock_subprocess.return_value = MagicMock(returncode=0)
+
+        result = check_and_execute_with_version_lock(
+            pathlib.Path("/mock/template"), "remote/template"
+        )
+
+        assert result is True
+        mock_get_cli_command.assert_called_once_with("0.14.2")
+        mock_subprocess.assert_called_with(
+            [
+                "/envs/0.14.2/bin/agent-starter-pack",
+                "create",
+                "test-project",
+                "-a",
+                "local@/mock/template",
+                "--skip-welcome",
+                "--locked",
+            ],
+            check=True,
+        )
+
+    @patch(
+        "sys.argv",
+        [
+            "agent-starter-pack",
+            "create",
+            "test-project",
+            "-a",
+            "remote/template",
+            "--profile",
+            "--profile-output",
+            "profile.json",
+            "--no-cache",
+            "--profile-output=other.json",
+        ],
+    )
+    @patch("agent_starter_pack.cli.utils.remote_template.subprocess.run")
+    @patch(
+        "agent_starter_pack.cli.utils.remote_template.parse_agent_starter_pack_version_from_lock"
+    )
+    @patch("agent_starter_pack.cli.utils.remote_template.Console")
+    @pytest.mark.parametrize(
+        ("version", "forwarded"),
+        [
+            ("0.31.8", []),
+            (
+                "0.32.0",
+                [
+                    "--profile",
+                    "--profile-output",
+                    "profile.json",
+                    "--no-cache",
+                    "--profile-output=other.json",
+                ],
+            ),
+        ],
+    )
+    def test_version_lock_strips_unknown_options(
+        self,
+        mock_console: MagicMock,
+        mock_parse_version: MagicMock,
+        mock_subprocess: MagicMock,
+        version: str,
+        forwarded: list[str],
+    ) -> None:
+        """Test that options older versions do not know are not forwarded."""
+        mock_parse_version.return_value = version
+        mock_subprocess.return_value = MagicMock(returncode=0)
+
+        result = check_and_execute_with_version_lock(
+            pathlib.Path("/mock/template"), "remote/template"
+        )
+
+        assert result is True
+        mock_subprocess.assert_called_with(
+            [
+                "uvx",
+                f"agent-starter-pack@{version}",
+                "create",
+                "test-project",
+                "-a",
+                "local@/mock/template",
+                *forwarded,
+                "--skip-welcome",
+                "--locked",
+            ],
+            check=True,
+        )
+
+    @patch(
+        "sys.argv",
+        ["agent-starter-pack", "create", "test-project", "-a", "x/y", "--dry-run"],
+    )
+    @patch("agent_starter_pack.cli.utils.remote_template.subprocess.run")
+    @patch(
+        "agent_starter_pack.cli.utils.remote_template.parse_agent_starter_pack_version_from_lock"
+    )
+    @patch("agent_starter_pack.cli.utils.remote_template.Console")
+    def test_version_lock_dry_run_with_old_version(
+        self,
+        mock_console: MagicMock,
+        mock_parse_version: MagicMock,
+        mock_subprocess: MagicMock,
+    ) -> None:
+        """Test that dry runs are not re-executed by versions without --dry-run."""
+        mock_parse_version.return_value = "0.31.8"
+
+        result = check_and_execute_with_version_lock(
+            pathlib.Path("/mock/template"), "x/y"
+        )
+
+        assert result is False
+        mock_subprocess.assert_not_called()
+        print_calls = [
+            call[0][0] for call in mock_console.return_value.print.call_args_list
+        ]
+        assert any("does not support --dry-run" in call for call in print_calls)
+
     @patch("pathlib.Path.exists")
     @patch("builtins.open", new_callable=mock_open)
     def test_render_and_merge_handles_complex_command_blocks(
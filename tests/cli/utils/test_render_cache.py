@@ -0,0 +1,201 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import pathlib
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from agent_starter_pack.cli.utils.cache import prune_cache_entries
+from agent_starter_pack.cli.utils.region import RegionRewriter
+from agent_starter_pack.cli.utils.render_cache import (
+    RENDER_CACHE_ENV_VAR,
+    RenderCache,
+    is_render_cache_enabled,
+)
+from agent_starter_pack.cli.utils.render_engine import (
+    ALL_VARIABLES,
+    FilePlan,
+    RenderEngine,
+)
+
+
+def _write(path: pathlib.Path, content: str) -> pathlib.Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+    return path
+
+
+def _tree(root: pathlib.Path) -> dict[str, bytes]:
+    return {
+        p.relative_to(root).as_posix(): p.read_bytes()
+        for p in sorted(root.rglob("*"))
+        if p.is_file()
+    }
+
+
+def _config(project_name: str, **overrides: Any) -> dict[str, Any]:
+    return {
+        "project_name": project_name,
+        "generated_at": f"{project_name}-timestamp",
+        "agent_directory": "app",
+        "package_name": "{{ cookiecutter.project_name | replace('-', '_') }}",
+        "deployment_target": "cloud_run",
+        "_copy_without_render": ["*.json"],
+        **overrides,
+    }
+
+
+@pytest.fixture
+def plan(tmp_path: pathlib.Path) -> FilePlan:
+    src = tmp_path / "src"
+    _write(src / "README.md", "# {{cookiecutter.project_name}}\n")
+    _write(src / "pyproject.toml", 'name = "{{cookiecutter.package_name}}"\n')
+    _write(src / "Dockerfile", "# target: {{cookiecutter.deployment_target}}\n")
+    _write(src / "{{cookiecutter.agent_directory}}" / "agent.py", "x = 1\n")
+    _write(src / "{{cookiecutter.project_name}}.md", "renamed\n")
+    _write(src / "dump.txt", "{{ cookiecutter | tojson }}\n")
+    _write(src / "data.json", '{"a": "{{ raw }}"}')
+    plan = FilePlan()
+    plan.add_tree(src)
+    return plan
+
+
+def _render(
+    cache: RenderCache, plan: FilePlan, out: pathlib.Path, config: dict[str, Any]
+) -> bool:
+    return cache.render(RenderEngine(config), plan, out / config["project_name"])
+
+
+class TestRenderCache:
+    """Tests for the rendered output cache."""
+
+    def test_hit_matches_uncached_render(
+        self, tmp_path: pathlib.Path, plan: FilePlan
+    ) -> None:
+        """Test that a hit for another project name is byte-identical."""
+        cache = RenderCache(tmp_path / "cache")
+        assert not _render(cache, plan, tmp_path / "miss", _config("first-agent"))
+
+        assert _render(cache, plan, tmp_path / "hit", _config("second-agent"))
+
+        expected = tmp_path / "expected" / "second-agent"
+        RenderEngine(_config("second-agent")).render_plan(plan, expected)
+        assert _tree(tmp_path / "hit" / "second-agent") == _tree(expected)
+
+    def test_hit_only_renders_project_specific_files(
+        self, tmp_path: pathlib.Path, plan: FilePlan
+    ) -> None:
+        """Test that files not reading project-specific values are copied."""
+        cache = RenderCache(tmp_path / "cache")
+        _render(cache, plan, tmp_path / "miss", _config("first-agent"))
+
+        rendered: list[str] = []
+        original = RenderEngine._render_file
+
+        def record(
+            self: RenderEngine, rel_path: str, src: pathlib.Path, outfile: pathlib.Path
+        ) -> str:
+            rendered.append(rel_path)
+            return original(self, rel_path, src, outfile)
+
+        with patch.object(RenderEngine, "_render_file", record):
+            _render(cache, plan, tmp_path / "hit", _config("second-agent"))
+
+        # The renamed file has no Jinja syntax, so it is copied to its new path
+        assert sorted(rendered) == ["README.md", "dump.txt", "pyproject.toml"]
+        assert (tmp_path / "hit" / "second-agent" / "second-agent.md").exists()
+
+    def test_key_depends_on_config_and_templates(
+        self, tmp_path: pathlib.Path, plan: FilePlan
+    ) -> None:
+        """Test that options, the region and template content invalidate entries."""
+        cache = RenderCache(tmp_path / "cache")
+        engine = RenderEngine(_config("first-agent"))
+        key = cache.get_key(engine, plan)
+
+        assert cache.get_key(RenderEngine(_config("other-name")), plan) == key
+        project_variables = cache.get_project_variables(engine)
+        assert "package_name" in project_variables
+        assert "deployment_target" not in project_variables
+
+        other_target = _config("first-agent", deployment_target="agent_engine")
+        assert cache.get_key(RenderEngine(other_target), plan) != key
+
+        other_region = RenderEngine(_config("first-agent"))
+        other_region.region_rewriter = RegionRewriter("europe-west1")
+        assert cache.get_key(other_region, plan) != key
+
+        _write(plan.files["Dockerfile"], "# changed\n")
+        assert cache.get_key(RenderEngine(_config("first-agent")), plan) != key
+
+    def test_unwritable_directory_does_not_fail(
+        self, tmp_path: pathlib.Path, plan: FilePlan
+    ) -> None:
+        """Test that cache write errors never break rendering."""
+        blocker = tmp_path / "not_a_dir"
+        blocker.write_text("")
+        cache = RenderCache(blocker / "cache")
+
+        assert not _render(cache, plan, tmp_path / "out", _config("first-agent"))
+        assert (tmp_path / "out" / "first-agent" / "app" / "agent.py").exists()
+
+    def test_enabled_by_env_var(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that the cache is opt-in."""
+        monkeypatch.delenv(RENDER_CACHE_ENV_VAR, raising=False)
+        assert not is_render_cache_enabled()
+        monkeypatch.setenv(RENDER_CACHE_ENV_VAR, "1")
+        assert is_render_cache_enabled()
+
+
+class TestDependencyTracking:
+    """Tests for recording the variables read by each template."""
+
+    def test_records_variables_per_file(
+        self, tmp_path: pathlib.Path, plan: FilePlan
+    ) -> None:
+        """Test that path and content accesses are recorded."""
+        engine = RenderEngine(_config("first-agent"))
+        engine.dependencies = {}
+        engine.render_plan(plan, tmp_path / "out")
+
+        dependencies = engine.dependencies
+        assert dependencies["Dockerfile"] == {"deployment_target"}
+        assert dependencies["{{cookiecutter.agent_directory}}/agent.py"] == {
+            "agent_directory"
+        }
+        assert ALL_VARIABLES in dependencies["dump.txt"]
+        assert dependencies["data.json"] == set()
+
+
+class TestPruneCacheEntries:
+    """Tests for size-capped eviction of entry directories."""
+
+    def test_evicts_least_recently_used_entries(self, tmp_path: pathlib.Path) -> None:
+        """Test that the oldest entries are removed until the cap is met."""
+        for i, name in enumerate(("old", "mid", "new")):
+            _write(tmp_path / name / "tree" / "file.txt", "x" * 100)
+            os.utime(tmp_path / name, (1000 + i, 1000 + i))
+        _write(tmp_path / ".in-progress" / "file.txt", "x" * 1000)
+
+        removed = prune_cache_entries(tmp_path, 200)
+
+        assert removed == 1
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            ".in-progress",
+            "mid",
+            "new",
+        ]
@@ -0,0 +1,460 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import pathlib
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from cookiecutter.main import cookiecutter
+
+from agent_starter_pack.cli.utils.render_engine import (
+    COOKIECUTTER_ENGINE,
+    RENDER_ENGINE_ENV_VAR,
+    RENDER_WORKERS_ENV_VAR,
+    SINGLE_PASS_ENGINE,
+    FilePlan,
+    RenderEngine,
+    RenderError,
+    get_render_engine_name,
+    get_render_workers,
+    get_static_copy_patterns,
+    notify_render,
+    render_listener,
+    run_file_tasks,
+)
+
+
+def _write(path: pathlib.Path, content: str | bytes) -> pathlib.Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if isinstance(content, bytes):
+        path.write_bytes(content)
+    else:
+        path.write_text(content, encoding="utf-8")
+    return path
+
+
+def _tree(root: pathlib.Path) -> dict[str, bytes]:
+    return {
+        p.relative_to(root).as_posix(): p.read_bytes()
+        for p in sorted(root.rglob("*"))
+        if p.is_file()
+    }
+
+
+@pytest.fixture
+def config() -> dict[str, Any]:
+    return {
+        "project_name": "demo-project",
+        "agent_directory": "my_agent",
+        "tags": ["adk", "a2a"],
+        "settings": {"port": 8080},
+        "_copy_without_render": ["*.json", "frontend/**/*", "notebooks/*"],
+    }
+
+
+class TestFilePlan:
+    """Tests for the FilePlan layering."""
+
+    def test_later_layers_override_earlier_ones(self, tmp_path: pathlib.Path) -> None:
+        """Test that a later layer replaces files with the same relative path."""
+        base = tmp_path / "base"
+        overlay = tmp_path / "overlay"
+        _write(base / "README.md", "base")
+        _write(base / "app" / "agent.py", "base agent")
+        _write(overlay / "agent.py", "overlay agent")
+
+        plan = FilePlan()
+        plan.add_tree(base)
+        plan.add_tree(overlay, "app")
+
+        assert plan.files["README.md"] == base / "README.md"
+        assert plan.files["app/agent.py"] == overlay / "agent.py"
+        assert plan.directories == {"app"}
+        assert len(plan) == 2
+
+    def test_skip_predicate_excludes_paths(self, tmp_path: pathlib.Path) -> None:
+        """Test that skipped files and directories never enter the plan."""
+        src = tmp_path / "src"
+        _write(src / "keep.py", "x")
+        _write(src / "__pycache__" / "keep.cpython-311.pyc", "x")
+        _write(src / "nested" / "skip.pyc", "x")
+
+        plan = FilePlan()
+        plan.add_tree(
+            src,
+            should_skip=lambda p: p.suffix == ".pyc" or p.name == "__pycache__",
+        )
+
+        assert set(plan.files) == {"keep.py"}
+        assert plan.directories == {"nested"}
+
+    def test_stage_materializes_plan(self, tmp_path: pathlib.Path) -> None:
+        """Test that staging writes every planned file and directory."""
+        src = tmp_path / "src"
+        _write(src / "a" / "b.txt", "content")
+        (src / "empty").mkdir()
+
+        plan = FilePlan()
+        plan.add_tree(src)
+        plan.stage(tmp_path / "staged")
+
+        assert (tmp_path / "staged" / "a" / "b.txt").read_text() == "content"
+        assert (tmp_path / "staged" / "empty").is_dir()
+
+
+class TestRenderEngine:
+    """Tests for single-pass rendering."""
+
+    def test_renders_paths_and_content(
+        self, tmp_path: pathlib.Path, config: dict[str, Any]
+    ) -> None:
+        """Test that templated paths and file contents are rendered."""
+        src = tmp_path / "src"
+        _write(
+            src / "{{cookiecutter.agent_directory}}" / "agent.py",
+            'NAME = "{{cookiecutter.project_name}}"\n',
+        )
+
+        plan = FilePlan()
+        plan.add_tree(src)
+        out = tmp_path / "out"
+        written = RenderEngine(config).render_plan(plan, out)
+
+        assert written == 1
+        assert (out / "my_agent" / "agent.py").read_text() == 'NAME = "demo-project"\n'
+
+    def test_copy_without_render_patterns(
+        self, tmp_path: pathlib.Path, config: dict[str, Any]
+    ) -> None:
+        """Test that files matching _copy_without_render are copied verbatim."""
+        src = tmp_path / "src"
+        raw = "{{ not_a_cookiecutter_var }}"
+        _write(src / "data.json", raw)
+        _write(src / "frontend" / "src" / "App.tsx", raw)
+        _write(src / "notebooks" / "demo.ipynb", raw)
+
+        plan = FilePlan()
+        plan.add_tree(src)
+        out = tmp_path / "out"
+        RenderEngine(config).render_plan(plan, out)
+
+        for rel in ("data.json", "frontend/src/App.tsx", "notebooks/demo.ipynb"):
+            assert (out / rel).read_text() == raw
+
+    def test_binary_files_are_not_rendered(
+        self, tmp_path: pathlib.Path, config: dict[str, Any]
+    ) -> None:
+        """Test that binary files are copied byte for byte."""
+        src = tmp_path / "src"
+        payload = b"\x89PNG\r\n\x1a\n\x00\x00{{cookiecutter.project_name}}\xff"
+        _write(src / "logo.png", payload)
+
+        plan = FilePlan()
+        plan.add_tree(src)
+        out = tmp_path / "out"
+        RenderEngine(config).render_plan(plan, out)
+
+        assert (out / "logo.png").read_bytes() == payload
+
+    def test_preserves_crlf_newlines(
+        self, tmp_path: pathlib.Path, config: dict[str, Any]
+    ) -> None:
+        """Test that the newline style of the source file is kept."""
+        src = tmp_path / "src"
+        _write(src / "run.bat", b"echo {{cookiecutter.project_name}}\r\nexit\r\n")
+
+        plan = FilePlan()
+        plan.add_tree(src)
+        out = tmp_path / "out"
+        RenderEngine(config).render_plan(plan, out)
+
+        assert (out / "run.bat").read_bytes() == b"echo demo-project\r\nexit\r\n"
+
+    def test_files_without_markers_are_copied(
+        self, tmp_path: pathlib.Path, config: dict[str, Any]
+    ) -> None:
+        """Test that files without Jinja syntax are copied instead of rendered."""
+        src = tmp_path / "src"
+        _write(src / "app.py", "print('hello')\n")
+        _write(src / "mixed.txt", b"mixed\r\nnewlines\n")
+
+        plan = FilePlan()
+        plan.add_tree(src)
+        out = tmp_path / "out"
+        engine = RenderEngine(config)
+        rendered: list[str] = []
+        get_template = engine.env.get_template
+
+        def record(name: str) -> Any:
+            rendered.append(name)
+            return get_template(name)
+
+        with patch.object(engine.env, "get_template", record):
+            engine.render_plan(plan, out)
+
+        # Rendering normalizes mixed newlines, so that file is not copied
+        assert rendered == ["mixed.txt"]
+        assert (out / "app.py").read_text() == "print('hello')\n"
+
+    def test_matches_cookiecutter_output(
+        self, tmp_path: pathlib.Path, config: dict[str, Any]
+    ) -> None:
+        """Test that the engine output is byte-identical to cookiecutter's."""
+        src = tmp_path / "src"
+        _write(src / "README.md", "# {{cookiecutter.project_name}}\n")
+        _write(
+            src / "pyproject.toml",
+            '{%- if "adk" in cookiecutter.tags %}\nadk = true\n{%- endif %}\n'
+            "port = {{cookiecutter.settings.port}}\n",
+        )
+        _write(src / "{{cookiecutter.agent_directory}}" / "__init__.py", "")
+        _write(src / "frontend" / "public" / "index.html", "{{ raw }}")
+        _write(src / "config.json", '{"a": "{{ raw }}"}')
+        _write(src / "static" / "[id].py", "ids = [1, 2]\r\n")
+        (src / "empty_dir").mkdir()
+
+        plan = FilePlan()
+        plan.add_tree(src)
+
+        engine_out = tmp_path / "engine"
+        RenderEngine(config).render_plan(plan, engine_out / config["project_name"])
+
+        template = tmp_path / "template"
+        plan.stage(template / "{{cookiecutter.project_name}}")
+        static_patterns = get_static_copy_patterns(plan, config)
+        assert static_patterns == [
+            "static/[[]id].py",
+            "{{cookiecutter.agent_directory}}/__init__.py",
+        ]
+        staged_config = {
+            **config,
+            "_copy_without_render": config["_copy_without_render"] + static_patterns,
+        }
+        (template / "cookiecutter.json").write_text(json.dumps(staged_config))
+        cookiecutter_out = tmp_path / "cookiecutter"
+        cookiecutter(
+            str(template),
+            no_input=True,
+            output_dir=str(cookiecutter_out),
+        )
+
+        assert _tree(engine_out) == _tree(cookiecutter_out)
+        assert (engine_out / "demo-project" / "empty_dir").is_dir()
+
+    def test_render_file_outside_plan(
+        self, tmp_path: pathlib.Path, config: dict[str, Any]
+    ) -> None:
+        """Test that single files render with the engine's context."""
+        base_file = _write(
+            tmp_path / "base" / "pyproject.toml",
+            b'name = "{{cookiecutter.project_name}}"\r\n',
+        )
+        raw_file = _write(tmp_path / "base" / "config.json", "{{ raw }}")
+        engine = RenderEngine(config)
+
+        engine.render_file(base_file, tmp_path / "out" / "starter_pack_pyproject.toml")
+        engine.render_file(raw_file, tmp_path / "out" / "config.json")
+
+        assert (tmp_path / "out" / "starter_pack_pyproject.toml").read_bytes() == (
+            b'name = "demo-project"\r\n'
+        )
+        assert (tmp_path / "out" / "config.json").read_text() == "{{ raw }}"
+
+    def test_excluded_outputs_are_not_written(
+        self, tmp_path: pathlib.Path, config: dict[str, Any]
+    ) -> None:
+        """Test that excluded outputs and directories are never written."""
+        src = tmp_path / "src"
+        _write(src / "README.md", "# {{cookiecutter.project_name}}\n")
+        _write(src / ".github" / "workflows" / "ci.yaml", "on: push\n")
+        _write(src / "{{cookiecutter.agent_directory}}" / "gcs.py", "x = 1\n")
+
+        plan = FilePlan()
+        plan.add_tree(src)
+        engine = RenderEngine(config)
+        engine.exclude_output = lambda path: path in (".github", "my_agent/gcs.py")
+        out = tmp_path / "out"
+        written = engine.render_plan(plan, out)
+
+        assert written == 1
+        assert _tree(out) == {"README.md": b"# demo-project\n"}
+        assert not (out / ".github").exists()
+        assert sorted(engine.excluded) == [
+            out / ".github" / "workflows" / "ci.yaml",
+            out / "my_agent" / "gcs.py",
+        ]
+
+    def test_resolve_outputs_without_creating_dirs(
+        self, tmp_path: pathlib.Path, config: dict[str, Any]
+    ) -> None:
+        """Test that a plan can be resolved without touching the output."""
+        src = tmp_path / "src"
+        _write(src / "{{cookiecutter.agent_directory}}" / "agent.py", "")
+
+        plan = FilePlan()
+        plan.add_tree(src)
+        out = tmp_path / "out"
+        outputs = RenderEngine(config).resolve_outputs(plan, out, create_dirs=False)
+
+        assert list(outputs) == [out / "my_agent" / "agent.py"]
+        assert not out.exists()
+
+    def test_render_sources_only_writes_changed_outputs(
+        self, tmp_path: pathlib.Path, config: dict[str, Any]
+    ) -> None:
+        """Test that only the outputs of changed sources are rendered again."""
+        src = tmp_path / "src"
+        readme = _write(src / "README.md", "# {{cookiecutter.project_name}}\n")
+        _write(src / "{{cookiecutter.agent_directory}}" / "agent.py", "")
+
+        plan = FilePlan()
+        plan.add_tree(src)
+        engine = RenderEngine(config)
+        out = tmp_path / "out"
+        engine.render_plan(plan, out)
+        (out / "my_agent" / "agent.py").write_text("edited")
+        _write(readme, "# {{cookiecutter.project_name}} v2\n")
+        # Make the change visible to mtime-based template caches
+        os.utime(readme, (readme.stat().st_atime, readme.stat().st_mtime + 1))
+
+        written = engine.render_sources(plan, out, {readme})
+
+        assert written == [out / "README.md"]
+        assert _tree(out) == {
+            "README.md": b"# demo-project v2\n",
+            "my_agent/agent.py": b"edited",
+        }
+        assert engine.render_sources(plan, out, {tmp_path / "other.py"}) == []
+
+    def test_render_listener(
+        self, tmp_path: pathlib.Path, config: dict[str, Any]
+    ) -> None:
+        """Test that listeners are notified of renders while registered."""
+        plan = FilePlan()
+        engine = RenderEngine(config)
+        renders = []
+
+        with render_listener(lambda *args: renders.append(args)):
+            notify_render(engine, plan, tmp_path)
+        notify_render(engine, plan, tmp_path)
+
+        assert renders == [(engine, plan, tmp_path)]
+
+
+class TestWorkerPool:
+    """Tests for pooled rendering and writing."""
+
+    def test_pool_output_matches_sequential(
+        self, tmp_path: pathlib.Path, config: dict[str, Any]
+    ) -> None:
+        """Test that pooled rendering produces the same tree."""
+        src = tmp_path / "src"
+        for i in range(20):
+            _write(
+                src / "{{cookiecutter.agent_directory}}" / f"mod_{i}.py",
+                f"# {{{{cookiecutter.project_name}}}} {i}\n",
+            )
+            _write(src / "notebooks" / f"nb_{i}.ipynb", "{{ raw }}")
+        # Two entries render to my_agent/mod_0.py; the later one in walk
+        # order ("{" sorts after "m") must win in both modes
+        _write(src / "my_agent" / "mod_0.py", "# shadowed\n")
+
+        plan = FilePlan()
+        plan.add_tree(src)
+        sequential = tmp_path / "sequential"
+        pooled = tmp_path / "pooled"
+        written = RenderEngine(config).render_plan(plan, sequential, max_workers=1)
+        RenderEngine(config).render_plan(plan, pooled, max_workers=8)
+
+        assert written == 40
+        assert _tree(pooled) == _tree(sequential)
+        assert (pooled / "my_agent" / "mod_0.py").read_text() == "# demo-project 0\n"
+
+    def test_pool_aggregates_errors(
+        self, tmp_path: pathlib.Path, config: dict[str, Any]
+    ) -> None:
+        """Test that every failing file is reported."""
+        src = tmp_path / "src"
+        _write(src / "ok.txt", "{{cookiecutter.project_name}}")
+        _write(src / "bad_1.txt", "{{cookiecutter.missing_1}}")
+        _write(src / "bad_2.txt", "{{cookiecutter.missing_2}}")
+
+        plan = FilePlan()
+        plan.add_tree(src)
+
+        with pytest.raises(RenderError) as exc_info:
+            RenderEngine(config).render_plan(plan, tmp_path / "out", max_workers=4)
+
+        assert [label for label, _ in exc_info.value.errors] == [
+            "bad_1.txt",
+            "bad_2.txt",
+        ]
+        assert (tmp_path / "out" / "ok.txt").read_text() == "demo-project"
+
+    def test_results_keep_task_order(self) -> None:
+        """Test that results are returned in task order."""
+        tasks = [(str(i), lambda i=i: i * i) for i in range(10)]
+        assert run_file_tasks(tasks, max_workers=4) == [i * i for i in range(10)]
+
+    def test_sequential_mode_raises_first_error(self) -> None:
+        """Test that sequential mode keeps the original exception."""
+
+        def fail() -> None:
+            raise OSError("disk full")
+
+        with pytest.raises(OSError, match="disk full"):
+            run_file_tasks([("a", fail), ("b", fail)], max_workers=1)
+
+    @pytest.mark.parametrize(
+        "value,expected",
+        [(None, 1), ("4", 4), ("0", 1), ("invalid", 1)],
+    )
+    def test_render_workers_env_var(
+        self, monkeypatch: pytest.MonkeyPatch, value: str | None, expected: int
+    ) -> None:
+        """Test parsing of ASP_RENDER_WORKERS."""
+        if value is None:
+            monkeypatch.delenv(RENDER_WORKERS_ENV_VAR, raising=False)
+        else:
+            monkeypatch.setenv(RENDER_WORKERS_ENV_VAR, value)
+        assert get_render_workers() == expected
+
+    def test_render_workers_auto(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that "auto" sizes the pool from the CPU count."""
+        monkeypatch.setenv(RENDER_WORKERS_ENV_VAR, "auto")
+        assert get_render_workers() > 1
+
+
+class TestGetRenderEngineName:
+    """Tests for render engine selection."""
+
+    def test_defaults_to_single_pass(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that the single-pass engine is used by default."""
+        monkeypatch.delenv(RENDER_ENGINE_ENV_VAR, raising=False)
+        assert get_render_engine_name() == SINGLE_PASS_ENGINE
+
+    def test_cookiecutter_engine_can_be_selected(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that the legacy engine is selected case-insensitively."""
+        monkeypatch.setenv(RENDER_ENGINE_ENV_VAR, "Cookiecutter")
+        assert get_render_engine_name() == COOKIECUTTER_ENGINE
+
+    def test_unknown_engine_falls_back(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that unknown values fall back to the single-pass engine."""
+        monkeypatch.setenv(RENDER_ENGINE_ENV_VAR, "turbo")
+        assert get_render_engine_name() == SINGLE_PASS_ENGINE
@@ -13,11 +13,21 @@
 # limitations under the License.
 
 import pathlib
+from typing import Any
+from unittest.mock import patch
 
 import pytest
 
+from agent_starter_pack.cli.utils.region import (
+    is_region_file,
+    replace_region_in_files,
+)
+from agent_starter_pack.cli.utils.render_engine import RenderEngine
 from agent_starter_pack.cli.utils.template import (
     copy_flat_structure_agent_files,
+    get_template_path,
+    is_excluded_output,
+    process_template,
     validate_agent_directory_name,
 )
 
@@ -223,5 +233,142 @@ class TestCopyFlatStructureAgentFiles:
         assert (dst / "new_agent" / "agent.py").exists()
 
 
+class TestIsExcludedOutput:
+    """Tests for the paths left out of generated projects."""
+
+    @pytest.fixture
+    def config(self) -> dict[str, Any]:
+        return {
+            "agent_name": "adk",
+            "deployment_target": "cloud_run",
+            "cicd_runner": "github_actions",
+            "is_adk": True,
+            "is_adk_live": False,
+            "is_a2a": False,
+        }
+
+    @pytest.mark.parametrize(
+        "rel_path,expected",
+        [
+            ("README.md", False),
+            (".github/workflows/deploy.yaml", False),
+            (".cloudbuild", True),
+            (".cloudbuild/deploy.yaml", True),
+            ("deployment/terraform/wif.tf", False),
+            ("deployment/terraform/build_triggers.tf", True),
+            ("my_agent/app_utils/gcs.py", True),
+            ("app/app_utils/gcs.py", False),
+            ("tests/helpers.py", True),
+            ("unused_notes.md", True),
+            ("docs/unused_dir/file.md", True),
+            # The unused_* cleanup does not look inside hidden directories
+            (".github/unused_workflow.yaml", False),
+        ],
+    )
+    def test_conditional_and_unused_paths(
+        self, config: dict[str, Any], rel_path: str, expected: bool
+    ) -> None:
+        """Test that conditional files and unused_* paths are excluded."""
+        assert is_excluded_output(rel_path, config, "my_agent") is expected
+
+    def test_prototype_mode_paths(self, config: dict[str, Any]) -> None:
+        """Test that prototype mode excludes deployment, load tests and notebooks."""
+        prototype_config = {**config, "cicd_runner": "skip"}
+
+        assert is_excluded_output("deployment/README.md", prototype_config)
+        assert is_excluded_output("tests/load_test/load_test.py", prototype_config)
+        assert is_excluded_output("notebooks", prototype_config)
+        assert not is_excluded_output("tests/unit/test_dummy.py", prototype_config)
+        assert not is_excluded_output("deployment_notes.md", prototype_config)
+        assert not is_excluded_output("deployment/README.md", config)
+
+
+class TestRegenerateExistingProject:
+    """Tests for generating a project over an existing one."""
+
+    def _process(self, output_dir: pathlib.Path) -> None:
+        process_template(
+            "adk",
+            get_template_path("adk"),
+            "my-agent",
+            deployment_target="cloud_run",
+            cicd_runner="skip",
+            output_dir=output_dir,
+            no_cache=True,
+        )
+
+    def test_existing_project_kept_on_failure(self, tmp_path: pathlib.Path) -> None:
+        """Test that a failed render leaves the existing project untouched."""
+        project = tmp_path / "my-agent"
+        (project / "app").mkdir(parents=True)
+        (project / "README.md").write_text("mine")
+        (project / "app" / "agent.py").write_text("root_agent = None\n")
+
+        with patch.object(RenderEngine, "render_plan", side_effect=KeyboardInterrupt):
+            with pytest.raises(KeyboardInterrupt):
+                self._process(tmp_path)
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["my-agent"]
+        assert (project / "README.md").read_text() == "mine"
+        assert (project / "app" / "agent.py").read_text() == "root_agent = None\n"
+
+    def test_existing_project_replaced_on_success(self, tmp_path: pathlib.Path) -> None:
+        """Test that the existing project is replaced and its README preserved."""
+        project = tmp_path / "my-agent"
+        project.mkdir()
+        (project / "README.md").write_text("mine")
+        (project / "stale.txt").write_text("stale")
+
+        self._process(tmp_path)
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["my-agent"]
+        assert (project / "starter_pack_README.md").read_text() == "mine"
+        assert (project / "app" / "agent.py").exists()
+        assert not (project / "stale.txt").exists()
+
+
+class TestRegionSubstitution:
+    """Tests for generating a project in another region."""
+
+    def test_only_files_written_after_rendering_are_rewritten(
+        self, tmp_path: pathlib.Path
+    ) -> None:
+        """Test that the post-render pass only visits files the engine did not write."""
+        project = tmp_path / "my-agent"
+        project.mkdir()
+        (project / "README.md").write_text("mine in us-central1\n")
+
+        with patch(
+            "agent_starter_pack.cli.utils.template.replace_region_in_files",
+            wraps=replace_region_in_files,
+        ) as replace:
+            process_template(
+                "adk",
+                get_template_path("adk"),
+                "my-agent",
+                deployment_target="cloud_run",
+                cicd_runner="google_cloud_build",
+                output_dir=tmp_path,
+                region="europe-west1",
+                no_cache=True,
+            )
+
+        files = replace.call_args.kwargs["files"]
+        assert project / "Makefile" in files
+        assert project / "starter_pack_README.md" in files
+        assert project / "README.md" not in files
+        assert (project / "starter_pack_README.md").read_text() == (
+            "mine in europe-west1\n"
+        )
+        region_files = [
+            path
+            for path in project.rglob("*")
+            if path.is_file() and is_region_file(path)
+        ]
+        assert region_files
+        for path in region_files:
+            assert "us-central1" not in path.read_text(encoding="utf-8"), path
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,174 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import pathlib
+from unittest.mock import patch
+
+import pytest
+from jinja2 import Environment
+
+from agent_starter_pack.cli.utils.cache import prune_cache_dir
+from agent_starter_pack.cli.utils.template_cache import (
+    BYTECODE_CACHE_EXTENSION,
+    TEMPLATE_CACHE_DISABLE_ENV_VAR,
+    TemplateBytecodeCache,
+    get_bytecode_cache,
+    template_from_string,
+    with_bytecode_cache_extension,
+)
+
+
+@pytest.fixture
+def template_file(tmp_path: pathlib.Path) -> pathlib.Path:
+    path = tmp_path / "templates" / "Makefile"
+    path.parent.mkdir()
+    path.write_text(
+        "install:\n\tuv sync{% if cookiecutter.dev %} --dev{% endif %}\n",
+        encoding="utf-8",
+    )
+    return path
+
+
+class TestTemplateBytecodeCache:
+    """Tests for the persistent compiled template cache."""
+
+    def test_reuses_compiled_bytecode(
+        self, tmp_path: pathlib.Path, template_file: pathlib.Path
+    ) -> None:
+        """Test that a second environment loads the template without compiling."""
+        cache_dir = tmp_path / "cache"
+        env = Environment(bytecode_cache=TemplateBytecodeCache(cache_dir))
+        first = template_from_string(
+            env, template_file.read_text(encoding="utf-8")
+        ).render(cookiecutter={"dev": True})
+        assert len(list(cache_dir.glob("*.jinjabc"))) == 1
+
+        env = Environment(bytecode_cache=TemplateBytecodeCache(cache_dir))
+        with patch.object(env, "compile", side_effect=AssertionError("compiled")):
+            second = template_from_string(
+                env, template_file.read_text(encoding="utf-8")
+            ).render(cookiecutter={"dev": True})
+
+        assert first == second == "install:\n\tuv sync --dev"
+
+    def test_matches_from_string_rendering(
+        self, tmp_path: pathlib.Path, template_file: pathlib.Path
+    ) -> None:
+        """Test that cached templates render like Environment.from_string."""
+        env = Environment(bytecode_cache=TemplateBytecodeCache(tmp_path / "cache"))
+        expected = Environment().from_string(template_file.read_text(encoding="utf-8"))
+
+        for dev in (True, False):
+            context = {"cookiecutter": {"dev": dev}}
+            assert template_from_string(
+                env, template_file.read_text(encoding="utf-8")
+            ).render(**context) == expected.render(**context)
+
+    def test_key_depends_on_content_version_and_environment(
+        self, tmp_path: pathlib.Path
+    ) -> None:
+        """Test that source, package version and settings invalidate entries."""
+        cache = TemplateBytecodeCache(tmp_path)
+        env = Environment()
+        key = cache.get_content_key(env, "Makefile", "Makefile", "a")
+
+        assert cache.get_content_key(env, "Makefile", "Makefile", "a") == key
+        assert cache.get_content_key(env, "Makefile", "Makefile", "b") != key
+        assert (
+            cache.get_content_key(
+                Environment(keep_trailing_newline=True), "Makefile", "Makefile", "a"
+            )
+            != key
+        )
+
+        with patch(
+            "agent_starter_pack.cli.utils.template_cache.get_current_version",
+            return_value="99.0.0",
+        ):
+            other_release = TemplateBytecodeCache(tmp_path)
+        assert other_release.get_content_key(env, "Makefile", "Makefile", "a") != key
+
+    def test_unwritable_directory_does_not_fail(
+        self, tmp_path: pathlib.Path, template_file: pathlib.Path
+    ) -> None:
+        """Test that cache write errors never break rendering."""
+        blocker = tmp_path / "not_a_dir"
+        blocker.write_text("")
+        env = Environment(bytecode_cache=TemplateBytecodeCache(blocker / "cache"))
+
+        rendered = template_from_string(
+            env, template_file.read_text(encoding="utf-8")
+        ).render(cookiecutter={"dev": False})
+
+        assert rendered == "install:\n\tuv sync"
+
+
+class TestPruneCacheDir:
+    """Tests for size-capped cache eviction."""
+
+    def test_evicts_least_recently_used_entries(self, tmp_path: pathlib.Path) -> None:
+        """Test that the oldest entries are removed until the cap is met."""
+        for i, name in enumerate(("old", "mid", "new")):
+            path = tmp_path / f"{name}.jinjabc"
+            path.write_bytes(b"x" * 100)
+            os.utime(path, (1000 + i, 1000 + i))
+        (tmp_path / "other.txt").write_bytes(b"x" * 1000)
+
+        removed = prune_cache_dir(tmp_path, 200, "*.jinjabc")
+
+        assert removed == 1
+        assert not (tmp_path / "old.jinjabc").exists()
+        assert (tmp_path / "mid.jinjabc").exists()
+        assert (tmp_path / "new.jinjabc").exists()
+        assert (tmp_path / "other.txt").exists()
+
+    def test_missing_directory(self, tmp_path: pathlib.Path) -> None:
+        """Test that pruning a missing directory is a no-op."""
+        assert prune_cache_dir(tmp_path / "missing", 0) == 0
+
+
+class TestCacheConfiguration:
+    """Tests for enabling the cache in cookiecutter and via environment."""
+
+    def test_disabled_by_env_var(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that the cache can be disabled."""
+        monkeypatch.setenv(TEMPLATE_CACHE_DISABLE_ENV_VAR, "1")
+        assert get_bytecode_cache() is None
+
+    def test_cache_dir_from_env_var(
+        self, tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that ASP_CACHE_DIR relocates the cache."""
+        monkeypatch.delenv(TEMPLATE_CACHE_DISABLE_ENV_VAR, raising=False)
+        monkeypatch.setenv("ASP_CACHE_DIR", str(tmp_path))
+
+        bytecode_cache = get_bytecode_cache()
+
+        assert bytecode_cache is not None
+        assert bytecode_cache.directory == tmp_path / "templates"
+
+    def test_extension_attaches_cache(
+        self, tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that the cookiecutter extension configures the environment."""
+        monkeypatch.delenv(TEMPLATE_CACHE_DISABLE_ENV_VAR, raising=False)
+        monkeypatch.setenv("ASP_CACHE_DIR", str(tmp_path))
+        config = with_bytecode_cache_extension({"project_name": "demo"})
+
+        env = Environment(extensions=config["_extensions"])
+
+        assert config["_extensions"] == [BYTECODE_CACHE_EXTENSION]
+        assert isinstance(env.bytecode_cache, TemplateBytecodeCache)
+        assert with_bytecode_cache_extension(config) == config
@@ -0,0 +1,128 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pathlib
+from unittest.mock import patch
+
+import pytest
+from jinja2 import Environment
+
+from agent_starter_pack.cli.utils import template_index
+from agent_starter_pack.cli.utils.template_index import (
+    TemplateIndex,
+    get_template_markers,
+    is_static_content,
+)
+
+MARKERS = ("{%", "{{", "{#")
+
+
+class TestIsStaticContent:
+    """Tests for detecting files that render to their own content."""
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            b"",
+            b"no newline",
+            b"line\nline\n",
+            b"line\r\nline\r\n",
+            b"const style = { a: { b: 1 } };\n",
+            "café\n".encode(),
+        ],
+    )
+    def test_static(self, data: bytes) -> None:
+        """Test that content without markers and one newline style is static."""
+        assert is_static_content(data, MARKERS)
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            b"name = {{ cookiecutter.project_name }}\n",
+            b"{% if x %}x{% endif %}\n",
+            b"{# comment #}\n",
+            # Rendering writes every newline in the style of the first one
+            b"mixed\r\nnewlines\n",
+            b"\xff\xfe not utf-8\n",
+        ],
+    )
+    def test_not_static(self, data: bytes) -> None:
+        """Test that content rendering would change is not static."""
+        assert not is_static_content(data, MARKERS)
+
+    def test_environment_markers(self) -> None:
+        """Test that custom syntax of the environment is taken into account."""
+        env = Environment(
+            variable_start_string="<<",
+            variable_end_string=">>",
+            line_statement_prefix="%%",
+            keep_trailing_newline=True,
+        )
+        markers = get_template_markers(env)
+
+        assert markers == ("{%", "<<", "{#", "%%")
+        assert get_template_markers(Environment()) is None
+
+
+class TestTemplateIndex:
+    """Tests for the on-disk index of static template files."""
+
+    def test_package_files_indexed(self, tmp_path: pathlib.Path) -> None:
+        """Test that files of the package are only read once across runs."""
+        static = tmp_path / "package" / "app.js"
+        templated = tmp_path / "package" / "README.md"
+        static.parent.mkdir()
+        static.write_text("export {};\n")
+        templated.write_text("# {{ cookiecutter.project_name }}\n")
+        index_path = tmp_path / "cache" / "index.json"
+
+        with patch.object(template_index, "_PACKAGE_ROOT", tmp_path / "package"):
+            index = TemplateIndex(MARKERS, index_path)
+            assert index.is_static(static)
+            assert not index.is_static(templated)
+            index.save()
+
+            index = TemplateIndex(MARKERS, index_path)
+            with patch.object(pathlib.Path, "read_bytes", side_effect=AssertionError):
+                assert index.is_static(static)
+                assert not index.is_static(templated)
+
+    def test_changed_file_reclassified(self, tmp_path: pathlib.Path) -> None:
+        """Test that a file is read again once its size or mtime changes."""
+        path = tmp_path / "package" / "app.js"
+        path.parent.mkdir()
+        path.write_text("export {};\n")
+        index_path = tmp_path / "cache" / "index.json"
+
+        with patch.object(template_index, "_PACKAGE_ROOT", tmp_path / "package"):
+            index = TemplateIndex(MARKERS, index_path)
+            assert index.is_static(path)
+            index.save()
+            path.write_text("export const name = '{{ cookiecutter.name }}';\n")
+
+            assert not TemplateIndex(MARKERS, index_path).is_static(path)
+
+    def test_other_files_not_saved(self, tmp_path: pathlib.Path) -> None:
+        """Test that files outside the package, e.g. remote templates, are not saved."""
+        path = tmp_path / "remote" / "app.js"
+        path.parent.mkdir()
+        path.write_text("export {};\n")
+        index_path = tmp_path / "cache" / "index.json"
+
+        with patch.object(template_index, "_PACKAGE_ROOT", tmp_path / "package"):
+            index = TemplateIndex(MARKERS, index_path)
+            assert index.is_static(path)
+            index.save()
+
+        assert not index_path.exists()
@@ -0,0 +1,128 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import pathlib
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from agent_starter_pack.cli.utils import version
+from agent_starter_pack.cli.utils.version import (
+    DEFAULT_UPDATE_CHECK_TTL,
+    NO_UPDATE_CHECK_ENV_VAR,
+    UPDATE_CHECK_TTL_ENV_VAR,
+    UpdateCheck,
+    get_update_check_ttl,
+    start_update_check,
+)
+
+
+def _write_cache(path: pathlib.Path, latest: str, age: float) -> None:
+    path.write_text(
+        json.dumps({"latest": latest, "checked_at": time.time() - age}),
+        encoding="utf-8",
+    )
+
+
+class TestUpdateCheck:
+    """Tests for the cached, non-blocking update check."""
+
+    def test_fresh_cache_skips_lookup(self, tmp_path: pathlib.Path) -> None:
+        """Test that a cached version within the TTL is used without a lookup."""
+        cache_path = tmp_path / "update_check.json"
+        _write_cache(cache_path, "9.9.9", age=10)
+
+        with patch.object(version, "get_latest_version") as mock_latest:
+            check = UpdateCheck(cache_path, ttl=60)
+            check.start()
+
+        mock_latest.assert_not_called()
+        assert check.latest_version() == "9.9.9"
+
+    def test_stale_cache_refreshed_in_background(self, tmp_path: pathlib.Path) -> None:
+        """Test that an expired cache is refreshed without blocking the caller."""
+        cache_path = tmp_path / "update_check.json"
+        _write_cache(cache_path, "1.0.0", age=120)
+        release = threading.Event()
+
+        def slow_lookup() -> str:
+            release.wait(5)
+            return "2.0.0"
+
+        with patch.object(version, "get_latest_version", side_effect=slow_lookup):
+            check = UpdateCheck(cache_path, ttl=60)
+            check.start()
+            # The lookup is still running, nothing is known or displayed yet
+            assert check.latest_version() is None
+            release.set()
+            assert check._thread is not None
+            check._thread.join(5)
+
+        assert check.latest_version() == "2.0.0"
+        assert json.loads(cache_path.read_text())["latest"] == "2.0.0"
+
+    def test_failed_lookup_is_cached(self, tmp_path: pathlib.Path) -> None:
+        """Test that runners without network access do not retry every run."""
+        cache_path = tmp_path / "cache" / "update_check.json"
+
+        with patch.object(version, "get_latest_version", return_value="0.0.0"):
+            check = UpdateCheck(cache_path, ttl=60)
+            check.start()
+            assert check._thread is not None
+            check._thread.join(5)
+
+        assert json.loads(cache_path.read_text())["latest"] == "0.0.0"
+
+    @patch.object(version, "get_current_version", return_value="1.0.0")
+    @patch.object(version, "print_update_message")
+    def test_display_only_newer_versions(
+        self,
+        mock_print: MagicMock,
+        mock_current: MagicMock,
+        tmp_path: pathlib.Path,
+    ) -> None:
+        """Test that the message is only printed for a newer version."""
+        cache_path = tmp_path / "update_check.json"
+        for latest in ("0.9.0", "1.0.0", "1.1.0"):
+            _write_cache(cache_path, latest, age=0)
+            check = UpdateCheck(cache_path, ttl=60)
+            check.start()
+            check.display()
+
+        mock_print.assert_called_once_with("1.0.0", "1.1.0")
+
+    def test_disabled_by_env_var(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that the update check can be disabled."""
+        monkeypatch.setenv(NO_UPDATE_CHECK_ENV_VAR, "1")
+
+        assert start_update_check() is None
+
+    @pytest.mark.parametrize(
+        "value,expected",
+        [
+            ("", DEFAULT_UPDATE_CHECK_TTL),
+            ("3600", 3600),
+            ("soon", DEFAULT_UPDATE_CHECK_TTL),
+        ],
+    )
+    def test_ttl_env_var(
+        self, monkeypatch: pytest.MonkeyPatch, value: str, expected: float
+    ) -> None:
+        """Test the configurable cache lifetime."""
+        monkeypatch.setenv(UPDATE_CHECK_TTL_ENV_VAR, value)
+
+        assert get_update_check_ttl() == expected
@@ -0,0 +1,171 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pathlib
+import subprocess
+from collections.abc import Iterator
+from unittest.mock import patch
+
+import pytest
+from click.testing import CliRunner, Result
+
+from agent_starter_pack.cli.utils.lock_store import LockStore
+from agent_starter_pack.utils import generate_locks
+
+CLOUD_RUN = "uv-adk-cloud_run.lock"
+AGENT_ENGINE = "uv-adk-agent_engine.lock"
+
+AGENT_CONFIGS = {
+    "adk": {
+        "language": "python",
+        "deployment_targets": ["cloud_run", "agent_engine"],
+        "tags": ["adk"],
+    }
+}
+
+# Template changing the pyproject.toml of the Cloud Run lock only
+CHANGED_TEMPLATE = (
+    "{% if cookiecutter.deployment_target == 'cloud_run' %}# changed\n"
+    "{% endif %}target = {{cookiecutter.deployment_target}}\n"
+)
+
+
+class FakeUvLock:
+    """Stand-in for ``generate_lock_file`` recording what it locks."""
+
+    def __init__(self) -> None:
+        self.version = 1
+        self.failing: set[str] = set()
+        self.calls: list[str] = []
+
+    def __call__(self, pyproject_content: str) -> bytes:
+        target = pyproject_content.split("target = ")[1].strip()
+        self.calls.append(target)
+        if target in self.failing:
+            raise subprocess.CalledProcessError(1, "uv", stderr=b"No solution found")
+        return f"version = {self.version}\n# {target}\n".encode()
+
+
+@pytest.fixture
+def store_path(tmp_path: pathlib.Path) -> pathlib.Path:
+    return tmp_path / "uv-locks.store"
+
+
+@pytest.fixture
+def template(tmp_path: pathlib.Path) -> pathlib.Path:
+    path = tmp_path / "pyproject.toml"
+    path.write_text("target = {{cookiecutter.deployment_target}}\n", encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def uv_lock(store_path: pathlib.Path) -> Iterator[FakeUvLock]:
+    fake = FakeUvLock()
+    with (
+        patch.object(generate_locks, "get_agent_configs", return_value=AGENT_CONFIGS),
+        patch.object(generate_locks, "get_lock_store_path", return_value=store_path),
+        patch.object(generate_locks, "generate_lock_file", side_effect=fake),
+        patch.object(generate_locks, "generate_go_lock_file"),
+    ):
+        yield fake
+
+
+def _run(template: pathlib.Path, *args: str) -> Result:
+    return CliRunner().invoke(
+        generate_locks.main, ["--template", str(template), "--jobs", "2", *args]
+    )
+
+
+class TestGenerateLocks:
+    """Tests for incremental lock generation."""
+
+    def test_unchanged_locks_are_reused(
+        self, template: pathlib.Path, store_path: pathlib.Path, uv_lock: FakeUvLock
+    ) -> None:
+        """Test that locks whose input did not change are not locked again."""
+        assert _run(template).exit_code == 0
+        assert sorted(uv_lock.calls) == ["agent_engine", "cloud_run"]
+        saved = store_path.read_bytes()
+
+        uv_lock.calls.clear()
+        result = _run(template)
+
+        assert result.exit_code == 0, result.output
+        assert uv_lock.calls == []
+        assert "2 lock files up to date, generating 0" in result.output
+        assert store_path.read_bytes() == saved
+
+    def test_changed_input_is_locked_again(
+        self, template: pathlib.Path, store_path: pathlib.Path, uv_lock: FakeUvLock
+    ) -> None:
+        """Test that only locks whose pyproject.toml changed are regenerated."""
+        assert _run(template).exit_code == 0
+        uv_lock.calls.clear()
+        template.write_text(CHANGED_TEMPLATE, encoding="utf-8")
+
+        assert _run(template).exit_code == 0
+        assert uv_lock.calls == ["cloud_run"]
+
+    def test_force_regenerates_every_lock(
+        self, template: pathlib.Path, store_path: pathlib.Path, uv_lock: FakeUvLock
+    ) -> None:
+        """Test that --force locks every input again."""
+        assert _run(template).exit_code == 0
+        uv_lock.calls.clear()
+        uv_lock.version = 2
+
+        assert _run(template, "--force").exit_code == 0
+
+        assert sorted(uv_lock.calls) == ["agent_engine", "cloud_run"]
+        store = LockStore.load(store_path)
+        assert store.read(CLOUD_RUN) == b"version = 2\n# cloud_run\n"
+
+    def test_failed_lock_keeps_previous_content(
+        self, template: pathlib.Path, store_path: pathlib.Path, uv_lock: FakeUvLock
+    ) -> None:
+        """Test that a failed lock is kept as it was and retried next time."""
+        assert _run(template).exit_code == 0
+        previous = LockStore.load(store_path)
+        template.write_text(CHANGED_TEMPLATE, encoding="utf-8")
+        uv_lock.version = 2
+        uv_lock.failing = {"cloud_run"}
+
+        result = _run(template)
+
+        assert result.exit_code != 0
+        assert f"Failed to generate 1 lock files: {CLOUD_RUN}" in result.output
+        store = LockStore.load(store_path)
+        assert store.read(CLOUD_RUN) == previous.read(CLOUD_RUN)
+        assert store.inputs[CLOUD_RUN] == previous.inputs[CLOUD_RUN]
+
+        uv_lock.failing = set()
+        uv_lock.calls.clear()
+        assert _run(template).exit_code == 0
+        assert uv_lock.calls == ["cloud_run"]
+        store = LockStore.load(store_path)
+        assert store.read(CLOUD_RUN) == b"version = 2\n# cloud_run\n"
+
+    def test_failed_new_lock_is_dropped(
+        self, template: pathlib.Path, store_path: pathlib.Path, uv_lock: FakeUvLock
+    ) -> None:
+        """Test that a lock that never generated is left out of the store."""
+        uv_lock.failing = {"cloud_run"}
+
+        result = _run(template)
+
+        assert result.exit_code != 0
+        assert CLOUD_RUN in result.output
+        store = LockStore.load(store_path)
+        assert store.names == [AGENT_ENGINE]
+        assert list(store.inputs) == [AGENT_ENGINE]
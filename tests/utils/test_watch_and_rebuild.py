@@ -0,0 +1,194 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pathlib
+import threading
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+pytest.importorskip("watchdog")
+
+from watchdog.events import (
+    FileCreatedEvent,
+    FileDeletedEvent,
+    FileModifiedEvent,
+    FileOpenedEvent,
+)
+
+from agent_starter_pack.cli.utils.render_engine import FilePlan
+from agent_starter_pack.utils.watch_and_rebuild import TemplateHandler
+
+
+def _write(path: pathlib.Path, content: str = "") -> pathlib.Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def templates(tmp_path: pathlib.Path) -> pathlib.Path:
+    root = tmp_path / "templates"
+    _write(root / "base" / "README.md", "# {{cookiecutter.project_name}}\n")
+    _write(root / "base" / "Makefile", "install:\n")
+    _write(root / "base" / "app" / "agent.py")
+    _write(root / "other_agent" / "agent.py")
+    _write(root / "agent" / ".template" / "templateconfig.yaml")
+    return root
+
+
+@pytest.fixture
+def handler(tmp_path: pathlib.Path, templates: pathlib.Path) -> TemplateHandler:
+    """Handler with the state of a render of the ``base`` templates."""
+    handler = TemplateHandler(
+        agent_name="agent",
+        project_name="my-agent",
+        deployment_target="cloud_run",
+        output_dir=str(tmp_path / "out"),
+        region="us-central1",
+        debounce=0.01,
+    )
+    handler.template_dir = templates / "agent" / ".template"
+    plan = FilePlan()
+    plan.add_tree(templates / "base")
+    handler._on_render(MagicMock(), plan, handler.project_path)
+    return handler
+
+
+class TestGetChangedSources:
+    """Tests for choosing between an incremental update and a full rebuild."""
+
+    def test_edited_sources(
+        self, handler: TemplateHandler, templates: pathlib.Path
+    ) -> None:
+        """Test that templates edited in place are rendered again."""
+        readme = templates / "base" / "README.md"
+        agent = templates / "base" / "app" / "agent.py"
+
+        assert handler.get_changed_sources({readme, agent}, set()) == {readme, agent}
+
+    def test_replaced_source(
+        self, handler: TemplateHandler, templates: pathlib.Path
+    ) -> None:
+        """Test that a template saved by replacing the file is an edit."""
+        readme = templates / "base" / "README.md"
+
+        assert handler.get_changed_sources({readme}, {readme}) == {readme}
+
+    def test_files_outside_the_plan_are_ignored(
+        self, handler: TemplateHandler, templates: pathlib.Path
+    ) -> None:
+        """Test that edits and new files outside the plan change nothing."""
+        other = templates / "other_agent" / "agent.py"
+        new = _write(templates / "other_agent" / "tools.py")
+
+        assert handler.get_changed_sources({other, new}, {new}) == set()
+
+    def test_template_config_rebuilds(
+        self, handler: TemplateHandler, templates: pathlib.Path
+    ) -> None:
+        """Test that an edit under .template/ regenerates the project."""
+        config = templates / "agent" / ".template" / "templateconfig.yaml"
+
+        assert handler.get_changed_sources({config}, set()) is None
+
+    def test_added_or_removed_template_rebuilds(
+        self, handler: TemplateHandler, templates: pathlib.Path
+    ) -> None:
+        """Test that adding or removing a template of the plan regenerates it."""
+        new = _write(templates / "base" / "app" / "tools.py")
+        removed = templates / "base" / "README.md"
+        removed.unlink()
+
+        assert handler.get_changed_sources({new}, {new}) is None
+        assert handler.get_changed_sources({removed}, {removed}) is None
+
+    def test_post_processed_output_rebuilds(
+        self, handler: TemplateHandler, templates: pathlib.Path
+    ) -> None:
+        """Test that a changed Makefile regenerates the project."""
+        makefile = templates / "base" / "Makefile"
+
+        assert handler.get_changed_sources({makefile}, set()) is None
+
+    def test_without_render_rebuilds(
+        self, handler: TemplateHandler, templates: pathlib.Path
+    ) -> None:
+        """Test that the project is regenerated until a render was recorded."""
+        handler._render = None
+
+        assert handler.get_changed_sources({templates / "base"}, set()) is None
+
+
+class TestEventHandling:
+    """Tests for filtering and debouncing file system events."""
+
+    @pytest.fixture
+    def batches(self, handler: TemplateHandler) -> list[tuple[Any, ...]]:
+        batches: list[tuple[Any, ...]] = []
+        self.rebuilt = threading.Event()
+
+        def record(*args: Any) -> None:
+            batches.append(args)
+            self.rebuilt.set()
+
+        handler.update_template = record  # type: ignore[method-assign]
+        return batches
+
+    def test_burst_is_rebuilt_once(
+        self,
+        handler: TemplateHandler,
+        templates: pathlib.Path,
+        batches: list[tuple[Any, ...]],
+    ) -> None:
+        """Test that a burst of events is coalesced into one batch."""
+        readme = templates / "base" / "README.md"
+        new = templates / "base" / "app" / "tools.py"
+
+        for _ in range(5):
+            handler.on_any_event(FileModifiedEvent(str(readme)))
+        handler.on_any_event(FileCreatedEvent(str(new)))
+
+        assert self.rebuilt.wait(5)
+        if handler._timer is not None:
+            handler._timer.join()
+        assert batches == [({readme, new}, {new})]
+
+    @pytest.mark.parametrize(
+        "name", [".README.md.swp", "README.md~", "4913", ".#README.md", "#README.md#"]
+    )
+    def test_editor_files_are_ignored(
+        self,
+        handler: TemplateHandler,
+        templates: pathlib.Path,
+        batches: list[tuple[Any, ...]],
+        name: str,
+    ) -> None:
+        """Test that swap and backup files written by editors are ignored."""
+        handler.on_any_event(FileModifiedEvent(str(templates / "base" / name)))
+        handler.on_any_event(FileDeletedEvent(str(templates / "base" / name)))
+
+        assert handler._timer is None
+
+    def test_non_change_events_are_ignored(
+        self,
+        handler: TemplateHandler,
+        templates: pathlib.Path,
+        batches: list[tuple[Any, ...]],
+    ) -> None:
+        """Test that files being opened do not trigger a rebuild."""
+        handler.on_any_event(FileOpenedEvent(str(templates / "base" / "README.md")))
+
+        assert handler._timer is None